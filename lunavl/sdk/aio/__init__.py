@@ -0,0 +1,18 @@
+"""
+Awaitable api: detectors, estimators and indexes with a shared limit of core tasks in flight.
+"""
+from .detectors import AsyncFaceDetector
+from .engine import AsyncFaceEngine
+from .estimators import AsyncEstimator, AsyncFaceDescriptorEstimator
+from .indexes import AsyncDenseIndex, AsyncDynamicIndex
+from .limiter import InFlightLimiter
+
+__all__ = [
+    "AsyncDenseIndex",
+    "AsyncDynamicIndex",
+    "AsyncEstimator",
+    "AsyncFaceDescriptorEstimator",
+    "AsyncFaceDetector",
+    "AsyncFaceEngine",
+    "InFlightLimiter",
+]
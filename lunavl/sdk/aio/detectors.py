@@ -0,0 +1,137 @@
+"""
+Module contains awaitable detectors.
+"""
+from typing import List, Optional, Union
+
+from ..detectors.base import ImageForDetection, ImageForRedetection
+from ..detectors.facedetector import FaceDetection, FaceDetector, FaceRedetectResult, FacesRedetectResult
+from ..image_utils.geometry import Rect
+from ..image_utils.image import VLImage
+from .limiter import InFlightLimiter
+
+
+class AsyncFaceDetector:
+    """
+    Awaitable face detector. Each call runs a core async task, count of simultaneous tasks is limited by the limiter.
+
+    Attributes:
+        _detector (FaceDetector): face detector
+        _limiter (InFlightLimiter): in flight tasks limiter
+    """
+
+    __slots__ = ("_detector", "_limiter")
+
+    def __init__(self, detector: FaceDetector, limiter: InFlightLimiter):
+        """
+        Init.
+
+        Args:
+            detector: face detector
+            limiter: in flight tasks limiter (usually shared by all wrappers of an engine)
+        """
+        self._detector = detector
+        self._limiter = limiter
+
+    @property
+    def detector(self) -> FaceDetector:
+        """Get underlying face detector"""
+        return self._detector
+
+    @property
+    def limiter(self) -> InFlightLimiter:
+        """Get in flight tasks limiter"""
+        return self._limiter
+
+    async def detectOne(
+        self,
+        image: VLImage,
+        detectArea: Optional[Rect] = None,
+        detect5Landmarks: bool = True,
+        detect68Landmarks: bool = False,
+    ) -> Optional[FaceDetection]:
+        """
+        Detect just one best detection on the image.
+
+        Args:
+            image: image. Format must be R8G8B8
+            detectArea: rectangle area which contains face to detect. If not set will be set image.rect
+            detect5Landmarks: detect or not landmarks5
+            detect68Landmarks: detect or not landmarks68
+        Returns:
+            face detection if face is found otherwise None
+        Raises:
+            LunaSDKException: if detection failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._detector.detectOne(image, detectArea, detect5Landmarks, detect68Landmarks, asyncEstimate=True)
+        )
+
+    async def detect(
+        self,
+        images: List[Union[VLImage, ImageForDetection]],
+        limit: int = 5,
+        detect5Landmarks: bool = True,
+        detect68Landmarks: bool = False,
+    ) -> List[List[FaceDetection]]:
+        """
+        Batch detect faces on images.
+
+        Args:
+            images: input images list. Format must be R8G8B8
+            limit: max number of detections per input image
+            detect5Landmarks: detect or not landmarks5
+            detect68Landmarks: detect or not landmarks68
+        Returns:
+            list of lists detection, order of detection lists is corresponding to order input images
+        Raises:
+            LunaSDKException: if detection failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._detector.detect(images, limit, detect5Landmarks, detect68Landmarks, asyncEstimate=True)
+        )
+
+    async def redetectOne(
+        self,
+        image: VLImage,
+        bBox: Union[Rect, FaceDetection],
+        detect5Landmarks: bool = True,
+        detect68Landmarks: bool = False,
+    ) -> FaceRedetectResult:
+        """
+        Redetect face on an image in area, restricted with bBox or detection.
+
+        Args:
+            image: image. Format must be R8G8B8
+            bBox: detection bounding box or detection
+            detect5Landmarks: detect or not landmarks5
+            detect68Landmarks: detect or not landmarks68
+        Returns:
+            detection if face found otherwise None
+        Raises:
+            LunaSDKException: if redetection failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._detector.redetectOne(image, bBox, detect5Landmarks, detect68Landmarks, asyncEstimate=True)
+        )
+
+    async def redetect(
+        self,
+        images: List[ImageForRedetection],
+        detect5Landmarks: bool = True,
+        detect68Landmarks: bool = False,
+    ) -> FacesRedetectResult:
+        """
+        Redetect faces on images in areas, restricted with bounding boxes.
+
+        Args:
+            images: images with bounding boxes. Format must be R8G8B8
+            detect5Landmarks: detect or not landmarks5
+            detect68Landmarks: detect or not landmarks68
+        Returns:
+            detections, order of detection lists is corresponding to order input images
+        Raises:
+            LunaSDKException: if redetection failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._detector.redetect(images, detect5Landmarks, detect68Landmarks, asyncEstimate=True)
+        )
@@ -0,0 +1,110 @@
+"""
+Module contains a factory of awaitable detectors, estimators and indexes which share one in flight limiter.
+"""
+from typing import Dict, Optional, Union
+
+from ..faceengine.engine import VLFaceEngine
+from ..faceengine.setting_provider import DetectorType
+from ..indexes.stored_index import DenseIndex, DynamicIndex
+from ..launch_options import LaunchOptions
+from .detectors import AsyncFaceDetector
+from .estimators import AsyncEstimator, AsyncFaceDescriptorEstimator, Estimator
+from .indexes import AsyncDenseIndex, AsyncDynamicIndex
+from .limiter import InFlightLimiter
+
+
+class AsyncFaceEngine:
+    """
+    Factory of awaitable wrappers. All wrappers created by one factory share one in flight limiter, so the limit
+    is applied per engine.
+
+    Attributes:
+        _faceEngine (VLFaceEngine): face engine
+        _limiter (InFlightLimiter): in flight tasks limiter
+    """
+
+    __slots__ = ("_faceEngine", "_limiter")
+
+    def __init__(self, faceEngine: VLFaceEngine, maxInFlight: int = 8, maxWaiting: Optional[int] = None):
+        """
+        Init.
+
+        Args:
+            faceEngine: face engine
+            maxInFlight: max count of core tasks in flight
+            maxWaiting: max count of coroutines waiting for a slot, None - unlimited
+        """
+        self._faceEngine = faceEngine
+        self._limiter = InFlightLimiter(maxInFlight, maxWaiting)
+
+    @property
+    def faceEngine(self) -> VLFaceEngine:
+        """Get face engine"""
+        return self._faceEngine
+
+    @property
+    def limiter(self) -> InFlightLimiter:
+        """Get in flight tasks limiter"""
+        return self._limiter
+
+    @property
+    def metrics(self) -> Dict[str, Optional[int]]:
+        """Get limiter metrics (in flight and waiting tasks counts etc.)"""
+        return self._limiter.asDict()
+
+    def createFaceDetector(
+        self, detectorType: DetectorType = DetectorType.FACE_DET_V3, launchOptions: Optional[LaunchOptions] = None
+    ) -> AsyncFaceDetector:
+        """
+        Create awaitable face detector.
+
+        Args:
+            detectorType: detector type
+            launchOptions: detector launch options
+
+        Returns:
+            awaitable face detector
+        """
+        return AsyncFaceDetector(self._faceEngine.createFaceDetector(detectorType, launchOptions), self._limiter)
+
+    def createFaceDescriptorEstimator(
+        self, descriptorVersion: int = 0, launchOptions: Optional[LaunchOptions] = None
+    ) -> AsyncFaceDescriptorEstimator:
+        """
+        Create awaitable face descriptor estimator.
+
+        Args:
+            descriptorVersion: descriptor version or zero for use default descriptor version
+            launchOptions: estimator launch options
+
+        Returns:
+            awaitable face descriptor estimator
+        """
+        estimator = self._faceEngine.createFaceDescriptorEstimator(descriptorVersion, launchOptions)
+        return AsyncFaceDescriptorEstimator(estimator, self._limiter)
+
+    def wrapEstimator(self, estimator: Estimator) -> AsyncEstimator[Estimator]:
+        """
+        Wrap an estimator to awaitable estimator.
+
+        Args:
+            estimator: estimator which supports `asyncEstimate` argument
+
+        Returns:
+            awaitable estimator
+        """
+        return AsyncEstimator(estimator, self._limiter)
+
+    def wrapIndex(self, index: Union[DenseIndex, DynamicIndex]) -> Union[AsyncDenseIndex, AsyncDynamicIndex]:
+        """
+        Wrap an index to awaitable index.
+
+        Args:
+            index: dense or dynamic index
+
+        Returns:
+            awaitable index
+        """
+        if isinstance(index, DynamicIndex):
+            return AsyncDynamicIndex(index, self._limiter)
+        return AsyncDenseIndex(index, self._limiter)
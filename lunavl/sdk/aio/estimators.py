@@ -0,0 +1,131 @@
+"""
+Module contains awaitable estimators.
+"""
+from typing import Any, Generic, List, Optional, TypeVar, Union
+
+from ..descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
+from ..estimators.base import BaseEstimator
+from ..estimators.face_estimators.face_descriptor import FaceDescriptorBatchEstimation, FaceDescriptorEstimator
+from ..estimators.face_estimators.facewarper import FaceWarp, FaceWarpedImage
+from .limiter import InFlightLimiter
+
+Estimator = TypeVar("Estimator", bound=BaseEstimator)
+
+
+class AsyncEstimator(Generic[Estimator]):
+    """
+    Awaitable estimator. Wrapper over any estimator which supports `asyncEstimate` argument of `estimate` and
+    `estimateBatch` methods, count of simultaneous core tasks is limited by the limiter.
+
+    Attributes:
+        _estimator (BaseEstimator): estimator
+        _limiter (InFlightLimiter): in flight tasks limiter
+    """
+
+    __slots__ = ("_estimator", "_limiter")
+
+    def __init__(self, estimator: Estimator, limiter: InFlightLimiter):
+        """
+        Init.
+
+        Args:
+            estimator: estimator
+            limiter: in flight tasks limiter (usually shared by all wrappers of an engine)
+        """
+        self._estimator = estimator
+        self._limiter = limiter
+
+    @property
+    def estimator(self) -> Estimator:
+        """Get underlying estimator"""
+        return self._estimator
+
+    @property
+    def limiter(self) -> InFlightLimiter:
+        """Get in flight tasks limiter"""
+        return self._limiter
+
+    async def estimate(self, *args, **kwargs) -> Any:
+        """
+        Estimate. Arguments are the same as the estimator `estimate` method has (except `asyncEstimate`).
+
+        Returns:
+            estimation
+        Raises:
+            LunaSDKException: if estimation failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(lambda: self._estimator.estimate(*args, asyncEstimate=True, **kwargs))
+
+    async def estimateBatch(self, *args, **kwargs) -> Any:
+        """
+        Batch estimate. Arguments are the same as the estimator `estimateBatch` method has (except `asyncEstimate`).
+
+        Returns:
+            estimations
+        Raises:
+            LunaSDKException: if estimation failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._estimator.estimateBatch(*args, asyncEstimate=True, **kwargs)  # type: ignore
+        )
+
+
+class AsyncFaceDescriptorEstimator(AsyncEstimator[FaceDescriptorEstimator]):
+    """
+    Awaitable face descriptor estimator.
+    """
+
+    __slots__ = ()
+
+    async def estimate(  # type: ignore
+        self, warp: Union[FaceWarp, FaceWarpedImage], descriptor: Optional[FaceDescriptor] = None
+    ) -> FaceDescriptor:
+        """
+        Estimate face descriptor from a warp image.
+
+        Args:
+            warp: warped image
+            descriptor: descriptor for saving extract result
+        Returns:
+            estimated descriptor
+        Raises:
+            LunaSDKException: if estimation failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._estimator.estimate(warp, descriptor, asyncEstimate=True)  # type: ignore
+        )
+
+    async def estimateDescriptorsBatch(
+        self,
+        warps: List[Union[FaceWarp, FaceWarpedImage]],
+        aggregate: bool = False,
+        descriptorBatch: Optional[FaceDescriptorBatch] = None,
+    ) -> FaceDescriptorBatchEstimation:
+        """
+        Estimate a batch of descriptors from warped images.
+
+        Args:
+            warps: warped images
+            aggregate:  whether to estimate  aggregate descriptor or not
+            descriptorBatch: optional batch for saving descriptors
+        Returns:
+            tuple of batch and the aggregate descriptors (or None)
+        Raises:
+            LunaSDKException: if estimation failed or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._estimator.estimateDescriptorsBatch(  # type: ignore
+                warps, aggregate, descriptorBatch, asyncEstimate=True
+            )
+        )
+
+    async def estimateBatch(self, *args, **kwargs) -> Any:
+        """
+        Estimate a batch of descriptors, alias of `estimateDescriptorsBatch`.
+
+        Returns:
+            tuple of batch and the aggregate descriptors (or None)
+        Raises:
+            LunaSDKException: if estimation failed or waiting queue of the limiter is full
+        """
+        return await self.estimateDescriptorsBatch(*args, **kwargs)
@@ -0,0 +1,146 @@
+"""
+Module contains awaitable indexes.
+"""
+from typing import Generic, List, Optional, Sequence, TypeVar, Union
+
+from ..descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
+from ..indexes.base import IndexResult
+from ..indexes.stored_index import DenseIndex, DynamicIndex, IndexType
+from .limiter import InFlightLimiter
+
+Index = TypeVar("Index", bound=Union[DenseIndex, DynamicIndex])
+
+
+class _AsyncIndex(Generic[Index]):
+    """
+    Base awaitable index.
+
+    Attributes:
+        _index (Union[DenseIndex, DynamicIndex]): index
+        _limiter (InFlightLimiter): in flight tasks limiter
+    """
+
+    __slots__ = ("_index", "_limiter")
+
+    def __init__(self, index: Index, limiter: InFlightLimiter):
+        """
+        Init.
+
+        Args:
+            index: index
+            limiter: in flight tasks limiter (usually shared by all wrappers of an engine)
+        """
+        self._index = index
+        self._limiter = limiter
+
+    @property
+    def index(self) -> Index:
+        """Get underlying index"""
+        return self._index
+
+    @property
+    def limiter(self) -> InFlightLimiter:
+        """Get in flight tasks limiter"""
+        return self._limiter
+
+    @property
+    def bufSize(self) -> int:
+        """Get count of descriptors in the index"""
+        return self._index.bufSize
+
+    async def search(self, descriptor: FaceDescriptor, maxCount: int = 1) -> List[IndexResult]:
+        """
+        Search for descriptors with the shorter distance to passed descriptor.
+
+        Args:
+            descriptor: descriptor to match against index
+            maxCount: max count of results (default is 1)
+        Returns:
+            list with index search results
+        Raises:
+            LunaSDKException: if an error occurs while searching or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(lambda: self._index.search(descriptor, maxCount, asyncSearch=True))
+
+    async def searchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int = 1,
+        similarityThreshold: Optional[float] = None,
+    ) -> List[List[IndexResult]]:
+        """
+        Search for descriptors with the shorter distance to each of passed descriptors.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor (default is 1)
+            similarityThreshold: min similarity of results
+        Returns:
+            list with index search results for each descriptor
+        Raises:
+            LunaSDKException: if an error occurs while searching or waiting queue of the limiter is full
+        """
+        return await self._limiter.run(
+            lambda: self._index.searchBatch(descriptors, maxCount, similarityThreshold, asyncSearch=True)
+        )
+
+
+class AsyncDenseIndex(_AsyncIndex[DenseIndex]):
+    """
+    Awaitable dense index.
+    """
+
+    __slots__ = ()
+
+
+class AsyncDynamicIndex(_AsyncIndex[DynamicIndex]):
+    """
+    Awaitable dynamic index. Index updates are synchronous since core index has not async updates.
+    """
+
+    __slots__ = ()
+
+    @property
+    def descriptorsCount(self) -> int:
+        """Get actual count of descriptor in internal storage."""
+        return self._index.descriptorsCount
+
+    def append(self, descriptor: FaceDescriptor) -> None:
+        """
+        Appends descriptor to internal storage.
+
+        Args:
+            descriptor: descriptor with correct length, version and data
+        Raises:
+            LunaSDKException: if an error occurs while adding the descriptor
+        """
+        self._index.append(descriptor)
+
+    def appendBatch(self, descriptorsBatch: FaceDescriptorBatch) -> None:
+        """
+        Appends batch of descriptors to internal storage.
+
+        Args:
+            descriptorsBatch: batch of descriptors with correct length, version and data
+        Raises:
+            LunaSDKException: if an error occurs while adding the batch of descriptors
+        """
+        self._index.appendBatch(descriptorsBatch)
+
+    def remove(self, i: int) -> None:
+        """Remove descriptor at index `i` (0-based)."""
+        self._index.remove(i)
+
+    def save(self, path: str, indexType: IndexType = IndexType.dynamic) -> None:
+        """
+        Save index as 'dynamic' or 'dense' to local storage.
+
+        Args:
+            path: path to file to be created
+            indexType: index type ('dynamic' or 'dense')
+        Raises:
+            ValueError: if path is a directory or index type is incorrect
+            PermissionError: if write access is denied
+            LunaSDKException: if an error occurs while saving the index
+        """
+        self._index.save(path, indexType)
@@ -0,0 +1,159 @@
+"""
+Module contains a limiter of core tasks which are running simultaneously.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from ..errors.errors import LunaVLError
+from ..errors.exceptions import LunaSDKException
+
+TaskResult = TypeVar("TaskResult")
+
+
+class InFlightLimiter:
+    """
+    Limiter of core tasks in flight.
+
+    Coroutines wait for a free slot before starting a core task, so a burst of requests does not create an unbounded
+    count of core tasks. If `maxWaiting` is set and the waiting queue is full, new requests are rejected immediately,
+    so a service can apply backpressure (answer 429/503) instead of growing memory.
+
+    Attributes:
+        _maxInFlight (int): max count of core tasks in flight
+        _maxWaiting (Optional[int]): max count of coroutines waiting for a slot, None - unlimited
+        _semaphore (Optional[asyncio.Semaphore]): semaphore, created in a running event loop
+        _loop (Optional[asyncio.AbstractEventLoop]): event loop of the semaphore
+        _inFlight (int): count of core tasks in flight
+        _waiting (int): count of coroutines waiting for a slot
+        _completed (int): count of completed tasks
+        _rejected (int): count of rejected tasks
+    """
+
+    __slots__ = (
+        "_maxInFlight",
+        "_maxWaiting",
+        "_semaphore",
+        "_loop",
+        "_inFlight",
+        "_waiting",
+        "_completed",
+        "_rejected",
+    )
+
+    def __init__(self, maxInFlight: int = 8, maxWaiting: Optional[int] = None):
+        """
+        Init.
+
+        Args:
+            maxInFlight: max count of core tasks in flight
+            maxWaiting: max count of coroutines waiting for a slot, None - unlimited
+        Raises:
+            ValueError: if max in flight count is not positive or max waiting count is negative
+        """
+        if maxInFlight < 1:
+            raise ValueError(f"Max in flight count must be positive, got {maxInFlight}")
+        if maxWaiting is not None and maxWaiting < 0:
+            raise ValueError(f"Max waiting count must be not negative, got {maxWaiting}")
+        self._maxInFlight = maxInFlight
+        self._maxWaiting = maxWaiting
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inFlight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def maxInFlight(self) -> int:
+        """Get max count of core tasks in flight"""
+        return self._maxInFlight
+
+    @property
+    def maxWaiting(self) -> Optional[int]:
+        """Get max count of coroutines waiting for a slot"""
+        return self._maxWaiting
+
+    @property
+    def inFlightCount(self) -> int:
+        """Get count of core tasks in flight"""
+        return self._inFlight
+
+    @property
+    def waitingCount(self) -> int:
+        """Get count of coroutines waiting for a slot (queue depth)"""
+        return self._waiting
+
+    @property
+    def completedCount(self) -> int:
+        """Get count of completed (successfully or not) tasks"""
+        return self._completed
+
+    @property
+    def rejectedCount(self) -> int:
+        """Get count of tasks rejected due to full waiting queue"""
+        return self._rejected
+
+    @property
+    def isSaturated(self) -> bool:
+        """Whether all slots are busy, so a new task will wait"""
+        return self._inFlight + self._waiting >= self._maxInFlight
+
+    def asDict(self) -> Dict[str, Optional[int]]:
+        """
+        Get limiter metrics as dict.
+
+        Returns:
+            dict with limits and counters
+        """
+        return {
+            "max_in_flight": self._maxInFlight,
+            "max_waiting": self._maxWaiting,
+            "in_flight": self._inFlight,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def _getSemaphore(self) -> asyncio.Semaphore:
+        """
+        Get a semaphore of the running event loop. Semaphore is recreated if the limiter is used in a new loop.
+
+        Returns:
+            semaphore
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._maxInFlight)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, taskFactory: Callable[[], Awaitable[TaskResult]]) -> TaskResult:
+        """
+        Wait for a free slot, start a task and await its result.
+
+        Args:
+            taskFactory: function which starts a task and returns an awaitable (`AsyncTask`)
+
+        Returns:
+            task result
+        Raises:
+            LunaSDKException(LunaVLError.TooManyRequests): if waiting queue is full
+        """
+        semaphore = self._getSemaphore()
+        if self._maxWaiting is not None and semaphore.locked() and self._waiting >= self._maxWaiting:
+            self._rejected += 1
+            raise LunaSDKException(
+                LunaVLError.TooManyRequests.format(f"{self._waiting} requests are already waiting for a core task slot")
+            )
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._inFlight += 1
+        try:
+            return await taskFactory()
+        finally:
+            self._inFlight -= 1
+            self._completed += 1
+            semaphore.release()
@@ -82,16 +82,21 @@ class Landmarks(BaseEstimation):
             )
         return self._points
 
-    def asDict(self) -> Tuple[Tuple[int, int], ...]:  # type: ignore
+    def asDict(self, imageScale: float = 1.0) -> Tuple[Tuple[int, int], ...]:  # type: ignore
         """
         Convert to dict
 
+        Args:
+            imageScale: scale of the image the landmarks are estimated on (`VLImage.scale`), coordinates are mapped
+                to the original image
         Returns:
             list to list points
         """
         pointCount = len(self._coreEstimation)
         points = self._coreEstimation
-        return tuple(((int(points[index].x), int(points[index].y)) for index in range(pointCount)))
+        return tuple(
+            ((int(points[index].x / imageScale), int(points[index].y / imageScale)) for index in range(pointCount))
+        )
 
 
 class LandmarkWithScore(BaseEstimation):
@@ -126,14 +131,18 @@ class LandmarkWithScore(BaseEstimation):
         """
         return self._coreEstimation.score
 
-    def asDict(self) -> dict:
+    def asDict(self, imageScale: float = 1.0) -> dict:
         """
         Convert point to list (json),  coordinates will be cast from float to int
 
+        Args:
+            imageScale: scale of the image the landmark is estimated on (`VLImage.scale`), coordinates are mapped to
+                the original image
         Returns:
             dict with keys: score and point
         """
-        return {"score": self._coreEstimation.score, "point": (int(self.point.x), int(self.point.y))}
+        point = self.point
+        return {"score": self._coreEstimation.score, "point": (int(point.x / imageScale), int(point.y / imageScale))}
 
     def __repr__(self) -> str:
         """
@@ -179,14 +188,17 @@ class LandmarksWithScore(BaseEstimation):
             )
         return self._points
 
-    def asDict(self) -> Tuple[dict, ...]:  # type: ignore
+    def asDict(self, imageScale: float = 1.0) -> Tuple[dict, ...]:  # type: ignore
         """
         Convert to dict
 
+        Args:
+            imageScale: scale of the image the landmarks are estimated on (`VLImage.scale`), coordinates are mapped
+                to the original image
         Returns:
             list to list points
         """
-        return tuple(point.asDict() for point in self.points)
+        return tuple(point.asDict(imageScale) for point in self.points)
 
 
 class BoundingBox(BaseEstimation):
@@ -0,0 +1,208 @@
+"""
+Module realizes micro batching: single items submitted from many threads or coroutines are combined into batches
+and processed by one batch call.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from queue import Empty, Queue
+from typing import Callable, Generic, List, Tuple, TypeVar
+
+BatchItem = TypeVar("BatchItem")
+BatchItemResult = TypeVar("BatchItemResult")
+
+# sentinel for stopping a worker
+_STOP = object()
+
+
+class MicroBatcher(Generic[BatchItem, BatchItemResult]):
+    """
+    Micro batching executor.
+
+    Items are submitted one by one. A background worker collects items into a batch until the batch is full or the
+    first item of the batch waits longer than `maxWaitTime`, then processes the batch by one `processBatch` call and
+    resolves a future of each item. If a batch call fails, items are reprocessed one by one so each caller receives
+    its own result or its own exception.
+
+    Attributes:
+        _processBatch (Callable): batch processing function, it must return results in the order of items
+        _maxBatchSize (int): max batch size
+        _maxWaitTime (float): max time (in seconds) which the first item of a batch waits for other items
+        _queue (Queue): queue of items waiting for processing
+        _workers (List[threading.Thread]): worker threads
+        _closed (bool): batcher is closed or not
+    """
+
+    __slots__ = ("_processBatch", "_maxBatchSize", "_maxWaitTime", "_queue", "_workers", "_closed", "_lock")
+
+    def __init__(
+        self,
+        processBatch: Callable[[List[BatchItem]], List[BatchItemResult]],
+        maxBatchSize: int = 16,
+        maxWaitTime: float = 0.005,
+        workerCount: int = 1,
+        name: str = "MicroBatcher",
+    ):
+        """
+        Init.
+
+        Args:
+            processBatch: batch processing function
+            maxBatchSize: max batch size
+            maxWaitTime: max time (in seconds) which the first item of a batch waits for other items
+            workerCount: count of worker threads
+            name: worker threads name prefix
+        Raises:
+            ValueError: if max batch size or worker count is not positive or max wait time is negative
+        """
+        if maxBatchSize < 1:
+            raise ValueError(f"Max batch size must be positive, got {maxBatchSize}")
+        if maxWaitTime < 0:
+            raise ValueError(f"Max wait time must be not negative, got {maxWaitTime}")
+        if workerCount < 1:
+            raise ValueError(f"Worker count must be positive, got {workerCount}")
+        self._processBatch = processBatch
+        self._maxBatchSize = maxBatchSize
+        self._maxWaitTime = maxWaitTime
+        self._queue: Queue = Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"{name}-{idx}", daemon=True) for idx in range(workerCount)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def maxBatchSize(self) -> int:
+        """Get max batch size"""
+        return self._maxBatchSize
+
+    @property
+    def maxWaitTime(self) -> float:
+        """Get max time (in seconds) which the first item of a batch waits for other items"""
+        return self._maxWaitTime
+
+    @property
+    def pendingCount(self) -> int:
+        """Get approximate count of items waiting for processing"""
+        return self._queue.qsize()
+
+    def submit(self, item: BatchItem) -> "Future[BatchItemResult]":
+        """
+        Submit an item for processing.
+
+        Args:
+            item: item
+
+        Returns:
+            future of the item result
+        Raises:
+            RuntimeError: if batcher is closed
+        """
+        future: "Future[BatchItemResult]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot submit an item to a closed batcher")
+            self._queue.put((item, future))
+        return future
+
+    async def asyncSubmit(self, item: BatchItem) -> BatchItemResult:
+        """
+        Submit an item for processing and await its result.
+
+        Args:
+            item: item
+
+        Returns:
+            item result
+        """
+        return await asyncio.wrap_future(self.submit(item))
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting items. Already submitted items will be processed.
+
+        Args:
+            wait: wait for workers to finish or not
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                for _ in self._workers:
+                    self._queue.put(_STOP)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self) -> "MicroBatcher[BatchItem, BatchItemResult]":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _collectBatch(self) -> Tuple[List[Tuple[BatchItem, Future]], bool]:
+        """
+        Collect next batch from the queue.
+
+        Returns:
+            tuple: first - batch of items with futures, second - worker must stop or not
+        """
+        batch: List[Tuple[BatchItem, Future]] = []
+        first = self._queue.get()
+        if first is _STOP:
+            return batch, True
+        batch.append(first)
+        deadline = time.monotonic() + self._maxWaitTime
+        while len(batch) < self._maxBatchSize:
+            timeout = deadline - time.monotonic()
+            try:
+                nextItem = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except Empty:
+                break
+            if nextItem is _STOP:
+                return batch, True
+            batch.append(nextItem)
+        return batch, False
+
+    def _runBatch(self, batch: List[Tuple[BatchItem, Future]]) -> None:
+        """
+        Process a batch and resolve its futures.
+
+        Args:
+            batch: batch of items with futures
+        """
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self._resolve(batch)
+
+    def _resolve(self, batch: List[Tuple[BatchItem, Future]]) -> None:
+        """
+        Process a batch of running futures. If the batch call fails, items are processed one by one.
+
+        Args:
+            batch: batch of items with futures
+        """
+        try:
+            results = self._processBatch([item for item, _ in batch])
+        except Exception as exc:  # pylint: disable=W0703
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            for itemWithFuture in batch:
+                self._resolve([itemWithFuture])
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _work(self) -> None:
+        """
+        Worker loop.
+        """
+        stop = False
+        while not stop:
+            batch, stop = self._collectBatch()
+            if batch:
+                self._runBatch(batch)
@@ -6,6 +6,7 @@ See `face descriptor`_.
 """
 from typing import Dict, Iterator, List, Optional, Type, Union
 
+import numpy as np
 from FaceEngine import DescriptorBatchResult, IDescriptorBatchPtr, IDescriptorPtr  # pylint: disable=E0611,E0401
 
 from ..base import BaseEstimation
@@ -164,6 +165,53 @@ class BaseDescriptorBatch(BaseEstimation):
             assertError(error)
             yield self._descriptorFactory(descriptor, self.scores[index])
 
+    def asNumpy(self) -> np.ndarray:
+        """
+        Get descriptor payloads of the batch as one array. The array is allocated once and each payload is copied to
+        its row, no descriptor wrappers are created.
+
+        Returns:
+            read-only uint8 array with shape (count, descriptor length)
+        """
+        count = len(self)
+        if not count:
+            return np.empty((0, 0), dtype=np.uint8)
+        array = None
+        for index in range(count):
+            error, descriptor = self._coreEstimation.getDescriptorFast(index)
+            assertError(error)
+            payload = np.frombuffer(descriptor.getData(), dtype=np.uint8)
+            if array is None:
+                # payload length is known after the first descriptor
+                array = np.empty((count, payload.size), dtype=np.uint8)
+            array[index] = payload
+        array.flags.writeable = False
+        return array
+
+    @classmethod
+    def fromNumpy(
+        cls,
+        descriptors: np.ndarray,
+        descriptorFactory: "BaseDescriptorFactory",
+        scores: Optional[List[float]] = None,
+        descriptorVersion: int = 0,
+    ) -> "BaseDescriptorBatch":
+        """
+        Create a batch from an array of descriptor payloads.
+
+        Args:
+            descriptors: uint8 array with shape (count, descriptor length)
+            descriptorFactory: descriptor factory
+            scores: garbage scores of descriptors
+            descriptorVersion: descriptor version or zero for use the factory descriptor version
+
+        Returns:
+            descriptor batch
+        Raises:
+            ValueError: if descriptor length or scores count is incorrect
+        """
+        return descriptorFactory.generateDescriptorsBatchFromNumpy(descriptors, scores, descriptorVersion)
+
     def append(self, descriptor: BaseDescriptor) -> None:
         """
         Add descriptor to end of batch.
@@ -265,6 +313,45 @@ class BaseDescriptorFactory:
         )
         return self._descriptorBatchFactory(coreBatch)
 
+    def generateDescriptorsBatchFromNumpy(
+        self, descriptors: np.ndarray, scores: Optional[List[float]] = None, descriptorVersion: int = 0
+    ) -> BaseDescriptorBatch:
+        """
+        Generate descriptors batch from an array of descriptor payloads.
+
+        Args:
+            descriptors: uint8 array with shape (count, descriptor length)
+            scores: garbage scores of descriptors
+            descriptorVersion: descriptor version or zero for use default descriptor version
+
+        Returns:
+            batch with descriptors
+        Raises:
+            ValueError: if descriptor length or scores count is incorrect
+            LunaSDKException: if descriptor cannot be loaded
+        """
+        descriptors = np.ascontiguousarray(descriptors, dtype=np.uint8)
+        if descriptors.ndim != 2:
+            raise ValueError(f"Expected 2d array of descriptors, got {descriptors.ndim}d array")
+        count = descriptors.shape[0]
+        if scores is not None and len(scores) != count:
+            raise ValueError(f"Scores count {len(scores)} does not match descriptors count {count}")
+        descriptorVersion = descriptorVersion or self._descriptorVersion
+        descriptor = self.generateDescriptor(descriptorVersion=descriptorVersion)
+        payloadLength = len(descriptor.asBytes)
+        if descriptors.shape[1] != payloadLength:
+            raise ValueError(f"Descriptor length must be {payloadLength}, got {descriptors.shape[1]}")
+        # serialized descriptor is a header (signature and version) followed by the payload
+        rawDescriptor = descriptor.rawDescriptor
+        header = rawDescriptor[: len(rawDescriptor) - payloadLength]
+        batch = self.generateDescriptorsBatch(max(count, 1), descriptorVersion)
+        for row in descriptors:
+            descriptor.reload(header + row.tobytes())
+            error: DescriptorBatchResult = batch.coreEstimation.add(descriptor.coreEstimation)
+            assertError(error)
+        batch.scores = list(scores) if scores is not None else [0.0] * count
+        return batch
+
 
 class FaceDescriptor(BaseDescriptor):
     """
@@ -3,11 +3,13 @@ Module realize face descriptor match.
 
 see `face descriptors matching`_.
 """
-from typing import List, Union
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from FaceEngine import IDescriptorMatcherPtr  # pylint: disable=E0611,E0401
 
-from lunavl.sdk.descriptors.descriptors import FaceDescriptorFactory
+from lunavl.sdk.descriptors.descriptors import BaseDescriptor, BaseDescriptorBatch, FaceDescriptorFactory
 from lunavl.sdk.errors.exceptions import assertError
 from lunavl.sdk.estimators.face_estimators.face_descriptor import FaceDescriptor, FaceDescriptorBatch
 
@@ -91,3 +93,288 @@ class FaceMatcher:
 
         assertError(error)
         return matchResults
+
+
+#: descriptors which can be converted to an array of descriptor payloads
+DescriptorsLike = Union[np.ndarray, BaseDescriptor, bytes, BaseDescriptorBatch, Iterable[Union[BaseDescriptor, bytes]]]
+
+
+def descriptorsAsArray(descriptors: DescriptorsLike) -> np.ndarray:
+    """
+    Convert descriptors to a 2d array of descriptor payloads (`asBytes`), one row per descriptor.
+
+    Args:
+        descriptors: array, descriptor, descriptor payload bytes, batch or iterable of descriptors or payloads
+
+    Returns:
+        array with shape (count, descriptor length)
+    Raises:
+        ValueError: if descriptors have different length
+    """
+    if isinstance(descriptors, np.ndarray):
+        return descriptors.reshape(1, -1) if descriptors.ndim == 1 else descriptors
+    if isinstance(descriptors, BaseDescriptorBatch):
+        return descriptors.asNumpy()
+    if isinstance(descriptors, (BaseDescriptor, bytes)):
+        descriptors = [descriptors]
+    payloads = [
+        descriptor.asBytes if isinstance(descriptor, BaseDescriptor) else descriptor for descriptor in descriptors
+    ]
+    if not payloads:
+        return np.empty((0, 0), dtype=np.uint8)
+    if len({len(payload) for payload in payloads}) != 1:
+        raise ValueError("Descriptors must have the same length")
+    array = np.empty((len(payloads), len(payloads[0])), dtype=np.uint8)
+    for index, payload in enumerate(payloads):
+        array[index] = np.frombuffer(payload, dtype=np.uint8)
+    return array
+
+
+def cosineSimilarity(cosines: np.ndarray) -> np.ndarray:
+    """
+    Default similarity: map cosine of angle between descriptors from [-1, 1] to [0, 1].
+
+    Args:
+        cosines: cosines of angles between descriptors
+
+    Returns:
+        similarities
+    """
+    return np.clip((cosines + 1.0) / 2.0, 0.0, 1.0)
+
+
+class NumpyDescriptorMatcher:
+    """
+    Vectorized one-to-many and many-to-many descriptor matcher.
+
+    Candidates are kept as one (N, D) matrix, so matching a (Q, D) block of queries is a few BLAS matrix products.
+    uint8 descriptor payloads are kept as passed (a memory map is not copied) and converted to float32 by blocks of
+    `blockSize` rows while matching, other candidates are converted to one contiguous float32 matrix. Distances are
+    L2 distances between (centered and optionally normalized) descriptor payloads, similarities are computed from
+    cosines of angles between them by `similarityFunction`.
+
+    Distances and similarities are not in the `FaceMatcher` scale: the core matcher dequantizes payloads and maps
+    distances to similarities by a function calibrated per descriptor model. The default `cosineSimilarity` only
+    maps cosines to [0, 1], so thresholds tuned for `FaceMatcher` are not applicable. Use `calibrateSimilarity` to
+    fit a similarity function to the core matcher or use `FaceMatcher` where exactly core values are required.
+
+    Attributes:
+        _candidates (np.ndarray): (N, D) uint8 candidates payloads or float32 candidates matrix
+        _squaredNorms (np.ndarray): (N,) squared norms of candidates
+        _offset (float): value subtracted from descriptor payloads before matching
+        _normalize (bool): normalize descriptors to unit length or not
+        _similarityFunction (Callable): function converting cosines to similarities
+        _blockSize (int): count of uint8 candidates converted to float32 at once
+    """
+
+    __slots__ = ("_candidates", "_squaredNorms", "_offset", "_normalize", "_similarityFunction", "_blockSize")
+
+    def __init__(
+        self,
+        candidates: DescriptorsLike,
+        offset: float = 0.0,
+        normalize: bool = True,
+        similarityFunction: Callable[[np.ndarray], np.ndarray] = cosineSimilarity,
+        blockSize: int = 16384,
+    ):
+        """
+        Init.
+
+        Args:
+            candidates: candidates, (N, D) uint8 or float32 array or descriptors
+            offset: value subtracted from descriptor payloads before matching (quantization zero point)
+            normalize: normalize descriptors to unit length or not
+            similarityFunction: function converting cosines between descriptors to similarities
+            blockSize: count of uint8 candidates converted to float32 at once
+        Raises:
+            ValueError: if block size is not positive
+        """
+        if blockSize < 1:
+            raise ValueError(f"Block size must be positive, got {blockSize}")
+        self._offset = offset
+        self._normalize = normalize
+        self._similarityFunction = similarityFunction
+        self._blockSize = blockSize
+        array = descriptorsAsArray(candidates)
+        self._candidates = array if array.dtype == np.uint8 else self._prepare(array)
+        self._squaredNorms = np.empty(array.shape[0], dtype=np.float32)
+        for start, block in self._candidateBlocks():
+            stop = start + len(block)
+            self._squaredNorms[start:stop] = np.einsum("ij,ij->i", block, block)
+
+    def __len__(self) -> int:
+        """
+        Get candidates count.
+
+        Returns:
+            candidates count
+        """
+        return self._candidates.shape[0]
+
+    @property
+    def candidates(self) -> np.ndarray:
+        """Get (N, D) candidates matrix: uint8 payloads as passed or float32 prepared candidates"""
+        return self._candidates
+
+    def _candidateBlocks(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Iterate over prepared candidates by blocks of rows.
+
+        Returns:
+            iterator of tuples of a block start row and a (count, D) float32 block
+        """
+        if self._candidates.dtype != np.uint8:
+            yield 0, self._candidates
+            return
+        for start in range(0, self._candidates.shape[0], self._blockSize):
+            stop = start + self._blockSize
+            yield start, self._prepare(self._candidates[start:stop])
+
+    def _prepare(self, descriptors: np.ndarray) -> np.ndarray:
+        """
+        Convert descriptor payloads to float32 matching vectors.
+
+        Args:
+            descriptors: (count, D) array
+
+        Returns:
+            (count, D) contiguous float32 array
+        """
+        vectors = np.ascontiguousarray(descriptors, dtype=np.float32)
+        if self._offset:
+            vectors = vectors - np.float32(self._offset)
+        if self._normalize:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors = vectors / norms
+        return vectors
+
+    def _matchBlock(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Match prepared queries with all candidates.
+
+        Args:
+            queries: (Q, D) prepared queries
+
+        Returns:
+            tuple of (Q, N) distances and (Q, N) similarities
+        """
+        products = np.empty((queries.shape[0], len(self)), dtype=np.float32)
+        for start, block in self._candidateBlocks():
+            stop = start + len(block)
+            products[:, start:stop] = queries @ block.T
+        querySquaredNorms = np.einsum("ij,ij->i", queries, queries)[:, np.newaxis]
+        distances = np.sqrt(np.maximum(querySquaredNorms + self._squaredNorms - 2 * products, 0.0))
+        normsProduct = np.sqrt(querySquaredNorms * self._squaredNorms)
+        cosines = np.divide(products, normsProduct, out=np.zeros_like(products), where=normsProduct > 0)
+        return distances, self._similarityFunction(cosines)
+
+    def match(self, queries: DescriptorsLike) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Match queries with all candidates.
+
+        Args:
+            queries: query descriptors, (Q, D) or (D,) array or descriptors
+
+        Returns:
+            tuple of (Q, N) distances and (Q, N) similarities
+        Raises:
+            ValueError: if queries length is not equal to candidates length
+        """
+        preparedQueries = self._prepareQueries(queries)
+        return self._matchBlock(preparedQueries)
+
+    def _prepareQueries(self, queries: DescriptorsLike) -> np.ndarray:
+        """
+        Convert queries to prepared matching vectors.
+
+        Args:
+            queries: query descriptors
+
+        Returns:
+            (Q, D) prepared queries
+        Raises:
+            ValueError: if queries length is not equal to candidates length
+        """
+        array = descriptorsAsArray(queries)
+        if array.shape[1] != self._candidates.shape[1]:
+            raise ValueError(
+                f"Query length {array.shape[1]} does not match candidate length {self._candidates.shape[1]}"
+            )
+        return self._prepare(array)
+
+    def search(
+        self, queries: DescriptorsLike, topK: int = 1, chunkSize: Optional[int] = 1024
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find top-k nearest candidates for each query.
+
+        Args:
+            queries: query descriptors, (Q, D) or (D,) array or descriptors
+            topK: count of nearest candidates per query
+            chunkSize: count of queries matched at once (limits size of the (chunk, N) distance block),
+                None - match all queries at once
+
+        Returns:
+            tuple of (Q, k) candidate indexes, (Q, k) distances and (Q, k) similarities. Results of each query are
+            sorted by distance, k is min(topK, N)
+        Raises:
+            ValueError: if topK is not positive or queries length is not equal to candidates length
+        """
+        if topK < 1:
+            raise ValueError(f"Top k must be positive, got {topK}")
+        preparedQueries = self._prepareQueries(queries)
+        queryCount = preparedQueries.shape[0]
+        k = min(topK, len(self))
+        indexes = np.empty((queryCount, k), dtype=np.int64)
+        distances = np.empty((queryCount, k), dtype=np.float32)
+        similarities = np.empty((queryCount, k), dtype=np.float32)
+        step = chunkSize or max(queryCount, 1)
+        for start in range(0, queryCount, step):
+            stop = min(start + step, queryCount)
+            blockDistances, blockSimilarities = self._matchBlock(preparedQueries[start:stop])
+            if k < len(self):
+                topIndexes = np.argpartition(blockDistances, k - 1, axis=1)[:, :k]
+            else:
+                topIndexes = np.broadcast_to(np.arange(k), blockDistances.shape).copy()
+            topDistances = np.take_along_axis(blockDistances, topIndexes, axis=1)
+            order = np.argsort(topDistances, axis=1, kind="stable")
+            topIndexes = np.take_along_axis(topIndexes, order, axis=1)
+            indexes[start:stop] = topIndexes
+            distances[start:stop] = np.take_along_axis(topDistances, order, axis=1)
+            similarities[start:stop] = np.take_along_axis(blockSimilarities, topIndexes, axis=1)
+        return indexes, distances, similarities
+
+
+def calibrateSimilarity(
+    faceMatcher: FaceMatcher, descriptors: Sequence[FaceDescriptor], offset: float = 0.0, normalize: bool = True
+) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Fit a similarity function of `NumpyDescriptorMatcher` to `FaceMatcher` similarities. All pairs of descriptors are
+    matched by both matchers, the function is a monotone piecewise linear map of cosines to core similarities.
+
+    Args:
+        faceMatcher: core matcher of the descriptors model
+        descriptors: sample descriptors, the more different faces the more accurate calibration
+        offset: offset of the numpy matcher (see `NumpyDescriptorMatcher`)
+        normalize: normalize option of the numpy matcher
+
+    Returns:
+        similarity function for `NumpyDescriptorMatcher`
+    Raises:
+        ValueError: if there are less than two descriptors
+        LunaSDKException: if core matching failed
+    """
+    if len(descriptors) < 2:
+        raise ValueError("At least two descriptors are required for calibration")
+    matcher = NumpyDescriptorMatcher(descriptors, offset=offset, normalize=normalize, similarityFunction=np.asarray)
+    _, cosines = matcher.match(descriptors)
+    coreSimilarities = np.array(
+        [[result.similarity for result in faceMatcher.match(query, list(descriptors))] for query in descriptors],
+        dtype=np.float64,
+    )
+    order = np.argsort(cosines.ravel(), kind="stable")
+    sortedCosines = cosines.ravel()[order].astype(np.float64)
+    # core similarity does not decrease with the cosine, smooth out noise of quantization
+    sortedSimilarities = np.maximum.accumulate(coreSimilarities.ravel()[order])
+    return partial(np.interp, xp=sortedCosines, fp=sortedSimilarities)
@@ -0,0 +1,284 @@
+"""
+Module contains a compact binary descriptor store.
+
+File layout (little endian):
+
+    header: magic (4 bytes), format version (uint32), descriptor model version (uint32), descriptor length (uint32),
+            descriptors count (uint64), reserved (8 bytes)
+    descriptors: packed uint8 matrix (count, descriptor length), padded to 8 bytes
+    garbage scores: float32 column (count,), padded to 8 bytes
+    ids: int64 column (count,)
+
+The file is opened with `numpy.memmap`, so large galleries are mapped without reading and are shared between
+processes by the page cache.
+"""
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .descriptors import BaseDescriptor, BaseDescriptorBatch, BaseDescriptorFactory
+from .matcher import NumpyDescriptorMatcher
+
+#: store file signature
+STORE_MAGIC = b"LVDS"
+#: current store format version
+STORE_FORMAT_VERSION = 1
+#: header struct: magic, format version, model version, descriptor length, count, reserved
+_HEADER = struct.Struct("<4sIIIQ8x")
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    """
+    Align an offset up.
+
+    Args:
+        offset: offset
+        alignment: alignment
+
+    Returns:
+        aligned offset
+    """
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _getLayout(count: int, descriptorLength: int) -> Tuple[int, int, int, int]:
+    """
+    Get offsets of store sections.
+
+    Args:
+        count: descriptors count
+        descriptorLength: descriptor length
+
+    Returns:
+        offsets of descriptors, scores, ids and file size
+    """
+    descriptorsOffset = _HEADER.size
+    scoresOffset = _align(descriptorsOffset + count * descriptorLength)
+    idsOffset = _align(scoresOffset + count * 4)
+    return descriptorsOffset, scoresOffset, idsOffset, idsOffset + count * 8
+
+
+class DescriptorStore:
+    """
+    Descriptor store: descriptor payloads matrix, garbage scores and ids of descriptors of one model version.
+
+    Attributes:
+        _descriptors (np.ndarray): (count, descriptor length) uint8 descriptor payloads
+        _scores (np.ndarray): (count,) float32 garbage scores
+        _ids (np.ndarray): (count,) int64 descriptor ids
+        _descriptorVersion (int): descriptor model version
+    """
+
+    __slots__ = ("_descriptors", "_scores", "_ids", "_descriptorVersion")
+
+    def __init__(
+        self,
+        descriptors: np.ndarray,
+        descriptorVersion: int,
+        scores: Optional[np.ndarray] = None,
+        ids: Optional[np.ndarray] = None,
+    ):
+        """
+        Init.
+
+        Args:
+            descriptors: (count, descriptor length) uint8 descriptor payloads
+            descriptorVersion: descriptor model version
+            scores: garbage scores, zeros by default
+            ids: descriptor ids, row numbers by default
+        Raises:
+            ValueError: if shapes of arrays are inconsistent
+        """
+        if descriptors.ndim != 2:
+            raise ValueError(f"Expected 2d array of descriptors, got {descriptors.ndim}d array")
+        count = descriptors.shape[0]
+        self._descriptors = descriptors if descriptors.dtype == np.uint8 else descriptors.astype(np.uint8)
+        self._scores = np.zeros(count, dtype=np.float32) if scores is None else np.asarray(scores, dtype=np.float32)
+        self._ids = np.arange(count, dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        if self._scores.shape != (count,) or self._ids.shape != (count,):
+            raise ValueError("Count of scores and ids must be equal to descriptors count")
+        self._descriptorVersion = descriptorVersion
+
+    @classmethod
+    def fromDescriptors(
+        cls,
+        descriptors: Union[BaseDescriptorBatch, Iterable[BaseDescriptor]],
+        ids: Optional[Iterable[int]] = None,
+        descriptorVersion: int = 0,
+    ) -> "DescriptorStore":
+        """
+        Create a store from sdk descriptors.
+
+        Args:
+            descriptors: descriptor batch or descriptors
+            ids: descriptor ids, row numbers by default
+            descriptorVersion: descriptor model version, detected from descriptors by default
+        Returns:
+            descriptor store
+        Raises:
+            ValueError: if descriptors have different versions or version cannot be detected
+        """
+        if isinstance(descriptors, BaseDescriptorBatch):
+            array = descriptors.asNumpy()
+            scores = descriptors.scores[: len(descriptors)]
+            versions = {descriptors[0].model} if len(descriptors) else set()
+        else:
+            descriptors = list(descriptors)
+            array = np.empty((0, 0), dtype=np.uint8)
+            for index, descriptor in enumerate(descriptors):
+                payload = np.frombuffer(descriptor.asBytes, dtype=np.uint8)
+                if not index:
+                    # payload length is known after the first descriptor
+                    array = np.empty((len(descriptors), payload.size), dtype=np.uint8)
+                array[index] = payload
+            scores = [descriptor.garbageScore for descriptor in descriptors]
+            versions = {descriptor.model for descriptor in descriptors}
+        if len(versions) > 1:
+            raise ValueError(f"Descriptors have different versions: {sorted(versions)}")
+        if versions:
+            descriptorVersion = versions.pop()
+        if not descriptorVersion:
+            raise ValueError("Descriptor version is not specified")
+        idsArray = None if ids is None else np.fromiter(ids, dtype=np.int64)
+        return cls(array, descriptorVersion, np.asarray(scores, dtype=np.float32), idsArray)
+
+    def __len__(self) -> int:
+        """
+        Get descriptors count.
+
+        Returns:
+            descriptors count
+        """
+        return self._descriptors.shape[0]
+
+    @property
+    def descriptors(self) -> np.ndarray:
+        """Get (count, descriptor length) uint8 descriptor payloads"""
+        return self._descriptors
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Get garbage scores"""
+        return self._scores
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Get descriptor ids"""
+        return self._ids
+
+    @property
+    def descriptorVersion(self) -> int:
+        """Get descriptor model version"""
+        return self._descriptorVersion
+
+    @property
+    def descriptorLength(self) -> int:
+        """Get descriptor payload length"""
+        return self._descriptors.shape[1]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the store to a file. The file is replaced atomically.
+
+        Args:
+            path: file path
+        Raises:
+            ValueError: if path is a directory
+        """
+        path = Path(path)
+        if path.is_dir():
+            raise ValueError(f"{path} must not be a directory")
+        count, descriptorLength = self._descriptors.shape
+        descriptorsOffset, scoresOffset, idsOffset, _ = _getLayout(count, descriptorLength)
+        header = _HEADER.pack(STORE_MAGIC, STORE_FORMAT_VERSION, self._descriptorVersion, descriptorLength, count)
+        # write to a temporary file and replace: the file may be memory mapped by other stores or processes
+        temporaryPath = path.with_name(f".{path.name}.tmp")
+        with temporaryPath.open("wb") as file:
+            file.write(header)
+            file.write(np.ascontiguousarray(self._descriptors).tobytes())
+            file.write(b"\0" * (scoresOffset - descriptorsOffset - count * descriptorLength))
+            file.write(self._scores.astype("<f4").tobytes())
+            file.write(b"\0" * (idsOffset - scoresOffset - count * 4))
+            file.write(self._ids.astype("<i8").tobytes())
+        os.replace(temporaryPath, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mode: str = "r") -> "DescriptorStore":
+        """
+        Open a store file as memory mapped arrays.
+
+        Args:
+            path: file path
+            mode: memmap mode: "r" - read only, "r+" - read and write, "c" - copy on write
+        Returns:
+            descriptor store
+        Raises:
+            ValueError: if file is not a descriptor store or has unsupported format version
+        """
+        with open(path, "rb") as file:
+            headerBytes = file.read(_HEADER.size)
+        if len(headerBytes) != _HEADER.size:
+            raise ValueError(f"{path} is not a descriptor store")
+        magic, formatVersion, descriptorVersion, descriptorLength, count = _HEADER.unpack(headerBytes)
+        if magic != STORE_MAGIC:
+            raise ValueError(f"{path} is not a descriptor store")
+        if formatVersion != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported descriptor store format version: {formatVersion}")
+        descriptorsOffset, scoresOffset, idsOffset, _ = _getLayout(count, descriptorLength)
+        if not count:
+            return cls(np.empty((0, descriptorLength), dtype=np.uint8), descriptorVersion)
+        descriptors = np.memmap(
+            path, dtype=np.uint8, mode=mode, offset=descriptorsOffset, shape=(count, descriptorLength)
+        )
+        scores = np.memmap(path, dtype="<f4", mode=mode, offset=scoresOffset, shape=(count,))
+        ids = np.memmap(path, dtype="<i8", mode=mode, offset=idsOffset, shape=(count,))
+        return cls(descriptors, descriptorVersion, scores, ids)
+
+    def toBatch(
+        self, descriptorFactory: BaseDescriptorFactory, start: int = 0, stop: Optional[int] = None
+    ) -> BaseDescriptorBatch:
+        """
+        Create a descriptor batch from a slice of the store (e.g. for `IndexBuilder.appendBatch`).
+
+        Args:
+            descriptorFactory: descriptor factory
+            start: first row
+            stop: row after the last, end of the store by default
+        Returns:
+            descriptor batch
+        """
+        return descriptorFactory.generateDescriptorsBatchFromNumpy(
+            self._descriptors[start:stop], self._scores[start:stop].tolist(), self._descriptorVersion
+        )
+
+    def iterBatches(self, descriptorFactory: BaseDescriptorFactory, batchSize: int) -> Iterator[BaseDescriptorBatch]:
+        """
+        Iterate over the store by descriptor batches.
+
+        Args:
+            descriptorFactory: descriptor factory
+            batchSize: max batch size
+        Yields:
+            descriptor batches
+        Raises:
+            ValueError: if batch size is not positive
+        """
+        if batchSize < 1:
+            raise ValueError(f"Batch size must be positive, got {batchSize}")
+        for start in range(0, len(self), batchSize):
+            yield self.toBatch(descriptorFactory, start, start + batchSize)
+
+    def asMatcher(self, **kwargs) -> NumpyDescriptorMatcher:
+        """
+        Create a vectorized matcher over descriptors of the store. Descriptor payloads are not copied: the matcher
+        converts memory mapped rows to float32 by blocks while matching.
+
+        Args:
+            kwargs: `NumpyDescriptorMatcher` arguments
+        Returns:
+            matcher, indexes of its search results are row numbers of the store (see `ids`)
+        """
+        return NumpyDescriptorMatcher(self._descriptors, **kwargs)
@@ -1,4 +1,8 @@
-from typing import Any, Dict, List, NamedTuple, Tuple, Union
+import itertools
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
 
 from FaceEngine import (
     Detection,
@@ -74,14 +78,163 @@ class BaseDetection(BaseEstimation):
         """
         return self._image
 
+    @property
+    def originalRect(self) -> Rect[float]:
+        """
+        Get bounding box rect in coordinates of the original image. It differs from `boundingBox.rect` if the image is
+        decoded at reduced resolution (see `VLImage.fromBytes`).
+
+        Returns:
+            float rect
+        """
+        rect = self.boundingBox.rect
+        scale = self._image.scale
+        if scale == 1:
+            return rect
+        return Rect(rect.x / scale, rect.y / scale, rect.width / scale, rect.height / scale)
+
     def asDict(self) -> Dict[str, Any]:
         """
-        Convert face detection to dict (json).
+        Convert face detection to dict (json). Coordinates are in the original image.
 
         Returns:
             dict. required keys: 'rect', 'score'.
         """
-        return self.boundingBox.asDict()
+        if self._image.scale == 1:
+            return self.boundingBox.asDict()
+        return {"rect": self.originalRect.asDict(), "score": self.boundingBox.score}
+
+
+#: detector output modes: list of lists of detection objects or columnar detection arrays
+DETECTION_OUTPUTS = ("detections", "arrays")
+
+
+def assertDetectionOutput(output: str) -> None:
+    """
+    Assert detector output mode.
+
+    Args:
+        output: output mode
+    Raises:
+        ValueError: if the output mode is not one of `DETECTION_OUTPUTS`
+    """
+    if output not in DETECTION_OUTPUTS:
+        raise ValueError(f"Detection output must be one of {DETECTION_OUTPUTS}, got {output!r}")
+
+
+def getLandmarksArray(coreLandmarks: Sequence[Any], pointCount: int) -> np.ndarray:
+    """
+    Convert core landmarks to an array.
+
+    Args:
+        coreLandmarks: core landmarks of detections
+        pointCount: count of landmarks points
+    Returns:
+        (N, pointCount, 2) float32 array of points: x, y
+    """
+    points = np.empty((len(coreLandmarks), pointCount, 2), dtype=np.float32)
+    for row, landmarks in enumerate(coreLandmarks):
+        coordinates: List[float] = []
+        for index in range(pointCount):
+            point = landmarks[index]
+            coordinates += (point.x, point.y)
+        points[row] = np.array(coordinates, dtype=np.float32).reshape(pointCount, 2)
+    return points
+
+
+class DetectionArrays(ABC):
+    """
+    Columnar detections of a batch of images. Rows are grouped by images in order of the input images, detection
+    objects are created only on request (see `detection` and `detections`).
+
+    Attributes:
+        imageIndexes (np.ndarray): (N,) int32 indexes of images of detections
+        rects (np.ndarray): (N, 4) float32 bounding boxes: x, y, width, height
+        scores (np.ndarray): (N,) float32 detection scores
+        _coreDetections (List[Detection]): core detections of rows
+        _images (List[VLImage]): images
+        _imageOffsets (np.ndarray): (images count + 1,) offsets of rows of images
+    """
+
+    __slots__ = ("imageIndexes", "rects", "scores", "_coreDetections", "_images", "_imageOffsets")
+
+    def __init__(
+        self,
+        coreDetections: List[List[Detection]],
+        images: Sequence[Union[VLImage, ImageForDetection, ImageForRedetection]],
+    ):
+        """
+        Init.
+
+        Args:
+            coreDetections: core detections of images
+            images: incoming images
+        Raises:
+            RuntimeError: if any detection is not valid
+        """
+        counts = [len(imageDetections) for imageDetections in coreDetections]
+        self._coreDetections: List[Detection] = list(itertools.chain.from_iterable(coreDetections))
+        if not all(detection.isValid() for detection in self._coreDetections):
+            raise RuntimeError("Invalid detection")
+        self._images = [image if isinstance(image, VLImage) else image.image for image in images]
+        self._imageOffsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        self.imageIndexes = np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+        coreRects = [detection.getRect() for detection in self._coreDetections]
+        self.rects = np.array(
+            [(rect.x, rect.y, rect.width, rect.height) for rect in coreRects], dtype=np.float32
+        ).reshape(-1, 4)
+        self.scores = np.fromiter(
+            (detection.getScore() for detection in self._coreDetections), np.float32, len(self._coreDetections)
+        )
+
+    def __len__(self) -> int:
+        """Get count of detections"""
+        return len(self._coreDetections)
+
+    def getImageRows(self, imageIdx: int) -> slice:
+        """
+        Get rows of detections of an image.
+
+        Args:
+            imageIdx: index of the image
+        Returns:
+            slice of rows
+        """
+        return slice(int(self._imageOffsets[imageIdx]), int(self._imageOffsets[imageIdx + 1]))
+
+    def getImage(self, row: int) -> VLImage:
+        """
+        Get image of a row.
+
+        Args:
+            row: row
+        Returns:
+            image
+        """
+        return self._images[self.imageIndexes[row]]
+
+    @abstractmethod
+    def detection(self, row: int) -> BaseDetection:
+        """
+        Create detection of a row.
+
+        Args:
+            row: row
+        Returns:
+            detection
+        """
+
+    def detections(self) -> List[List[BaseDetection]]:
+        """
+        Create detections of all rows.
+
+        Returns:
+            list of lists detection, order of detection lists is corresponding to order input images
+        """
+        return [
+            [self.detection(row) for row in range(rows.start, rows.stop)]
+            for rows in map(self.getImageRows, range(len(self._images)))
+        ]
 
 
 def assertImageForDetection(image: VLImage) -> None:
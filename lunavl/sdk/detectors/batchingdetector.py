@@ -0,0 +1,196 @@
+"""
+Module contains a face detector which combines single image detections from many threads or coroutines into batch
+detections.
+"""
+from concurrent.futures import Future
+from typing import List, Optional, Union
+
+from ..batching import MicroBatcher
+from ..image_utils.geometry import Rect
+from ..image_utils.image import VLImage
+from .base import ImageForDetection
+from .facedetector import FaceDetection, FaceDetector
+
+
+class BatchingFaceDetector:
+    """
+    Micro batching face detector.
+
+    Single image submissions are collected into one `FaceDetector.detect` call. A batch is sent to the core detector
+    as soon as it contains `maxBatchSize` images or the first image of the batch waits longer than `maxWaitTime`.
+    Each caller receives detections of its own image or its own exception.
+
+    Attributes:
+        _detector (FaceDetector): face detector
+        _batcher (MicroBatcher): micro batcher
+        _limit (int): max number of detections per input image
+        _detect5Landmarks (bool): detect or not landmarks5
+        _detect68Landmarks (bool): detect or not landmarks68
+    """
+
+    __slots__ = ("_detector", "_batcher", "_limit", "_detect5Landmarks", "_detect68Landmarks")
+
+    def __init__(
+        self,
+        detector: FaceDetector,
+        maxBatchSize: int = 16,
+        maxWaitTime: float = 0.005,
+        limit: int = 5,
+        detect5Landmarks: bool = True,
+        detect68Landmarks: bool = False,
+        workerCount: int = 1,
+    ):
+        """
+        Init.
+
+        Args:
+            detector: face detector
+            maxBatchSize: max count of images in one core detect call
+            maxWaitTime: max time (in seconds) which the first image of a batch waits for other images
+            limit: max number of detections per input image
+            detect5Landmarks: detect or not landmarks5
+            detect68Landmarks: detect or not landmarks68
+            workerCount: count of threads which send batches to the core detector
+        """
+        self._detector = detector
+        self._limit = limit
+        self._detect5Landmarks = detect5Landmarks
+        self._detect68Landmarks = detect68Landmarks
+        self._batcher: MicroBatcher[Union[VLImage, ImageForDetection], List[FaceDetection]] = MicroBatcher(
+            self._detectBatch,
+            maxBatchSize=maxBatchSize,
+            maxWaitTime=maxWaitTime,
+            workerCount=workerCount,
+            name=self.__class__.__name__,
+        )
+
+    @property
+    def detector(self) -> FaceDetector:
+        """Get underlying face detector"""
+        return self._detector
+
+    @property
+    def pendingCount(self) -> int:
+        """Get approximate count of images waiting for detection"""
+        return self._batcher.pendingCount
+
+    def _detectBatch(self, images: List[Union[VLImage, ImageForDetection]]) -> List[List[FaceDetection]]:
+        """
+        Detect faces on a collected batch of images.
+
+        Args:
+            images: images
+
+        Returns:
+            list of lists detection, order of detection lists is corresponding to order input images
+        """
+        return self._detector.detect(images, self._limit, self._detect5Landmarks, self._detect68Landmarks)
+
+    def submit(self, image: VLImage, detectArea: Optional[Rect] = None) -> "Future[List[FaceDetection]]":
+        """
+        Submit an image for detection.
+
+        Args:
+            image: image. Format must be R8G8B8
+            detectArea: rectangle area which contains faces to detect. If not set will be set image.rect
+
+        Returns:
+            future of face detections on the image
+        Raises:
+            RuntimeError: if detector is closed
+        """
+        if detectArea is None:
+            return self._batcher.submit(image)
+        return self._batcher.submit(ImageForDetection(image=image, detectArea=detectArea))
+
+    def detect(self, image: VLImage, detectArea: Optional[Rect] = None) -> List[FaceDetection]:
+        """
+        Detect faces on the image. The call blocks until the batch containing the image is processed.
+
+        Args:
+            image: image. Format must be R8G8B8
+            detectArea: rectangle area which contains faces to detect. If not set will be set image.rect
+
+        Returns:
+            face detections
+        Raises:
+            LunaSDKException: if detection is failed
+        """
+        return self.submit(image, detectArea).result()
+
+    def detectOne(self, image: VLImage, detectArea: Optional[Rect] = None) -> Optional[FaceDetection]:
+        """
+        Detect one best detection on the image.
+
+        Args:
+            image: image. Format must be R8G8B8
+            detectArea: rectangle area which contains face to detect. If not set will be set image.rect
+
+        Returns:
+            face detection with max score if face is found otherwise None
+        Raises:
+            LunaSDKException: if detection is failed
+        """
+        return self._bestDetection(self.detect(image, detectArea))
+
+    async def asyncDetect(self, image: VLImage, detectArea: Optional[Rect] = None) -> List[FaceDetection]:
+        """
+        Detect faces on the image without blocking an event loop.
+
+        Args:
+            image: image. Format must be R8G8B8
+            detectArea: rectangle area which contains faces to detect. If not set will be set image.rect
+
+        Returns:
+            face detections
+        Raises:
+            LunaSDKException: if detection is failed
+        """
+        if detectArea is None:
+            return await self._batcher.asyncSubmit(image)
+        return await self._batcher.asyncSubmit(ImageForDetection(image=image, detectArea=detectArea))
+
+    async def asyncDetectOne(self, image: VLImage, detectArea: Optional[Rect] = None) -> Optional[FaceDetection]:
+        """
+        Detect one best detection on the image without blocking an event loop.
+
+        Args:
+            image: image. Format must be R8G8B8
+            detectArea: rectangle area which contains face to detect. If not set will be set image.rect
+
+        Returns:
+            face detection with max score if face is found otherwise None
+        Raises:
+            LunaSDKException: if detection is failed
+        """
+        return self._bestDetection(await self.asyncDetect(image, detectArea))
+
+    @staticmethod
+    def _bestDetection(detections: List[FaceDetection]) -> Optional[FaceDetection]:
+        """
+        Get detection with max score.
+
+        Args:
+            detections: face detections
+
+        Returns:
+            detection with max score or None if detection list is empty
+        """
+        if not detections:
+            return None
+        return max(detections, key=lambda detection: detection.boundingBox.score)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting images. Already submitted images will be processed.
+
+        Args:
+            wait: wait for processing of submitted images or not
+        """
+        self._batcher.close(wait)
+
+    def __enter__(self) -> "BatchingFaceDetector":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -1,9 +1,12 @@
 """
 Module contains function for detection human bodies on images.
 """
+import itertools
 from functools import partial
 from typing import Any, Dict, List, Optional, Union, Literal, overload
 
+import numpy as np
+
 from FaceEngine import (  # pylint: disable=E0611,E0401
     Detection,
     FSDKErrorResult,
@@ -14,20 +17,24 @@ from FaceEngine import (  # pylint: disable=E0611,E0401
 
 from .base import (
     BaseDetection,
+    DetectionArrays,
     ImageForDetection,
     ImageForRedetection,
+    assertDetectionOutput,
     assertImageForDetection,
     getArgsForCoreDetectorForImages,
     getArgsForCoreRedetect,
     validateBatchDetectInput,
     validateReDetectInput,
 )
+from .tiling import getImageTiles, mergeTileDetections, postProcessingTiles
 from ..async_task import AsyncTask
 from ..base import LandmarksWithScore
 from ..errors.exceptions import assertError
 from ..image_utils.geometry import Rect
 from ..image_utils.image import VLImage
 from ..launch_options import LaunchOptions
+from ..validation import applyValidationPolicy
 
 
 def _createCoreBodies(image: ImageForRedetection) -> List[Human]:
@@ -94,10 +101,80 @@ class BodyDetection(BaseDetection):
         """
         res = super().asDict()
         if self.landmarks17 is not None:
-            res["landmarks17"] = self.landmarks17.asDict()
+            res["landmarks17"] = self.landmarks17.asDict(self._image.scale)
         return res
 
 
+class BodyDetectionArrays(DetectionArrays):
+    """
+    Columnar body detections of a batch of images.
+
+    Attributes:
+        landmarks17 (Optional[np.ndarray]): (N, 17, 2) float32 landmarks17 points if landmarks are detected
+        landmarks17Scores (Optional[np.ndarray]): (N, 17) float32 scores of landmarks17 points if landmarks are detected
+        _coreLandmarks17 (Optional[List[CoreLandmarks17]]): core landmarks17 of rows
+    """
+
+    __slots__ = ("landmarks17", "landmarks17Scores", "_coreLandmarks17")
+
+    def __init__(
+        self,
+        coreDetections: List[List[Detection]],
+        images: List[Union[VLImage, ImageForDetection]],
+        coreLandmarks17: Optional[List[List[CoreLandmarks17]]] = None,
+    ):
+        """
+        Init.
+
+        Args:
+            coreDetections: core detections of images
+            images: incoming images
+            coreLandmarks17: core landmarks17 of images if landmarks are detected
+        """
+        super().__init__(coreDetections, images)
+        if coreLandmarks17 is None:
+            self._coreLandmarks17 = None
+            self.landmarks17 = None
+            self.landmarks17Scores = None
+            return
+        self._coreLandmarks17 = list(itertools.chain.from_iterable(coreLandmarks17))
+        self.landmarks17 = np.empty((len(self._coreLandmarks17), 17, 2), dtype=np.float32)
+        self.landmarks17Scores = np.empty((len(self._coreLandmarks17), 17), dtype=np.float32)
+        for row, landmarks in enumerate(self._coreLandmarks17):
+            for index in range(17):
+                landmark = landmarks[index]
+                point = landmark.point
+                self.landmarks17[row, index] = (point.x, point.y)
+                self.landmarks17Scores[row, index] = landmark.score
+
+    def coreDetection(self, row: int) -> Human:
+        """
+        Create core human of a row.
+
+        Args:
+            row: row
+        Returns:
+            core human
+        """
+        human = Human()
+        human.img = self.getImage(row).coreImage
+        human.detection = self._coreDetections[row]
+        if self._coreLandmarks17 is not None:
+            human.landmarks17_opt.set(self._coreLandmarks17[row])
+        return human
+
+    def detection(self, row: int) -> BodyDetection:
+        """
+        Create body detection of a row.
+
+        Args:
+            row: row
+        Returns:
+            body detection
+        """
+        return BodyDetection(self.coreDetection(row), self.getImage(row))
+
+
 def createHumanDetection(image: VLImage, detection: Detection, landmarks17: Optional[CoreLandmarks17]):
     """
     Create human detection structure from core detection result.
@@ -231,6 +308,30 @@ def postProcessing(
     )
 
 
+def postProcessingArrays(
+    error: FSDKErrorResult, fsdkDetectRes, images: List[Union[VLImage, ImageForDetection]], detectLandmarks: bool
+) -> BodyDetectionArrays:
+    """
+    Convert core human detections from detector results to `BodyDetectionArrays` and error check.
+
+    Args:
+        error: detection error, usually error.isError is False
+        fsdkDetectRes: core detection batch
+        images: original images
+        detectLandmarks: whether landmarks are detected
+
+    Returns:
+        body detection arrays
+    """
+    assertError(error)
+    imageIndexes = range(fsdkDetectRes.getSize())
+    return BodyDetectionArrays(
+        [fsdkDetectRes.getDetections(imageIdx) for imageIdx in imageIndexes],
+        images,
+        [fsdkDetectRes.getLandmarks17(imageIdx) for imageIdx in imageIndexes] if detectLandmarks else None,
+    )
+
+
 def postProcessingRedect(
     error: FSDKErrorResult, fsdkDetectRes, images: List[ImageForRedetection], detectLandmarks: bool
 ) -> List[List[Optional[BodyDetection]]]:
@@ -360,7 +461,8 @@ class BodyDetector:
         limit: int = 5,
         detectLandmarks: bool = True,
         asyncEstimate: Literal[False] = False,
-    ) -> Union[DetectResult, AsyncTask[DetectResult]]:
+        output: Literal["detections", "arrays"] = "detections",
+    ) -> Union[DetectResult, BodyDetectionArrays]:
         ...
 
     @overload
@@ -370,7 +472,8 @@ class BodyDetector:
         limit: int,
         detectLandmarks: bool,
         asyncEstimate: Literal[True] = True,
-    ) -> Union[DetectResult, AsyncTask[DetectResult]]:
+        output: Literal["detections", "arrays"] = "detections",
+    ) -> Union[AsyncTask[DetectResult], AsyncTask[BodyDetectionArrays]]:
         ...
 
     def detect(
@@ -379,6 +482,7 @@ class BodyDetector:
         limit: int = 5,
         detectLandmarks: bool = True,
         asyncEstimate=False,
+        output: str = "detections",
     ):
         """
         Batch detect human bodies on images.
@@ -388,19 +492,78 @@ class BodyDetector:
             limit: max number of detections per input image
             detectLandmarks: detect or not landmarks
             asyncEstimate: estimate or run estimation in background
+            output: "detections" - list of lists of body detections, "arrays" - columnar `BodyDetectionArrays`
         Returns:
             asyncEstimate is False: return list of lists detection, order of detection lists is corresponding
-                                    to order input images
+                                    to order input images (or body detection arrays)
             asyncEstimate isTrue:  async task
+        Raises:
+            ValueError: if the output mode is unknown
         """
+        assertDetectionOutput(output)
         coreImages, detectAreas = getArgsForCoreDetectorForImages(images)
         detectionType = self._getDetectionType(detectLandmarks)
-        validateBatchDetectInput(self._detector, coreImages, detectAreas)
+        postProcessingFunc = partial(
+            postProcessingArrays if output == "arrays" else postProcessing,
+            images=images,
+            detectLandmarks=detectLandmarks,
+        )
+        postProcessingFunc = applyValidationPolicy(
+            postProcessingFunc, validateBatchDetectInput, self._detector, coreImages, detectAreas
+        )
         if asyncEstimate:
             task = self._detector.asyncDetect(coreImages, detectAreas, limit, detectionType)
-            return AsyncTask(task, partial(postProcessing, images=images, detectLandmarks=detectLandmarks))
+            return AsyncTask(task, postProcessingFunc)
         error, fsdkDetectRes = self._detector.detect(coreImages, detectAreas, limit, detectionType)
-        return postProcessing(error, fsdkDetectRes, images, detectLandmarks)
+        return postProcessingFunc(error, fsdkDetectRes)
+
+    def detectTiled(
+        self,
+        images: List[Union[VLImage, ImageForDetection]],
+        tileSize: int = 1024,
+        overlap: int = 256,
+        limit: int = 100,
+        detectLandmarks: bool = True,
+        iouThreshold: float = 0.4,
+        asyncEstimate: bool = False,
+        fullFrame: bool = False,
+    ):
+        """
+        Batch detect human bodies on large images by overlapping tiles. All tiles of all images are detected by one
+        batched call, duplicates found on overlaps are merged by a non-maximum suppression (see `tiling.nms`).
+
+        Args:
+            images: input images list. Format must be R8G8B8
+            tileSize: max tile side
+            overlap: min overlap of neighbour tiles, it should not be less than the largest expected body
+            limit: max number of detections per tile and per input image
+            detectLandmarks: detect or not landmarks
+            iouThreshold: max intersection over union of merged detections
+            asyncEstimate: estimate or run estimation in background
+            fullFrame: also detect the whole image downscaled to the detector input, it finds bodys larger than the
+                overlap, detections are merged with tile detections
+        Returns:
+            asyncEstimate is False: return list of lists detection (in descending order of scores), order of detection
+                                    lists is corresponding to order input images
+            asyncEstimate is True: async task
+        Raises:
+            ValueError: if the overlap is not less than the tile size
+        """
+        tiles, imageIndexes = getImageTiles(images, tileSize, overlap, fullFrame)
+        merge = partial(
+            mergeTileDetections,
+            imageIndexes=imageIndexes,
+            imageCount=len(images),
+            limit=limit,
+            iouThreshold=iouThreshold,
+        )
+        if asyncEstimate:
+            task = self.detect(tiles, limit, detectLandmarks, asyncEstimate=True)
+            return AsyncTask(
+                task.coreTask,
+                postProcessing=partial(postProcessingTiles, postProcessing=task.postProcessing, merge=merge),
+            )
+        return merge(self.detect(tiles, limit, detectLandmarks))
 
     def redetectOne(  # noqa: F811
         self,
@@ -456,10 +619,15 @@ class BodyDetector:
             LunaSDKException if an error occurs, context contains all errors
         """
         coreImages, detectAreas = getArgsForCoreRedetect(images)
-        validateReDetectInput(self._detector, coreImages, detectAreas)
+        pProcessing = applyValidationPolicy(
+            partial(postProcessingRedect, images=images, detectLandmarks=detectLandmarks),
+            validateReDetectInput,
+            self._detector,
+            coreImages,
+            detectAreas,
+        )
         if asyncEstimate:
             task = self._detector.asyncRedetect(coreImages, detectAreas, self._getDetectionType(detectLandmarks))
-            pProcessing = partial(postProcessingRedect, images=images, detectLandmarks=detectLandmarks)
             return AsyncTask(task, pProcessing)
         error, fsdkDetectRes = self._detector.redetect(coreImages, detectAreas, self._getDetectionType(detectLandmarks))
-        return postProcessingRedect(error, fsdkDetectRes, images=images, detectLandmarks=detectLandmarks)
+        return pProcessing(error, fsdkDetectRes)
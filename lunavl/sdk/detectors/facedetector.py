@@ -1,6 +1,7 @@
 """
 Module contains function for detection faces on images.
 """
+import itertools
 from enum import Enum
 from functools import partial
 from typing import Any, Dict, List, Literal, Optional, Union, overload
@@ -17,25 +18,32 @@ from FaceEngine import (  # pylint: disable=E0611,E0401
     Image as CoreImage,
     Landmarks5 as CoreLandmarks5,
     Landmarks68 as CoreLandmarks68,
+    Vector2f,
 )
+from PIL.Image import Image as PilImage
 
 from ..async_task import AsyncTask
 from ..base import Landmarks
 from ..detectors.base import (
     BaseDetection,
+    DetectionArrays,
     ImageForDetection,
     ImageForRedetection,
+    assertDetectionOutput,
     getArgsForCoreDetectorForImages,
     getArgsForCoreRedetect,
+    getLandmarksArray,
     validateBatchDetectInput,
     validateReDetectInput,
 )
+from ..detectors.tiling import getImageTiles, mergeTileDetections, postProcessingTiles
 from ..errors.errors import LunaVLError
 from ..errors.exceptions import LunaSDKException, assertError
 from ..faceengine.setting_provider import DetectorType
 from ..image_utils.geometry import Rect
 from ..image_utils.image import VLImage
 from ..launch_options import LaunchOptions
+from ..validation import applyValidationPolicy
 
 
 class FaceLandmarks(Enum):
@@ -114,17 +122,123 @@ class FaceDetection(BaseDetection):
         """
         res = super().asDict()
         if self.landmarks5 is not None:
-            coreLandmarks5 = self.landmarks5.coreEstimation
-            res["landmarks5"] = tuple(
-                (int(coreLandmarks5[index].x), int(coreLandmarks5[index].y)) for index in range(5)
-            )
+            res["landmarks5"] = self.landmarks5.asDict(self._image.scale)
         if self.landmarks68 is not None:
-            coreLandmarks68 = self.landmarks68.coreEstimation
-            res["landmarks68"] = tuple(
-                (int(coreLandmarks68[index].x), int(coreLandmarks68[index].y)) for index in range(68)
-            )
+            res["landmarks68"] = self.landmarks68.asDict(self._image.scale)
         return res
 
+    def _getKnownLandmarks68(self) -> Optional[Landmarks68]:
+        """
+        Get landmarks68 of the detection if they are known, subclasses with lazy landmarks68 do not estimate them.
+
+        Returns:
+            landmarks68 or None
+        """
+        return self.landmarks68
+
+    def toFullResolution(self, margin: float = 1.0, fullResolutionImage: Optional[PilImage] = None) -> "FaceDetection":
+        """
+        Move the detection of an image decoded at reduced resolution (see `VLImage.fromBytes`) to a crop of the full
+        resolution image. Only the crop is kept in memory, it is enough for warping.
+
+        Args:
+            margin: margin of the crop around the bounding box relative to the larger bounding box side
+            fullResolutionImage: original image decoded by `VLImage.decodeFullResolution`, decoded for the crop if
+                not set
+        Returns:
+            detection on the full resolution crop or the detection itself if its image is not reduced
+        Raises:
+            LunaSDKException: if failed to create the crop
+        """
+        image = self._image
+        if not image.isReduced:
+            return self
+        scale = image.scale
+        rect = self.originalRect
+        side = max(rect.width, rect.height) * margin
+        crop, cropRect = image.cropFullResolution(
+            Rect(rect.x - side, rect.y - side, rect.width + 2 * side, rect.height + 2 * side), fullResolutionImage
+        )
+        cropDetection = Rect(rect.x - cropRect.x, rect.y - cropRect.y, rect.width, rect.height)
+        face = Face(crop.coreImage, Detection(cropDetection.coreRectF, self.boundingBox.score))
+        landmarksPairs = (
+            (self.landmarks5, face.landmarks5_opt, CoreLandmarks5),
+            (self._getKnownLandmarks68(), face.landmarks68_opt, CoreLandmarks68),
+        )
+        for landmarks, coreLandmarksOptional, coreLandmarksType in landmarksPairs:
+            if landmarks is None:
+                continue
+            coreLandmarks = coreLandmarksType()
+            for index, point in enumerate(landmarks.points):
+                coreLandmarks[index] = Vector2f(point.x / scale - cropRect.x, point.y / scale - cropRect.y)
+            coreLandmarksOptional.set(coreLandmarks)
+        return FaceDetection(face, crop)
+
+
+class FaceDetectionArrays(DetectionArrays):
+    """
+    Columnar face detections of a batch of images.
+
+    Attributes:
+        landmarks5 (Optional[np.ndarray]): (N, 5, 2) float32 landmarks5 points if landmarks5 are detected
+        landmarks68 (Optional[np.ndarray]): (N, 68, 2) float32 landmarks68 points if landmarks68 are detected
+        _coreLandmarks5 (Optional[List[CoreLandmarks5]]): core landmarks5 of rows
+        _coreLandmarks68 (Optional[List[CoreLandmarks68]]): core landmarks68 of rows
+    """
+
+    __slots__ = ("landmarks5", "landmarks68", "_coreLandmarks5", "_coreLandmarks68")
+
+    def __init__(
+        self,
+        coreDetections: List[List[Detection]],
+        images: List[Union[VLImage, ImageForDetection]],
+        coreLandmarks5: Optional[List[List[CoreLandmarks5]]] = None,
+        coreLandmarks68: Optional[List[List[CoreLandmarks68]]] = None,
+    ):
+        """
+        Init.
+
+        Args:
+            coreDetections: core detections of images
+            images: incoming images
+            coreLandmarks5: core landmarks5 of images if landmarks5 are detected
+            coreLandmarks68: core landmarks68 of images if landmarks68 are detected
+        """
+        super().__init__(coreDetections, images)
+        self._coreLandmarks5 = None if coreLandmarks5 is None else list(itertools.chain.from_iterable(coreLandmarks5))
+        self._coreLandmarks68 = (
+            None if coreLandmarks68 is None else list(itertools.chain.from_iterable(coreLandmarks68))
+        )
+        self.landmarks5 = None if self._coreLandmarks5 is None else getLandmarksArray(self._coreLandmarks5, 5)
+        self.landmarks68 = None if self._coreLandmarks68 is None else getLandmarksArray(self._coreLandmarks68, 68)
+
+    def coreDetection(self, row: int) -> Face:
+        """
+        Create core face of a row.
+
+        Args:
+            row: row
+        Returns:
+            core face
+        """
+        face = Face(self.getImage(row).coreImage, self._coreDetections[row])
+        if self._coreLandmarks5 is not None:
+            face.landmarks5_opt.set(self._coreLandmarks5[row])
+        if self._coreLandmarks68 is not None:
+            face.landmarks68_opt.set(self._coreLandmarks68[row])
+        return face
+
+    def detection(self, row: int) -> FaceDetection:
+        """
+        Create face detection of a row.
+
+        Args:
+            row: row
+        Returns:
+            face detection
+        """
+        return FaceDetection(self.coreDetection(row), self.getImage(row))
+
 
 # alias for detection result
 FacesDetectResult = List[List[FaceDetection]]
@@ -209,6 +323,31 @@ def collectDetectionsResult(
     return _collectDetectionsResult(fsdkDetectRes=fsdkDetectRes, images=images, isRedectResult=False)  # type: ignore
 
 
+def collectDetectionArrays(
+    fsdkDetectRes: IFaceDetectionBatchPtr,
+    images: List[Union[VLImage, ImageForDetection]],
+    detect5Landmarks: bool,
+    detect68Landmarks: bool,
+) -> FaceDetectionArrays:
+    """
+    Collect columnar detection results from core reply
+    Args:
+        fsdkDetectRes: fsdk detect results
+        images: incoming images
+        detect5Landmarks: whether landmarks5 are detected
+        detect68Landmarks: whether landmarks68 are detected
+    Returns:
+        face detection arrays
+    """
+    imageIndexes = range(fsdkDetectRes.getSize())
+    return FaceDetectionArrays(
+        [fsdkDetectRes.getDetections(imageIdx) for imageIdx in imageIndexes],
+        images,
+        [fsdkDetectRes.getLandmarks5(imageIdx) for imageIdx in imageIndexes] if detect5Landmarks else None,
+        [fsdkDetectRes.getLandmarks68(imageIdx) for imageIdx in imageIndexes] if detect68Landmarks else None,
+    )
+
+
 def postProcessingOne(error: FSDKErrorResult, detectRes: Face, image: VLImage) -> Optional[FaceDetection]:
     """
     Convert core face detection to `FaceDetection` after detect one and error check.
@@ -267,6 +406,30 @@ def postProcessing(
     return collectDetectionsResult(detectionsBatch, images)
 
 
+def postProcessingArrays(
+    error: FSDKErrorResult,
+    detectionsBatch: IFaceDetectionBatchPtr,
+    images: List[Union[VLImage, ImageForDetection]],
+    detect5Landmarks: bool,
+    detect68Landmarks: bool,
+) -> FaceDetectionArrays:
+    """
+    Convert core face detections from detector results to `FaceDetectionArrays` and error check.
+
+    Args:
+        error: detection error, usually error.isError is False
+        detectionsBatch: core detection batch
+        images: original images
+        detect5Landmarks: whether landmarks5 are detected
+        detect68Landmarks: whether landmarks68 are detected
+
+    Returns:
+        face detection arrays
+    """
+    assertError(error)
+    return collectDetectionArrays(detectionsBatch, images, detect5Landmarks, detect68Landmarks)
+
+
 def postProcessingRedetect(
     error: FSDKErrorResult, detectionsBatch: IFaceDetectionBatchPtr, images: List[ImageForRedetection]
 ) -> List[List[Optional[FaceDetection]]]:
@@ -382,16 +545,22 @@ class FaceDetector:
             _detectArea = image.coreImage.getRect()
         else:
             _detectArea = detectArea.coreRectI
-        validateBatchDetectInput(self._detector, image.coreImage, _detectArea)
+        postProcessingFunc = applyValidationPolicy(
+            partial(postProcessingOne, image=image),
+            validateBatchDetectInput,
+            self._detector,
+            image.coreImage,
+            _detectArea,
+        )
         if asyncEstimate:
             task = self._detector.asyncDetectOne(
                 image.coreImage, _detectArea, self._getDetectionType(detect5Landmarks, detect68Landmarks)
             )
-            return AsyncTask(task, postProcessing=partial(postProcessingOne, image=image))
+            return AsyncTask(task, postProcessing=postProcessingFunc)
         error, detectRes = self._detector.detectOne(
             image.coreImage, _detectArea, self._getDetectionType(detect5Landmarks, detect68Landmarks)
         )
-        return postProcessingOne(error, detectRes, image)
+        return postProcessingFunc(error, detectRes)
 
     @overload  # type: ignore
     def detect(
@@ -401,6 +570,7 @@ class FaceDetector:
         detect5Landmarks: bool = True,
         detect68Landmarks: bool = False,
         asyncEstimate: Literal[False] = False,
+        output: Literal["detections"] = "detections",
     ) -> FacesDetectResult:
         ...
 
@@ -412,9 +582,36 @@ class FaceDetector:
         detect5Landmarks: bool,
         detect68Landmarks: bool,
         asyncEstimate: Literal[True],
+        output: Literal["detections"] = "detections",
     ) -> AsyncTask[FacesDetectResult]:
         ...
 
+    @overload
+    def detect(
+        self,
+        images: List[Union[VLImage, ImageForDetection]],
+        limit: int = 5,
+        detect5Landmarks: bool = True,
+        detect68Landmarks: bool = False,
+        asyncEstimate: Literal[False] = False,
+        *,
+        output: Literal["arrays"],
+    ) -> FaceDetectionArrays:
+        ...
+
+    @overload
+    def detect(
+        self,
+        images: List[Union[VLImage, ImageForDetection]],
+        limit: int,
+        detect5Landmarks: bool,
+        detect68Landmarks: bool,
+        asyncEstimate: Literal[True],
+        *,
+        output: Literal["arrays"],
+    ) -> AsyncTask[FaceDetectionArrays]:
+        ...
+
     def detect(
         self,
         images: List[Union[VLImage, ImageForDetection]],
@@ -422,6 +619,7 @@ class FaceDetector:
         detect5Landmarks: bool = True,
         detect68Landmarks: bool = False,
         asyncEstimate=False,
+        output: str = "detections",
     ):
         """
         Batch detect faces on images.
@@ -432,21 +630,87 @@ class FaceDetector:
             detect5Landmarks: detect or not landmarks5
             detect68Landmarks: detect or not landmarks68
             asyncEstimate: estimate or run estimation in background
+            output: "detections" - list of lists of face detections, "arrays" - columnar `FaceDetectionArrays`,
+                face detections are created only on request, it is much cheaper for images with many faces
         Returns:
             asyncEstimate is False: return list of lists detection, order of detection lists
-                                    is corresponding to order input images
+                                    is corresponding to order input images (or face detection arrays)
             asyncEstimate is True: async task
         Raises:
             LunaSDKException if an error occurs
+            ValueError: if the output mode is unknown
         """
+        assertDetectionOutput(output)
         coreImages, detectAreas = getArgsForCoreDetectorForImages(images)
         detectionType = self._getDetectionType(detect5Landmarks, detect68Landmarks)
-        validateBatchDetectInput(self._detector, coreImages, detectAreas)
+        if output == "arrays":
+            postProcessingFunc = partial(
+                postProcessingArrays,
+                images=images,
+                detect5Landmarks=detect5Landmarks,
+                detect68Landmarks=detect68Landmarks,
+            )
+        else:
+            postProcessingFunc = partial(postProcessing, images=images)
+        postProcessingFunc = applyValidationPolicy(
+            postProcessingFunc, validateBatchDetectInput, self._detector, coreImages, detectAreas
+        )
         if asyncEstimate:
             task = self._detector.asyncDetect(coreImages, detectAreas, limit, detectionType)
-            return AsyncTask(task, postProcessing=partial(postProcessing, images=images))
+            return AsyncTask(task, postProcessing=postProcessingFunc)
         error, fsdkDetectRes = self._detector.detect(coreImages, detectAreas, limit, detectionType)
-        return postProcessing(error, fsdkDetectRes, images=images)
+        return postProcessingFunc(error, fsdkDetectRes)
+
+    def detectTiled(
+        self,
+        images: List[Union[VLImage, ImageForDetection]],
+        tileSize: int = 1024,
+        overlap: int = 128,
+        limit: int = 100,
+        detect5Landmarks: bool = True,
+        detect68Landmarks: bool = False,
+        iouThreshold: float = 0.4,
+        asyncEstimate: bool = False,
+        fullFrame: bool = False,
+    ):
+        """
+        Batch detect faces on large images by overlapping tiles. All tiles of all images are detected by one batched
+        call, duplicates found on overlaps are merged by a non-maximum suppression (see `tiling.nms`).
+
+        Args:
+            images: input images list. Format must be R8G8B8
+            tileSize: max tile side
+            overlap: min overlap of neighbour tiles, it should not be less than the largest expected face
+            limit: max number of detections per tile and per input image
+            detect5Landmarks: detect or not landmarks5
+            detect68Landmarks: detect or not landmarks68
+            iouThreshold: max intersection over union of merged detections
+            asyncEstimate: estimate or run estimation in background
+            fullFrame: also detect the whole image downscaled to the detector input, it finds faces larger than the
+                overlap, detections are merged with tile detections
+        Returns:
+            asyncEstimate is False: return list of lists detection (in descending order of scores), order of detection
+                                    lists is corresponding to order input images
+            asyncEstimate is True: async task
+        Raises:
+            LunaSDKException if an error occurs
+            ValueError: if the overlap is not less than the tile size
+        """
+        tiles, imageIndexes = getImageTiles(images, tileSize, overlap, fullFrame)
+        merge = partial(
+            mergeTileDetections,
+            imageIndexes=imageIndexes,
+            imageCount=len(images),
+            limit=limit,
+            iouThreshold=iouThreshold,
+        )
+        if asyncEstimate:
+            task = self.detect(tiles, limit, detect5Landmarks, detect68Landmarks, asyncEstimate=True)
+            return AsyncTask(
+                task.coreTask,
+                postProcessing=partial(postProcessingTiles, postProcessing=task.postProcessing, merge=merge),
+            )
+        return merge(self.detect(tiles, limit, detect5Landmarks, detect68Landmarks))
 
     @overload
     def redetectOne(
@@ -498,16 +762,18 @@ class FaceDetector:
             coreBBox = Detection(bBox.coreRectF, 1.0)
         else:
             coreBBox = bBox.coreEstimation.detection
-        self._validateReDetectInput(image.coreImage, coreBBox)
+        postProcessingFunc = applyValidationPolicy(
+            partial(postProcessingRedetectOne, image=image), self._validateReDetectInput, image.coreImage, coreBBox
+        )
         if asyncEstimate:
             task = self._detector.asyncRedetectOne(
                 image.coreImage, coreBBox, self._getDetectionType(detect5Landmarks, detect68Landmarks)
             )
-            return AsyncTask(task, partial(postProcessingRedetectOne, image=image))
+            return AsyncTask(task, postProcessingFunc)
         error, detectRes = self._detector.redetectOne(
             image.coreImage, coreBBox, self._getDetectionType(detect5Landmarks, detect68Landmarks)
         )
-        return postProcessingRedetectOne(error, detectRes, image)
+        return postProcessingFunc(error, detectRes)
 
     def _validateReDetectInput(self, coreImages: List[CoreImage], detectAreas: List[List[Detection]]):
         """
@@ -591,9 +857,15 @@ class FaceDetector:
         detectionType = self._getDetectionType(detect5Landmarks, detect68Landmarks)
 
         coreImages, detectAreas = getArgsForCoreRedetect(images)
-        validateReDetectInput(self._detector, coreImages, detectAreas)
+        postProcessingFunc = applyValidationPolicy(
+            partial(postProcessingRedetect, images=images),
+            validateReDetectInput,
+            self._detector,
+            coreImages,
+            detectAreas,
+        )
         if asyncEstimate:
             task = self._detector.asyncRedetect(coreImages, detectAreas, detectionType)
-            return AsyncTask(task, postProcessing=partial(postProcessingRedetect, images=images))
+            return AsyncTask(task, postProcessing=postProcessingFunc)
         error, fsdkDetectRes = self._detector.redetect(coreImages, detectAreas, detectionType)
-        return postProcessingRedetect(error, fsdkDetectRes, images=images)
+        return postProcessingFunc(error, fsdkDetectRes)
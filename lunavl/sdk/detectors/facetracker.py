@@ -0,0 +1,320 @@
+"""
+Module contains face tracker for video streams.
+
+A full detection runs every `detectionPeriod` frames of a stream. Between them tracks are propagated by redetection of
+the previous bounding boxes, which is much cheaper. Trackers of several streams (cameras) sharing a detector are
+updated by one batched detect call and one batched redetect call per frame (see `FaceTracker.updateMany`).
+"""
+import itertools
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..image_utils.image import VLImage
+from .base import ImageForRedetection
+from .facedetector import FaceDetection, FaceDetector
+from .tiling import getBoxes, getIoU
+
+#: min intersection over union of redetected faces of two tracks to merge the tracks
+DUPLICATE_IOU_THRESHOLD = 0.7
+
+
+class FaceTrack:
+    """
+    Face track.
+
+    Attributes:
+        trackId (int): track id, unique for a tracker
+        detection (FaceDetection): last detection of the face
+        firstFrame (int): number of the frame where the track is born
+        lastFrame (int): number of the last frame where the face is found
+        misses (int): count of consecutive frames where the face is not found
+    """
+
+    __slots__ = ("trackId", "detection", "firstFrame", "lastFrame", "misses")
+
+    def __init__(self, trackId: int, detection: FaceDetection, frame: int):
+        """
+        Init.
+
+        Args:
+            trackId: track id
+            detection: first detection of the face
+            frame: number of the frame where the track is born
+        """
+        self.trackId = trackId
+        self.detection = detection
+        self.firstFrame = frame
+        self.lastFrame = frame
+        self.misses = 0
+
+    def _hit(self, detection: FaceDetection, frame: int) -> None:
+        """
+        Update track by a detection of the face.
+
+        Args:
+            detection: detection
+            frame: frame number
+        """
+        self.detection = detection
+        self.lastFrame = frame
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return f"FaceTrack(trackId={self.trackId}, frames={self.firstFrame}-{self.lastFrame}, misses={self.misses})"
+
+
+def matchBoxes(boxes: np.ndarray, otherBoxes: np.ndarray, iouThreshold: float) -> List[Tuple[int, int]]:
+    """
+    Greedy one-to-one matching of boxes by the highest intersection over union.
+
+    Args:
+        boxes: (N, 4) boxes: left, top, right, bottom
+        otherBoxes: (M, 4) boxes
+        iouThreshold: min intersection over union of matched boxes
+    Returns:
+        pairs of indexes of matched boxes and other boxes
+    """
+    if not len(boxes) or not len(otherBoxes):
+        return []
+    iou = getIoU(boxes, otherBoxes)
+    pairs: List[Tuple[int, int]] = []
+    matched, otherMatched = set(), set()
+    for flatIdx in np.argsort(-iou, axis=None, kind="stable"):
+        idx, otherIdx = divmod(int(flatIdx), iou.shape[1])
+        if iou[idx, otherIdx] < iouThreshold:
+            break
+        if idx not in matched and otherIdx not in otherMatched:
+            pairs.append((idx, otherIdx))
+            matched.add(idx)
+            otherMatched.add(otherIdx)
+    return pairs
+
+
+class FaceTracker:
+    """
+    Face tracker of a video stream.
+
+    Track lifecycle:
+
+        - a track is born from a full detection which does not match any live track
+        - a track is propagated by redetection in its previous bounding box (or matched to a full detection)
+        - a track dies if the face is not found `maxMisses` + 1 frames in a row
+
+    Attributes:
+        _detector (FaceDetector): face detector
+        _detectionPeriod (int): period of full detection in frames
+        _iouThreshold (float): min intersection over union to match a detection with a track
+        _maxMisses (int): max count of consecutive frames without the face to keep a track
+        _limit (int): max count of faces found by full detection
+        _detect68Landmarks (bool): detect landmarks68 or not
+        _tracks (List[FaceTrack]): live tracks
+        _frame (int): number of the last frame
+        _trackIds (Iterator[int]): generator of track ids
+    """
+
+    __slots__ = (
+        "_detector",
+        "_detectionPeriod",
+        "_iouThreshold",
+        "_maxMisses",
+        "_limit",
+        "_detect68Landmarks",
+        "_tracks",
+        "_frame",
+        "_trackIds",
+    )
+
+    def __init__(
+        self,
+        detector: FaceDetector,
+        detectionPeriod: int = 10,
+        iouThreshold: float = 0.3,
+        maxMisses: int = 2,
+        limit: int = 32,
+        detect68Landmarks: bool = False,
+    ):
+        """
+        Init.
+
+        Args:
+            detector: face detector
+            detectionPeriod: run full detection every `detectionPeriod` frames (new faces appear with this delay)
+            iouThreshold: min intersection over union to match a detection with a track
+            maxMisses: max count of consecutive frames without the face to keep a track
+            limit: max count of faces found by full detection
+            detect68Landmarks: detect landmarks68 or not (landmarks5 are always detected)
+        Raises:
+            ValueError: if detection period is not positive or max misses is negative
+        """
+        if detectionPeriod < 1:
+            raise ValueError(f"Detection period must be positive, got {detectionPeriod}")
+        if maxMisses < 0:
+            raise ValueError(f"Max misses must not be negative, got {maxMisses}")
+        self._detector = detector
+        self._detectionPeriod = detectionPeriod
+        self._iouThreshold = iouThreshold
+        self._maxMisses = maxMisses
+        self._limit = limit
+        self._detect68Landmarks = detect68Landmarks
+        self._tracks: List[FaceTrack] = []
+        self._frame = -1
+        self._trackIds = itertools.count()
+
+    @property
+    def detector(self) -> FaceDetector:
+        """Get face detector"""
+        return self._detector
+
+    @property
+    def tracks(self) -> List[FaceTrack]:
+        """Get live tracks (including tracks missed in the last frames)"""
+        return list(self._tracks)
+
+    @property
+    def frame(self) -> int:
+        """Get number of the last frame (-1 before the first update)"""
+        return self._frame
+
+    def reset(self) -> None:
+        """
+        Drop all tracks, the next frame is fully detected.
+        """
+        self._tracks = []
+        self._frame = -1
+
+    def _isDetectionFrame(self) -> bool:
+        """
+        Check the next frame should be fully detected.
+
+        Returns:
+            True on every `detectionPeriod`-th frame and when there are no tracks to redetect
+        """
+        return not self._tracks or (self._frame + 1) % self._detectionPeriod == 0
+
+    def _miss(self, track: FaceTrack) -> bool:
+        """
+        Count a frame without the face of a track.
+
+        Args:
+            track: track
+        Returns:
+            whether the track is still alive
+        """
+        track.misses += 1
+        return track.misses <= self._maxMisses
+
+    def _applyDetections(self, detections: List[FaceDetection]) -> None:
+        """
+        Update tracks by full detection of a frame: matched tracks are propagated, unmatched detections give birth to
+        new tracks.
+
+        Args:
+            detections: detections of the frame
+        """
+        pairs = matchBoxes(
+            getBoxes([track.detection for track in self._tracks]), getBoxes(detections), self._iouThreshold
+        )
+        matchedDetections = set()
+        matchedTracks = set()
+        for trackIdx, detectionIdx in pairs:
+            self._tracks[trackIdx]._hit(detections[detectionIdx], self._frame)  # pylint: disable=W0212
+            matchedTracks.add(trackIdx)
+            matchedDetections.add(detectionIdx)
+        tracks = [track for idx, track in enumerate(self._tracks) if idx in matchedTracks or self._miss(track)]
+        for idx, detection in enumerate(detections):
+            if idx not in matchedDetections:
+                tracks.append(FaceTrack(next(self._trackIds), detection, self._frame))
+        self._tracks = tracks
+
+    def _applyRedetections(self, redetections: List[Optional[FaceDetection]]) -> None:
+        """
+        Update tracks by redetection of their faces. Tracks which converge to the same face are merged into the oldest
+        one.
+
+        Args:
+            redetections: redetections in the order of tracks, None if the face is not found
+        """
+        tracks = []
+        for track, detection in zip(self._tracks, redetections):
+            if detection is not None:
+                track._hit(detection, self._frame)  # pylint: disable=W0212
+                tracks.append(track)
+            elif self._miss(track):
+                tracks.append(track)
+        found = [track for track in tracks if track.lastFrame == self._frame]
+        if len(found) > 1:
+            boxes = getBoxes([track.detection for track in found])
+            duplicates = set()
+            for idx, otherIdx in zip(*np.nonzero(np.triu(getIoU(boxes, boxes), 1) > DUPLICATE_IOU_THRESHOLD)):
+                duplicates.add(max(found[idx].trackId, found[otherIdx].trackId))
+            tracks = [track for track in tracks if track.trackId not in duplicates]
+        self._tracks = tracks
+
+    def _getFoundTracks(self) -> List[FaceTrack]:
+        """
+        Get tracks found in the last frame.
+
+        Returns:
+            tracks
+        """
+        return [track for track in self._tracks if track.lastFrame == self._frame]
+
+    def update(self, image: VLImage) -> List[FaceTrack]:
+        """
+        Process the next frame of the stream.
+
+        Args:
+            image: frame
+        Returns:
+            tracks found in the frame
+        Raises:
+            LunaSDKException: if detection failed
+        """
+        return self.updateMany([self], [image])[0]
+
+    @staticmethod
+    def updateMany(trackers: Sequence["FaceTracker"], images: Sequence[VLImage]) -> List[List[FaceTrack]]:
+        """
+        Process the next frames of several streams. Trackers which share a detector are processed by one batched
+        detect call (for streams on a full detection frame) and one batched redetect call (for other streams).
+
+        Args:
+            trackers: trackers of streams
+            images: next frames of the streams
+        Returns:
+            tracks found in the frames in the order of trackers
+        Raises:
+            ValueError: if counts of trackers and images differ
+            LunaSDKException: if detection failed
+        """
+        if len(trackers) != len(images):
+            raise ValueError(f"Count of trackers ({len(trackers)}) and images ({len(images)}) differ")
+        groups: Dict[Tuple[int, bool], List[Tuple[FaceTracker, VLImage]]] = {}
+        for tracker, image in zip(trackers, images):
+            detectionFrame = tracker._isDetectionFrame()  # pylint: disable=W0212
+            groups.setdefault((id(tracker.detector), detectionFrame), []).append((tracker, image))
+            tracker._frame += 1  # pylint: disable=W0212
+
+        for (_, detectionFrame), group in groups.items():
+            detector = group[0][0].detector
+            if detectionFrame:
+                detectionsBatch = detector.detect(
+                    [image for _, image in group],
+                    limit=max(tracker._limit for tracker, _ in group),  # pylint: disable=W0212
+                    detect68Landmarks=any(tracker._detect68Landmarks for tracker, _ in group),  # pylint: disable=W0212
+                )
+                for (tracker, _), detections in zip(group, detectionsBatch):
+                    limit = tracker._limit  # pylint: disable=W0212
+                    tracker._applyDetections(detections[:limit])  # pylint: disable=W0212
+            else:
+                redetectionsBatch = detector.redetect(
+                    [
+                        ImageForRedetection(image, [track.detection.boundingBox.rect for track in tracker._tracks])
+                        for tracker, image in group
+                    ],
+                    detect68Landmarks=any(tracker._detect68Landmarks for tracker, _ in group),  # pylint: disable=W0212
+                )
+                for (tracker, _), redetections in zip(group, redetectionsBatch):
+                    tracker._applyRedetections(redetections)  # pylint: disable=W0212
+        return [tracker._getFoundTracks() for tracker in trackers]  # pylint: disable=W0212
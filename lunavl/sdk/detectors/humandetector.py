@@ -4,23 +4,27 @@ Module contains function for detection on images.
 from functools import partial
 from typing import Any, Dict, List, Literal, Optional, Union, overload
 
+import numpy as np
+
 from FaceEngine import (  # pylint: disable=E0611,E0401
     Face,
     Human,
     FSDKErrorResult,
 )
 
-from .bodydetector import BodyDetection
-from .facedetector import FaceDetection
+from .bodydetector import BodyDetection, BodyDetectionArrays
+from .facedetector import FaceDetection, FaceDetectionArrays
 from ..async_task import AsyncTask
 from ..detectors.base import (
     ImageForDetection,
+    assertDetectionOutput,
     getArgsForCoreDetectorForImages,
     validateBatchDetectInput,
 )
 from ..errors.exceptions import assertError
 from ..image_utils.image import VLImage
 from ..launch_options import LaunchOptions
+from ..validation import applyValidationPolicy
 
 
 class HumanDetection:
@@ -128,7 +132,7 @@ def collectDetectionsResult(
             humanDetections.append(humanDetection)
 
         for faceIdx, face in enumerate(faces):
-            if faceIdx in bodiesWithFace:
+            if faceIdx in facesWithBody:
                 continue
             humanDetection = HumanDetection(faces[faceIdx], None, image=vlImage)
             humanDetections.append(humanDetection)
@@ -138,6 +142,85 @@ def collectDetectionsResult(
     return res
 
 
+class HumanDetectionArrays:
+    """
+    Columnar human detections of a batch of images. Human detections are created only on request (see `detections`).
+
+    Attributes:
+        faces (FaceDetectionArrays): face detections
+        bodies (BodyDetectionArrays): body detections
+        associations (np.ndarray): (K, 2) int32 associated rows of faces and bodies
+        associationScores (np.ndarray): (K,) float32 association scores
+        _associationOffsets (np.ndarray): (images count + 1,) offsets of associations of images
+    """
+
+    __slots__ = ("faces", "bodies", "associations", "associationScores", "_associationOffsets")
+
+    def __init__(self, fsdkDetectRes, images: List[Union[VLImage, ImageForDetection]]):
+        """
+        Init.
+
+        Args:
+            fsdkDetectRes: fsdk detect results
+            images: incoming images
+        """
+        imageIndexes = range(fsdkDetectRes.getSize())
+        self.faces = FaceDetectionArrays(
+            [fsdkDetectRes.getFaceDetections(imageIdx) for imageIdx in imageIndexes], images
+        )
+        self.bodies = BodyDetectionArrays(
+            [fsdkDetectRes.getHumanDetections(imageIdx) for imageIdx in imageIndexes], images
+        )
+        associations, scores, counts = [], [], []
+        for imageIdx in imageIndexes:
+            faceOffset = self.faces.getImageRows(imageIdx).start
+            bodyOffset = self.bodies.getImageRows(imageIdx).start
+            imageAssociations = fsdkDetectRes.getAssociations(imageIdx)
+            for association in imageAssociations:
+                associations.append((faceOffset + association.faceId, bodyOffset + association.humanId))
+                scores.append(association.score)
+            counts.append(len(imageAssociations))
+        self.associations = np.array(associations, dtype=np.int32).reshape(-1, 2)
+        self.associationScores = np.array(scores, dtype=np.float32)
+        self._associationOffsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+
+    def detections(self) -> HumanDetectResult:
+        """
+        Create human detections of all rows.
+
+        Returns:
+            list of lists detection, order of detection lists is corresponding to order input images
+        """
+        res = []
+        for imageIdx in range(len(self._associationOffsets) - 1):
+            start, stop = self._associationOffsets[imageIdx], self._associationOffsets[imageIdx + 1]
+            facesWithBody, bodiesWithFace = set(), set()
+            humanDetections = []
+            imageAssociations = self.associations[start:stop].tolist()
+            for (faceRow, bodyRow), score in zip(imageAssociations, self.associationScores[start:stop].tolist()):
+                facesWithBody.add(faceRow)
+                bodiesWithFace.add(bodyRow)
+                humanDetection = HumanDetection(
+                    self.faces.coreDetection(faceRow),
+                    self.bodies.coreDetection(bodyRow),
+                    image=self.faces.getImage(faceRow),
+                    score=score,
+                )
+                humanDetections.append(humanDetection)
+            bodyRows = self.bodies.getImageRows(imageIdx)
+            for bodyRow in range(bodyRows.start, bodyRows.stop):
+                if bodyRow not in bodiesWithFace:
+                    image = self.bodies.getImage(bodyRow)
+                    humanDetections.append(HumanDetection(None, self.bodies.coreDetection(bodyRow), image=image))
+            faceRows = self.faces.getImageRows(imageIdx)
+            for faceRow in range(faceRows.start, faceRows.stop):
+                if faceRow not in facesWithBody:
+                    image = self.faces.getImage(faceRow)
+                    humanDetections.append(HumanDetection(self.faces.coreDetection(faceRow), None, image=image))
+            res.append(humanDetections)
+        return res
+
+
 def postProcessing(
     error: FSDKErrorResult, detectionsBatch, images: List[Union[VLImage, ImageForDetection]]
 ) -> List[List[HumanDetection]]:
@@ -156,6 +239,24 @@ def postProcessing(
     return collectDetectionsResult(detectionsBatch, images)
 
 
+def postProcessingArrays(
+    error: FSDKErrorResult, detectionsBatch, images: List[Union[VLImage, ImageForDetection]]
+) -> HumanDetectionArrays:
+    """
+    Convert core bodies and faces detections from detector results to `HumanDetectionArrays` and error check.
+
+    Args:
+        error: detection error, usually error.isError is False
+        detectionsBatch: core detection batch
+        images: original images
+
+    Returns:
+        human detection arrays
+    """
+    assertError(error)
+    return HumanDetectionArrays(detectionsBatch, images)
+
+
 class HumanDetector:
     """
     Human detector. Human is optional Union face, body, ...
@@ -181,6 +282,7 @@ class HumanDetector:
         self,
         images: List[Union[VLImage, ImageForDetection]],
         asyncEstimate: Literal[False] = False,
+        output: Literal["detections"] = "detections",
     ) -> HumanDetectResult:
         ...
 
@@ -189,31 +291,62 @@ class HumanDetector:
         self,
         images: List[Union[VLImage, ImageForDetection]],
         asyncEstimate: Literal[True],
+        output: Literal["detections"] = "detections",
     ) -> AsyncTask[HumanDetectResult]:
         ...
 
+    @overload
+    def detect(
+        self,
+        images: List[Union[VLImage, ImageForDetection]],
+        asyncEstimate: Literal[False] = False,
+        *,
+        output: Literal["arrays"],
+    ) -> HumanDetectionArrays:
+        ...
+
+    @overload
+    def detect(
+        self,
+        images: List[Union[VLImage, ImageForDetection]],
+        asyncEstimate: Literal[True],
+        *,
+        output: Literal["arrays"],
+    ) -> AsyncTask[HumanDetectionArrays]:
+        ...
+
     def detect(
         self,
         images: List[Union[VLImage, ImageForDetection]],
         asyncEstimate=False,
-    ) -> Union[HumanDetectResult, AsyncTask[HumanDetectResult]]:
+        output: str = "detections",
+    ) -> Union[HumanDetectResult, AsyncTask[HumanDetectResult], HumanDetectionArrays, AsyncTask[HumanDetectionArrays]]:
         """
         Batch detect humans on images.
 
         Args:
             images: input images list. Format must be R8G8B8
             asyncEstimate: estimate or run estimation in background
+            output: "detections" - list of lists of human detections, "arrays" - columnar `HumanDetectionArrays`
         Returns:
             asyncEstimate is False: return list of lists detection, order of detection lists
-                                    is corresponding to order input images
+                                    is corresponding to order input images (or human detection arrays)
             asyncEstimate is True: async task
         Raises:
             LunaSDKException if an error occurs
+            ValueError: if the output mode is unknown
         """
+        assertDetectionOutput(output)
         coreImages, detectAreas = getArgsForCoreDetectorForImages(images)
-        validateBatchDetectInput(self._detector, coreImages, detectAreas)
+        postProcessingFunc = applyValidationPolicy(
+            partial(postProcessingArrays if output == "arrays" else postProcessing, images=images),
+            validateBatchDetectInput,
+            self._detector,
+            coreImages,
+            detectAreas,
+        )
         if asyncEstimate:
             task = self._detector.asyncDetect(coreImages, detectAreas)
-            return AsyncTask(task, postProcessing=partial(postProcessing, images=images))
+            return AsyncTask(task, postProcessing=postProcessingFunc)
         error, fsdkDetectRes = self._detector.detect(coreImages, detectAreas)
-        return postProcessing(error, fsdkDetectRes, images=images)
+        return postProcessingFunc(error, fsdkDetectRes)
@@ -0,0 +1,210 @@
+"""
+Module contains tiling of large images for detection and merging of tile detections.
+
+Small faces and bodies on a large frame are lost when the whole frame is downscaled to the detector input. A tiled
+detection runs the detector on overlapping tiles of the frame by one batched call. The core returns detections of a
+detect area in coordinates of the image, so detections of different tiles are comparable and duplicates found on
+overlaps are merged by a non-maximum suppression. An optional full frame pass detects the whole frame downscaled
+to the detector input in the same batch, it finds objects larger than the tile overlap, which are cut by tile
+borders, and its detections are merged with tile detections by the same suppression.
+"""
+import math
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar, Union
+
+import numpy as np
+
+from ..image_utils.geometry import Rect
+from ..image_utils.image import VLImage
+from .base import BaseDetection, ImageForDetection
+
+#: detection type
+_Detection = TypeVar("_Detection", bound=BaseDetection)
+
+
+def getBoxes(detections: Sequence[BaseDetection]) -> np.ndarray:
+    """
+    Get bounding boxes of detections.
+
+    Args:
+        detections: detections
+    Returns:
+        (N, 4) float array of boxes: left, top, right, bottom
+    """
+    boxes = np.empty((len(detections), 4), dtype=np.float64)
+    for idx, detection in enumerate(detections):
+        rect = detection.boundingBox.rect
+        boxes[idx] = (rect.x, rect.y, rect.x + rect.width, rect.y + rect.height)
+    return boxes
+
+
+def getIoU(boxes: np.ndarray, otherBoxes: np.ndarray) -> np.ndarray:
+    """
+    Compute intersection over union of boxes.
+
+    Args:
+        boxes: (N, 4) boxes: left, top, right, bottom
+        otherBoxes: (M, 4) boxes
+    Returns:
+        (N, M) intersection over union matrix
+    """
+    left = np.maximum(boxes[:, None, 0], otherBoxes[None, :, 0])
+    top = np.maximum(boxes[:, None, 1], otherBoxes[None, :, 1])
+    right = np.minimum(boxes[:, None, 2], otherBoxes[None, :, 2])
+    bottom = np.minimum(boxes[:, None, 3], otherBoxes[None, :, 3])
+    intersection = np.clip(right - left, 0, None) * np.clip(bottom - top, 0, None)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    otherAreas = (otherBoxes[:, 2] - otherBoxes[:, 0]) * (otherBoxes[:, 3] - otherBoxes[:, 1])
+    union = areas[:, None] + otherAreas[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iouThreshold: float = 0.4, containThreshold: float = 0.8) -> np.ndarray:
+    """
+    Greedy non-maximum suppression. A box is suppressed by a box with a higher score if their intersection over union
+    is more than `iouThreshold` or if the intersection covers more than `containThreshold` of the smaller box (a face
+    cut by a tile border is detected as a part of the whole face found on the neighbour tile).
+
+    Args:
+        boxes: (N, 4) boxes: left, top, right, bottom
+        scores: (N,) scores of boxes
+        iouThreshold: max intersection over union of kept boxes
+        containThreshold: max share of the smaller box covered by the intersection of kept boxes
+    Returns:
+        indexes of kept boxes in descending order of scores
+    """
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        idx = order[0]
+        keep.append(idx)
+        rest = order[1:]
+        width = np.minimum(boxes[idx, 2], boxes[rest, 2]) - np.maximum(boxes[idx, 0], boxes[rest, 0])
+        height = np.minimum(boxes[idx, 3], boxes[rest, 3]) - np.maximum(boxes[idx, 1], boxes[rest, 1])
+        intersection = np.clip(width, 0, None) * np.clip(height, 0, None)
+        union = areas[idx] + areas[rest] - intersection
+        smaller = np.minimum(areas[idx], areas[rest])
+        iou = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        contain = np.divide(intersection, smaller, out=np.zeros_like(intersection), where=smaller > 0)
+        order = rest[(iou <= iouThreshold) & (contain <= containThreshold)]
+    return np.array(keep, dtype=np.int64)
+
+
+def _getTileStarts(start: int, length: int, tileSize: int, overlap: int) -> List[int]:
+    """
+    Get starts of overlapping tiles along one axis. Tiles are spread evenly, so the overlap may be larger than required.
+
+    Args:
+        start: start of the area
+        length: length of the area
+        tileSize: tile size
+        overlap: min overlap of neighbour tiles
+    Returns:
+        tile starts
+    """
+    if length <= tileSize:
+        return [start]
+    count = math.ceil((length - overlap) / (tileSize - overlap))
+    step = (length - tileSize) / (count - 1)
+    return [start + round(step * idx) for idx in range(count)]
+
+
+def getTiles(area: Rect, tileSize: int, overlap: int) -> List[Rect]:
+    """
+    Split an area into overlapping tiles. The overlap should not be less than the largest expected object, so each
+    object is entirely inside at least one tile.
+
+    Args:
+        area: area to split
+        tileSize: max tile side
+        overlap: min overlap of neighbour tiles
+    Returns:
+        tiles row by row, one tile if the area is not larger than a tile
+    Raises:
+        ValueError: if the overlap is not less than the tile size
+    """
+    if not 0 <= overlap < tileSize:
+        raise ValueError(f"Overlap must be in [0, {tileSize}), got {overlap}")
+    x, y, width, height = int(area.x), int(area.y), int(area.width), int(area.height)
+    tiles = []
+    for top in _getTileStarts(y, height, tileSize, overlap):
+        for left in _getTileStarts(x, width, tileSize, overlap):
+            tiles.append(Rect(left, top, min(tileSize, width), min(tileSize, height)))
+    return tiles
+
+
+def getImageTiles(
+    images: List[Union[VLImage, ImageForDetection]], tileSize: int, overlap: int, fullFrame: bool = False
+) -> Tuple[List[ImageForDetection], List[int]]:
+    """
+    Split images (or their detect areas) into tiles for one batched detection.
+
+    Args:
+        images: images
+        tileSize: max tile side
+        overlap: min overlap of neighbour tiles
+        fullFrame: add the whole detect area of an image split into several tiles as one more tile
+    Returns:
+        tiles and indexes of images of the tiles
+    """
+    tiles, imageIndexes = [], []
+    for imageIdx, image in enumerate(images):
+        if isinstance(image, VLImage):
+            image = ImageForDetection(image, image.rect)
+        imageTiles = getTiles(image.detectArea, tileSize, overlap)
+        if fullFrame and len(imageTiles) > 1:
+            imageTiles.append(image.detectArea)
+        for tile in imageTiles:
+            tiles.append(ImageForDetection(image.image, tile))
+            imageIndexes.append(imageIdx)
+    return tiles, imageIndexes
+
+
+def mergeTileDetections(
+    tileDetections: List[List[_Detection]],
+    imageIndexes: List[int],
+    imageCount: int,
+    limit: int,
+    iouThreshold: float = 0.4,
+    containThreshold: float = 0.8,
+) -> List[List[_Detection]]:
+    """
+    Merge detections of tiles into detections of images.
+
+    Args:
+        tileDetections: detections of tiles
+        imageIndexes: indexes of images of the tiles
+        imageCount: count of images
+        limit: max number of detections per image
+        iouThreshold: iou threshold of the non-maximum suppression (see `nms`)
+        containThreshold: contain threshold of the non-maximum suppression (see `nms`)
+    Returns:
+        detections of images in descending order of scores
+    """
+    imageDetections: List[List[_Detection]] = [[] for _ in range(imageCount)]
+    for imageIdx, detections in zip(imageIndexes, tileDetections):
+        imageDetections[imageIdx].extend(detections)
+    res = []
+    for detections in imageDetections:
+        if not detections:
+            res.append([])
+            continue
+        scores = np.fromiter((detection.boundingBox.score for detection in detections), np.float64, len(detections))
+        keep = nms(getBoxes(detections), scores, iouThreshold, containThreshold)
+        limitedKeep = keep[:limit] if limit > 0 else keep
+        res.append([detections[idx] for idx in limitedKeep])
+    return res
+
+
+def postProcessingTiles(*coreResult: Any, postProcessing: Callable, merge: Callable) -> List[List[_Detection]]:
+    """
+    Post processing of an async tiled detection.
+
+    Args:
+        coreResult: result of the core async task
+        postProcessing: post processing of the detection of tiles
+        merge: merge of tile detections (`mergeTileDetections` with bound arguments)
+    Returns:
+        detections of images
+    """
+    return merge(postProcessing(*coreResult))
@@ -122,7 +122,8 @@ class LunaVLError:
     BatchedInternalError = ErrorInfo(100035, "Batching error", "{}")
 
     HighMemoryUsage = ErrorInfo(110020, "High memory usage", "{}")
-    # next 110029 error, 110028 was removed
+    TooManyRequests = ErrorInfo(110029, "Too many requests", "{}")
+    # next 110030 error, 110028 was removed
 
     @classmethod
     def fromSDKError(cls, sdkError: FSDKErrorResult) -> "ErrorInfo":
@@ -13,6 +13,7 @@ from .estimators.face_estimators.face_descriptor import FaceDescriptorEstimator
 from .estimators.face_estimators.facewarper import FaceWarper
 from .estimators.face_estimators.glasses import GlassesEstimator
 from .estimators.face_estimators.head_pose import HeadPoseEstimator
+from .estimators.face_estimators.landmarks import FaceLandmarksEstimator
 from .estimators.face_estimators.livenessv1 import LivenessV1Estimator
 from .estimators.face_estimators.mask import MaskEstimator
 from .estimators.face_estimators.mouth_state import MouthStateEstimator
@@ -107,6 +108,8 @@ class EstimatorsSettings:
     credibility: CommonEstimatorSettings = field(default_factory=CommonEstimatorSettings)
     #: orientation mode estimator settings
     orientationMode: CommonEstimatorSettings = field(default_factory=CommonEstimatorSettings)
+    #: face landmarks estimator settings
+    landmarks: CommonEstimatorSettings = field(default_factory=CommonEstimatorSettings)
 
 
 class FaceEstimatorsCollection:
@@ -128,6 +131,7 @@ class FaceEstimatorsCollection:
         _livenessV1Estimator (Optional[LivenessV1Estimator]): lazy livenessv1 estimator
         _orientationModeEstimator (Optional[OrientationModeEstimator]): lazy orientation mode estimator
         _credibilityEstimator (Optional[CredibilityEstimator]): lazy credibility estimator
+        _landmarksEstimator (Optional[FaceLandmarksEstimator]): lazy face landmarks estimator
         warper (Optional[Warper]): warper
     """
 
@@ -148,6 +152,7 @@ class FaceEstimatorsCollection:
         "_livenessV1Estimator",
         "_orientationModeEstimator",
         "_credibilityEstimator",
+        "_landmarksEstimator",
         "_estimatorsSettings",
     )
 
@@ -189,6 +194,7 @@ class FaceEstimatorsCollection:
         self._livenessV1Estimator: Union[None, LivenessV1Estimator] = None
         self._orientationModeEstimator: Union[None, OrientationModeEstimator] = None
         self._credibilityEstimator: Union[None, CredibilityEstimator] = None
+        self._landmarksEstimator: Union[None, FaceLandmarksEstimator] = None
         self.warper: FaceWarper = self._faceEngine.createFaceWarper()
 
         if startEstimators:
@@ -625,6 +631,32 @@ class FaceEstimatorsCollection:
         """
         self._credibilityEstimator = newEstimator
 
+    @property
+    def landmarksEstimator(self) -> FaceLandmarksEstimator:
+        """
+        Get face landmarks estimator.
+
+        If estimator is initialized it will be returned otherwise it will be initialized and returned
+
+        Returns:
+            estimator
+        """
+        if self._landmarksEstimator is None:
+            self._landmarksEstimator = self._faceEngine.createFaceLandmarksEstimator(
+                launchOptions=self._estimatorsSettings.landmarks.launchOptions
+            )
+        return self._landmarksEstimator
+
+    @landmarksEstimator.setter
+    def landmarksEstimator(self, newEstimator: FaceLandmarksEstimator) -> None:
+        """
+        Set face landmarks estimator.
+
+        Args:
+            newEstimator: new estimator
+        """
+        self._landmarksEstimator = newEstimator
+
     @property
     def faceEngine(self) -> VLFaceEngine:
         """
@@ -644,6 +676,8 @@ class FaceEstimatorsCollection:
             newFaceEngine: new faceengine
         """
         self._faceEngine = newFaceEngine
+        # landmarks estimator is not a face attribute estimator, it will be re-created on demand
+        self._landmarksEstimator = None
         for estimatorName in self.__slots__:
             if estimatorName == "_faceEngine":
                 continue
@@ -0,0 +1,228 @@
+"""
+Module contains a micro batching estimator wrapper. Single estimations from many threads or coroutines are combined
+into batch estimations.
+"""
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from ..batching import MicroBatcher
+from ..launch_options import LaunchOptions
+from .base import BaseEstimator
+from .body_estimators.body_descriptor import BodyDescriptorEstimator
+from .face_estimators.basic_attributes import BasicAttributesEstimator
+from .face_estimators.face_descriptor import FaceDescriptorEstimator
+from .face_estimators.facewarper import FaceWarp, FaceWarpedImage
+from .face_estimators.mask import MaskEstimator
+
+Estimator = TypeVar("Estimator", bound=BaseEstimator)
+
+# estimation item: estimated object and sorted keyword arguments of the estimation
+EstimationItem = Tuple[Any, Tuple[Tuple[str, Any], ...]]
+
+
+class BatchingEstimator(Generic[Estimator]):
+    """
+    Micro batching estimator.
+
+    The wrapper is a drop-in replacement of an estimator `estimate` method. Single estimations are collected and sent
+    to the estimator batch method as soon as `maxBatchSize` objects are collected or the first object waits longer
+    than `maxWaitTime`. Objects estimated with different keyword arguments are batched separately. Each caller receives
+    its own estimation or its own exception.
+
+    Objects which have no batch counterpart (a face detection for the mask estimator, a descriptor estimation into
+    an existing descriptor) are estimated one by one by the worker.
+
+    Attributes:
+        _estimator (BaseEstimator): wrapped estimator
+        _batcher (MicroBatcher): micro batcher
+    """
+
+    __slots__ = ("_estimator", "_batcher")
+
+    def __init__(
+        self,
+        estimator: Estimator,
+        maxBatchSize: int = 16,
+        maxWaitTime: float = 0.005,
+        workerCount: int = 1,
+    ):
+        """
+        Init.
+
+        Args:
+            estimator: estimator
+            maxBatchSize: max count of objects in one batch estimation
+            maxWaitTime: max time (in seconds) which the first object of a batch waits for other objects
+            workerCount: count of threads which send batches to the estimator
+        Raises:
+            ValueError: if the estimator does not support batch estimation
+        """
+        if self._getBatchFunction(estimator) is None:
+            raise ValueError(f"{estimator.__class__.__name__} does not support batch estimation")
+        self._estimator = estimator
+        self._batcher: MicroBatcher[EstimationItem, Any] = MicroBatcher(
+            self._estimateBatch,
+            maxBatchSize=maxBatchSize,
+            maxWaitTime=maxWaitTime,
+            workerCount=workerCount,
+            name=f"Batching{estimator.__class__.__name__}",
+        )
+
+    @property
+    def estimator(self) -> Estimator:
+        """Get wrapped estimator"""
+        return self._estimator
+
+    @property
+    def launchOptions(self) -> LaunchOptions:
+        """Get estimator launch options"""
+        return self._estimator.launchOptions
+
+    @property
+    def maxBatchSize(self) -> int:
+        """Get max count of objects in one batch estimation"""
+        return self._batcher.maxBatchSize
+
+    @property
+    def maxWaitTime(self) -> float:
+        """Get max time (in seconds) which the first object of a batch waits for other objects"""
+        return self._batcher.maxWaitTime
+
+    @property
+    def pendingCount(self) -> int:
+        """Get approximate count of objects waiting for estimation"""
+        return self._batcher.pendingCount
+
+    @staticmethod
+    def _getBatchFunction(estimator: BaseEstimator) -> Optional[Callable[..., List[Any]]]:
+        """
+        Get a batch function of the estimator which returns a list of estimations.
+
+        Args:
+            estimator: estimator
+
+        Returns:
+            batch function or None if estimator does not support batch estimation
+        """
+        if isinstance(estimator, BasicAttributesEstimator):
+            return lambda items, **kwargs: estimator.estimateBasicAttributesBatch(items, **kwargs)[0]
+        if isinstance(estimator, (FaceDescriptorEstimator, BodyDescriptorEstimator)):
+            return lambda items, **kwargs: list(estimator.estimateDescriptorsBatch(items, **kwargs)[0])
+        return getattr(estimator, "estimateBatch", None)
+
+    def _isBatchable(self, item: EstimationItem) -> bool:
+        """
+        Check whether an object can be estimated by the batch function.
+
+        Args:
+            item: estimation item
+
+        Returns:
+            true if object can be batched otherwise false
+        """
+        estimationObject, kwargs = item
+        if isinstance(self._estimator, MaskEstimator):
+            return isinstance(estimationObject, (FaceWarp, FaceWarpedImage))
+        if isinstance(self._estimator, (FaceDescriptorEstimator, BodyDescriptorEstimator)):
+            return dict(kwargs).get("descriptor") is None
+        return True
+
+    def _estimateBatch(self, items: List[EstimationItem]) -> List[Any]:
+        """
+        Estimate a collected batch. Objects are grouped by estimation keyword arguments.
+
+        Args:
+            items: estimation items
+
+        Returns:
+            estimations in the order of items
+        """
+        results: List[Any] = [None] * len(items)
+        groups: Dict[Tuple[Tuple[str, Any], ...], List[int]] = {}
+        for idx, item in enumerate(items):
+            if self._isBatchable(item):
+                groups.setdefault(item[1], []).append(idx)
+            else:
+                estimationObject, kwargs = item
+                results[idx] = self._estimator.estimate(estimationObject, **dict(kwargs))
+
+        batchFunction: Callable[..., List[Any]] = self._getBatchFunction(self._estimator)  # type: ignore
+        for kwargs, indexes in groups.items():
+            if isinstance(self._estimator, (FaceDescriptorEstimator, BodyDescriptorEstimator)):
+                kwargs = tuple((key, value) for key, value in kwargs if key != "descriptor")
+            estimations = batchFunction([items[idx][0] for idx in indexes], **dict(kwargs))
+            for idx, estimation in zip(indexes, estimations):
+                results[idx] = estimation
+        return results
+
+    def submit(self, estimationObject: Any, **kwargs) -> "Future[Any]":
+        """
+        Submit an object for estimation.
+
+        Args:
+            estimationObject: object for estimation (warp, detection, etc. depends on the estimator)
+            kwargs: estimation keyword arguments of the estimator `estimate` method (except `asyncEstimate`)
+
+        Returns:
+            future of the estimation
+        Raises:
+            RuntimeError: if estimator is closed
+        """
+        return self._batcher.submit((estimationObject, tuple(sorted(kwargs.items()))))
+
+    def estimate(self, estimationObject: Any, asyncEstimate: bool = False, **kwargs) -> Any:
+        """
+        Estimate an object. The call blocks until the batch containing the object is processed.
+
+        Args:
+            estimationObject: object for estimation (warp, detection, etc. depends on the estimator)
+            asyncEstimate: estimate or run estimation in background. Background estimation is not batched
+            kwargs: estimation keyword arguments of the estimator `estimate` method
+
+        Returns:
+            estimation if asyncEstimate is false otherwise async task
+        Raises:
+            LunaSDKException: if estimation failed
+        """
+        if asyncEstimate:
+            return self._estimator.estimate(estimationObject, asyncEstimate=True, **kwargs)
+        return self.submit(estimationObject, **kwargs).result()
+
+    def estimateBatch(self, *args, **kwargs) -> Any:
+        """
+        Estimate a batch by the wrapped estimator directly.
+
+        Returns:
+            result of the wrapped estimator batch function
+        """
+        return self._getBatchFunction(self._estimator)(*args, **kwargs)  # type: ignore
+
+    async def asyncEstimate(self, estimationObject: Any, **kwargs) -> Any:
+        """
+        Estimate an object without blocking an event loop.
+
+        Args:
+            estimationObject: object for estimation (warp, detection, etc. depends on the estimator)
+            kwargs: estimation keyword arguments of the estimator `estimate` method (except `asyncEstimate`)
+
+        Returns:
+            estimation
+        Raises:
+            LunaSDKException: if estimation failed
+        """
+        return await self._batcher.asyncSubmit((estimationObject, tuple(sorted(kwargs.items()))))
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop accepting objects. Already submitted objects will be estimated.
+
+        Args:
+            wait: wait for estimation of submitted objects or not
+        """
+        self._batcher.close(wait)
+
+    def __enter__(self) -> "BatchingEstimator[Estimator]":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -10,6 +10,7 @@ from FaceEngine import HumanAttributeRequest, LowerBodyClothing  # pylint: disab
 from lunavl.sdk.base import BaseEstimation
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from .bodywarper import BodyWarp, BodyWarpedImage
@@ -697,12 +698,18 @@ class BodyAttributesEstimator(BaseEstimator):
         """
         coreImages = [warp.warpedImage.coreImage for warp in warps]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages, HumanAttributeRequest.EstimateAll)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch,
+            validateInputByBatchEstimator,
+            self._coreEstimator,
+            coreImages,
+            HumanAttributeRequest.EstimateAll,
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(coreImages, HumanAttributeRequest.EstimateAll)
-            return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, estimations = self._coreEstimator.estimate(coreImages, HumanAttributeRequest.EstimateAll)
-        return POST_PROCESSING.postProcessingBatch(error, estimations)
+        return postProcessingFunc(error, estimations)
 
     def aggregate(self, attributes: Iterable[BodyAttributes]) -> BodyAttributes:
         """Aggregate several body attributes to one"""
@@ -39,6 +39,8 @@ class BodyWarpedImage(VLImage):
             self.source = body.source
             self.filename = body.filename
             self.coreImage = body.coreImage
+            self.scale = 1.0
+            self._fullResolutionSource = None
         else:
             super().__init__(body, filename=filename, colorFormat=colorFormat)
         self.assertWarp()
@@ -8,6 +8,7 @@ from lunavl.sdk.async_task import AsyncTask
 from lunavl.sdk.descriptors.descriptors import BaseDescriptor, BaseDescriptorBatch, BaseDescriptorFactory
 from lunavl.sdk.errors.errors import LunaVLError
 from lunavl.sdk.errors.exceptions import LunaSDKException, assertError
+from lunavl.sdk.validation import applyValidationPolicy
 
 from ..body_estimators.bodywarper import BodyWarp, BodyWarpedImage
 from ..face_estimators.facewarper import FaceWarp, FaceWarpedImage
@@ -172,33 +173,35 @@ def estimateDescriptorsBatch(
     if descriptorBatch is None:
         descriptorBatch = descriptorFactory.generateDescriptorsBatch(len(warps))
     coreImages = [warp.warpedImage.coreImage for warp in warps]
-    validateInputByBatchEstimator(coreEstimator, coreImages)
     if aggregate:
         aggregatedDescriptor = descriptorFactory.generateDescriptor()
+        postProcessingFunc = applyValidationPolicy(
+            partial(
+                postProcessingBatchWithAggregation,
+                descriptorBatch=descriptorBatch,
+                aggregatedDescriptor=aggregatedDescriptor,
+            ),
+            validateInputByBatchEstimator,
+            coreEstimator,
+            coreImages,
+        )
         if asyncEstimate:
             task = coreEstimator.asyncExtractFromWarpedImageBatch(
                 coreImages, descriptorBatch.coreEstimation, aggregatedDescriptor.coreEstimation
             )
-            return AsyncTask(
-                task,
-                postProcessing=partial(
-                    postProcessingBatchWithAggregation,
-                    descriptorBatch=descriptorBatch,
-                    aggregatedDescriptor=aggregatedDescriptor,
-                ),
-            )
+            return AsyncTask(task, postProcessing=postProcessingFunc)
         error, optionalGSAggregateDescriptor, scores = coreEstimator.extractFromWarpedImageBatch(
             coreImages, descriptorBatch.coreEstimation, aggregatedDescriptor.coreEstimation
         )
-        return postProcessingBatchWithAggregation(
-            error,
-            optionalGSAggregateDescriptor,
-            scores,
-            descriptorBatch=descriptorBatch,
-            aggregatedDescriptor=aggregatedDescriptor,
-        )
+        return postProcessingFunc(error, optionalGSAggregateDescriptor, scores)
+    postProcessingFunc = applyValidationPolicy(
+        partial(postProcessingBatch, descriptorBatch=descriptorBatch),
+        validateInputByBatchEstimator,
+        coreEstimator,
+        coreImages,
+    )
     if asyncEstimate:
         task = coreEstimator.asyncExtractFromWarpedImageBatch(coreImages, descriptorBatch.coreEstimation)
-        return AsyncTask(task, postProcessing=partial(postProcessingBatch, descriptorBatch=descriptorBatch))
+        return AsyncTask(task, postProcessing=postProcessingFunc)
     error, scores = coreEstimator.extractFromWarpedImageBatch(coreImages, descriptorBatch.coreEstimation)
-    return postProcessingBatch(error, scores, descriptorBatch=descriptorBatch)
+    return postProcessingFunc(error, scores)
@@ -7,6 +7,7 @@ from typing import List, Optional, Union
 from lunavl.sdk.detectors.facedetector import FaceDetection
 from lunavl.sdk.errors.exceptions import assertError
 
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator, ImageWithFaceDetection
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 
@@ -61,8 +62,10 @@ class AGSEstimator(BaseEstimator):
         coreImages = [detection.image.coreImage for detection in detections]
         boundingBoxEstimations = [detection.boundingBox.coreEstimation for detection in detections]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages, boundingBoxEstimations)
+        assertValidResult = applyValidationPolicy(
+            assertError, validateInputByBatchEstimator, self._coreEstimator, coreImages, boundingBoxEstimations
+        )
         error, agsList = self._coreEstimator.estimate(coreImages, boundingBoxEstimations)
 
-        assertError(error)
+        assertValidResult(error)
         return agsList
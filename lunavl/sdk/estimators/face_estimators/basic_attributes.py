@@ -16,6 +16,7 @@ from FaceEngine import (  # pylint: disable=E0611,E0401; pylint: disable=E0611,E
 from lunavl.sdk.base import BaseEstimation
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from ..face_estimators.facewarper import FaceWarp, FaceWarpedImage
@@ -311,16 +312,18 @@ class BasicAttributesEstimator(BaseEstimator):
 
         images = [warp.warpedImage.coreImage for warp in warps]
 
-        validateInputByBatchEstimator(self._coreEstimator, images, AttributeRequest(dtAttributes))
+        postProcessingFunc = applyValidationPolicy(
+            partial(POST_PROCESSING.postProcessingBatchWithAggregation, aggregate=aggregate),
+            validateInputByBatchEstimator,
+            self._coreEstimator,
+            images,
+            AttributeRequest(dtAttributes),
+        )
 
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(images, AttributeRequest(dtAttributes))
-            return AsyncTask(
-                task, postProcessing=partial(POST_PROCESSING.postProcessingBatchWithAggregation, aggregate=aggregate)
-            )
+            return AsyncTask(task, postProcessing=postProcessingFunc)
         error, baseAttributes, aggregatedAttribute = self._coreEstimator.estimate(
             images, AttributeRequest(dtAttributes)
         )
-        return POST_PROCESSING.postProcessingBatchWithAggregation(
-            error, baseAttributes, aggregatedAttribute, aggregate=aggregate
-        )
+        return postProcessingFunc(error, baseAttributes, aggregatedAttribute)
@@ -2,13 +2,15 @@
 Module for estimate a credibility person by face.
 """
 from enum import Enum
-from typing import Literal, Union, overload
+from typing import List, Literal, Union, overload
 
 from FaceEngine import CredibilityCheckEstimation, CredibilityStatus
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
 from ...base import BaseEstimation
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator
+from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from ..face_estimators.facewarper import FaceWarp, FaceWarpedImage
 
 
@@ -117,3 +119,29 @@ class CredibilityEstimator(BaseEstimator):
             return AsyncTask(task, POST_PROCESSING.postProcessing)
         error, credibility = self._coreEstimator.estimate(warp.warpedImage.coreImage)
         return POST_PROCESSING.postProcessing(error, credibility)
+
+    #  pylint: disable=W0221
+    def estimateBatch(
+        self, warps: List[Union[FaceWarp, FaceWarpedImage]], asyncEstimate: bool = False
+    ) -> Union[List[Credibility], AsyncTask[List[Credibility]]]:
+        """
+        Batch estimate credibility
+
+        Args:
+            warps: warped images
+            asyncEstimate: estimate or run estimation in background
+        Returns:
+            list of estimated credibility if asyncEstimate is false otherwise async task
+        Raises:
+            LunaSDKException: if estimation failed
+        """
+        coreImages = [warp.warpedImage.coreImage for warp in warps]
+
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch, validateInputByBatchEstimator, self._coreEstimator, coreImages
+        )
+        if asyncEstimate:
+            task = self._coreEstimator.asyncEstimate(coreImages)
+            return AsyncTask(task, postProcessingFunc)
+        error, credibilities = self._coreEstimator.estimate(coreImages)
+        return postProcessingFunc(error, credibilities)
@@ -13,6 +13,7 @@ from FaceEngine import (  # pylint: disable=E0611,E0401
 from lunavl.sdk.base import BaseEstimation
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from ..face_estimators.facewarper import FaceWarp, FaceWarpedImage
@@ -186,9 +187,11 @@ class EyebrowExpressionEstimator(BaseEstimator):
         """
         coreImages = [warp.warpedImage.coreImage for warp in warps]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch, validateInputByBatchEstimator, self._coreEstimator, coreImages
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(coreImages)
-            return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, estimations = self._coreEstimator.estimate(coreImages)
-        return POST_PROCESSING.postProcessingBatch(error, estimations)
+        return postProcessingFunc(error, estimations)
@@ -21,6 +21,7 @@ from lunavl.sdk.base import BaseEstimation, Landmarks
 from lunavl.sdk.detectors.facedetector import Landmarks5, Landmarks68
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from ..face_estimators.facewarper import FaceWarp, FaceWarpedImage
@@ -270,12 +271,18 @@ class EyeEstimator(BaseEstimator):
                     )
                 )
         coreImages = [row.warp.warpedImage.coreImage for row in warpWithLandmarksList]
-        validateInputByBatchEstimator(self._coreEstimator, coreImages, eyeRectList)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING_EYES.postProcessingBatch,
+            validateInputByBatchEstimator,
+            self._coreEstimator,
+            coreImages,
+            eyeRectList,
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(coreImages, eyeRectList)
-            return AsyncTask(task, POST_PROCESSING_EYES.postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, eyesEstimations = self._coreEstimator.estimate(coreImages, eyeRectList)
-        return POST_PROCESSING_EYES.postProcessingBatch(error, eyesEstimations)
+        return postProcessingFunc(error, eyesEstimations)
 
 
 def _isNotNan(value: float) -> bool:
@@ -414,9 +421,15 @@ class GazeEstimator(BaseEstimator):
         """
         images = [row.warp.warpedImage.coreImage for row in warpWithLandmarks5List]
         landmarks = [row.landmarks.coreEstimation for row in warpWithLandmarks5List]
-        validateInputByBatchEstimator(self._coreEstimator, images, landmarks)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING_GAZE.postProcessingBatch,
+            validateInputByBatchEstimator,
+            self._coreEstimator,
+            images,
+            landmarks,
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(images, landmarks)
-            return AsyncTask(task, POST_PROCESSING_GAZE.postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, gazeList = self._coreEstimator.estimate(images, landmarks)
-        return POST_PROCESSING_GAZE.postProcessingBatch(error, gazeList)
+        return postProcessingFunc(error, gazeList)
@@ -1,6 +1,6 @@
 """Module for creating warped images
 """
-from typing import Optional, Union
+from typing import Dict, List, Optional, Sequence, Union
 
 from FaceEngine import Image as CoreImage, IWarperPtr, Transformation  # pylint: disable=E0611,E0401
 from numpy import ndarray
@@ -41,6 +41,8 @@ class FaceWarpedImage(VLImage):
             self.source = body.source
             self.filename = body.filename
             self.coreImage = body.coreImage
+            self.scale = 1.0
+            self._fullResolutionSource = None
         else:
             super().__init__(body, filename=filename, colorFormat=colorFormat)
         self.assertWarp()
@@ -149,7 +151,9 @@ class FaceWarper:
 
     def warp(self, faceDetection: FaceDetection) -> FaceWarp:
         """
-        Create warp from detection.
+        Create warp from detection. A detection of an image decoded at reduced resolution is warped from a crop of the
+        full resolution image (see `FaceDetection.toFullResolution`), use `warpBatch` to warp several faces of the image
+        by one decoding of the full resolution image.
 
         Args:
             faceDetection: face detection with landmarks5
@@ -159,8 +163,50 @@ class FaceWarper:
         Raises:
             LunaSDKException: if creation failed
         """
-        transformation = self._createWarpTransformation(faceDetection)
-        error, warp = self._coreWarper.warp(faceDetection.coreEstimation.img, transformation)
+        return self._warp(faceDetection, faceDetection.toFullResolution())
+
+    def warpBatch(self, faceDetections: Sequence[FaceDetection]) -> List[FaceWarp]:
+        """
+        Create warps from detections. The full resolution image of a reduced image is decoded once for all detections
+        of the image and is released after their warping.
+
+        Args:
+            faceDetections: face detections with landmarks5
+
+        Returns:
+            warps in the order of detections
+        Raises:
+            LunaSDKException: if creation failed
+        """
+        imageDetections: Dict[int, List[int]] = {}
+        for index, faceDetection in enumerate(faceDetections):
+            imageDetections.setdefault(id(faceDetection.image), []).append(index)
+        warps: List[Optional[FaceWarp]] = [None] * len(faceDetections)
+        for indexes in imageDetections.values():
+            image = faceDetections[indexes[0]].image
+            fullResolutionImage = image.decodeFullResolution() if image.isReduced else None
+            for index in indexes:
+                faceDetection = faceDetections[index]
+                warps[index] = self._warp(
+                    faceDetection, faceDetection.toFullResolution(fullResolutionImage=fullResolutionImage)
+                )
+        return warps  # type: ignore
+
+    def _warp(self, faceDetection: FaceDetection, warpDetection: FaceDetection) -> FaceWarp:
+        """
+        Create warp from detection on a full resolution image.
+
+        Args:
+            faceDetection: source face detection
+            warpDetection: the detection on a full resolution image (see `FaceDetection.toFullResolution`)
+
+        Returns:
+            Warp
+        Raises:
+            LunaSDKException: if creation failed
+        """
+        transformation = self._createWarpTransformation(warpDetection)
+        error, warp = self._coreWarper.warp(warpDetection.coreEstimation.img, transformation)
         assertError(error)
 
         warpedImage = FaceWarpedImage(body=warp, filename=faceDetection.image.filename)
@@ -11,6 +11,7 @@ from lunavl.sdk.base import BaseEstimation
 from lunavl.sdk.detectors.facedetector import FaceDetection
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator, ImageWithFaceDetection
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 
@@ -105,9 +106,15 @@ class FisheyeEstimator(BaseEstimator):
         coreImages = [row.image.coreImage for row in batch]
         detections = [row.boundingBox.coreEstimation for row in batch]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages, detections)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch,
+            validateInputByBatchEstimator,
+            self._coreEstimator,
+            coreImages,
+            detections,
+        )
         if not asyncEstimate:
             error, estimations = self._coreEstimator.estimate(coreImages, detections)
-            return POST_PROCESSING.postProcessingBatch(error, estimations)
+            return postProcessingFunc(error, estimations)
         task = self._coreEstimator.asyncEstimate(coreImages, detections)
-        return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
+        return AsyncTask(task, postProcessingFunc)
@@ -9,6 +9,7 @@ from FaceEngine import GlassesEstimation
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
 from ...base import BaseEstimation
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from ..face_estimators.facewarper import FaceWarp, FaceWarpedImage
@@ -135,9 +136,11 @@ class GlassesEstimator(BaseEstimator):
         """
         coreImages = [warp.warpedImage.coreImage for warp in warps]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch, validateInputByBatchEstimator, self._coreEstimator, coreImages
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(coreImages)
-            return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, masks = self._coreEstimator.estimate(coreImages)
-        return POST_PROCESSING.postProcessingBatch(error, masks)
+        return postProcessingFunc(error, masks)
@@ -12,6 +12,7 @@ from lunavl.sdk.base import BaseEstimation
 from lunavl.sdk.detectors.facedetector import FaceDetection, Landmarks68
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator, ImageWithFaceDetection
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 
@@ -205,9 +206,15 @@ class HeadPoseEstimator(BaseEstimator):
         coreImages = [row.image.coreImage for row in batch]
         detections = [row.boundingBox.coreEstimation for row in batch]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages, detections)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch,
+            validateInputByBatchEstimator,
+            self._coreEstimator,
+            coreImages,
+            detections,
+        )
         if not asyncEstimate:
             error, headPoseEstimations = self._coreEstimator.estimate(coreImages, detections)
-            return POST_PROCESSING.postProcessingBatch(error, headPoseEstimations)
+            return postProcessingFunc(error, headPoseEstimations)
         task = self._coreEstimator.asyncEstimate(coreImages, detections)
-        return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
+        return AsyncTask(task, postProcessingFunc)
@@ -6,6 +6,7 @@ from FaceEngine import Image as CoreImage, Detection as CoreFaceDetection, FSDKE
 from lunavl.sdk.async_task import AsyncTask
 from lunavl.sdk.detectors.facedetector import Landmarks5, FaceDetection, Landmarks68, FaceLandmarks
 from lunavl.sdk.errors.exceptions import assertError, LunaSDKException
+from lunavl.sdk.validation import applyValidationPolicy
 from ..base import BaseEstimator
 from ...errors.errors import LunaVLError
 
@@ -207,7 +208,9 @@ class FaceLandmarksEstimator(BaseEstimator):
             estimator = (
                 self._coreEstimator.asyncDetectLandmarks68 if asyncEstimate else self._coreEstimator.detectLandmarks68
             )
-        self._validate(detection.image.coreImage, detection.coreEstimation.detection)
+        postProcessing = applyValidationPolicy(
+            postProcessing, self._validate, detection.image.coreImage, detection.coreEstimation.detection
+        )
         if asyncEstimate:
             task = estimator(detection.image.coreImage, [detection.coreEstimation.detection])
             return AsyncTask(task, postProcessing)
@@ -273,7 +276,6 @@ class FaceLandmarksEstimator(BaseEstimator):
         coreImages = [image[0] for image in preparedBatch]
         coreDetections = [image[1] for image in preparedBatch]
         batchSize = len(detections)
-        self._validate(coreImages, coreDetections)
         if landmarksType == FaceLandmarks.Landmarks5:
             postProcessing = partial(
                 _postProcessingBatch,
@@ -295,11 +297,12 @@ class FaceLandmarksEstimator(BaseEstimator):
                 self._coreEstimator.asyncDetectLandmarks68 if asyncEstimate else self._coreEstimator.detectLandmarks68
             )
 
+        postProcessing = applyValidationPolicy(postProcessing, self._validate, coreImages, coreDetections)
         if asyncEstimate:
             task = estimator(coreImages, coreDetections)
             return AsyncTask(task, postProcessing)
         error, estimations = estimator(coreImages, coreDetections)
-        return postProcessing(error, estimations, preparedBatch=preparedBatch, batchSize=batchSize)
+        return postProcessing(error, estimations)
 
     def _validate(
         self,
@@ -15,6 +15,7 @@ from lunavl.sdk.detectors.facedetector import FaceDetection
 from lunavl.sdk.errors.exceptions import assertError
 from lunavl.sdk.estimators.base import BaseEstimator
 from lunavl.sdk.estimators.estimators_utils.extractor_utils import validateInputByBatchEstimator
+from lunavl.sdk.validation import applyValidationPolicy
 
 
 class LivenessPrediction(Enum):
@@ -225,7 +226,14 @@ class LivenessV1Estimator(BaseEstimator):
         except AttributeError:
             raise ValueError("Landmarks5 is required for liveness estimation")
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages, detections, coreEstimations)
+        postProcessingFunc = applyValidationPolicy(
+            postProcessingBatch,
+            validateInputByBatchEstimator,
+            self._coreEstimator,
+            coreImages,
+            detections,
+            coreEstimations,
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(
                 coreImages,
@@ -233,11 +241,11 @@ class LivenessV1Estimator(BaseEstimator):
                 coreEstimations,
                 -1.0 if qualityThreshold is None else qualityThreshold,
             )
-            return AsyncTask(task, postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, estimations = self._coreEstimator.estimate(
             coreImages,
             detections,
             coreEstimations,
             -1.0 if qualityThreshold is None else qualityThreshold,
         )
-        return postProcessingBatch(error, estimations)
+        return postProcessingFunc(error, estimations)
@@ -17,6 +17,7 @@ from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from ..face_estimators.facewarper import FaceWarp, FaceWarpedImage
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
 from ...base import BaseEstimation
+from ...validation import applyValidationPolicy
 
 
 class FaceOcclusionState(Enum):
@@ -325,9 +326,11 @@ class MaskEstimator(BaseEstimator):
         """
         coreImages = [warp.warpedImage.coreImage for warp in warps]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch, validateInputByBatchEstimator, self._coreEstimator, coreImages
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(coreImages)
-            return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, masks = self._coreEstimator.estimate(coreImages)
-        return POST_PROCESSING.postProcessingBatch(error, masks)
+        return postProcessingFunc(error, masks)
@@ -13,6 +13,7 @@ from FaceEngine import (  # pylint: disable=E0611,E0401
 from lunavl.sdk.base import BaseEstimation
 
 from ...async_task import AsyncTask, DefaultPostprocessingFactory
+from ...validation import applyValidationPolicy
 from ..base import BaseEstimator
 from ..estimators_utils.extractor_utils import validateInputByBatchEstimator
 from .eyes import WarpWithLandmarks5
@@ -149,9 +150,11 @@ class RedEyesEstimator(BaseEstimator):
         """
         images = [row.warp.warpedImage.coreImage for row in warpWithLandmarks5List]
         landmarks = [row.landmarks.coreEstimation for row in warpWithLandmarks5List]
-        validateInputByBatchEstimator(self._coreEstimator, images, landmarks)
+        postProcessingFunc = applyValidationPolicy(
+            POST_PROCESSING.postProcessingBatch, validateInputByBatchEstimator, self._coreEstimator, images, landmarks
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(images, landmarks)
-            return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, estimations = self._coreEstimator.estimate(images, landmarks)
-        return POST_PROCESSING.postProcessingBatch(error, estimations)
+        return postProcessingFunc(error, estimations)
@@ -14,6 +14,7 @@ from lunavl.sdk.estimators.base import BaseEstimator
 from lunavl.sdk.estimators.estimators_utils.extractor_utils import validateInputByBatchEstimator
 from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarp, FaceWarpedImage
 from lunavl.sdk.image_utils.image import VLImage
+from lunavl.sdk.validation import applyValidationPolicy
 
 
 class OrientationType(Enum):
@@ -123,9 +124,11 @@ class OrientationModeEstimator(BaseEstimator):
         """
         coreImages = [img.warpedImage.coreImage if isinstance(img, FaceWarp) else img.coreImage for img in images]
 
-        validateInputByBatchEstimator(self._coreEstimator, coreImages)
+        postProcessingFunc = applyValidationPolicy(
+            postProcessingBatch, validateInputByBatchEstimator, self._coreEstimator, coreImages
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(coreImages)
-            return AsyncTask(task, postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, coreOrientationTypeList = self._coreEstimator.estimate(coreImages)
-        return postProcessingBatch(error, coreOrientationTypeList)
+        return postProcessingFunc(error, coreOrientationTypeList)
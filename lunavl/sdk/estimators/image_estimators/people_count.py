@@ -6,6 +6,7 @@ from lunavl.sdk.errors.exceptions import LunaSDKException, LunaVLError
 from FaceEngine import FSDKErrorResult, CrowdEstimation
 from lunavl.sdk.errors.exceptions import assertError
 from lunavl.sdk.estimators.estimators_utils.extractor_utils import validateInputByBatchEstimator
+from lunavl.sdk.validation import applyValidationPolicy
 from typing import List, Union, NamedTuple, Tuple
 
 class ImageForPeopleEstimation(NamedTuple):
@@ -102,12 +103,14 @@ class PeopleCountEstimator(BaseEstimator):
             image = image.image
         else:
             detectArea = image.coreImage.getRect()
-        validateInputByBatchEstimator(self._coreEstimator, [image.coreImage], [detectArea])
+        postProcessingFunc = applyValidationPolicy(
+            postProcessing, validateInputByBatchEstimator, self._coreEstimator, [image.coreImage], [detectArea]
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate([image.coreImage], [detectArea])
-            return AsyncTask(task, postProcessing)
+            return AsyncTask(task, postProcessingFunc)
         error, crowdEstimation = self._coreEstimator.estimate([image.coreImage], [detectArea])
-        return postProcessing(error, crowdEstimation)
+        return postProcessingFunc(error, crowdEstimation)
 
     def estimateBatch(
             self,
@@ -127,9 +130,11 @@ class PeopleCountEstimator(BaseEstimator):
             LunaSDKException: if estimation is failed
         """
         coreImages, detectAreas = getEstimatorArgsFromImages(images)
-        validateInputByBatchEstimator(self._coreEstimator, coreImages, detectAreas)
+        postProcessingFunc = applyValidationPolicy(
+            postProcessingBatch, validateInputByBatchEstimator, self._coreEstimator, coreImages, detectAreas
+        )
         if asyncEstimate:
             task = self._coreEstimator.asyncEstimate(coreImages, detectAreas)
-            return AsyncTask(task, postProcessingBatch)
+            return AsyncTask(task, postProcessingFunc)
         error, crowdEstimations = self._coreEstimator.estimate(coreImages, detectAreas)
-        return postProcessingBatch(error, crowdEstimations)
+        return postProcessingFunc(error, crowdEstimations)
@@ -0,0 +1,128 @@
+"""
+Module contains http fetcher of image bodies with a shared connection pool.
+"""
+import threading
+from typing import Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+#: statuses which are retried
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class ImageFetcher:
+    """
+    Fetcher of image bodies by url.
+
+    Connections are kept alive in a pool shared by all threads (`requests.Session` is thread-safe for GET requests
+    with a mounted adapter). Connection errors and `RETRY_STATUSES` are retried with exponential backoff.
+
+    Attributes:
+        _session (requests.Session): session with the connection pool
+        _timeout (Tuple[float, float]): connect and read timeouts in seconds
+        _maxBytes (Optional[int]): max size of a body
+        _chunkSize (int): size of chunks of a streamed body
+    """
+
+    __slots__ = ("_session", "_timeout", "_maxBytes", "_chunkSize")
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = (3.05, 30.0),
+        retries: int = 2,
+        backoffFactor: float = 0.1,
+        poolSize: int = 32,
+        maxBytes: Optional[int] = None,
+        chunkSize: int = 64 * 1024,
+    ):
+        """
+        Init.
+
+        Args:
+            timeout: read timeout or connect and read timeouts in seconds
+            retries: count of retries of a failed request
+            backoffFactor: backoff factor of retries, a retry sleeps `backoffFactor * 2 ** (retry number - 1)` seconds
+            poolSize: max count of kept alive connections per host, it should not be less than count of fetching
+                threads
+            maxBytes: max size of a body, None - unlimited
+            chunkSize: size of chunks of a streamed body
+        """
+        self._timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        self._maxBytes = maxBytes
+        self._chunkSize = chunkSize
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoffFactor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """Get connect and read timeouts in seconds"""
+        return self._timeout
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Fetch a body. The body is streamed by chunks and checked against the size limit while reading.
+
+        Args:
+            url: url
+        Returns:
+            body
+        Raises:
+            ValueError: if response status is not 200 or body is too large
+            requests.RequestException: if a connection error or timeout is not resolved by retries
+        """
+        with self._session.get(url, timeout=self._timeout, stream=True) as response:
+            if response.status_code != 200:
+                raise ValueError(f"Failed to fetch {url}: status {response.status_code}")
+            contentLength = response.headers.get("Content-Length")
+            if self._maxBytes is not None and contentLength is not None and int(contentLength) > self._maxBytes:
+                raise ValueError(f"Body of {url} is too large: {contentLength} bytes")
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(self._chunkSize):
+                size += len(chunk)
+                if self._maxBytes is not None and size > self._maxBytes:
+                    raise ValueError(f"Body of {url} is too large: more than {self._maxBytes} bytes")
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        """
+        Close pooled connections.
+        """
+        self._session.close()
+
+    def __enter__(self) -> "ImageFetcher":
+        return self
+
+    def __exit__(self, excType, excVal, excTb) -> None:
+        self.close()
+
+
+_defaultFetcher: Optional[ImageFetcher] = None
+_defaultFetcherLock = threading.Lock()
+
+
+def getDefaultFetcher() -> ImageFetcher:
+    """
+    Get fetcher shared by `VLImage.load` and `VLImage.loadManyFromUrls`, create it on the first call.
+
+    Returns:
+        default fetcher
+    """
+    global _defaultFetcher  # pylint: disable=W0603
+    if _defaultFetcher is None:
+        with _defaultFetcherLock:
+            if _defaultFetcher is None:
+                _defaultFetcher = ImageFetcher()
+    return _defaultFetcher
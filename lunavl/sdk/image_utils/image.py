@@ -1,21 +1,33 @@
 """
 Module realize VLImage - structure for storing image in special format.
 """
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
 from copy import copy
 from enum import Enum
+from functools import partial
+from io import BytesIO
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
 
 import numpy as np
-import requests
 from FaceEngine import FormatType, Image as CoreImage  # pylint: disable=E0611,E0401
 from PIL import Image as pilImage
 from PIL.Image import Image as PilImage
 
+from .fetcher import ImageFetcher, getDefaultFetcher
 from .geometry import Rect
 from .pil.np import getNPImageType, pilToNumpy
 from ..errors.exceptions import assertError
 
+#: source of `VLImage.loadMany`: filename or image body
+ImageSource = Union[str, Path, bytes, bytearray]
+_T = TypeVar("_T")
+
 
 class ImageFormat(Enum):
     """
@@ -139,6 +151,46 @@ class ColorFormat(Enum):
         raise ValueError(f"Cannot load '{colorFormat}' color format.")
 
 
+#: pillow formats of image formats
+_PIL_FORMATS = {
+    ImageFormat.JPEG: "JPEG",
+    ImageFormat.PNG: "PNG",
+    ImageFormat.PPM: "PPM",
+    ImageFormat.TIFF: "TIFF",
+    ImageFormat.BMP: "BMP",
+}
+#: image formats which support 16 bit grayscale
+_HIGH_DEPTH_FORMATS = (ImageFormat.PNG, ImageFormat.PPM, ImageFormat.TIFF)
+#: pillow modes and raw (buffer) modes of color formats
+_PIL_MODES = {
+    ColorFormat.R8G8B8: ("RGB", "RGB"),
+    ColorFormat.B8G8R8: ("RGB", "BGR"),
+    ColorFormat.R8G8B8X8: ("RGB", "RGBX"),
+    ColorFormat.B8G8R8X8: ("RGB", "BGRX"),
+    ColorFormat.IR_X8X8X8: ("RGB", "RGB"),
+    ColorFormat.R8: ("L", "L"),
+    ColorFormat.R16: ("I;16", "I;16"),
+}
+
+_encodeExecutor: Optional[ThreadPoolExecutor] = None
+_encodeExecutorLock = threading.Lock()
+
+
+def _getEncodeExecutor() -> ThreadPoolExecutor:
+    """
+    Get thread pool shared by `VLImage.encodeMany`, create it on the first call.
+
+    Returns:
+        thread pool with a thread per cpu
+    """
+    global _encodeExecutor  # pylint: disable=W0603
+    if _encodeExecutor is None:
+        with _encodeExecutorLock:
+            if _encodeExecutor is None:
+                _encodeExecutor = ThreadPoolExecutor(os.cpu_count() or 1, thread_name_prefix="lunavl-encode")
+    return _encodeExecutor
+
+
 class VLImage:
     """
     Class image.
@@ -147,9 +199,12 @@ class VLImage:
         coreImage (CoreFE.Image): core image object
         source (Union[bytes, bytearray, PilImage, CoreImage]): body of image
         filename (str): filename of the file which is source of image
+        scale (float): size of the image relative to the original image (less than 1 for images decoded at reduced
+            resolution, see `load` with `maxSide`)
+        _fullResolutionSource (Optional[bytes]): encoded original image of a reduced image
     """
 
-    __slots__ = ("coreImage", "source", "filename")
+    __slots__ = ("coreImage", "source", "filename", "scale", "_fullResolutionSource")
 
     def __init__(
         self,
@@ -208,6 +263,8 @@ class VLImage:
 
         self.source = body
         self.filename = filename
+        self.scale = 1.0
+        self._fullResolutionSource: Optional[bytes] = None
 
     @classmethod
     def rotate(cls, image: "VLImage", angle: RotationAngle):
@@ -236,7 +293,13 @@ class VLImage:
 
     @classmethod
     def load(
-        cls, *, filename: Optional[str] = None, url: Optional[str] = None, colorFormat: Optional[ColorFormat] = None
+        cls,
+        *,
+        filename: Optional[str] = None,
+        url: Optional[str] = None,
+        colorFormat: Optional[ColorFormat] = None,
+        fetcher: Optional[ImageFetcher] = None,
+        maxSide: Optional[int] = None,
     ) -> "VLImage":
 
         """
@@ -247,11 +310,15 @@ class VLImage:
             filename: filename
             url: url
             colorFormat: img format to cast into
+            fetcher: fetcher of url images, the shared default fetcher (pooled connections, timeouts, retries) is used
+                by default
+            maxSide: decode a JPEG image at reduced resolution (see `fromBytes`)
 
         Returns:
             vl image
         Raises:
-            ValueError: if no one argument  did not set.
+            ValueError: if no one argument  did not set or failed to fetch an url image
+            requests.RequestException: if a connection error or timeout is not resolved by retries
 
         >>> VLImage.load(url='https://st.kp.yandex.net/im/kadr/3/1/4/kinopoisk.ru-Keira-Knightley-3142930.jpg').rect
         x = 0, y = 0, width = 1000, height = 1288
@@ -262,18 +329,225 @@ class VLImage:
             path = Path(filename)
             with path.open("rb") as file:
                 body = file.read()
-                img = cls(body, colorFormat)
+                img = cls.fromBytes(body, colorFormat, maxSide)
                 img.filename = path.name
                 return img
 
         if url is not None:
-            response = requests.get(url=url)
-            if response.status_code == 200:
-                img = cls(response.content, colorFormat)
-                img.filename = url
-                return img
+            img = cls.fromBytes((fetcher or getDefaultFetcher()).fetch(url), colorFormat, maxSide)
+            img.filename = url
+            return img
         raise ValueError
 
+    @classmethod
+    def fromBytes(
+        cls, body: Union[bytes, bytearray], colorFormat: Optional[ColorFormat] = None, maxSide: Optional[int] = None
+    ) -> "VLImage":
+        """
+        Decode an image, optionally at reduced resolution.
+
+        With `maxSide` a JPEG image is decoded by libjpeg DCT scaling at 1/2, 1/4 or 1/8 of its size, the largest
+        reduction which keeps the longer side not less than `maxSide`. It is much faster and takes less memory than
+        full decoding of a large image. The reduction is recorded in `scale`: detections map their coordinates back to
+        the original image and warps are made from a full resolution crop (see `cropFullResolution`). Images of other
+        formats and small images are decoded at full resolution.
+
+        Args:
+            body: encoded image
+            colorFormat: img format to cast into
+            maxSide: min length of the longer side of a reduced image, None - decode at full resolution
+        Returns:
+            vl image
+        Raises:
+            ValueError: if max side is not positive
+            LunaSDKException: if failed to decode the image
+        """
+        if maxSide is None:
+            return cls(body, colorFormat)
+        if maxSide < 1:
+            raise ValueError(f"Max side must be positive, got {maxSide}")
+        body = bytes(body)
+        pilImg = pilImage.open(BytesIO(body))
+        width, height = pilImg.size
+        if pilImg.format != "JPEG" or max(width, height) < 2 * maxSide:
+            return cls(body, colorFormat)
+        reduction = maxSide / max(width, height)
+        pilImg.draft("RGB", (max(int(width * reduction), 1), max(int(height * reduction), 1)))
+        img = cls(pilImg, colorFormat)
+        img.scale = 1 / round(width / pilImg.size[0])
+        if img.scale != 1:
+            img._fullResolutionSource = body
+        return img
+
+    @property
+    def isReduced(self) -> bool:
+        """Whether the image is decoded at reduced resolution"""
+        return self._fullResolutionSource is not None
+
+    def decodeFullResolution(self) -> PilImage:
+        """
+        Decode the original image of a reduced image. The decoded image is not kept by the image, pass it to
+        `cropFullResolution` to crop several areas by one decoding.
+
+        Returns:
+            decoded original image
+        Raises:
+            ValueError: if the image is not reduced
+        """
+        if self._fullResolutionSource is None:
+            raise ValueError("Image is decoded at full resolution")
+        pilImg = pilImage.open(BytesIO(self._fullResolutionSource))
+        pilImg.load()
+        return pilImg
+
+    def cropFullResolution(self, rect: Rect, fullResolutionImage: Optional[PilImage] = None) -> Tuple["VLImage", Rect]:
+        """
+        Crop an area of the original image of a reduced image.
+
+        Args:
+            rect: area in coordinates of the original image
+            fullResolutionImage: original image decoded by `decodeFullResolution`, decoded for the crop if not set
+        Returns:
+            crop (in the image color format) and the cropped area (the area clipped by the original image borders)
+        Raises:
+            ValueError: if the image is not reduced or the area is outside of the image
+        """
+        pilImg = self.decodeFullResolution() if fullResolutionImage is None else fullResolutionImage
+        left, top = max(math.floor(rect.x), 0), max(math.floor(rect.y), 0)
+        right = min(math.ceil(rect.x + rect.width), pilImg.size[0])
+        bottom = min(math.ceil(rect.y + rect.height), pilImg.size[1])
+        if right <= left or bottom <= top:
+            raise ValueError(f"Area {rect} is outside of the image")
+        crop = pilImg.crop((left, top, right, bottom))
+        return VLImage(crop, self.format, filename=self.filename), Rect(left, top, right - left, bottom - top)
+
+    @classmethod
+    def _loadSource(cls, source: ImageSource, colorFormat: Optional[ColorFormat] = None) -> "VLImage":
+        """
+        Load image from a file or decode it from bytes.
+
+        Args:
+            source: filename or image body
+            colorFormat: img format to cast into
+        Returns:
+            vl image
+        """
+        if isinstance(source, (bytes, bytearray)):
+            return cls(source, colorFormat)
+        return cls.load(filename=str(source), colorFormat=colorFormat)
+
+    @classmethod
+    def loadMany(
+        cls,
+        sources: Iterable[ImageSource],
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        prefetch: Optional[int] = None,
+        colorFormat: Optional[ColorFormat] = None,
+        executor: Optional[Executor] = None,
+    ) -> Iterator["VLImage"]:
+        """
+        Load and decode images in parallel threads (file reading and core decoding release GIL).
+
+        Sources are consumed lazily: at most `prefetch` images are loading or loaded but not yet taken, so memory usage
+        is bounded for long sources. Loading is cancelled when the iterator is closed.
+
+        Args:
+            sources: filenames or image bodies
+            workers: count of loading threads, count of cpu by default
+            ordered: yield images in the order of sources or as soon as they are loaded
+            prefetch: max count of images loaded ahead, twice the workers count by default
+            colorFormat: img format to cast into
+            executor: executor for loading, a new thread pool with `workers` threads by default
+        Returns:
+            iterator over images
+        Raises:
+            ValueError: if workers or prefetch is not positive
+            LunaSDKException: if failed to decode an image (raised on iteration)
+            OSError: if failed to read a file (raised on iteration)
+
+        >>> for batch in VLImage.loadBatches(filenames, batchSize=16, workers=4):  # doctest: +SKIP
+        ...     detections = detector.detect(batch)
+        """
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        loader = partial(cls._loadSource, colorFormat=colorFormat)
+        return _loadInParallel(sources, loader, workers, ordered, prefetch, executor)
+
+    @classmethod
+    def loadManyFromUrls(
+        cls,
+        urls: Iterable[str],
+        workers: int = 16,
+        ordered: bool = True,
+        prefetch: Optional[int] = None,
+        colorFormat: Optional[ColorFormat] = None,
+        fetcher: Optional[ImageFetcher] = None,
+        executor: Optional[Executor] = None,
+    ) -> Iterator["VLImage"]:
+        """
+        Fetch and decode url images concurrently. Connections are reused from the fetcher pool.
+
+        Urls are consumed lazily: at most `prefetch` images are fetching or fetched but not yet taken.
+
+        Args:
+            urls: urls
+            workers: max count of concurrent requests, it should not exceed the fetcher pool size
+            ordered: yield images in the order of urls or as soon as they are loaded
+            prefetch: max count of images loaded ahead, twice the workers count by default
+            colorFormat: img format to cast into
+            fetcher: fetcher of images, the shared default fetcher by default
+            executor: executor for loading, a new thread pool with `workers` threads by default
+        Returns:
+            iterator over images
+        Raises:
+            ValueError: if workers or prefetch is not positive; if failed to fetch an image (raised on iteration)
+            requests.RequestException: if a connection error or timeout is not resolved by retries (raised on
+                iteration)
+            LunaSDKException: if failed to decode an image (raised on iteration)
+        """
+        fetcher = fetcher or getDefaultFetcher()
+
+        def load(url: str) -> "VLImage":
+            return cls.load(url=url, colorFormat=colorFormat, fetcher=fetcher)
+
+        return _loadInParallel(urls, load, workers, ordered, prefetch, executor)
+
+    @classmethod
+    def loadBatches(
+        cls,
+        sources: Iterable[ImageSource],
+        batchSize: int,
+        workers: Optional[int] = None,
+        colorFormat: Optional[ColorFormat] = None,
+        executor: Optional[Executor] = None,
+    ) -> Iterator[List["VLImage"]]:
+        """
+        Load images in parallel (see `loadMany`) and group them into batches (e.g. for `FaceDetector.detect`).
+
+        Images of a batch are in the order of sources. A batch is loaded ahead while the previous one is processed.
+
+        Args:
+            sources: filenames or image bodies
+            batchSize: count of images in a batch, the last batch may be smaller
+            workers: count of loading threads, count of cpu by default
+            colorFormat: img format to cast into
+            executor: executor for loading, a new thread pool with `workers` threads by default
+        Returns:
+            iterator over image batches
+        Raises:
+            ValueError: if batch size or workers is not positive
+        """
+        if batchSize < 1:
+            raise ValueError(f"Batch size must be positive, got {batchSize}")
+        images = cls.loadMany(
+            sources,
+            workers=workers,
+            prefetch=max(batchSize, 2 * (workers or os.cpu_count() or 1)),
+            colorFormat=colorFormat,
+            executor=executor,
+        )
+        return iter(lambda: list(islice(images, batchSize)), [])
+
     @staticmethod
     def _coreImageFromNumpyArray(
         ndarray: np.ndarray, inputColorFormat: ColorFormat, colorFormat: Optional[ColorFormat] = None
@@ -498,15 +772,93 @@ class VLImage:
             error = self.coreImage.save(filename, colorFormat.coreFormat)
         assertError(error)
 
-    def convertToBinaryImg(self, imageFormat: ImageFormat = ImageFormat.PPM) -> bytes:
+    def _asEncodablePillow(self, imageFormat: ImageFormat) -> PilImage:
+        """
+        Wrap image pixels into a pillow image, pixels of BGR and padded formats are unpacked.
+
+        Args:
+            imageFormat: format the image will be encoded to
+        Returns:
+            pillow image
+        """
+        array = self.asNPArray()
+        colorFormat = self.format
+        if colorFormat == ColorFormat.R16 and imageFormat not in _HIGH_DEPTH_FORMATS:
+            array = (array >> 8).astype(np.uint8)
+            colorFormat = ColorFormat.R8
+        array = np.ascontiguousarray(array)
+        mode, rawMode = _PIL_MODES[colorFormat]
+        size = (array.shape[1], array.shape[0])
+        if mode == rawMode:
+            return pilImage.frombuffer(mode, size, array, "raw", rawMode, 0, 1)
+        return pilImage.frombytes(mode, size, array, "raw", rawMode)
+
+    def convertToBinaryImg(
+        self, imageFormat: ImageFormat = ImageFormat.PPM, quality: int = 90, compressionLevel: int = 6
+    ) -> bytes:
         """
-        Convert VL image to binary image
+        Encode VL image in memory.
+
+        PPM image of R8G8B8 or R8 format is composed of the raw pixel buffer directly, other formats are encoded by
+        pillow from the raw pixel buffer. R16 image is reduced to 8 bits for JPEG and BMP.
+
         Args:
             imageFormat: format
+            quality: JPEG quality (1-95)
+            compressionLevel: PNG zlib compression level (0-9, 0 - no compression, 1 - fastest)
         Returns:
-            bytes
+            encoded image
+        Raises:
+            ValueError: if quality or compression level is out of range
+        """
+        if not 1 <= quality <= 95:
+            raise ValueError(f"JPEG quality must be in range [1, 95], got {quality}")
+        if not 0 <= compressionLevel <= 9:
+            raise ValueError(f"PNG compression level must be in range [0, 9], got {compressionLevel}")
+        if imageFormat == ImageFormat.PPM and self.format in (ColorFormat.R8G8B8, ColorFormat.R8):
+            array = self.asNPArray()
+            magic = "P6" if self.format == ColorFormat.R8G8B8 else "P5"
+            return f"{magic}\n{array.shape[1]} {array.shape[0]}\n255\n".encode() + array.tobytes()
+
+        options: Dict[str, Any] = {}
+        if imageFormat == ImageFormat.JPEG:
+            options["quality"] = quality
+        elif imageFormat == ImageFormat.PNG:
+            options["compress_level"] = compressionLevel
+        buffer = BytesIO()
+        self._asEncodablePillow(imageFormat).save(buffer, _PIL_FORMATS[imageFormat], **options)
+        return buffer.getvalue()
+
+    @staticmethod
+    def encodeMany(
+        images: Iterable["VLImage"],
+        imageFormat: ImageFormat = ImageFormat.JPEG,
+        quality: int = 90,
+        compressionLevel: int = 6,
+        executor: Optional[Executor] = None,
+    ) -> List[bytes]:
         """
-        pass
+        Encode images in parallel threads (pillow encoders release GIL). See `convertToBinaryImg`.
+
+        Args:
+            images: images (e.g. warps or face crops)
+            imageFormat: format
+            quality: JPEG quality (1-95)
+            compressionLevel: PNG zlib compression level (0-9)
+            executor: executor for encoding, shared thread pool by default
+        Returns:
+            encoded images in the order of images
+        Raises:
+            ValueError: if quality or compression level is out of range
+        """
+        images = list(images)
+        if len(images) < 2:
+            return [image.convertToBinaryImg(imageFormat, quality, compressionLevel) for image in images]
+        executor = executor or _getEncodeExecutor()
+        futures = [
+            executor.submit(image.convertToBinaryImg, imageFormat, quality, compressionLevel) for image in images
+        ]
+        return [future.result() for future in futures]
 
     def isValid(self) -> bool:
         """
@@ -534,3 +886,67 @@ class VLImage:
         assertError(error)
 
         return self.__class__(body=coreImage, filename=self.filename)
+
+
+def _loadInParallel(
+    sources: Iterable[_T],
+    load: Callable[[_T], VLImage],
+    workers: int,
+    ordered: bool,
+    prefetch: Optional[int],
+    executor: Optional[Executor],
+) -> Iterator[VLImage]:
+    """
+    Load images in parallel threads with bounded prefetch.
+
+    Args:
+        sources: image sources
+        load: loader of an image from a source
+        workers: count of loading threads
+        ordered: yield images in the order of sources or as soon as they are loaded
+        prefetch: max count of images loaded ahead, twice the workers count by default
+        executor: executor for loading, a new thread pool with `workers` threads by default
+    Returns:
+        iterator over images
+    Raises:
+        ValueError: if workers or prefetch is not positive
+    """
+    prefetch = 2 * workers if prefetch is None else prefetch
+    if workers < 1 or prefetch < 1:
+        raise ValueError(f"Workers and prefetch must be positive, got {workers} and {prefetch}")
+    return _iterLoaded(iter(sources), load, workers, ordered, prefetch, executor)
+
+
+def _iterLoaded(
+    sources: Iterator[_T],
+    load: Callable[[_T], VLImage],
+    workers: int,
+    ordered: bool,
+    prefetch: int,
+    executor: Optional[Executor],
+) -> Iterator[VLImage]:
+    """
+    Generator of `_loadInParallel`, pending loads are cancelled on closing.
+    """
+    ownExecutor = executor is None
+    loadExecutor = ThreadPoolExecutor(workers) if executor is None else executor
+    pending: Deque["Future[VLImage]"] = deque()
+    try:
+        for source in islice(sources, prefetch):
+            pending.append(loadExecutor.submit(load, source))
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                wait(pending, return_when=FIRST_COMPLETED)
+                future = next(future for future in pending if future.done())
+                pending.remove(future)
+            image = future.result()
+            for source in islice(sources, 1):
+                pending.append(loadExecutor.submit(load, source))
+            yield image
+    finally:
+        for future in pending:
+            future.cancel()
+        if ownExecutor:
+            loadExecutor.shutdown(wait=False)
@@ -0,0 +1,180 @@
+"""
+Module contains benchmark of approximate index search against exact search.
+
+Run it over a descriptor dump (see `DescriptorStore`)::
+
+    python -m lunavl.sdk.indexes.benchmark gallery.lvds --queries 1000 -k 1 10
+
+The index is built from the dump or loaded with `--index`. Recall@k shows how much HNSW search misses with current
+index settings, the ground truth is matching of queries with all index descriptors by the core matcher. QPS of
+approximate and exact search shows the gallery size below which exact search is faster (see `setExactSearch`).
+"""
+import argparse
+import time
+from typing import List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
+from lunavl.sdk.descriptors.matcher import FaceMatcher
+
+from .base import IndexResult
+from .stored_index import DenseIndex, DynamicIndex
+
+
+class IndexBenchmarkResult(NamedTuple):
+    """
+    Index benchmark result.
+
+    Attributes
+        k (int): count of search results
+        queryCount (int): count of queries
+        recall (float): mean recall@k of approximate search against the ground truth
+        approximateQps (float): approximate search queries per second (one query per call)
+        exactQps (float): exact search queries per second (all queries per call)
+    """
+
+    k: int
+    queryCount: int
+    recall: float
+    approximateQps: float
+    exactQps: float
+
+
+def recallAtK(approximateResults: List[List[IndexResult]], groundTruth: List[List[int]]) -> float:
+    """
+    Compute mean recall@k: share of the ground truth top-k positions found by approximate search.
+
+    Args:
+        approximateResults: approximate search results for each query
+        groundTruth: positions of true nearest descriptors for each query
+    Returns:
+        mean recall over queries, 1.0 if there are no true results
+    """
+    recalls = []
+    for approximate, expected in zip(approximateResults, groundTruth):
+        if not expected:
+            continue
+        found = {result.index for result in approximate}
+        recalls.append(sum(position in found for position in expected) / len(expected))
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+def getGroundTruth(
+    index: Union[DynamicIndex, DenseIndex], faceMatcher: FaceMatcher, queries: Sequence[FaceDescriptor], k: int
+) -> List[List[int]]:
+    """
+    Find true nearest descriptors: match each query with all index descriptors by the core matcher.
+
+    Args:
+        index: index
+        faceMatcher: core matcher of the index descriptor version
+        queries: query descriptors
+        k: count of nearest descriptors
+    Returns:
+        positions of k nearest descriptors for each query sorted by distance
+    Raises:
+        LunaSDKException: if an error occurs while getting descriptors or matching
+    """
+    positions, _ = index.asNumpy()
+    if not len(positions):
+        return [[] for _ in queries]
+    candidates = faceMatcher.descriptorFactory.generateDescriptorsBatch(len(positions))
+    for position in positions.tolist():
+        candidates.append(index[position])
+    groundTruth = []
+    for query in queries:
+        distances = np.array([result.distance for result in faceMatcher.match(query, candidates)])  # type: ignore
+        groundTruth.append(positions[np.argsort(distances, kind="stable")[:k]].tolist())
+    return groundTruth
+
+
+def benchmarkIndex(
+    index: Union[DynamicIndex, DenseIndex],
+    faceMatcher: FaceMatcher,
+    queries: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+    k: int = 10,
+) -> IndexBenchmarkResult:
+    """
+    Measure recall@k and QPS of approximate index search and QPS of exact search.
+
+    Args:
+        index: index
+        faceMatcher: core matcher of the index descriptor version, it finds the ground truth of recall
+        queries: query descriptors
+        k: count of search results
+    Returns:
+        benchmark result
+    Raises:
+        ValueError: if k is not positive or there are no queries
+        LunaSDKException: if an error occurs while searching
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    queries = list(queries)
+    if not queries:
+        raise ValueError("Queries are required")
+    # build the exact matcher beforehand, it is reused by following searches
+    index.exactSearch(queries[0], k)
+
+    start = time.perf_counter()
+    approximateResults = [index.approximateSearch(query, k) for query in queries]
+    approximateTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.exactSearchBatch(queries, k)
+    exactTime = time.perf_counter() - start
+
+    return IndexBenchmarkResult(
+        k=k,
+        queryCount=len(queries),
+        recall=recallAtK(approximateResults, getGroundTruth(index, faceMatcher, queries, k)),
+        approximateQps=len(queries) / approximateTime if approximateTime else float("inf"),
+        exactQps=len(queries) / exactTime if exactTime else float("inf"),
+    )
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    """
+    Run benchmark from the command line.
+
+    Args:
+        arguments: command line arguments, `sys.argv` by default
+    """
+    from lunavl.sdk.descriptors.store import DescriptorStore
+    from lunavl.sdk.faceengine.engine import VLFaceEngine
+
+    from .stored_index import IndexType
+
+    parser = argparse.ArgumentParser(description="Recall@k and QPS of approximate index search against exact search")
+    parser.add_argument("store", help="descriptor dump (DescriptorStore file)")
+    parser.add_argument("--index", help="saved index of the dump descriptors, the index is built if not set")
+    parser.add_argument("--index-type", default=IndexType.dynamic.value, choices=[t.value for t in IndexType])
+    parser.add_argument("--queries", type=int, default=1000, help="count of queries (first dump descriptors)")
+    parser.add_argument("-k", type=int, nargs="+", default=[1, 10], help="counts of search results")
+    args = parser.parse_args(arguments)
+
+    faceEngine = VLFaceEngine()
+    store = DescriptorStore.load(args.store)
+    builder = faceEngine.createIndexBuilder(descriptorVersion=store.descriptorVersion)
+    if args.index:
+        index = builder.loadIndex(args.index, IndexType(args.index_type), replayWal=False)
+    else:
+        start = time.perf_counter()
+        builder.appendFrom(store.descriptors)
+        index = builder.buildIndex()
+        print(f"built index of {index.bufSize} descriptors in {time.perf_counter() - start:.2f} s")
+    factory = faceEngine.createFaceDescriptorFactory(store.descriptorVersion)
+    queries = list(store.toBatch(factory, stop=args.queries))
+
+    faceMatcher = faceEngine.createFaceMatcher(store.descriptorVersion)
+    for k in args.k:
+        result = benchmarkIndex(index, faceMatcher, queries, k)
+        print(
+            f"k={result.k} queries={result.queryCount} recall@k={result.recall:.4f} "
+            f"approximate qps={result.approximateQps:.1f} exact qps={result.exactQps:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
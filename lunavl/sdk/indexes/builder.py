@@ -1,16 +1,34 @@
 """
 Module contains core index builder.
 """
+import time
 from pathlib import Path
-from typing import Union
+from typing import Callable, Iterable, NamedTuple, Optional, Union
 
-from FaceEngine import PyIFaceEngine
+import numpy as np
+from FaceEngine import IDescriptorBatchPtr, PyIFaceEngine
 
 from lunavl.sdk.descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
 from lunavl.sdk.errors.exceptions import assertError
 
 from .base import CoreIndex
 from .stored_index import DenseIndex, DynamicIndex, IndexType
+from .wal import getWalPath
+
+
+class AppendProgress(NamedTuple):
+    """
+    Progress of streaming descriptors appending.
+
+    Attributes
+        appended (int): count of appended descriptors
+        elapsed (float): elapsed time in seconds
+        throughput (float): descriptors per second
+    """
+
+    appended: int
+    elapsed: float
+    throughput: float
 
 
 class IndexBuilder(CoreIndex):
@@ -82,6 +100,95 @@ class IndexBuilder(CoreIndex):
         assertError(error)
         self._bufSize += len(descriptorsBatch)
 
+    def appendFrom(
+        self,
+        descriptors: Iterable[Union[FaceDescriptor, bytes, np.ndarray]],
+        chunkSize: int = 1000,
+        progressCallback: Optional[Callable[[AppendProgress], None]] = None,
+    ) -> int:
+        """
+        Append descriptors from any iterable (generator, file reader, `DescriptorStore.descriptors`, db cursor) by
+        chunks. One descriptor batch buffer is reused for all chunks, so memory usage does not depend on
+        count of descriptors.
+
+        Args:
+            descriptors: face descriptors, raw descriptors (`rawDescriptor`) or descriptor payloads
+                (`asBytes`, rows of `DescriptorStore.descriptors`)
+            chunkSize: count of descriptors appended to the index at once
+            progressCallback: function which is called after each appended chunk
+        Returns:
+            count of appended descriptors
+        Raises:
+            ValueError: if chunk size is not positive
+            LunaSDKException: if an error occurs while loading or adding descriptors
+        """
+        if chunkSize < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunkSize}")
+        descriptorVersion = self.descriptorVersion
+        coreDescriptor = self._faceEngine.createDescriptor(descriptorVersion)
+        payloadLength = len(coreDescriptor.getData())
+        error, rawDescriptor = coreDescriptor.save()
+        assertError(error)
+        # serialized descriptor is a header (signature and version) followed by the payload
+        header = rawDescriptor[: len(rawDescriptor) - payloadLength]
+        coreBatch = self._faceEngine.createDescriptorBatch(chunkSize, version=descriptorVersion)
+
+        start = time.monotonic()
+        appended = 0
+        for descriptor in descriptors:
+            if isinstance(descriptor, FaceDescriptor):
+                error = coreBatch.add(descriptor.coreEstimation)
+            else:
+                data = descriptor.tobytes() if isinstance(descriptor, np.ndarray) else descriptor
+                if len(data) == payloadLength:
+                    data = header + data
+                assertError(coreDescriptor.load(data, len(data)))
+                error = coreBatch.add(coreDescriptor)
+            assertError(error)
+            if coreBatch.getCount() < chunkSize:
+                continue
+            appended += self._appendCoreBatch(coreBatch)
+            # the core batch keeps its allocated capacity after clearing
+            coreBatch.clear()
+            if progressCallback is not None:
+                progressCallback(self._getAppendProgress(appended, start))
+        if coreBatch.getCount():
+            appended += self._appendCoreBatch(coreBatch)
+            if progressCallback is not None:
+                progressCallback(self._getAppendProgress(appended, start))
+        return appended
+
+    def _appendCoreBatch(self, coreBatch: IDescriptorBatchPtr) -> int:
+        """
+        Append a core descriptor batch to internal storage.
+
+        Args:
+            coreBatch: core descriptor batch
+        Returns:
+            count of appended descriptors
+        Raises:
+            LunaSDKException: if an error occurs while adding the batch of descriptors
+        """
+        count = coreBatch.getCount()
+        error = self._coreIndex.appendBatch(coreBatch)
+        assertError(error)
+        self._bufSize += count
+        return count
+
+    @staticmethod
+    def _getAppendProgress(appended: int, start: float) -> AppendProgress:
+        """
+        Get appending progress.
+
+        Args:
+            appended: count of appended descriptors
+            start: monotonic start time
+        Returns:
+            appending progress
+        """
+        elapsed = time.monotonic() - start
+        return AppendProgress(appended, elapsed, appended / elapsed if elapsed > 0 else 0.0)
+
     def __delitem__(self, index: int) -> None:
         """
         Removes descriptor out of internal storage.
@@ -94,14 +201,20 @@ class IndexBuilder(CoreIndex):
         super().__delitem__(index)
         self._bufSize -= 1
 
-    def loadIndex(self, path: str, indexType: IndexType) -> Union[DynamicIndex, DenseIndex]:
+    def loadIndex(self, path: str, indexType: IndexType, replayWal: bool = True) -> Union[DynamicIndex, DenseIndex]:
         """
         Load 'dynamic' or 'dense' index from file.
+
+        If a write-ahead log exists next to a dynamic index (`getWalPath(path)`), its updates made after the snapshot
+        are replayed and the log is attached to the index, so following updates are logged too.
         Args:
             path: path to saved index
             indexType: index type ('dynamic' or 'dense')
+            replayWal: replay and attach the write-ahead log of a dynamic index or not
         Raises:
             FileNotFoundError: if the index file is not found
+            ValueError: if the write-ahead log file is invalid
+            LunaSDKException: if an error occurs while loading the index or replaying the log
         Returns:
             class of DenseIndex or DynamicIndex
         """
@@ -109,7 +222,12 @@ class IndexBuilder(CoreIndex):
             raise FileNotFoundError(f"No such file or directory: {path}")
 
         if IndexType(indexType) == IndexType.dynamic:
-            return self._getDynamicIndex(path=path)
+            index = self._getDynamicIndex(path=path)
+            walPath = getWalPath(path)
+            if replayWal and walPath.exists():
+                index.replayWal(walPath, snapshotPath=path)
+                index.attachWal(walPath)
+            return index
         return self._getDenseIndex(path=path)
 
     def buildIndex(self) -> DynamicIndex:
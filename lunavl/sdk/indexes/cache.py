@@ -0,0 +1,165 @@
+"""
+Module contains LRU cache of index search results.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor
+
+from .base import IndexResult
+
+#: cache key: descriptor digest, max count of results, similarity threshold
+SearchCacheKey = Tuple[bytes, int, Optional[float]]
+
+
+def getSearchCacheKey(
+    descriptor: FaceDescriptor, maxCount: int, similarityThreshold: Optional[float] = None
+) -> SearchCacheKey:
+    """
+    Get cache key of a search query.
+
+    Args:
+        descriptor: query descriptor
+        maxCount: max count of results
+        similarityThreshold: min similarity of results
+    Returns:
+        cache key
+    """
+    return hashlib.blake2b(descriptor.asBytes, digest_size=16).digest(), maxCount, similarityThreshold
+
+
+class SearchCache:
+    """
+    Thread-safe LRU cache of search results with time to live.
+
+    The index clears the cache on each update. A search which started before an update does not put its (stale)
+    results to the cache: `put` takes the cache generation read before the search.
+
+    Attributes:
+        _maxSize (int): max count of cached queries
+        _ttl (Optional[float]): time to live of results in seconds, None - results do not expire
+        _entries (OrderedDict[Hashable, Tuple[float, List[IndexResult]]]): results and their expiration times in LRU
+            order (the most recently used are last)
+        _generation (int): count of cache clears
+        _hits (int): count of cache hits
+        _misses (int): count of cache misses
+        _lock (threading.Lock): lock of entries and counters
+    """
+
+    __slots__ = ("_maxSize", "_ttl", "_entries", "_generation", "_hits", "_misses", "_lock")
+
+    def __init__(self, maxSize: int = 1024, ttl: Optional[float] = None):
+        """
+        Init.
+
+        Args:
+            maxSize: max count of cached queries
+            ttl: time to live of results in seconds, None - results do not expire
+        Raises:
+            ValueError: if max size or ttl is not positive
+        """
+        if maxSize < 1:
+            raise ValueError(f"Max size must be positive, got {maxSize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"TTL must be positive, got {ttl}")
+        self._maxSize = maxSize
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[IndexResult]]]" = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def maxSize(self) -> int:
+        """Get max count of cached queries"""
+        return self._maxSize
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """Get time to live of results in seconds"""
+        return self._ttl
+
+    @property
+    def generation(self) -> int:
+        """Get count of cache clears"""
+        return self._generation
+
+    @property
+    def hits(self) -> int:
+        """Get count of cache hits"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Get count of cache misses"""
+        return self._misses
+
+    def __len__(self) -> int:
+        """Get count of cached queries (including expired ones)"""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[List[IndexResult]]:
+        """
+        Get cached results and count the hit or miss.
+
+        Args:
+            key: cache key
+        Returns:
+            copy of cached results or None if results are not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry[1])
+
+    def put(self, key: Hashable, results: List[IndexResult], generation: int) -> None:
+        """
+        Cache results, evict the least recently used results if the cache is full.
+
+        Args:
+            key: cache key
+            results: search results
+            generation: cache generation read before the search, results are dropped if the cache was cleared since
+        """
+        expiration = time.monotonic() + self._ttl if self._ttl is not None else float("inf")
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = expiration, list(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxSize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop all cached results.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def asDict(self) -> Dict[str, Union[int, float, None]]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict with size, max size, ttl, hits and misses
+        """
+        return {
+            "size": len(self),
+            "max_size": self._maxSize,
+            "ttl": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
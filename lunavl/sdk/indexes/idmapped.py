@@ -0,0 +1,614 @@
+"""
+Module contains index with external ids of descriptors.
+
+Ids are kept in numpy arrays: an int64 array of ids aligned with storage positions, a bitmap of removed positions and
+an open addressing hash table from ids to positions, so memory is `nbytes` and does not depend on python objects.
+The mapping is saved next to the index snapshot (`<snapshot>.ids.npz`) with the stamp of the snapshot.
+
+Ids are not logged to a write-ahead log (see `lunavl.sdk.indexes.wal`), so an index with a log cannot be wrapped:
+ids of descriptors replayed from the log after a crash would be unknown.
+"""
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
+
+from .base import IndexResult
+from .builder import IndexBuilder
+from .stored_index import DenseIndex, DynamicIndex, IndexType
+from .wal import getSnapshotStamp, getWalPath
+
+#: multiplier of fibonacci hashing
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_UINT64_MASK = (1 << 64) - 1
+#: hash table slot states
+_EMPTY, _USED, _DELETED = 0, 1, 2
+
+
+def getIdsPath(indexPath: Union[str, Path]) -> Path:
+    """
+    Get path of the ids mapping of an index snapshot.
+
+    Args:
+        indexPath: index snapshot path
+    Returns:
+        mapping path next to the snapshot
+    """
+    indexPath = Path(indexPath)
+    return indexPath.with_name(f"{indexPath.name}.ids.npz")
+
+
+class _IdTable:
+    """
+    Open addressing (linear probing) hash table from int64 ids to int64 positions.
+
+    Attributes:
+        _keys (np.ndarray): ids of slots
+        _values (np.ndarray): positions of slots
+        _states (np.ndarray): slot states (empty, used, deleted)
+        _bits (int): log2 of table size
+        _count (int): count of used slots
+        _deleted (int): count of deleted slots
+    """
+
+    __slots__ = ("_keys", "_values", "_states", "_bits", "_count", "_deleted")
+
+    def __init__(self, capacity: int = 0):
+        """
+        Init.
+
+        Args:
+            capacity: expected count of ids
+        """
+        self._allocate(max(int(capacity * 2 - 1).bit_length(), 4))
+
+    def _allocate(self, bits: int) -> None:
+        """
+        Allocate empty slots.
+
+        Args:
+            bits: log2 of table size
+        """
+        self._bits = bits
+        self._keys = np.zeros(1 << bits, dtype=np.int64)
+        self._values = np.zeros(1 << bits, dtype=np.int64)
+        self._states = np.zeros(1 << bits, dtype=np.uint8)
+        self._count = 0
+        self._deleted = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Get memory of the table in bytes"""
+        return self._keys.nbytes + self._values.nbytes + self._states.nbytes
+
+    def __len__(self) -> int:
+        """
+        Get count of ids.
+
+        Returns:
+            count of ids
+        """
+        return self._count
+
+    def _slot(self, key: int) -> int:
+        """
+        Find slot of a key or an empty slot for it.
+
+        Args:
+            key: id
+        Returns:
+            slot number
+        """
+        mask = (1 << self._bits) - 1
+        slot = ((key * _HASH_MULTIPLIER) & _UINT64_MASK) >> (64 - self._bits)
+        firstDeleted = -1
+        while True:
+            state = self._states[slot]
+            if state == _EMPTY:
+                return slot if firstDeleted < 0 else firstDeleted
+            if state == _USED and self._keys[slot] == key:
+                return slot
+            if state == _DELETED and firstDeleted < 0:
+                firstDeleted = slot
+            slot = (slot + 1) & mask
+
+    def get(self, key: int) -> Optional[int]:
+        """
+        Get position of an id.
+
+        Args:
+            key: id
+        Returns:
+            position or None if the id is absent
+        """
+        slot = self._slot(key)
+        if self._states[slot] == _USED and self._keys[slot] == key:
+            return int(self._values[slot])
+        return None
+
+    def set(self, key: int, value: int) -> None:
+        """
+        Set position of an id.
+
+        Args:
+            key: id
+            value: position
+        """
+        if (self._count + self._deleted + 1) * 2 > len(self._states):
+            self._rehash()
+        slot = self._slot(key)
+        if self._states[slot] != _USED:
+            if self._states[slot] == _DELETED:
+                self._deleted -= 1
+            self._count += 1
+        self._keys[slot] = key
+        self._values[slot] = value
+        self._states[slot] = _USED
+
+    def pop(self, key: int) -> Optional[int]:
+        """
+        Remove an id.
+
+        Args:
+            key: id
+        Returns:
+            position of removed id or None if the id is absent
+        """
+        slot = self._slot(key)
+        if self._states[slot] != _USED or self._keys[slot] != key:
+            return None
+        self._states[slot] = _DELETED
+        self._count -= 1
+        self._deleted += 1
+        return int(self._values[slot])
+
+    def _rehash(self) -> None:
+        """
+        Grow the table (or drop deleted slots) and reinsert used slots.
+        """
+        used = self._states == _USED
+        keys, values = self._keys[used], self._values[used]
+        bits = self._bits + 1 if self._count * 4 >= len(self._states) else self._bits
+        self._allocate(bits)
+        for key, value in zip(keys.tolist(), values.tolist()):
+            self.set(key, value)
+
+
+class IdIndexResult(IndexResult):
+    """
+    Search result of an index with external ids.
+
+    Attributes:
+        _id (int): external id of the descriptor
+    """
+
+    __slots__ = ("_id",)
+
+    def __init__(self, indexResult: IndexResult, descriptorId: int):
+        """
+        Init.
+
+        Args:
+            indexResult: index search result
+            descriptorId: external id of the descriptor
+        """
+        super().__init__(indexResult.coreEstimation)
+        self._id = descriptorId
+
+    @property
+    def id(self) -> int:
+        """
+        Get external id of the descriptor
+        Returns:
+            int value
+        """
+        return self._id
+
+    def asDict(self) -> Dict[str, Union[float, int]]:
+        """
+        Convert index search result to dict
+        Returns:
+            dict of index results
+        """
+        return {"distance": self.distance, "similarity": self.similarity, "index": self.index, "id": self.id}
+
+
+class IdMappedIndex:
+    """
+    Index wrapper which maps storage positions to external int64 ids.
+
+    Attributes:
+        _index (Union[DynamicIndex, DenseIndex]): index
+        _ids (np.ndarray): ids of storage positions, the array has spare capacity, first `_size` items are valid
+        _tombstones (np.ndarray): bitmap of removed positions (bit `i % 8` of byte `i // 8`)
+        _size (int): count of positions
+        _table (_IdTable): ids of live descriptors to positions
+    """
+
+    __slots__ = ("_index", "_ids", "_tombstones", "_size", "_table")
+
+    def __init__(
+        self,
+        index: Union[DynamicIndex, DenseIndex],
+        ids: Optional[Iterable[int]] = None,
+        tombstones: Optional[np.ndarray] = None,
+    ):
+        """
+        Init.
+
+        Args:
+            index: index
+            ids: ids of all storage positions of the index, positions are used by default
+            tombstones: bitmap of removed positions, no removed positions by default
+        Raises:
+            ValueError: if count of ids is not equal to index storage size, ids of live descriptors are not unique or
+                the index has a write-ahead log
+        """
+        if isinstance(index, DynamicIndex) and index.wal is not None:
+            raise ValueError("Index with write-ahead log cannot be wrapped, ids are not logged")
+        size = index.bufSize
+        idsArray = np.arange(size, dtype=np.int64) if ids is None else np.fromiter(ids, dtype=np.int64)
+        if len(idsArray) != size:
+            raise ValueError(f"Expected {size} ids, got {len(idsArray)}")
+        self._index = index
+        self._size = size
+        self._ids = idsArray
+        self._tombstones = np.zeros((size + 7) // 8, dtype=np.uint8)
+        if tombstones is not None:
+            self._tombstones[: len(tombstones)] = tombstones[: len(self._tombstones)]
+        self._table = _IdTable(size)
+        for position, descriptorId in enumerate(idsArray.tolist()):
+            if self._isRemoved(position):
+                continue
+            if self._table.get(descriptorId) is not None:
+                raise ValueError(f"Id {descriptorId} is not unique")
+            self._table.set(descriptorId, position)
+
+    @property
+    def index(self) -> Union[DynamicIndex, DenseIndex]:
+        """Get underlying index"""
+        return self._index
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Get ids of storage positions (read only view)"""
+        view = self._ids[: self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def tombstones(self) -> np.ndarray:
+        """Get bitmap of removed positions (read only view)"""
+        view = self._tombstones[: (self._size + 7) // 8]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        """Get memory of the mapping in bytes"""
+        return self._ids.nbytes + self._tombstones.nbytes + self._table.nbytes
+
+    def __len__(self) -> int:
+        """
+        Get count of live ids.
+
+        Returns:
+            count of live ids
+        """
+        return len(self._table)
+
+    def __contains__(self, descriptorId: int) -> bool:
+        """
+        Check the id is in the index.
+
+        Args:
+            descriptorId: id
+        Returns:
+            True if the descriptor with the id is in the index and is not removed
+        """
+        return self._table.get(descriptorId) is not None
+
+    def _isRemoved(self, position: int) -> bool:
+        """
+        Check a position is removed.
+
+        Args:
+            position: storage position
+        Returns:
+            True if the position is removed
+        """
+        return bool(self._tombstones[position >> 3] & (1 << (position & 7)))
+
+    def getPosition(self, descriptorId: int) -> int:
+        """
+        Get storage position of an id.
+
+        Args:
+            descriptorId: id
+        Returns:
+            storage position
+        Raises:
+            KeyError: if the id is not found
+        """
+        position = self._table.get(descriptorId)
+        if position is None:
+            raise KeyError(descriptorId)
+        return position
+
+    def getId(self, position: int) -> int:
+        """
+        Get id of a storage position.
+
+        Args:
+            position: storage position
+        Returns:
+            id
+        Raises:
+            IndexError: if position is out of range or removed
+        """
+        if not 0 <= position < self._size or self._isRemoved(position):
+            raise IndexError(f"Position '{position}' out of range or removed")
+        return int(self._ids[position])
+
+    def __getitem__(self, descriptorId: int) -> FaceDescriptor:
+        """
+        Get descriptor by id.
+
+        Args:
+            descriptorId: id
+        Returns:
+            descriptor
+        Raises:
+            KeyError: if the id is not found
+        """
+        return self._index[self.getPosition(descriptorId)]
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grow ids and bitmap arrays (amortized doubling).
+
+        Args:
+            count: required count of positions
+        """
+        if count > len(self._ids):
+            ids = np.zeros(max(count, len(self._ids) * 2, 16), dtype=np.int64)
+            ids[: self._size] = self._ids[: self._size]
+            self._ids = ids
+        bitmapSize = (len(self._ids) + 7) // 8
+        if bitmapSize > len(self._tombstones):
+            tombstones = np.zeros(bitmapSize, dtype=np.uint8)
+            tombstones[: len(self._tombstones)] = self._tombstones
+            self._tombstones = tombstones
+
+    def _checkNewIds(self, ids: Sequence[int]) -> None:
+        """
+        Check ids are not in the index and are unique.
+
+        Args:
+            ids: new ids
+        Raises:
+            ValueError: if an id is already in the index or ids are not unique
+        """
+        if len(set(ids)) != len(ids):
+            raise ValueError("Ids are not unique")
+        for descriptorId in ids:
+            if descriptorId in self:
+                raise ValueError(f"Id {descriptorId} is already in the index")
+
+    def _addIds(self, ids: Sequence[int]) -> None:
+        """
+        Add ids of appended descriptors.
+
+        Args:
+            ids: ids
+        """
+        start, stop = self._size, self._size + len(ids)
+        self._reserve(stop)
+        self._ids[start:stop] = ids
+        for descriptorId in ids:
+            self._table.set(descriptorId, self._size)
+            self._size += 1
+
+    def _getDynamicIndex(self) -> DynamicIndex:
+        """
+        Get underlying index for an update.
+
+        Returns:
+            dynamic index
+        Raises:
+            TypeError: if underlying index is dense
+            ValueError: if a write-ahead log is attached to underlying index
+        """
+        if not isinstance(self._index, DynamicIndex):
+            raise TypeError("Dense index cannot be updated")
+        if self._index.wal is not None:
+            raise ValueError("Index with write-ahead log cannot be updated, ids are not logged")
+        return self._index
+
+    def append(self, descriptor: FaceDescriptor, descriptorId: int) -> None:
+        """
+        Appends descriptor with an id.
+
+        Args:
+            descriptor: descriptor with correct length, version and data
+            descriptorId: id
+        Raises:
+            TypeError: if underlying index is dense
+            ValueError: if the id is already in the index
+            LunaSDKException: if an error occurs while adding the descriptor
+        """
+        self._checkNewIds([descriptorId])
+        self._getDynamicIndex().append(descriptor)
+        self._addIds([descriptorId])
+
+    def appendBatch(self, descriptorsBatch: FaceDescriptorBatch, ids: Sequence[int]) -> None:
+        """
+        Appends batch of descriptors with ids.
+
+        Args:
+            descriptorsBatch: batch of descriptors with correct length, version and data
+            ids: ids of descriptors
+        Raises:
+            TypeError: if underlying index is dense
+            ValueError: if count of ids is not equal to count of descriptors, ids are not unique or already in index
+            LunaSDKException: if an error occurs while adding the batch of descriptors
+        """
+        ids = [int(descriptorId) for descriptorId in ids]
+        if len(ids) != len(descriptorsBatch):
+            raise ValueError(f"Expected {len(descriptorsBatch)} ids, got {len(ids)}")
+        self._checkNewIds(ids)
+        self._getDynamicIndex().appendBatch(descriptorsBatch)
+        self._addIds(ids)
+
+    def removeById(self, descriptorId: int) -> None:
+        """
+        Remove descriptor by id.
+
+        Args:
+            descriptorId: id
+        Raises:
+            TypeError: if underlying index is dense
+            KeyError: if the id is not found
+            LunaSDKException: if an error occurs while remove descriptor failed
+        """
+        position = self.getPosition(descriptorId)
+        del self._getDynamicIndex()[position]
+        self._table.pop(descriptorId)
+        self._tombstones[position >> 3] |= np.uint8(1 << (position & 7))
+
+    def _toIdResults(self, results: List[IndexResult]) -> List[IdIndexResult]:
+        """
+        Convert index results to results with ids, removed positions are skipped.
+
+        Args:
+            results: index results
+        Returns:
+            results with ids
+        """
+        return [
+            IdIndexResult(result, int(self._ids[result.index]))
+            for result in results
+            if result.index < self._size and not self._isRemoved(result.index)
+        ]
+
+    def search(self, descriptor: FaceDescriptor, maxCount: int = 1) -> List[IdIndexResult]:
+        """
+        Search for descriptors with the shorter distance to passed descriptor.
+
+        Args:
+            descriptor: descriptor to match against index
+            maxCount: max count of results (default is 1)
+        Returns:
+            list with search results with ids
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        return self._toIdResults(self._index.search(descriptor, maxCount))
+
+    def searchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int = 1,
+        similarityThreshold: Optional[float] = None,
+    ) -> List[List[IdIndexResult]]:
+        """
+        Search for descriptors with the shorter distance to each of passed descriptors.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor (default is 1)
+            similarityThreshold: min similarity of results
+        Returns:
+            list with search results with ids for each descriptor
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        return [
+            self._toIdResults(results)
+            for results in self._index.searchBatch(descriptors, maxCount, similarityThreshold)
+        ]
+
+    def compact(self, snapshotPath: Optional[str] = None) -> None:
+        """
+        Compact underlying dynamic index (see `DynamicIndex.compact`) and remap ids to new positions.
+
+        Args:
+            snapshotPath: snapshot path, required if the index has a write-ahead log
+        Raises:
+            TypeError: if underlying index is dense
+            ValueError: if the index cannot be compacted
+            LunaSDKException: if an error occurs while compacting the index
+        """
+        mapping = self._getDynamicIndex().compact(snapshotPath)
+        oldPositions = np.fromiter(mapping.keys(), dtype=np.int64, count=len(mapping))
+        newPositions = np.fromiter(mapping.values(), dtype=np.int64, count=len(mapping))
+        ids = np.zeros(len(mapping), dtype=np.int64)
+        ids[newPositions] = self._ids[oldPositions]
+        self._ids = ids
+        self._size = len(ids)
+        self._tombstones = np.zeros((self._size + 7) // 8, dtype=np.uint8)
+        self._table = _IdTable(self._size)
+        for position, descriptorId in enumerate(ids.tolist()):
+            self._table.set(descriptorId, position)
+
+    def save(self, path: str, indexType: IndexType = IndexType.dynamic) -> None:
+        """
+        Save index and ids mapping (`getIdsPath(path)`).
+
+        Both files are written to temporary files and then replace the old ones, the mapping keeps the stamp of its
+        snapshot, so a crash while saving never leaves a snapshot with a mapping of another snapshot unnoticed.
+
+        Args:
+            path: path to file to be created
+            indexType: index type ('dynamic' or 'dense')
+        Raises:
+            TypeError: if underlying index is dense
+            ValueError: if path is a directory, index type is incorrect or the index has a write-ahead log
+            PermissionError: if write access is denied
+            LunaSDKException: if an error occurs while saving the index
+        """
+        index = self._getDynamicIndex()
+        if Path(path).is_dir():
+            raise ValueError(f"{path} must not be a directory")
+        temporaryPath = Path(path).with_name(f".{Path(path).name}.tmp")
+        temporaryIdsPath = getIdsPath(temporaryPath)
+        index.save(str(temporaryPath), indexType)
+        stamp = np.frombuffer(getSnapshotStamp(temporaryPath), dtype=np.uint8)
+        with temporaryIdsPath.open("wb") as file:
+            np.savez(file, ids=self.ids, tombstones=self.tombstones, snapshot=stamp)
+        os.replace(temporaryPath, path)
+        os.replace(temporaryIdsPath, getIdsPath(path))
+
+    @classmethod
+    def load(cls, indexBuilder: IndexBuilder, path: str, indexType: IndexType) -> "IdMappedIndex":
+        """
+        Load index and its ids mapping.
+
+        Args:
+            indexBuilder: index builder (see `IndexBuilder.loadIndex`)
+            path: path to saved index
+            indexType: index type ('dynamic' or 'dense')
+        Returns:
+            index with ids
+        Raises:
+            FileNotFoundError: if the index file or the mapping file is not found
+            ValueError: if the mapping does not match the index or the index has a write-ahead log
+            LunaSDKException: if an error occurs while loading the index
+        """
+        idsPath = getIdsPath(path)
+        if not idsPath.exists():
+            raise FileNotFoundError(f"No such file or directory: {idsPath}")
+        if getWalPath(path).exists():
+            raise ValueError(f"Index has a write-ahead log {getWalPath(path)}, ids of its updates are unknown")
+        with np.load(idsPath) as mapping:
+            ids, tombstones = mapping["ids"], mapping["tombstones"]
+            stamp = mapping["snapshot"].tobytes() if "snapshot" in mapping else None
+        if stamp is not None and stamp != getSnapshotStamp(path):
+            raise ValueError(f"Ids mapping {idsPath} does not belong to the index snapshot")
+        index = indexBuilder.loadIndex(path, indexType, replayWal=False)
+        if len(ids) != index.bufSize:
+            raise ValueError(f"Ids mapping has {len(ids)} ids, index has {index.bufSize} descriptors")
+        return cls(index, ids, tombstones)
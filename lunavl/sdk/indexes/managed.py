@@ -0,0 +1,399 @@
+"""
+Module contains managed index: a dynamic index which is rebuilt in background and swapped atomically.
+"""
+import bisect
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
+
+from .base import IndexResult
+from .builder import IndexBuilder
+from .stored_index import DynamicIndex
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None  # type: ignore
+
+#: pending operations
+_APPEND = "append"
+_APPEND_BATCH = "appendBatch"
+_REMOVE = "remove"
+
+PendingOperation = Tuple[str, Union[FaceDescriptor, FaceDescriptorBatch, int]]
+
+
+def _getPeakMemory() -> Optional[int]:
+    """
+    Get peak resident set size of the process.
+
+    Returns:
+        peak memory in bytes or None if it is not available on the platform
+    """
+    if resource is None:
+        return None
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macos reports bytes
+    return maxRss if sys.platform == "darwin" else maxRss * 1024
+
+
+def _applyOperation(index: Union[IndexBuilder, DynamicIndex], operation: PendingOperation) -> None:
+    """
+    Apply an index update operation.
+
+    Args:
+        index: index builder or dynamic index
+        operation: operation name and argument
+    Raises:
+        LunaSDKException: if an error occurs while updating the index
+    """
+    name, argument = operation
+    if name == _APPEND:
+        index.append(argument)  # type: ignore
+    elif name == _APPEND_BATCH:
+        index.appendBatch(argument)  # type: ignore
+    else:
+        del index[argument]  # type: ignore
+
+
+def _translatePosition(removed: List[int], position: int) -> Optional[int]:
+    """
+    Translate a descriptor position of an index to the position after removed descriptors are dropped from storage.
+
+    Args:
+        removed: sorted positions of removed descriptors
+        position: descriptor position
+    Returns:
+        translated position or None if the descriptor is removed
+    """
+    shift = bisect.bisect_left(removed, position)
+    if shift < len(removed) and removed[shift] == position:
+        return None
+    return position - shift
+
+
+class ManagedIndex:
+    """
+    Managed dynamic index.
+
+    Search is served by the current index while a background thread builds a replacement from the builder. The
+    builder receives updates made since the previous rebuild. Updates made during the build are replayed on the
+    replacement under the lock, and then the replacement is swapped in. Readers which already hold the old index
+    finish their search on it.
+
+    Removal keeps positions of the other descriptors of current index, but the builder drops removed descriptors
+    from its storage, so positions change on swap: a descriptor at position `i` of the previous index is at position
+    `remapPosition(i)` of the new one. Updates made during the build are translated to new positions on swap.
+
+    Attributes:
+        _builder (IndexBuilder): index builder, the source of rebuilt indexes
+        _index (DynamicIndex): current index
+        _lock (threading.Lock): lock of updates and swap
+        _pending (List[PendingOperation]): updates which are not applied to the builder yet
+        _builderRemoved (List[int]): sorted positions (of current index) of descriptors removed from the builder
+        _lastRemoved (List[int]): sorted positions (of the previous index) of descriptors dropped by the last swap
+        _rebuildThread (Optional[threading.Thread]): running rebuild thread
+        _rebuildError (Optional[Exception]): error of the last background rebuild
+        _rebuildCount (int): count of successful rebuilds
+        _failedRebuildCount (int): count of failed rebuilds
+        _lastBuildTime (Optional[float]): duration of the last index build in seconds
+        _lastSwapTime (Optional[float]): duration of the last swap (replay of updates and swap) in seconds
+        _maxSwapTime (Optional[float]): max swap duration in seconds
+        _memoryHighWater (Optional[int]): peak process memory after rebuilds in bytes
+    """
+
+    __slots__ = (
+        "_builder",
+        "_index",
+        "_lock",
+        "_pending",
+        "_builderRemoved",
+        "_lastRemoved",
+        "_rebuildThread",
+        "_rebuildError",
+        "_rebuildCount",
+        "_failedRebuildCount",
+        "_lastBuildTime",
+        "_lastSwapTime",
+        "_maxSwapTime",
+        "_memoryHighWater",
+    )
+
+    def __init__(self, builder: IndexBuilder, index: Optional[DynamicIndex] = None):
+        """
+        Init.
+
+        Args:
+            builder: index builder with all descriptors of the index
+            index: index built from the builder, it is built if not passed
+        Raises:
+            LunaSDKException: if an error occurs while building the index
+        """
+        self._builder = builder
+        self._index = builder.buildIndex() if index is None else index
+        self._lock = threading.Lock()
+        self._pending: List[PendingOperation] = []
+        self._builderRemoved: List[int] = []
+        self._lastRemoved: List[int] = []
+        self._rebuildThread: Optional[threading.Thread] = None
+        self._rebuildError: Optional[Exception] = None
+        self._rebuildCount = 0
+        self._failedRebuildCount = 0
+        self._lastBuildTime: Optional[float] = None
+        self._lastSwapTime: Optional[float] = None
+        self._maxSwapTime: Optional[float] = None
+        self._memoryHighWater = _getPeakMemory()
+
+    @property
+    def index(self) -> DynamicIndex:
+        """Get current index"""
+        return self._index
+
+    @property
+    def builder(self) -> IndexBuilder:
+        """Get index builder"""
+        return self._builder
+
+    @property
+    def bufSize(self) -> int:
+        """Get storage size of current index"""
+        return self._index.bufSize
+
+    @property
+    def descriptorsCount(self) -> int:
+        """Get actual count of descriptor in current index"""
+        return self._index.descriptorsCount
+
+    @property
+    def pendingCount(self) -> int:
+        """Get count of updates which are not applied to the builder yet"""
+        return len(self._pending)
+
+    @property
+    def isRebuilding(self) -> bool:
+        """Whether a background rebuild is running"""
+        thread = self._rebuildThread
+        return thread is not None and thread.is_alive()
+
+    def asDict(self) -> Dict[str, Optional[Union[int, float, bool]]]:
+        """
+        Get managed index metrics as dict.
+
+        Returns:
+            dict with rebuild counters, build and swap times (seconds) and memory high-water (bytes)
+        """
+        return {
+            "rebuilding": self.isRebuilding,
+            "pending": len(self._pending),
+            "rebuilds": self._rebuildCount,
+            "failed_rebuilds": self._failedRebuildCount,
+            "last_build_time": self._lastBuildTime,
+            "last_swap_time": self._lastSwapTime,
+            "max_swap_time": self._maxSwapTime,
+            "memory_high_water": self._memoryHighWater,
+        }
+
+    def search(self, descriptor: FaceDescriptor, maxCount: int = 1) -> List[IndexResult]:
+        """
+        Search for descriptors with the shorter distance to passed descriptor in current index.
+
+        Args:
+            descriptor: descriptor to match against index
+            maxCount: max count of results (default is 1)
+        Returns:
+            list with index search results
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        return self._index.search(descriptor, maxCount)
+
+    def searchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int = 1,
+        similarityThreshold: Optional[float] = None,
+    ) -> List[List[IndexResult]]:
+        """
+        Search for descriptors with the shorter distance to each of passed descriptors in current index.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor (default is 1)
+            similarityThreshold: min similarity of results
+        Returns:
+            list with index search results for each descriptor
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        return self._index.searchBatch(descriptors, maxCount, similarityThreshold)
+
+    def _update(self, operation: PendingOperation) -> None:
+        """
+        Apply an update to current index and remember it for the builder.
+
+        Args:
+            operation: update operation
+        Raises:
+            LunaSDKException: if an error occurs while updating the index
+        """
+        with self._lock:
+            _applyOperation(self._index, operation)
+            self._pending.append(operation)
+
+    def append(self, descriptor: FaceDescriptor) -> None:
+        """
+        Appends descriptor to current index.
+
+        Args:
+            descriptor: descriptor with correct length, version and data
+        Raises:
+            LunaSDKException: if an error occurs while adding the descriptor
+        """
+        self._update((_APPEND, descriptor))
+
+    def appendBatch(self, descriptorsBatch: FaceDescriptorBatch) -> None:
+        """
+        Appends batch of descriptors to current index.
+
+        Args:
+            descriptorsBatch: batch of descriptors with correct length, version and data
+        Raises:
+            LunaSDKException: if an error occurs while adding the batch of descriptors
+        """
+        self._update((_APPEND_BATCH, descriptorsBatch))
+
+    def remove(self, i: int) -> None:
+        """
+        Remove descriptor at index `i` (0-based) from current index.
+
+        Args:
+            i: identification of descriptors position in internal storage
+        Raises:
+            IndexError: if index out of range
+            LunaSDKException: if an error occurs while remove descriptor failed
+        """
+        self._update((_REMOVE, i))
+
+    def remapPosition(self, position: int) -> Optional[int]:
+        """
+        Translate a descriptor position of the index before the last swap to the position in current index.
+
+        Args:
+            position: descriptor position in the previous index
+        Returns:
+            descriptor position in current index or None if the descriptor was removed
+        """
+        return _translatePosition(self._lastRemoved, position)
+
+    def _rebuild(self) -> None:
+        """
+        Apply pending updates to the builder, build a new index and swap it with current one.
+
+        Appends are applied in order, then removed descriptors are dropped from the builder in descending order of
+        positions, so positions of the rest removals are not shifted.
+
+        Raises:
+            LunaSDKException: if an error occurs while updating the builder or building the index
+        """
+        with self._lock:
+            operations, self._pending = self._pending, []
+        appends = [operation for operation in operations if operation[0] != _REMOVE]
+        removes = [operation for operation in operations if operation[0] == _REMOVE]
+        newRemoved = {position for _, position in removes}.difference(self._builderRemoved)
+        applied = 0
+        try:
+            for operation in appends:
+                _applyOperation(self._builder, operation)
+                applied += 1
+            for position in sorted(newRemoved, reverse=True):
+                del self._builder[_translatePosition(self._builderRemoved, position)]  # type: ignore
+                bisect.insort(self._builderRemoved, position)
+            buildStart = time.perf_counter()
+            newIndex = self._builder.buildIndex()
+            self._lastBuildTime = time.perf_counter() - buildStart
+        except Exception:
+            with self._lock:
+                # removals which are already applied to the builder are skipped on the next rebuild
+                self._pending = appends[applied:] + removes + self._pending
+            raise
+
+        with self._lock:
+            swapStart = time.perf_counter()
+            removed = self._builderRemoved
+            # updates made during the build are in current index but not in the builder yet
+            pending: List[PendingOperation] = []
+            for name, argument in self._pending:
+                if name == _REMOVE:
+                    argument = _translatePosition(removed, argument)  # type: ignore
+                    if argument is None:
+                        continue
+                pending.append((name, argument))
+            for operation in pending:
+                _applyOperation(newIndex, operation)
+            self._pending = pending
+            self._index = newIndex
+            self._builderRemoved, self._lastRemoved = [], removed
+            self._lastSwapTime = time.perf_counter() - swapStart
+        self._maxSwapTime = max(self._maxSwapTime or 0.0, self._lastSwapTime)
+        self._memoryHighWater = _getPeakMemory()
+        self._rebuildCount += 1
+
+    def _runRebuild(self) -> None:
+        """
+        Background rebuild thread target, the error is saved for `waitRebuild`.
+        """
+        try:
+            self._rebuild()
+        except Exception as exc:  # pylint: disable=W0703
+            self._failedRebuildCount += 1
+            self._rebuildError = exc
+
+    def startRebuild(self) -> bool:
+        """
+        Start a background rebuild.
+
+        Returns:
+            False if a rebuild is already running, True otherwise
+        """
+        with self._lock:
+            if self.isRebuilding:
+                return False
+            self._rebuildError = None
+            self._rebuildThread = threading.Thread(target=self._runRebuild, name="lunavl-index-rebuild", daemon=True)
+            self._rebuildThread.start()
+        return True
+
+    def waitRebuild(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background rebuild.
+
+        Args:
+            timeout: max waiting time in seconds, None - wait until the rebuild finishes
+        Returns:
+            True if the rebuild is finished (or was not started), False on timeout
+        Raises:
+            LunaSDKException: if the rebuild failed
+        """
+        thread = self._rebuildThread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                return False
+        if self._rebuildError is not None:
+            error, self._rebuildError = self._rebuildError, None
+            raise error
+        return True
+
+    def rebuild(self) -> None:
+        """
+        Rebuild and swap the index, wait for the finish. Search is not blocked during the rebuild.
+
+        Raises:
+            LunaSDKException: if an error occurs while building the index
+        """
+        self.waitRebuild()
+        self.startRebuild()
+        self.waitRebuild()
@@ -0,0 +1,406 @@
+"""
+Module contains sharded index: a set of dynamic or dense indexes searched as one index.
+
+Manifest of a saved sharded index is a json file:
+
+    {"formatVersion": 1, "generation": 2, "descriptorVersion": 59, "indexType": "dynamic",
+     "shards": [{"path": "shard_0.2.dynamic.index", "bufSize": 1000}, ...]}
+
+Shard paths are relative to the manifest directory. Each save writes shard files of a new generation and replaces the
+manifest atomically, so the manifest always refers to complete shard files of one save.
+"""
+import heapq
+import json
+import os
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
+
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
+
+from .base import IndexResult
+from .builder import IndexBuilder
+from .stored_index import DenseIndex, DynamicIndex, IndexType, _getSearchExecutor
+
+if TYPE_CHECKING:
+    from lunavl.sdk.faceengine.engine import VLFaceEngine
+
+#: current manifest format version
+MANIFEST_FORMAT_VERSION = 1
+#: default manifest file name
+MANIFEST_NAME = "manifest.json"
+
+Shard = Union[DynamicIndex, DenseIndex]
+
+
+def _readManifest(directory: Path) -> Dict[str, Any]:
+    """
+    Read manifest of a sharded index.
+
+    Args:
+        directory: manifest directory
+    Returns:
+        manifest
+    Raises:
+        FileNotFoundError: if the manifest is not found
+        ValueError: if the manifest has unsupported format version
+    """
+    manifestPath = directory / MANIFEST_NAME
+    if not manifestPath.exists():
+        raise FileNotFoundError(f"No such file or directory: {manifestPath}")
+    manifest = json.loads(manifestPath.read_text())
+    if manifest.get("formatVersion") != MANIFEST_FORMAT_VERSION:
+        raise ValueError(f"Unsupported sharded index manifest format version: {manifest.get('formatVersion')}")
+    return manifest
+
+
+def _distance(result: IndexResult) -> float:
+    """
+    Get distance of search result (sort key).
+
+    Args:
+        result: search result
+    Returns:
+        distance
+    """
+    return result.distance
+
+
+class ShardedIndexResult(IndexResult):
+    """
+    Sharded index search result.
+
+    Attributes:
+        _shard (int): number of the shard which contains the descriptor
+    """
+
+    __slots__ = ("_shard",)
+
+    def __init__(self, indexResult: IndexResult, shard: int):
+        """
+        Init.
+
+        Args:
+            indexResult: search result of a shard
+            shard: shard number
+        """
+        super().__init__(indexResult.coreEstimation)
+        self._shard = shard
+
+    @property
+    def shard(self) -> int:
+        """
+        Get number of the shard which contains the descriptor
+        Returns:
+            int value
+        """
+        return self._shard
+
+    def asDict(self) -> Dict[str, Union[float, int]]:
+        """
+        Convert index search result to dict
+        Returns:
+            dict of index results
+        """
+        return {"distance": self.distance, "similarity": self.similarity, "index": self.index, "shard": self.shard}
+
+
+class ShardedIndex:
+    """
+    Sharded index. Descriptors are partitioned across several shard indexes, each shard is built by its own builder
+    and can be rebuilt independently. Search runs on all shards concurrently and merges top results by distance.
+
+    Attributes:
+        _shards (List[Union[DynamicIndex, DenseIndex]]): shard indexes
+        _executor (Optional[Executor]): executor for concurrent shard operations, None - shared search thread pool
+    """
+
+    __slots__ = ("_shards", "_executor")
+
+    def __init__(self, shards: Sequence[Shard], executor: Optional[Executor] = None):
+        """
+        Init.
+
+        Args:
+            shards: shard indexes with the same descriptor version
+            executor: executor for concurrent shard operations, shared thread pool by default
+        Raises:
+            ValueError: if shards list is empty or shards have different descriptor versions
+        """
+        if not shards:
+            raise ValueError("Sharded index must contain at least one shard")
+        versions = {shard.descriptorVersion for shard in shards}
+        if len(versions) > 1:
+            raise ValueError(f"Shards have different descriptor versions: {sorted(versions)}")
+        self._shards = list(shards)
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        """Get executor for concurrent shard operations"""
+        return self._executor or _getSearchExecutor()
+
+    @property
+    def shards(self) -> List[Shard]:
+        """Get shard indexes"""
+        return list(self._shards)
+
+    @property
+    def shardCount(self) -> int:
+        """Get count of shards"""
+        return len(self._shards)
+
+    @property
+    def bufSize(self) -> int:
+        """Get total storage size of shards"""
+        return sum(shard.bufSize for shard in self._shards)
+
+    @property
+    def descriptorVersion(self) -> int:
+        """Get descriptor version of shards"""
+        return self._shards[0].descriptorVersion
+
+    @classmethod
+    def fromBuilders(cls, builders: Sequence[IndexBuilder], executor: Optional[Executor] = None) -> "ShardedIndex":
+        """
+        Build shards from index builders in parallel.
+
+        Args:
+            builders: index builders, one per shard
+            executor: executor for concurrent shard operations, shared thread pool by default
+        Returns:
+            sharded index of dynamic indexes
+        Raises:
+            ValueError: if builders list is empty
+            LunaSDKException: if an error occurs while building an index
+        """
+        pool = executor or _getSearchExecutor()
+        futures = [pool.submit(builder.buildIndex) for builder in builders]
+        return cls([future.result() for future in futures], executor)
+
+    @classmethod
+    def build(
+        cls,
+        faceEngine: "VLFaceEngine",
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        shardCount: int,
+        descriptorVersion: int = 0,
+        executor: Optional[Executor] = None,
+    ) -> "ShardedIndex":
+        """
+        Partition descriptors into contiguous shards and build the shards in parallel.
+
+        Descriptor `i` of the sequence is stored in shard `i // shardSize` at index `i % shardSize`, where
+        `shardSize = ceil(len(descriptors) / shardCount)`. Shards are not empty, so the count of built shards is
+        `ceil(len(descriptors) / shardSize)`, it is less than `shardCount` if there are not enough descriptors.
+
+        Args:
+            faceEngine: face engine
+            descriptors: descriptors
+            shardCount: max count of shards
+            descriptorVersion: descriptor version, or zero if default should be used
+            executor: executor for concurrent shard operations, shared thread pool by default
+        Returns:
+            sharded index of dynamic indexes
+        Raises:
+            ValueError: if shard count is not positive
+            LunaSDKException: if an error occurs while appending descriptors or building an index
+        """
+        if shardCount < 1:
+            raise ValueError(f"Shard count must be positive, got {shardCount}")
+        descriptors = list(descriptors)
+        shardSize = max(-(-len(descriptors) // shardCount), 1)
+        shardCount = max(-(-len(descriptors) // shardSize), 1)
+        pool = executor or _getSearchExecutor()
+
+        def buildShard(start: int) -> DynamicIndex:
+            stop = start + shardSize
+            builder = faceEngine.createIndexBuilder(descriptorVersion=descriptorVersion, capacity=shardSize)
+            builder.appendFrom(descriptors[start:stop], chunkSize=min(shardSize, 1000))
+            return builder.buildIndex()
+
+        futures = [pool.submit(buildShard, shard * shardSize) for shard in range(shardCount)]
+        return cls([future.result() for future in futures], executor)
+
+    def rebuildShard(self, shard: int, builder: IndexBuilder) -> None:
+        """
+        Replace a shard by a new index built from the builder. Other shards are untouched.
+
+        Args:
+            shard: shard number
+            builder: index builder with descriptors of the shard
+        Raises:
+            IndexError: if shard number out of range
+            ValueError: if the builder has another descriptor version
+            LunaSDKException: if an error occurs while building the index
+        """
+        if not 0 <= shard < len(self._shards):
+            raise IndexError(f"Shard '{shard}' out of range")
+        if builder.descriptorVersion != self.descriptorVersion:
+            raise ValueError(f"Expected descriptor version {self.descriptorVersion}, got {builder.descriptorVersion}")
+        self._shards[shard] = builder.buildIndex()
+
+    def __getitem__(self, item: int) -> Shard:
+        """
+        Get shard index.
+
+        Args:
+            item: shard number
+        Returns:
+            shard index
+        """
+        return self._shards[item]
+
+    def __len__(self) -> int:
+        """
+        Get count of shards.
+
+        Returns:
+            count of shards
+        """
+        return len(self._shards)
+
+    def _searchShard(
+        self, shard: int, descriptors: Sequence[FaceDescriptor], maxCount: int, similarityThreshold: Optional[float]
+    ) -> List[List[ShardedIndexResult]]:
+        """
+        Search for descriptors in one shard.
+
+        Args:
+            shard: shard number
+            descriptors: descriptors to match against the shard
+            maxCount: max count of results per descriptor
+            similarityThreshold: min similarity of results
+        Returns:
+            shard search results for each descriptor
+        """
+        results = []
+        for descriptor in descriptors:
+            shardResults = self._shards[shard].search(descriptor, maxCount)
+            results.append(
+                [
+                    ShardedIndexResult(result, shard)
+                    for result in shardResults
+                    if similarityThreshold is None or result.similarity >= similarityThreshold
+                ]
+            )
+        return results
+
+    def searchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int = 1,
+        similarityThreshold: Optional[float] = None,
+    ) -> List[List[ShardedIndexResult]]:
+        """
+        Search for descriptors with the shorter distance to each of passed descriptors over all shards.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor (default is 1)
+            similarityThreshold: min similarity of results
+        Returns:
+            list with merged search results for each descriptor, results are sorted by distance
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        descriptors = list(descriptors)
+        futures = [
+            self.executor.submit(self._searchShard, shard, descriptors, maxCount, similarityThreshold)
+            for shard in range(len(self._shards))
+        ]
+        shardResults = [future.result() for future in futures]
+        return [
+            heapq.nsmallest(maxCount, (result for results in shardResults for result in results[query]), _distance)
+            for query in range(len(descriptors))
+        ]
+
+    def search(
+        self, descriptor: FaceDescriptor, maxCount: int = 1, similarityThreshold: Optional[float] = None
+    ) -> List[ShardedIndexResult]:
+        """
+        Search for descriptors with the shorter distance to passed descriptor over all shards.
+
+        Args:
+            descriptor: descriptor to match against index
+            maxCount: max count of results (default is 1)
+            similarityThreshold: min similarity of results
+        Returns:
+            list with merged search results sorted by distance
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        return self.searchBatch([descriptor], maxCount, similarityThreshold)[0]
+
+    def save(self, path: str, indexType: IndexType = IndexType.dynamic) -> None:
+        """
+        Save shards to a directory. Shards are saved to files of a new generation, then the manifest is replaced
+        atomically and files of the previous generation are removed, so a crash while saving leaves the previous
+        manifest and its shards intact.
+
+        Args:
+            path: manifest directory, created if does not exist
+            indexType: shards index type ('dynamic' or 'dense')
+        Raises:
+            ValueError: if a shard is dense (dense index cannot be saved) or index type is incorrect
+            LunaSDKException: if an error occurs while saving a shard
+        """
+        indexType = IndexType(indexType)
+        if any(not isinstance(shard, DynamicIndex) for shard in self._shards):
+            raise ValueError("Dense shards cannot be saved")
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        try:
+            previousManifest: Optional[Dict[str, Any]] = _readManifest(directory)
+        except FileNotFoundError:
+            previousManifest = None
+        generation = previousManifest.get("generation", 0) + 1 if previousManifest else 1
+        shardPaths = [f"shard_{number}.{generation}.{indexType.value}.index" for number in range(len(self._shards))]
+        futures = [
+            self.executor.submit(shard.save, str(directory / shardPath), indexType)  # type: ignore
+            for shard, shardPath in zip(self._shards, shardPaths)
+        ]
+        for future in futures:
+            future.result()
+        manifest = {
+            "formatVersion": MANIFEST_FORMAT_VERSION,
+            "generation": generation,
+            "descriptorVersion": self.descriptorVersion,
+            "indexType": indexType.value,
+            "shards": [
+                {"path": shardPath, "bufSize": shard.bufSize} for shard, shardPath in zip(self._shards, shardPaths)
+            ],
+        }
+        temporaryPath = directory / f".{MANIFEST_NAME}.tmp"
+        temporaryPath.write_text(json.dumps(manifest, indent=2))
+        os.replace(temporaryPath, directory / MANIFEST_NAME)
+        if previousManifest:
+            for shard in previousManifest["shards"]:
+                if shard["path"] not in shardPaths:
+                    (directory / shard["path"]).unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, faceEngine: "VLFaceEngine", path: str, executor: Optional[Executor] = None) -> "ShardedIndex":
+        """
+        Load shards listed in the manifest in parallel.
+
+        Args:
+            faceEngine: face engine
+            path: manifest directory
+            executor: executor for concurrent shard operations, shared thread pool by default
+        Returns:
+            sharded index
+        Raises:
+            FileNotFoundError: if the manifest or a shard file is not found
+            ValueError: if the manifest has unsupported format version
+            LunaSDKException: if an error occurs while loading a shard
+        """
+        directory = Path(path)
+        manifest = _readManifest(directory)
+        builder = faceEngine.createIndexBuilder(descriptorVersion=manifest["descriptorVersion"])
+        indexType = IndexType(manifest["indexType"])
+        pool = executor or _getSearchExecutor()
+        futures = [
+            pool.submit(builder.loadIndex, str(directory / shard["path"]), indexType) for shard in manifest["shards"]
+        ]
+        return cls([future.result() for future in futures], executor)
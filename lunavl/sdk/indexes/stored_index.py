@@ -1,13 +1,30 @@
 """Module realize dynamic and dense index."""
 import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import List, Literal, Union, overload
+from typing import Dict, Generator, Iterator, List, Literal, Optional, Sequence, Set, Tuple, Union, overload
+
+import numpy as np
+from FaceEngine import (  # pylint: disable=E0611,E0401
+    FSDKErrorResult,
+    IDenseIndexPtr,
+    IDescriptorBatchPtr,
+    IDescriptorMatcherPtr,
+    IDescriptorPtr,
+    IDynamicIndexPtr,
+    PyIFaceEngine,
+    SearchResult,
+)
 
 from lunavl.sdk.descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
 from lunavl.sdk.errors.exceptions import assertError
 
 from .base import CoreIndex, IndexResult
+from .cache import SearchCache, getSearchCacheKey
+from .wal import IndexWal, WalOperation, getRecordsAfterCheckpoint, readWal, unpackBatch, unpackRemove
 from ..async_task import DefaultPostprocessingFactory, AsyncTask
 
 
@@ -22,19 +39,555 @@ class IndexType(Enum):
 
 POST_PROCESSING = DefaultPostprocessingFactory(IndexResult)
 
+#: shared executor for batch searching, created on first use
+_searchExecutor: Optional[ThreadPoolExecutor] = None
+_searchExecutorLock = threading.Lock()
+
+
+def _getSearchExecutor() -> ThreadPoolExecutor:
+    """
+    Get shared executor for batch searching (core search releases GIL, so queries are searched in parallel).
+
+    Returns:
+        thread pool executor with a thread per cpu
+    """
+    global _searchExecutor  # pylint: disable=W0603
+    with _searchExecutorLock:
+        if _searchExecutor is None:
+            _searchExecutor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="lunavl-index-search")
+        return _searchExecutor
+
+
+def _filterResults(coreResults: List[SearchResult], similarityThreshold: Optional[float]) -> List[IndexResult]:
+    """
+    Filter core search results by similarity and convert them to index results.
+
+    Args:
+        coreResults: core search results
+        similarityThreshold: min similarity of results, None - do not filter
+    Returns:
+        index results
+    """
+    if similarityThreshold is None:
+        return [IndexResult(result) for result in coreResults]
+    return [IndexResult(result) for result in coreResults if result.similarity >= similarityThreshold]
+
+
+class _BatchSearchTask:
+    """
+    Composite core task of a batch search, one core search task per query.
 
-class DynamicIndex(CoreIndex):
+    Attributes:
+        _tasks (List[CoreAsyncTask]): core search tasks
+    """
+
+    __slots__ = ("_tasks",)
+
+    def __init__(self, tasks: List["CoreAsyncTask"]):  # type: ignore # noqa: F821
+        self._tasks = tasks
+
+    def get(self) -> Tuple[List[Tuple[FSDKErrorResult, List[SearchResult]]]]:
+        """
+        Wait all tasks.
+
+        Returns:
+            tuple with list of core search results
+        """
+        return ([task.get() for task in self._tasks],)
+
+    def __await__(self) -> Generator[None, None, None]:
+        """
+        Await all tasks.
+        """
+        for task in self._tasks:
+            yield from task.__await__()
+
+    def getResult(self) -> Tuple[List[Tuple[FSDKErrorResult, List[SearchResult]]]]:
+        """
+        Get results of finished tasks.
+
+        Returns:
+            tuple with list of core search results
+        """
+        return ([task.getResult() for task in self._tasks],)
+
+
+class _ExactSearchResult:
+    """
+    Exact search result, the same interface as core search result.
+
+    Attributes:
+        distance (float): distance between descriptors
+        similarity (float): descriptor similarity [0..1]
+        index (int): descriptor position in internal storage
+    """
+
+    __slots__ = ("distance", "similarity", "index")
+
+    def __init__(self, distance: float, similarity: float, index: int):
+        self.distance = distance
+        self.similarity = similarity
+        self.index = index
+
+
+class _SearchableIndex(CoreIndex):
+    """
+    Base class of indexes which supports searching.
+
+    Besides the approximate (HNSW) core search, an index supports exact brute force search over its descriptors:
+    the core matcher matches a query with every live descriptor, so exact search results have the same distances and
+    similarities as core search results. `search` switches to exact search automatically if the index is not larger
+    than `exactSearchThreshold` (exact search is faster for small galleries and has perfect recall).
+
+    Attributes:
+        _exactCandidates (Optional[Tuple[np.ndarray, IDescriptorBatchPtr]]): positions of live descriptors and
+            core batch of them, built on the first exact search and dropped by index updates
+        _exactSearchThreshold (int): max index size for automatic exact search, 0 - do not use exact search
+        _coreMatcher (Optional[IDescriptorMatcherPtr]): core matcher of exact search
+        _searchCache (Optional[SearchCache]): cache of sync search results, cleared by index updates
+    """
+
+    __slots__ = ("_exactCandidates", "_exactSearchThreshold", "_coreMatcher", "_searchCache")
+
+    def __init__(self, coreIndex: Union[IDenseIndexPtr, IDynamicIndexPtr], faceEngine: PyIFaceEngine):
+        """
+        Init index.
+
+        Args:
+            coreIndex: core index class
+            faceEngine (PyIFaceEngine): core face engine
+        """
+        super().__init__(coreIndex, faceEngine)
+        self._exactCandidates: Optional[Tuple[np.ndarray, IDescriptorBatchPtr]] = None
+        self._exactSearchThreshold = 0
+        self._coreMatcher: Optional[IDescriptorMatcherPtr] = None
+        self._searchCache: Optional[SearchCache] = None
+
+    @property
+    def exactSearchThreshold(self) -> int:
+        """Get max index size for automatic exact search (0 - exact search is not used automatically)"""
+        return self._exactSearchThreshold
+
+    def setExactSearch(self, sizeThreshold: int) -> None:
+        """
+        Set up exact search.
+
+        Args:
+            sizeThreshold: `search` and `searchBatch` use exact search if the index is not larger, 0 - never
+        Raises:
+            ValueError: if size threshold is negative
+        """
+        if sizeThreshold < 0:
+            raise ValueError(f"Size threshold must be not negative, got {sizeThreshold}")
+        self._exactSearchThreshold = sizeThreshold
+        if self._searchCache is not None:
+            self._searchCache.clear()
+
+    @property
+    def searchCache(self) -> Optional[SearchCache]:
+        """Get cache of search results (None if caching is disabled)"""
+        return self._searchCache
+
+    def enableSearchCache(self, maxSize: int = 1024, ttl: Optional[float] = 60.0) -> SearchCache:
+        """
+        Enable caching of sync search results (`search` and `searchBatch`). Results are cached by descriptor payload,
+        max count and similarity threshold, the cache is cleared by index updates.
+
+        Args:
+            maxSize: max count of cached queries, least recently used results are evicted
+            ttl: time to live of results in seconds, None - results do not expire
+        Returns:
+            the cache (see its `hits` and `misses`)
+        Raises:
+            ValueError: if max size or ttl is not positive
+        """
+        self._searchCache = SearchCache(maxSize, ttl)
+        return self._searchCache
+
+    def disableSearchCache(self) -> None:
+        """
+        Disable caching of search results.
+        """
+        self._searchCache = None
+
+    def _onUpdate(self) -> None:
+        """
+        Index update hook, drops data computed from the index descriptors.
+        """
+        self._exactCandidates = None
+        if self._searchCache is not None:
+            self._searchCache.clear()
+
+    def _getLivePositions(self) -> np.ndarray:
+        """
+        Get positions of descriptors available for search.
+
+        Returns:
+            positions
+        """
+        return np.arange(self.bufSize, dtype=np.int64)
+
+    def asNumpy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get payloads (`asBytes`) of descriptors available for search.
+
+        Returns:
+            (N,) int64 positions and (N, descriptor length) uint8 payloads of descriptors
+        Raises:
+            LunaSDKException: if an error occurs while getting descriptors
+        """
+        positions = self._getLivePositions()
+        coreDescriptor = self._faceEngine.createDescriptor(self.descriptorVersion)
+        payloads = np.empty((0, 0), dtype=np.uint8)
+        for row, position in enumerate(positions.tolist()):
+            error, descriptor = self._coreIndex.descriptorByIndex(position, coreDescriptor)
+            assertError(error)
+            payload = np.frombuffer(descriptor.getData(), dtype=np.uint8)
+            if not row:
+                # payload length is known after the first descriptor
+                payloads = np.empty((len(positions), payload.size), dtype=np.uint8)
+            payloads[row] = payload
+        return positions, payloads
+
+    def _getExactCandidates(self) -> Tuple[np.ndarray, IDescriptorBatchPtr]:
+        """
+        Get core batch of index descriptors available for search, build it on the first call after an update.
+
+        Returns:
+            positions of candidates and core batch of candidates
+        Raises:
+            LunaSDKException: if an error occurs while getting descriptors
+        """
+        exactCandidates = self._exactCandidates
+        if exactCandidates is None:
+            positions = self._getLivePositions()
+            coreDescriptor = self._faceEngine.createDescriptor(self.descriptorVersion)
+            coreBatch = self._faceEngine.createDescriptorBatch(max(len(positions), 1), version=self.descriptorVersion)
+            for position in positions.tolist():
+                error, descriptor = self._coreIndex.descriptorByIndex(position, coreDescriptor)
+                assertError(error)
+                assertError(coreBatch.add(descriptor))
+            exactCandidates = positions, coreBatch
+            self._exactCandidates = exactCandidates
+        return exactCandidates
+
+    def _getCoreMatcher(self) -> IDescriptorMatcherPtr:
+        """
+        Get core matcher of the index descriptor version, create it on the first call.
+
+        Returns:
+            core matcher
+        """
+        if self._coreMatcher is None:
+            self._coreMatcher = self._faceEngine.createMatcher(self.descriptorVersion)
+        return self._coreMatcher
+
+    def exactSearchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int = 1,
+        similarityThreshold: Optional[float] = None,
+    ) -> List[List[IndexResult]]:
+        """
+        Exact brute force search for descriptors with the shorter distance to each of passed descriptors.
+
+        Each query is matched with every descriptor available for search by one core matcher call, so distances and
+        similarities (and the similarity threshold) are in the core search scale.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor (default is 1)
+            similarityThreshold: min similarity of results
+        Returns:
+            list with index search results for each descriptor sorted by distance
+        Raises:
+            ValueError: if max count is not positive
+            LunaSDKException: if an error occurs while getting index descriptors or matching them
+        """
+        if maxCount < 1:
+            raise ValueError(f"Max count must be positive, got {maxCount}")
+        descriptors = list(descriptors)
+        positions, coreBatch = self._getExactCandidates()
+        if not descriptors or not len(positions):
+            return [[] for _ in descriptors]
+        coreMatcher = self._getCoreMatcher()
+        results = []
+        for descriptor in descriptors:
+            error, matchResults = coreMatcher.match(descriptor.coreEstimation, coreBatch)
+            assertError(error)
+            distances = np.array([result.distance for result in matchResults])
+            nearest = np.argsort(distances, kind="stable")[:maxCount].tolist()
+            results.append(
+                [
+                    IndexResult(_ExactSearchResult(matchResults[row].distance, matchResults[row].similarity, position))
+                    for row, position in zip(nearest, positions[nearest].tolist())
+                    if similarityThreshold is None or matchResults[row].similarity >= similarityThreshold
+                ]
+            )
+        return results
+
+    def exactSearch(self, descriptor: FaceDescriptor, maxCount: int = 1) -> List[IndexResult]:
+        """
+        Exact brute force search for descriptors with the shorter distance to passed descriptor.
+
+        Args:
+            descriptor: descriptor to match against index
+            maxCount: max count of results (default is 1)
+        Returns:
+            list with index search results sorted by distance
+        Raises:
+            ValueError: if max count is not positive
+            LunaSDKException: if an error occurs while getting index descriptors or matching them
+        """
+        return self.exactSearchBatch([descriptor], maxCount)[0]
+
+    def approximateSearch(self, descriptor: FaceDescriptor, maxCount: int = 1) -> List[IndexResult]:
+        """
+        Search with the core (approximate) index regardless of exact search settings and the search cache.
+
+        Args:
+            descriptor: descriptor to match against index
+            maxCount: max count of results (default is 1)
+        Returns:
+            list with index search results
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        error, resIndex = self._coreIndex.search(descriptor.coreEstimation, maxCount)
+        assertError(error)
+        return [IndexResult(result) for result in resIndex]
+
+    def _isExactSearchPreferred(self) -> bool:
+        """
+        Check automatic exact search is enabled and the index is small enough.
+
+        Returns:
+            True if exact search should be used
+        """
+        return 0 < self.bufSize <= self._exactSearchThreshold
+
+    def _searchChunk(
+        self, descriptors: Sequence[FaceDescriptor], maxCount: int, similarityThreshold: Optional[float]
+    ) -> List[List[IndexResult]]:
+        """
+        Search for descriptors one by one.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor
+            similarityThreshold: min similarity of results
+        Returns:
+            search results for each descriptor
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        results = []
+        for descriptor in descriptors:
+            error, coreResults = self._coreIndex.search(descriptor.coreEstimation, maxCount)
+            assertError(error)
+            results.append(_filterResults(coreResults, similarityThreshold))
+        return results
+
+    @overload
+    def searchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int = 1,
+        similarityThreshold: Optional[float] = None,
+        asyncSearch: Literal[False] = False,
+        executor: Optional[Executor] = None,
+    ) -> List[List[IndexResult]]:
+        ...
+
+    @overload
+    def searchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int,
+        similarityThreshold: Optional[float],
+        asyncSearch: Literal[True],
+        executor: Optional[Executor] = None,
+    ) -> AsyncTask[List[List[IndexResult]]]:
+        ...
+
+    def searchBatch(
+        self,
+        descriptors: Union[FaceDescriptorBatch, Sequence[FaceDescriptor]],
+        maxCount: int = 1,
+        similarityThreshold: Optional[float] = None,
+        asyncSearch: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> Union[List[List[IndexResult]], AsyncTask[List[List[IndexResult]]]]:
+        """
+        Search for descriptors with the shorter distance to each of passed descriptors.
+
+        Queries are split into contiguous chunks searched in parallel by the executor threads (core search releases
+        GIL). Async search runs a core async search per query, the task can be awaited or joined by `get`.
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor (default is 1)
+            similarityThreshold: min similarity of results, results are filtered before conversion to `IndexResult`
+            asyncSearch: search or run searching in background
+            executor: executor for parallel searching, shared thread pool by default
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        Returns:
+            list with index search results for each descriptor in the order of descriptors
+        """
+        descriptors = list(descriptors)
+        if asyncSearch:
+            tasks = [self._coreIndex.asyncSearch(descriptor.coreEstimation, maxCount) for descriptor in descriptors]
+
+            def postProcessing(coreResults: List[Tuple[FSDKErrorResult, List[SearchResult]]]):
+                results = []
+                for error, coreResult in coreResults:
+                    assertError(error)
+                    results.append(_filterResults(coreResult, similarityThreshold))
+                return results
+
+            return AsyncTask(_BatchSearchTask(tasks), postProcessing)
+        return self._searchWithCache(descriptors, maxCount, similarityThreshold, executor)
+
+    def _searchWithCache(
+        self,
+        descriptors: List[FaceDescriptor],
+        maxCount: int,
+        similarityThreshold: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[List[IndexResult]]:
+        """
+        Sync search, look up the search cache (if it is enabled) and search for missed descriptors only.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor
+            similarityThreshold: min similarity of results
+            executor: executor for parallel searching, shared thread pool by default
+        Returns:
+            search results for each descriptor
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        cache = self._searchCache
+        if cache is None:
+            return self._searchSync(descriptors, maxCount, similarityThreshold, executor)
+        generation = cache.generation
+        keys = [getSearchCacheKey(descriptor, maxCount, similarityThreshold) for descriptor in descriptors]
+        results = [cache.get(key) for key in keys]
+        missed = [idx for idx, result in enumerate(results) if result is None]
+        if missed:
+            missedResults = self._searchSync(
+                [descriptors[idx] for idx in missed], maxCount, similarityThreshold, executor
+            )
+            for idx, result in zip(missed, missedResults):
+                results[idx] = result
+                cache.put(keys[idx], result, generation)
+        return results  # type: ignore
+
+    def _searchSync(
+        self,
+        descriptors: List[FaceDescriptor],
+        maxCount: int,
+        similarityThreshold: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[List[IndexResult]]:
+        """
+        Sync search: exact search for a small index (see `setExactSearch`), parallel core search otherwise.
+
+        Args:
+            descriptors: descriptors to match against index
+            maxCount: max count of results per descriptor
+            similarityThreshold: min similarity of results
+            executor: executor for parallel searching, shared thread pool by default
+        Returns:
+            search results for each descriptor
+        Raises:
+            LunaSDKException: if an error occurs while searching for descriptors
+        """
+        if self._isExactSearchPreferred():
+            return self.exactSearchBatch(descriptors, maxCount, similarityThreshold)
+        if len(descriptors) < 2:
+            return self._searchChunk(descriptors, maxCount, similarityThreshold)
+        executor = executor or _getSearchExecutor()
+        chunkSize = -(-len(descriptors) // min(len(descriptors), os.cpu_count() or 1))
+        futures = []
+        for start in range(0, len(descriptors), chunkSize):
+            stop = start + chunkSize
+            futures.append(executor.submit(self._searchChunk, descriptors[start:stop], maxCount, similarityThreshold))
+        return [result for future in futures for result in future.result()]
+
+
+class DynamicIndex(_SearchableIndex):
     """
     Dynamic Index.
 
-    Allows updates, but loads slower than dense.
+    Allows updates, but loads slower than dense. Updates can be logged to a write-ahead log (see `attachWal`), the log
+    is replayed by `IndexBuilder.loadIndex` and folded into the snapshot by `checkpoint`.
+
+    Attributes:
+        _wal (Optional[IndexWal]): write-ahead log of updates
+        _removed (Set[int]): positions of descriptors removed from the graph, they are dropped by `compact`
+        _updateLock (threading.RLock): lock of index updates, compaction holds it to stop updates
     """
 
+    __slots__ = ("_wal", "_removed", "_updateLock")
+
+    def __init__(self, coreIndex: IDynamicIndexPtr, faceEngine: PyIFaceEngine):
+        """
+        Init index.
+
+        Args:
+            coreIndex: core index class
+            faceEngine (PyIFaceEngine): core face engine
+        """
+        super().__init__(coreIndex, faceEngine)
+        self._wal: Optional[IndexWal] = None
+        self._removed: Set[int] = set()
+        self._updateLock = threading.RLock()
+
     @property
     def descriptorsCount(self):
         """Get actual count of descriptor in internal storage."""
         return self._coreIndex.countOfIndexedDescriptors()
 
+    @property
+    def fragmentation(self) -> float:
+        """Get share of removed descriptors in internal storage (0 - no garbage), see `compact`."""
+        bufSize = self.bufSize
+        return (bufSize - self.descriptorsCount) / bufSize if bufSize else 0.0
+
+    @property
+    def wal(self) -> Optional[IndexWal]:
+        """Get write-ahead log of updates"""
+        return self._wal
+
+    def attachWal(self, path: Union[str, Path], sync: bool = False) -> IndexWal:
+        """
+        Log all following updates to a write-ahead log. Usually the log is placed next to the index snapshot
+        (`getWalPath(snapshotPath)`), so `IndexBuilder.loadIndex` replays it.
+
+        Args:
+            path: log path, the log is created or continued
+            sync: fsync after each record or only flush
+        Returns:
+            write-ahead log
+        Raises:
+            ValueError: if existing file is not a write-ahead log
+        """
+        with self._updateLock:
+            self.detachWal()
+            self._wal = IndexWal(path, sync=sync)
+            return self._wal
+
+    def detachWal(self) -> None:
+        """
+        Stop logging of updates and close the log.
+        """
+        with self._updateLock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+
     def append(self, descriptor: FaceDescriptor) -> None:
         """
         Appends descriptor to internal storage.
@@ -43,8 +596,11 @@ class DynamicIndex(CoreIndex):
         Raises:
             LunaSDKException: if an error occurs while adding the descriptor
         """
-        error = self._coreIndex.appendDescriptor(descriptor.coreEstimation)
-        assertError(error)
+        with self._updating() as wal:
+            error = self._coreIndex.appendDescriptor(descriptor.coreEstimation)
+            assertError(error)
+            if wal is not None:
+                wal.logAppend(descriptor)
 
     def appendBatch(self, descriptorsBatch: FaceDescriptorBatch) -> None:
         """
@@ -54,12 +610,261 @@ class DynamicIndex(CoreIndex):
         Raises:
             LunaSDKException: if an error occurs while adding the batch of descriptors
         """
-        error = self._coreIndex.appendBatch(descriptorsBatch.coreEstimation)
-        assertError(error)
+        with self._updating() as wal:
+            error = self._coreIndex.appendBatch(descriptorsBatch.coreEstimation)
+            assertError(error)
+            if wal is not None:
+                wal.logAppendBatch(descriptorsBatch)
 
     def remove(self, i: int):
         """Remove descriptor at index `i` (0-based)."""
-        self._coreIndex.removeDescriptor(i)
+        with self._updating() as wal:
+            error = self._coreIndex.removeDescriptor(i)
+            if not error.isError:
+                self._removed.add(i)
+                if wal is not None:
+                    wal.logRemove(i)
+
+    def __delitem__(self, index: int) -> None:
+        """
+        Descriptor will be removed from the graph (not from the internal storage), so it is not available for search.
+        Args:
+            index: identification of descriptors position in internal storage
+        Raises:
+            IndexError: if index out of range
+            LunaSDKException: if an error occurs while remove descriptor failed
+        """
+        with self._updating() as wal:
+            super().__delitem__(index)
+            self._removed.add(index)
+            if wal is not None:
+                wal.logRemove(index)
+
+    @contextmanager
+    def _updating(self) -> Iterator[Optional[IndexWal]]:
+        """
+        Context of an index update: holds the update lock and the write-ahead log lock (if the log is attached) and
+        notifies about the update on exit.
+
+        Yields:
+            attached write-ahead log or None
+        """
+        with self._updateLock:
+            wal = self._wal
+            try:
+                if wal is None:
+                    yield None
+                else:
+                    with wal.lock:
+                        yield wal
+            finally:
+                self._onUpdate()
+
+    def _getLivePositions(self) -> np.ndarray:
+        """
+        Get positions of descriptors available for search (not removed).
+
+        Returns:
+            positions
+        """
+        positions = np.arange(self.bufSize, dtype=np.int64)
+        if not self._removed:
+            return positions
+        return positions[~np.isin(positions, np.fromiter(self._removed, dtype=np.int64))]
+
+    def _loadCoreDescriptor(self, rawDescriptor: bytes) -> IDescriptorPtr:
+        """
+        Load a core descriptor from a raw descriptor.
+
+        Args:
+            rawDescriptor: raw descriptor
+        Returns:
+            core descriptor
+        Raises:
+            LunaSDKException: if the raw descriptor is invalid
+        """
+        coreDescriptor = self._faceEngine.createDescriptor(self.descriptorVersion)
+        assertError(coreDescriptor.load(rawDescriptor, len(rawDescriptor)))
+        return coreDescriptor
+
+    def replayWal(self, path: Union[str, Path], snapshotPath: Optional[Union[str, Path]] = None) -> int:
+        """
+        Apply updates of a write-ahead log to the index. Updates are not logged again.
+
+        Args:
+            path: log path
+            snapshotPath: path of the snapshot the index was loaded from, records before its checkpoint are skipped
+        Returns:
+            count of applied records
+        Raises:
+            ValueError: if file is not a write-ahead log
+            LunaSDKException: if an error occurs while applying an update
+        """
+        records = readWal(path) if snapshotPath is None else getRecordsAfterCheckpoint(path, snapshotPath)
+        count = 0
+        for record in records:
+            if record.operation == WalOperation.append:
+                error = self._coreIndex.appendDescriptor(self._loadCoreDescriptor(record.payload))
+                assertError(error)
+            elif record.operation == WalOperation.appendBatch:
+                rawDescriptors = list(unpackBatch(record.payload))
+                coreBatch = self._faceEngine.createDescriptorBatch(
+                    max(len(rawDescriptors), 1), version=self.descriptorVersion
+                )
+                for rawDescriptor in rawDescriptors:
+                    assertError(coreBatch.add(self._loadCoreDescriptor(rawDescriptor)))
+                error = self._coreIndex.appendBatch(coreBatch)
+                assertError(error)
+            elif record.operation == WalOperation.remove:
+                position = unpackRemove(record.payload)
+                # the log repeats removes of the snapshot (see `checkpoint`), core may reject a repeated remove
+                self._coreIndex.removeDescriptor(position)
+                if position < self.bufSize:
+                    self._removed.add(position)
+            else:
+                continue
+            count += 1
+        self._onUpdate()
+        return count
+
+    def _compact(self, chunkSize: int) -> Dict[int, int]:
+        """
+        Rebuild core index from live descriptors.
+
+        Args:
+            chunkSize: count of descriptors appended to the new index at once
+        Returns:
+            mapping of old positions of live descriptors to new positions
+        Raises:
+            LunaSDKException: if an error occurs while reading descriptors or building the index
+        """
+        descriptorVersion = self.descriptorVersion
+        livePositions = [position for position in range(self.bufSize) if position not in self._removed]
+        coreBuilder = self._faceEngine.createIndexBuilder(version=descriptorVersion, capacity=len(livePositions))
+        coreDescriptor = self._faceEngine.createDescriptor(descriptorVersion)
+        for start in range(0, len(livePositions), chunkSize):
+            stop = start + chunkSize
+            positions = livePositions[start:stop]
+            coreBatch = self._faceEngine.createDescriptorBatch(len(positions), version=descriptorVersion)
+            for position in positions:
+                error, descriptor = self._coreIndex.descriptorByIndex(position, coreDescriptor)
+                assertError(error)
+                assertError(coreBatch.add(descriptor))
+            assertError(coreBuilder.appendBatch(coreBatch))
+        error, coreIndex = coreBuilder.buildIndex()
+        assertError(error)
+        self._coreIndex = coreIndex
+        self._removed = set()
+        self._onUpdate()
+        return {oldPosition: newPosition for newPosition, oldPosition in enumerate(livePositions)}
+
+    def compact(self, snapshotPath: Optional[str] = None, chunkSize: int = 1000) -> Dict[int, int]:
+        """
+        Rebuild the index from live descriptors only, so storage of removed descriptors is reclaimed. Positions of
+        descriptors change, use the returned mapping to update external references (ids of descriptors).
+
+        Compaction is worthwhile when `fragmentation` is high. Search is served by the old core index until the new
+        one is built, updates wait for the finish. Positions of removed descriptors are known for removes of this index
+        object (and removes restored from a write-ahead log), so the index must not be loaded from a snapshot with
+        removed descriptors without a log.
+        Args:
+            snapshotPath: snapshot path to checkpoint the compacted index to, required if a write-ahead log is
+                attached, since logged positions are not valid after compaction
+            chunkSize: count of descriptors appended to the new index at once
+        Returns:
+            mapping of old positions of live descriptors to new positions
+        Raises:
+            ValueError: if positions of removed descriptors are unknown, chunk size is not positive or snapshot path
+                is not passed for an index with write-ahead log
+            LunaSDKException: if an error occurs while reading descriptors, building or saving the index
+        """
+        if chunkSize < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunkSize}")
+        with self._updating() as wal:
+            if wal is not None and snapshotPath is None:
+                raise ValueError("Snapshot path is required to compact an index with write-ahead log")
+            self._checkRemovedPositions()
+            mapping = self._compact(chunkSize)
+            if wal is not None:
+                self._checkpoint(snapshotPath)  # type: ignore
+        return mapping
+
+    def _checkRemovedPositions(self) -> None:
+        """
+        Check positions of all removed descriptors are known.
+
+        Raises:
+            ValueError: if count of known removed positions differs from count of removed descriptors
+        """
+        removedCount = self.bufSize - self.descriptorsCount
+        if removedCount != len(self._removed):
+            raise ValueError(
+                f"Positions of {removedCount - len(self._removed)} removed descriptors are unknown, "
+                f"rebuild the index from source descriptors instead"
+            )
+
+    def _checkpoint(self, path: str) -> None:
+        """
+        Save a dynamic snapshot, replace the old one and clear the write-ahead log. Updates wait for the finish.
+
+        Args:
+            path: snapshot path
+        Raises:
+            ValueError: if write-ahead log is not attached
+            LunaSDKException: if an error occurs while saving the index
+        """
+        wal = self._wal
+        if wal is None:
+            raise ValueError("Write-ahead log is not attached")
+        temporaryPath = Path(path).with_name(f".{Path(path).name}.tmp")
+        with wal.lock:
+            error = self._coreIndex.saveToDynamicIndex(str(temporaryPath))
+            assertError(error)
+            # the checkpoint record tells replay to skip previous records if the log survives a crash below
+            wal.logCheckpoint(temporaryPath)
+            os.replace(temporaryPath, path)
+            wal.reset()
+            # snapshot does not keep positions of removed descriptors, log them again for `compact` after restart
+            for position in sorted(self._removed):
+                wal.logRemove(position)
+
+    def checkpoint(self, path: str, background: bool = False) -> Optional["Future[None]"]:
+        """
+        Fold the write-ahead log into a new dynamic snapshot. Search is not blocked, updates wait for the finish.
+
+        A crash at any moment keeps the snapshot and the log consistent: the old snapshot with the full log or the new
+        snapshot with a log which starts with (or contains nothing but) its checkpoint.
+        Args:
+            path: snapshot path, usually the path the index was loaded from
+            background: run the checkpoint in a background thread or wait for the finish
+        Returns:
+            future of the background checkpoint or None
+        Raises:
+            ValueError: if write-ahead log is not attached or path is a directory
+            PermissionError: if write access is denied
+            LunaSDKException: if an error occurs while saving the index
+        """
+        if self._wal is None:
+            raise ValueError("Write-ahead log is not attached")
+        if Path(path).is_dir():
+            raise ValueError(f"{path} must not be a directory")
+        if not os.access(Path(path).parent, os.W_OK):
+            raise PermissionError(f"Access is denied: {path}")
+        if not background:
+            self._checkpoint(path)
+            return None
+        future: "Future[None]" = Future()
+
+        def run() -> None:
+            try:
+                self._checkpoint(path)
+            except Exception as exc:  # pylint: disable=W0703
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+
+        threading.Thread(target=run, name="lunavl-index-checkpoint", daemon=True).start()
+        return future
 
     #  pylint: disable=W0221
     @overload
@@ -91,9 +896,9 @@ class DynamicIndex(CoreIndex):
         if asyncSearch:
             task = self._coreIndex.asyncSearch(descriptor.coreEstimation, maxCount)
             return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
-        error, resIndex = self._coreIndex.search(descriptor.coreEstimation, maxCount)
-        assertError(error)
-        return [IndexResult(result) for result in resIndex]
+        if self._searchCache is None and not self._isExactSearchPreferred():
+            return self.approximateSearch(descriptor, maxCount)
+        return self._searchWithCache([descriptor], maxCount)[0]
 
     def save(self, path: str, indexType: IndexType = IndexType.dynamic) -> None:
         """
@@ -119,7 +924,7 @@ class DynamicIndex(CoreIndex):
         assertError(error)
 
 
-class DenseIndex(CoreIndex):
+class DenseIndex(_SearchableIndex):
     """
     Dense Index.
 
@@ -160,6 +965,6 @@ class DenseIndex(CoreIndex):
         if asyncSearch:
             task = self._coreIndex.asyncSearch(descriptor.coreEstimation, maxCount)
             return AsyncTask(task, POST_PROCESSING.postProcessingBatch)
-        error, resIndex = self._coreIndex.search(descriptor.coreEstimation, maxCount)
-        assertError(error)
-        return [IndexResult(result) for result in resIndex]
+        if self._searchCache is None and not self._isExactSearchPreferred():
+            return self.approximateSearch(descriptor, maxCount)
+        return self._searchWithCache([descriptor], maxCount)[0]
@@ -0,0 +1,369 @@
+"""
+Module contains write-ahead log of dynamic index updates.
+
+File layout (little endian):
+
+    header: magic (4 bytes), format version (uint32)
+    records: operation (uint8), payload length (uint32), payload, crc32 of operation, length and payload (uint32)
+
+Payloads:
+
+    append: raw descriptor (`FaceDescriptor.rawDescriptor`)
+    appendBatch: descriptors count (uint32), raw descriptor length (uint32), concatenated raw descriptors
+    remove: descriptor position (uint64)
+    checkpoint: size (uint64) and modification time in ns (uint64) of the snapshot which contains all previous records
+
+A record is written after the update is applied to the index. A torn record at the end of the log (a crash while
+writing) is ignored on reading.
+"""
+import os
+import struct
+import threading
+import zlib
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple, Union
+
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor, FaceDescriptorBatch
+
+#: log file signature
+WAL_MAGIC = b"LVWL"
+#: current log format version
+WAL_FORMAT_VERSION = 1
+#: file header struct: magic, format version
+_FILE_HEADER = struct.Struct("<4sI")
+#: record header struct: operation, payload length
+_RECORD_HEADER = struct.Struct("<BI")
+#: record trailer struct: crc32
+_RECORD_TRAILER = struct.Struct("<I")
+#: batch payload header struct: count, raw descriptor length
+_BATCH_HEADER = struct.Struct("<II")
+#: remove payload struct: position
+_REMOVE = struct.Struct("<Q")
+#: checkpoint payload struct: snapshot size, snapshot modification time
+_CHECKPOINT = struct.Struct("<QQ")
+
+
+class WalOperation(Enum):
+    """Logged index operations."""
+
+    # append one descriptor
+    append = 1
+    # append descriptors batch
+    appendBatch = 2
+    # remove descriptor
+    remove = 3
+    # snapshot with all previous records is saved
+    checkpoint = 4
+
+
+class WalRecord(NamedTuple):
+    """
+    Write-ahead log record.
+
+    Attributes
+        operation (WalOperation): logged operation
+        payload (bytes): operation payload
+    """
+
+    operation: WalOperation
+    payload: bytes
+
+
+def getWalPath(indexPath: Union[str, Path]) -> Path:
+    """
+    Get path of the write-ahead log of an index snapshot.
+
+    Args:
+        indexPath: index snapshot path
+    Returns:
+        log path next to the snapshot
+    """
+    indexPath = Path(indexPath)
+    return indexPath.with_name(f"{indexPath.name}.wal")
+
+
+def getSnapshotStamp(indexPath: Union[str, Path]) -> bytes:
+    """
+    Get checkpoint payload of a snapshot.
+
+    Args:
+        indexPath: index snapshot path
+    Returns:
+        packed snapshot size and modification time
+    """
+    stat = os.stat(indexPath)
+    return _CHECKPOINT.pack(stat.st_size, stat.st_mtime_ns)
+
+
+def packBatch(descriptorsBatch: FaceDescriptorBatch) -> bytes:
+    """
+    Pack descriptors batch to a record payload.
+
+    Args:
+        descriptorsBatch: descriptors batch
+    Returns:
+        payload
+    """
+    rawDescriptors = [descriptor.rawDescriptor for descriptor in descriptorsBatch]
+    rawLength = len(rawDescriptors[0]) if rawDescriptors else 0
+    return _BATCH_HEADER.pack(len(rawDescriptors), rawLength) + b"".join(rawDescriptors)
+
+
+def unpackBatch(payload: bytes) -> Iterator[bytes]:
+    """
+    Unpack raw descriptors from a batch record payload.
+
+    Args:
+        payload: payload
+    Yields:
+        raw descriptors
+    """
+    count, rawLength = _BATCH_HEADER.unpack_from(payload)
+    for index in range(count):
+        start = _BATCH_HEADER.size + index * rawLength
+        stop = start + rawLength
+        yield payload[start:stop]
+
+
+def unpackRemove(payload: bytes) -> int:
+    """
+    Unpack descriptor position from a remove record payload.
+
+    Args:
+        payload: payload
+    Returns:
+        descriptor position
+    """
+    return _REMOVE.unpack(payload)[0]
+
+
+def _checkHeader(header: bytes, path: Union[str, Path]) -> bool:
+    """
+    Check a log file header.
+
+    Args:
+        header: file header
+        path: log path
+    Returns:
+        False if the file is empty, True otherwise
+    Raises:
+        ValueError: if file is not a write-ahead log or has unsupported format version
+    """
+    if not header:
+        return False
+    if len(header) != _FILE_HEADER.size or header[:4] != WAL_MAGIC:
+        raise ValueError(f"{path} is not an index write-ahead log")
+    _, formatVersion = _FILE_HEADER.unpack(header)
+    if formatVersion != WAL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported write-ahead log format version: {formatVersion}")
+    return True
+
+
+def _iterRecords(file: BinaryIO) -> Iterator[Tuple[WalRecord, int]]:
+    """
+    Read records from a log file positioned after the header. Reading stops on a torn or corrupted record.
+
+    Args:
+        file: log file
+    Yields:
+        log records and file offsets after them
+    Raises:
+        ValueError: if a record has unknown operation
+    """
+    while True:
+        recordHeader = file.read(_RECORD_HEADER.size)
+        if len(recordHeader) != _RECORD_HEADER.size:
+            return
+        operation, length = _RECORD_HEADER.unpack(recordHeader)
+        payload = file.read(length)
+        trailer = file.read(_RECORD_TRAILER.size)
+        if len(payload) != length or len(trailer) != _RECORD_TRAILER.size:
+            return
+        if _RECORD_TRAILER.unpack(trailer)[0] != zlib.crc32(payload, zlib.crc32(recordHeader)):
+            return
+        yield WalRecord(WalOperation(operation), payload), file.tell()
+
+
+def readWal(path: Union[str, Path]) -> Iterator[WalRecord]:
+    """
+    Read records of a write-ahead log. Reading stops on a torn or corrupted record.
+
+    Args:
+        path: log path
+    Yields:
+        log records
+    Raises:
+        ValueError: if file is not a write-ahead log or has unsupported format version
+    """
+    with open(path, "rb") as file:
+        if not _checkHeader(file.read(_FILE_HEADER.size), path):
+            return
+        for record, _ in _iterRecords(file):
+            yield record
+
+
+class IndexWal:
+    """
+    Appendable write-ahead log of index updates.
+
+    Attributes:
+        _path (Path): log path
+        _file (BinaryIO): log file opened for appending
+        _sync (bool): fsync after each record or only flush
+        _lock (threading.RLock): lock of index update and its record, checkpoint holds it to stop updates
+    """
+
+    __slots__ = ("_path", "_file", "_sync", "_lock")
+
+    def __init__(self, path: Union[str, Path], sync: bool = False):
+        """
+        Init. Open (or create) the log for appending.
+
+        Args:
+            path: log path
+            sync: fsync after each record (durable on power loss) or only flush (durable on process crash)
+        Raises:
+            ValueError: if existing file is not a write-ahead log or has unsupported format version
+        """
+        self._path = Path(path)
+        self._sync = sync
+        self._lock = threading.RLock()
+        validLength = 0
+        if self._path.exists():
+            with self._path.open("rb") as file:
+                if _checkHeader(file.read(_FILE_HEADER.size), self._path):
+                    validLength = _FILE_HEADER.size
+                    for _, validLength in _iterRecords(file):
+                        pass
+        self._file = open(self._path, "ab")
+        # cut a torn record of a crash, otherwise new records are unreachable after it
+        if self._file.tell() > validLength:
+            self._file.truncate(validLength)
+            self._file.seek(validLength)
+        if self._file.tell() == 0:
+            self._file.write(_FILE_HEADER.pack(WAL_MAGIC, WAL_FORMAT_VERSION))
+            self._flush()
+
+    @property
+    def path(self) -> Path:
+        """Get log path"""
+        return self._path
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Get lock of index updates and its records"""
+        return self._lock
+
+    @property
+    def size(self) -> int:
+        """Get log size in bytes"""
+        return self._file.tell()
+
+    def _flush(self) -> None:
+        """
+        Flush written records to the os (and to the disk if sync is enabled).
+        """
+        self._file.flush()
+        if self._sync:
+            os.fsync(self._file.fileno())
+
+    def write(self, operation: WalOperation, payload: bytes) -> None:
+        """
+        Write a record.
+
+        Args:
+            operation: operation
+            payload: operation payload
+        """
+        recordHeader = _RECORD_HEADER.pack(operation.value, len(payload))
+        crc = zlib.crc32(payload, zlib.crc32(recordHeader))
+        with self._lock:
+            self._file.write(recordHeader + payload + _RECORD_TRAILER.pack(crc))
+            self._flush()
+
+    def logAppend(self, descriptor: FaceDescriptor) -> None:
+        """
+        Log appending of a descriptor.
+
+        Args:
+            descriptor: appended descriptor
+        """
+        self.write(WalOperation.append, descriptor.rawDescriptor)
+
+    def logAppendBatch(self, descriptorsBatch: FaceDescriptorBatch) -> None:
+        """
+        Log appending of a descriptors batch.
+
+        Args:
+            descriptorsBatch: appended descriptors batch
+        """
+        self.write(WalOperation.appendBatch, packBatch(descriptorsBatch))
+
+    def logRemove(self, index: int) -> None:
+        """
+        Log removing of a descriptor.
+
+        Args:
+            index: position of removed descriptor
+        """
+        self.write(WalOperation.remove, _REMOVE.pack(index))
+
+    def logCheckpoint(self, snapshotPath: Union[str, Path]) -> None:
+        """
+        Log a checkpoint: the snapshot contains all previous records. The record is always synced to the disk.
+
+        Args:
+            snapshotPath: snapshot path
+        """
+        with self._lock:
+            self.write(WalOperation.checkpoint, getSnapshotStamp(snapshotPath))
+            os.fsync(self._file.fileno())
+
+    def reset(self) -> None:
+        """
+        Remove all records from the log.
+        """
+        with self._lock:
+            self._file.truncate(_FILE_HEADER.size)
+            self._file.seek(_FILE_HEADER.size)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Close the log file.
+        """
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "IndexWal":
+        return self
+
+    def __exit__(self, excType, excVal, excTb) -> None:
+        self.close()
+
+
+def getRecordsAfterCheckpoint(walPath: Union[str, Path], indexPath: Union[str, Path]) -> Iterator[WalRecord]:
+    """
+    Get log records which are not contained in the snapshot.
+
+    Records before the last checkpoint of the snapshot are skipped. Checkpoints of other snapshots (a crash before
+    the snapshot replacing) are ignored.
+
+    Args:
+        walPath: log path
+        indexPath: index snapshot path
+    Returns:
+        update records (without checkpoints)
+    Raises:
+        ValueError: if file is not a write-ahead log or has unsupported format version
+    """
+    stamp: Optional[bytes] = getSnapshotStamp(indexPath) if Path(indexPath).exists() else None
+    records = []
+    for record in readWal(walPath):
+        if record.operation != WalOperation.checkpoint:
+            records.append(record)
+        elif record.payload == stamp:
+            records = []
+    return iter(records)
@@ -2,7 +2,7 @@
 High-level api for estimating face attributes
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 
 from FaceEngine import Face  # pylint: disable=E0611,E0401
 from FaceEngine import Image as CoreImage  # pylint: disable=E0611,E0401
@@ -10,8 +10,8 @@ from numpy import ndarray
 from PIL.Image import Image as PilImage
 
 from .detectors.base import ImageForDetection, ImageForRedetection
-from .detectors.facedetector import FaceDetection, FaceDetector, Landmarks5
-from .estimator_collections import FaceEstimatorsCollection, EstimatorsSettings
+from .detectors.facedetector import FaceDetection, FaceDetector, FaceLandmarks, Landmarks5, Landmarks68
+from .estimator_collections import EstimatorsSettings, FaceEstimator, FaceEstimatorsCollection
 from .estimators.base import ImageWithFaceDetection
 from .estimators.face_estimators.basic_attributes import BasicAttributes
 from .estimators.face_estimators.credibility import Credibility
@@ -40,6 +40,22 @@ class VLFaceDetectionSettings:
 
     # estimate mask from detection or warp
     estimateMaskFromDetection: bool = False
+    # estimate head pose by landmarks68 or bounding box
+    estimateHeadPoseByLandmarks68: bool = False
+
+
+def isLandmarks68Required(estimators: Iterable[FaceEstimator], estimationSettings: VLFaceDetectionSettings) -> bool:
+    """
+    Check whether estimators require landmarks68 of detections. Other estimators use landmarks5 (warps, eyes, gaze)
+    or bounding boxes only.
+
+    Args:
+        estimators: face estimators
+        estimationSettings: settings for estimation
+    Returns:
+        True if landmarks68 should be detected with faces otherwise they are estimated on demand
+    """
+    return estimationSettings.estimateHeadPoseByLandmarks68 and FaceEstimator.HeadPose in set(estimators)
 
 
 class VLFaceDetection(FaceDetection):
@@ -60,6 +76,7 @@ class VLFaceDetection(FaceDetection):
         _headPose (Optional[HeadPose]): lazy load head pose estimation
         _ags (Optional[float]): lazy load ags estimation
         _transformedLandmarks5 (Optional[Landmarks68]): lazy load transformed landmarks68
+        _landmarks68 (Optional[Landmarks68]): landmarks68 from detector or lazy load landmarks68 estimation
         _liveness (Optional[LivenessV1]): lazy load liveness estimation
     """
 
@@ -81,6 +98,7 @@ class VLFaceDetection(FaceDetection):
         "_glasses",
         "_liveness",
         "_credibility",
+        "_landmarks68",
     )
 
     def __init__(
@@ -137,17 +155,53 @@ class VLFaceDetection(FaceDetection):
             self._warp = self.estimatorCollection.warper.warp(self)
         return self._warp
 
+    @property  # type: ignore
+    def landmarks68(self) -> Landmarks68:
+        """
+        Get landmarks68 of the detection. Landmarks are estimated if the detector has not detected them.
+
+        Returns:
+            landmarks68
+        """
+        if self._landmarks68 is None:
+            estimator = self.estimatorCollection.landmarksEstimator
+            self._landmarks68 = estimator.estimate(self, FaceLandmarks.Landmarks68)  # type: ignore
+        return self._landmarks68
+
+    @landmarks68.setter
+    def landmarks68(self, landmarks68: Optional[Landmarks68]) -> None:
+        """
+        Set landmarks68 of the detection.
+
+        Args:
+            landmarks68: landmarks68 or None to estimate them on demand
+        """
+        self._landmarks68 = landmarks68
+
+    def _getKnownLandmarks68(self) -> Optional[Landmarks68]:
+        """
+        Get landmarks68 of the detection if they are detected or already estimated.
+
+        Returns:
+            landmarks68 or None
+        """
+        return self._landmarks68
+
     @property
     def headPose(self) -> HeadPose:
         """
-        Get a head pose of the detection. Estimation bases on an original and a bounding box
+        Get a head pose of the detection. Estimation bases on an original and a bounding box or landmarks68
+        (see `VLFaceDetectionSettings.estimateHeadPoseByLandmarks68`)
 
         Returns:
             head pose
         """
         if self._headPose is None:
-            imageWithFaceDetection = ImageWithFaceDetection(self.image, self.boundingBox)
-            self._headPose = self.estimatorCollection.headPoseEstimator.estimateByBoundingBox(imageWithFaceDetection)
+            estimator = self.estimatorCollection.headPoseEstimator
+            if self._estimationSettings.estimateHeadPoseByLandmarks68:
+                self._headPose = estimator.estimateBy68Landmarks(self.landmarks68)  # type: ignore
+            else:
+                self._headPose = estimator.estimateByBoundingBox(ImageWithFaceDetection(self.image, self.boundingBox))
         return self._headPose
 
     @property
@@ -311,25 +365,26 @@ class VLFaceDetection(FaceDetection):
 
     def asDict(self) -> Dict[str, Union[str, dict, list, float, tuple]]:
         """
-        Convert to dict.
+        Convert to dict. Coordinates are in the original image.
 
         Returns:
             All estimated attributes will be added to dict
         """
+        rect = self.originalRect
         res: Dict[str, Union[str, dict, list, float, tuple]] = {
             "rect": {
-                "x": int(self.boundingBox.rect.x),
-                "y": int(self.boundingBox.rect.y),
-                "width": int(self.boundingBox.rect.width),
-                "height": int(self.boundingBox.rect.height),
+                "x": int(rect.x),
+                "y": int(rect.y),
+                "width": int(rect.width),
+                "height": int(rect.height),
             }
         }
         if self._warpQuality is not None:
             res["quality"] = self.warpQuality.asDict()
         if self.landmarks5 is not None:
-            res["landmarks5"] = self.landmarks5.asDict()
-        if self.landmarks68 is not None:
-            res["landmarks68"] = self.landmarks68.asDict()
+            res["landmarks5"] = self.landmarks5.asDict(self.image.scale)
+        if self._landmarks68 is not None:
+            res["landmarks68"] = self._landmarks68.asDict(self.image.scale)
 
         attributes = {}
 
@@ -366,6 +421,41 @@ class VLFaceDetection(FaceDetection):
         return res
 
 
+#: map of face estimators to lazy attributes of VLFaceDetection
+FACE_ESTIMATOR_TO_SLOT = {
+    FaceEstimator.HeadPose: "_headPose",
+    FaceEstimator.Eye: "_eyes",
+    FaceEstimator.Emotions: "_emotions",
+    FaceEstimator.BasicAttributes: "_basicAttributes",
+    FaceEstimator.GazeDirection: "_gaze",
+    FaceEstimator.MouthState: "_mouthState",
+    FaceEstimator.WarpQuality: "_warpQuality",
+    FaceEstimator.AGS: "_ags",
+    FaceEstimator.Descriptor: "_descriptor",
+    FaceEstimator.Mask: "_mask",
+    FaceEstimator.Glasses: "_glasses",
+    FaceEstimator.LivenessV1: "_liveness",
+    FaceEstimator.Credibility: "_credibility",
+}
+
+#: map of face estimators (which estimate by warps) to estimators collection attributes
+FACE_ESTIMATOR_TO_COLLECTION_ATTRIBUTE = {
+    FaceEstimator.Emotions: "emotionsEstimator",
+    FaceEstimator.MouthState: "mouthStateEstimator",
+    FaceEstimator.WarpQuality: "warpQualityEstimator",
+    FaceEstimator.Mask: "maskEstimator",
+    FaceEstimator.Glasses: "glassesEstimator",
+    FaceEstimator.Credibility: "credibilityEstimator",
+}
+
+
+#: map of face estimators to settings of VLFaceDetection which select the estimation method
+FACE_ESTIMATOR_TO_SETTING = {
+    FaceEstimator.HeadPose: "estimateHeadPoseByLandmarks68",
+    FaceEstimator.Mask: "estimateMaskFromDetection",
+}
+
+
 @dataclass
 class FaceDetectorSettings:
     """Face detector settings"""
@@ -384,6 +474,7 @@ class VLFaceDetector:
           estimatorsCollection (FaceEstimatorsCollection): face estimator collections for new detections.
           _faceDetector (FaceDetector): face detector
           faceEngine (VLFaceEngine): face engine for detector and estimators, default *FACE_ENGINE*.
+          _detect68Landmarks (bool): whether detect landmarks68 with faces (see `isLandmarks68Required`)
     """
 
     #: a global instance of FaceEngine for usual creating detectors
@@ -397,6 +488,7 @@ class VLFaceDetector:
         faceEngine: Optional[VLFaceEngine] = None,
         estimationSettings: Optional[VLFaceDetectionSettings] = None,
         estimatorsSettings: Optional[EstimatorsSettings] = None,
+        estimators: Optional[Iterable[FaceEstimator]] = None,
     ):
         """
         Init.
@@ -406,6 +498,8 @@ class VLFaceDetector:
             faceEngine: face engine for detector and estimators
             estimationSettings: settings for estimation
             estimatorsSettings: settings for estimators creation
+            estimators: face estimators which estimations are expected from detections, landmarks68 are detected with
+                        faces if these estimators require them otherwise landmarks68 are estimated on demand
         """
         if faceEngine is None:
             if not hasattr(self, "faceEngine"):
@@ -423,6 +517,9 @@ class VLFaceDetector:
             detectorSettings.detectorType, launchOptions=detectorSettings.launchOptions
         )
         self._estimationSettings: Optional[VLFaceDetectionSettings] = estimationSettings
+        self._detect68Landmarks: bool = isLandmarks68Required(
+            estimators or (), estimationSettings or VLFaceDetectionSettings()
+        )
 
     @classmethod
     def initialize(
@@ -452,7 +549,7 @@ class VLFaceDetector:
         Returns:
             face detection if face is found otherwise None
         """
-        detectRes = self._faceDetector.detectOne(image, detectArea, True, True)
+        detectRes = self._faceDetector.detectOne(image, detectArea, True, self._detect68Landmarks)
         if detectRes is None:
             return None
         return VLFaceDetection(
@@ -514,9 +611,163 @@ class VLFaceDetector:
         Returns:
             return list of lists detection, order of detection lists is corresponding to order of input images
         """
-        detectRes = self._faceDetector.detect(images, limit, True, True)
+        return self._detect(images, limit, self._detect68Landmarks)
+
+    def _detect(
+        self, images: List[Union[VLImage, ImageForDetection]], limit: int, detect68Landmarks: bool
+    ) -> List[List[VLFaceDetection]]:
+        """
+        Batch detect faces on images.
+
+        Args:
+            images: input images list. Format must be R8G8B8
+            limit: max number of detections per input image
+            detect68Landmarks: whether detect landmarks68
+        Returns:
+            return list of lists detection, order of detection lists is corresponding to order of input images
+        """
+        detectRes = self._faceDetector.detect(images, limit, True, detect68Landmarks)
         return self.postProcessingDetectionBatch(detectRes)  # type: ignore
 
+    def detectAndEstimate(
+        self, images: List[Union[VLImage, ImageForDetection]], attributes: Iterable[FaceEstimator], limit: int = 5
+    ) -> List[List[VLFaceDetection]]:
+        """
+        Batch detect faces on images and estimate attributes of all detected faces.
+
+        Each requested estimator is called once for all faces of all images, estimations are stored to the
+        corresponding lazy attributes of detections.
+
+        Args:
+            images: input images list. Format must be R8G8B8
+            attributes: face estimators which estimations will be calculated
+            limit: max number of detections per input image
+        Returns:
+            return list of lists detection, order of detection lists is corresponding to order of input images
+        Raises:
+            LunaSDKException: if estimation failed
+            ValueError: if estimator does not estimate a face attribute
+        """
+        attributes = set(attributes)
+        estimationSettings = self._estimationSettings or VLFaceDetectionSettings()
+        detections = self._detect(images, limit, isLandmarks68Required(attributes, estimationSettings))
+        self.estimateAttributes(
+            [detection for imageDetections in detections for detection in imageDetections], attributes
+        )
+        return detections
+
+    def estimateAttributes(self, detections: List[VLFaceDetection], attributes: Iterable[FaceEstimator]) -> None:
+        """
+        Estimate attributes of detections by batches. Each estimator is called once for all detections which have not
+        the corresponding estimation yet.
+
+        Args:
+            detections: detections
+            attributes: face estimators which estimations will be calculated
+        Raises:
+            LunaSDKException: if estimation failed
+            ValueError: if estimator does not estimate a face attribute
+        """
+        attributes = set(attributes)
+        if FaceEstimator.OrientationMode in attributes:
+            raise ValueError("Orientation mode is not a face attribute")
+        for attribute in attributes:
+            slotName = FACE_ESTIMATOR_TO_SLOT[attribute]
+            toEstimate = [detection for detection in detections if getattr(detection, slotName) is None]
+            # detections may have different settings which select the estimation method of the attribute
+            settingName = FACE_ESTIMATOR_TO_SETTING.get(attribute)
+            groups: Dict[bool, List[VLFaceDetection]] = {}
+            for detection in toEstimate:
+                key = bool(settingName and getattr(detection.estimationSettings, settingName))
+                groups.setdefault(key, []).append(detection)
+            for group in groups.values():
+                for detection, estimation in zip(group, self._estimateAttributeBatch(group, attribute)):
+                    setattr(detection, slotName, estimation)
+
+    def _estimateAttributeBatch(self, detections: List[VLFaceDetection], attribute: FaceEstimator) -> list:
+        """
+        Estimate an attribute of detections with the same estimation settings by a batch.
+
+        Args:
+            detections: not empty list of detections
+            attribute: face estimator
+        Returns:
+            estimations of detections
+        Raises:
+            LunaSDKException: if estimation failed
+        """
+        collection = self.estimatorsCollection
+        estimationSettings = detections[0].estimationSettings
+        if attribute == FaceEstimator.HeadPose and estimationSettings.estimateHeadPoseByLandmarks68:
+            # head pose estimator has not batch estimation by landmarks
+            return [
+                collection.headPoseEstimator.estimateBy68Landmarks(landmarks68)
+                for landmarks68 in self.estimateLandmarks68(detections)
+            ]
+        if attribute == FaceEstimator.HeadPose:
+            return collection.headPoseEstimator.estimateBatch(detections)
+        if attribute == FaceEstimator.AGS:
+            return collection.AGSEstimator.estimateBatch(detections)
+        if attribute == FaceEstimator.LivenessV1:
+            return collection.livenessV1Estimator.estimateBatch(detections)
+        if attribute == FaceEstimator.Mask and estimationSettings.estimateMaskFromDetection:
+            # mask estimator has not batch estimation by detections
+            return [collection.maskEstimator.estimate(row) for row in detections]
+        self._fillWarps(detections)
+        if attribute == FaceEstimator.Eye:
+            return collection.eyeEstimator.estimateBatch(
+                [WarpWithLandmarks(row.warp, row._getTransformedLandmarks5()) for row in detections]
+            )
+        if attribute == FaceEstimator.GazeDirection:
+            return collection.gazeDirectionEstimator.estimateBatch(
+                [WarpWithLandmarks5(row.warp, row._getTransformedLandmarks5()) for row in detections]
+            )
+        if attribute == FaceEstimator.BasicAttributes:
+            estimations, _ = collection.basicAttributesEstimator.estimateBasicAttributesBatch(
+                [row.warp for row in detections], estimateAge=True, estimateGender=True, estimateEthnicity=True
+            )
+            return estimations
+        if attribute == FaceEstimator.Descriptor:
+            descriptorBatch, _ = collection.descriptorEstimator.estimateDescriptorsBatch(
+                [row.warp for row in detections]
+            )
+            return list(descriptorBatch)
+        estimator = getattr(collection, FACE_ESTIMATOR_TO_COLLECTION_ATTRIBUTE[attribute])
+        return estimator.estimateBatch([row.warp for row in detections])
+
+    def _fillWarps(self, detections: List[VLFaceDetection]) -> None:
+        """
+        Warp detections without a warp by a batch (see `FaceWarper.warpBatch`).
+
+        Args:
+            detections: detections
+        Raises:
+            LunaSDKException: if warping failed
+        """
+        toWarp = [detection for detection in detections if detection._warp is None]
+        if toWarp:
+            for detection, warp in zip(toWarp, self.estimatorsCollection.warper.warpBatch(toWarp)):
+                detection._warp = warp
+
+    def estimateLandmarks68(self, detections: List[VLFaceDetection]) -> List[Landmarks68]:
+        """
+        Estimate landmarks68 of detections by a batch. Only detections without landmarks68 are estimated.
+
+        Args:
+            detections: detections
+        Returns:
+            landmarks68 of detections
+        Raises:
+            LunaSDKException: if estimation failed
+        """
+        toEstimate = [detection for detection in detections if detection._landmarks68 is None]
+        if toEstimate:
+            estimator = self.estimatorsCollection.landmarksEstimator
+            estimations = estimator.estimateBatch(toEstimate, FaceLandmarks.Landmarks68)  # type: ignore
+            for detection, landmarks68 in zip(toEstimate, estimations):
+                detection.landmarks68 = landmarks68
+        return [detection.landmarks68 for detection in detections]
+
     def redetectOne(self, image: Union[VLImage, VLFaceDetection], bBox: Rect) -> Union[VLFaceDetection, None]:
         """
         Redetect faces on an image. If VLFaceDetection is provided, only VLImage from that object will be used.
@@ -532,7 +783,7 @@ class VLFaceDetector:
         else:
             imageForRedetct = image
         redetection: Union[None, FaceDetection] = self._faceDetector.redetectOne(
-            imageForRedetct, bBox=bBox, detect5Landmarks=True, detect68Landmarks=True
+            imageForRedetct, bBox=bBox, detect5Landmarks=True, detect68Landmarks=self._detect68Landmarks
         )
         return self.postProcessing(redetection)
 
@@ -551,7 +802,7 @@ class VLFaceDetector:
                 Order of detections is corresponding to order of input bounding boxes.
         """
 
-        redetections = self._faceDetector.redetect(imagesAndBBoxes, True, True)
+        redetections = self._faceDetector.redetect(imagesAndBBoxes, True, self._detect68Landmarks)
         return self.postProcessingDetectionBatch(redetections)
 
 
@@ -0,0 +1,130 @@
+"""
+Module contains validation policy of input data of detectors and estimators.
+
+Before a core call, detectors and estimators validate input data by the core `validate` method. The validation
+builds a detailed error of each batch item, but it doubles the bookkeeping for input which is known to be valid.
+The policy defines when the validation runs:
+
+    - `ValidationPolicy.always` - before each core call (default)
+    - `ValidationPolicy.onError` - only after a failed core call, to raise an exception with detailed errors
+    - `ValidationPolicy.never` - never, a failed core call raises an exception with the core error only
+
+The policy is set for the process by `setValidationPolicy` and may be overridden for a block of calls by the
+`validationPolicy` context manager.
+
+>>> with validationPolicy("never"):
+...     detections = detector.detect(images)  # doctest: +SKIP
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Generator, Optional, TypeVar, Union
+
+from FaceEngine import FSDKErrorResult  # pylint: disable=E0611,E0401
+
+#: post processing result type
+_T = TypeVar("_T")
+
+
+class ValidationPolicy(Enum):
+    """Validation policy of input data"""
+
+    #: validate before each core call
+    always = "always"
+    #: validate only after a failed core call
+    onError = "on-error"
+    #: never validate
+    never = "never"
+
+
+_defaultPolicy = ValidationPolicy.always
+_policy: ContextVar[Optional[ValidationPolicy]] = ContextVar("validationPolicy", default=None)
+
+
+def setValidationPolicy(policy: Union[ValidationPolicy, str]) -> None:
+    """
+    Set validation policy for all detectors and estimators.
+
+    Args:
+        policy: policy or its value
+    Raises:
+        ValueError: if the policy is unknown
+    """
+    global _defaultPolicy  # pylint: disable=W0603
+    _defaultPolicy = ValidationPolicy(policy)
+
+
+def getValidationPolicy() -> ValidationPolicy:
+    """
+    Get current validation policy.
+
+    Returns:
+        the policy of the `validationPolicy` block if any otherwise the policy set by `setValidationPolicy`
+    """
+    policy = _policy.get()
+    return _defaultPolicy if policy is None else policy
+
+
+@contextmanager
+def validationPolicy(policy: Union[ValidationPolicy, str]) -> Generator[None, None, None]:
+    """
+    Override validation policy for calls in the block. The override is local for the current thread (and asyncio
+    task), background estimations (`asyncEstimate=True`) use the policy of the call which starts them.
+
+    Args:
+        policy: policy or its value
+    Raises:
+        ValueError: if the policy is unknown
+    """
+    token = _policy.set(ValidationPolicy(policy))
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+def _postProcessingWithValidation(
+    error: FSDKErrorResult, *coreResult: Any, postProcessing: Callable[..., _T], validate: Callable[[], None]
+) -> _T:
+    """
+    Run validation if a core call is failed and post processing.
+
+    Args:
+        error: core call error
+        coreResult: rest of the core call result
+        postProcessing: post processing of the core call result
+        validate: validation of the core call input
+    Returns:
+        post processing result
+    Raises:
+        LunaSDKException: if the input is not valid or the core call is failed
+    """
+    if error.isError:
+        validate()
+    return postProcessing(error, *coreResult)
+
+
+def applyValidationPolicy(
+    postProcessing: Callable[..., _T], validate: Callable[..., None], *args: Any
+) -> Callable[..., _T]:
+    """
+    Validate input data of a core call according to the current validation policy.
+
+    Args:
+        postProcessing: post processing of the core call result (error first)
+        validate: validation function
+        args: validation function arguments
+    Returns:
+        post processing of the core call result, it runs the validation on the core call error for
+        `ValidationPolicy.onError`
+    Raises:
+        LunaSDKException: if the input is not valid and the policy is `ValidationPolicy.always`
+    """
+    policy = getValidationPolicy()
+    if policy == ValidationPolicy.always:
+        validate(*args)
+        return postProcessing
+    if policy == ValidationPolicy.never:
+        return postProcessing
+    return partial(_postProcessingWithValidation, postProcessing=postProcessing, validate=partial(validate, *args))
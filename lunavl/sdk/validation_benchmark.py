@@ -0,0 +1,90 @@
+"""
+Module contains benchmark of validation policies (see `lunavl.sdk.validation`).
+
+Run it over a few images with faces::
+
+    python -m lunavl.sdk.validation_benchmark image1.jpg image2.jpg --repeat 100
+
+Each call is timed under every policy, the difference between "always" and "never" is the cost of the input
+validation, "on-error" costs as much as "never" for valid input.
+"""
+import argparse
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+from .validation import ValidationPolicy, validationPolicy
+
+
+def benchmarkValidationPolicies(
+    call: Callable[[], object], repeat: int = 100, warmup: int = 3
+) -> Dict[ValidationPolicy, float]:
+    """
+    Measure mean duration of a call under each validation policy.
+
+    Args:
+        call: detector or estimator call with bound arguments
+        repeat: count of measured calls per policy
+        warmup: count of calls before measurement
+    Returns:
+        mean call duration (seconds) for each policy
+    Raises:
+        ValueError: if repeat is not positive
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat must be positive, got {repeat}")
+    for _ in range(warmup):
+        call()
+    res = {}
+    for policy in ValidationPolicy:
+        with validationPolicy(policy):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                call()
+            res[policy] = (time.perf_counter() - start) / repeat
+    return res
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    """
+    Run benchmark from the command line.
+
+    Args:
+        arguments: command line arguments, `sys.argv` by default
+    """
+    from .detectors.base import ImageForRedetection
+    from .faceengine.engine import VLFaceEngine
+    from .faceengine.setting_provider import DetectorType
+    from .image_utils.image import VLImage
+
+    parser = argparse.ArgumentParser(description="Duration of detector and estimator calls under validation policies")
+    parser.add_argument("images", nargs="+", help="images with faces")
+    parser.add_argument("--repeat", type=int, default=100, help="count of measured calls per policy")
+    args = parser.parse_args(arguments)
+
+    faceEngine = VLFaceEngine()
+    detector = faceEngine.createFaceDetector(DetectorType.FACE_DET_V3)
+    warper = faceEngine.createFaceWarper()
+    images = [VLImage.load(filename=filename) for filename in args.images]
+    detections = [imageDetections[0] for imageDetections in detector.detect(images, limit=1) if imageDetections]
+    warps = [warper.warp(detection) for detection in detections]
+    redetectImages = [ImageForRedetection(detection.image, [detection.boundingBox.rect]) for detection in detections]
+    headPoseEstimator = faceEngine.createHeadPoseEstimator()
+    maskEstimator = faceEngine.createMaskEstimator()
+    calls = {
+        "FaceDetector.detect": lambda: detector.detect(images, limit=1),
+        "FaceDetector.redetect": lambda: detector.redetect(redetectImages),
+        "HeadPoseEstimator.estimateBatch": lambda: headPoseEstimator.estimateBatch(detections),
+        "MaskEstimator.estimateBatch": lambda: maskEstimator.estimateBatch(warps),
+    }
+    for name, call in calls.items():
+        durations = benchmarkValidationPolicies(call, args.repeat)
+        always = durations[ValidationPolicy.always]
+        report = " ".join(
+            f"{policy.value}={duration * 1000:.3f} ms (saved {(1 - duration / always) * 100:.1f}%)"
+            for policy, duration in durations.items()
+        )
+        print(f"{name}: {report}")
+
+
+if __name__ == "__main__":
+    main()
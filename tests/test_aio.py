@@ -0,0 +1,117 @@
+"""
+Test awaitable api.
+"""
+import asyncio
+
+import pytest
+
+from lunavl.sdk.aio import AsyncFaceEngine, InFlightLimiter
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor
+from lunavl.sdk.detectors.facedetector import FaceDetection
+from lunavl.sdk.errors.errors import LunaVLError
+from lunavl.sdk.errors.exceptions import LunaSDKException
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.estimators.face_estimators.mask import Mask
+from lunavl.sdk.image_utils.image import VLImage
+from lunavl.sdk.indexes.base import IndexResult
+from tests.base import BaseTestClass
+from tests.detect_test_class import VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE
+from tests.resources import WARP_CLEAN_FACE
+
+
+class TestAio(BaseTestClass):
+    """
+    Test of awaitable detectors, estimators and indexes.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.warp = FaceWarpedImage(VLImage.load(filename=WARP_CLEAN_FACE))
+
+    def test_detect(self):
+        """
+        Test awaitable detection
+        """
+        asyncEngine = AsyncFaceEngine(self.faceEngine, maxInFlight=2)
+        detector = asyncEngine.createFaceDetector()
+
+        async def detect():
+            return await asyncio.gather(
+                detector.detectOne(VLIMAGE_ONE_FACE), detector.detect([VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE])
+            )
+
+        detection, detections = asyncio.run(detect())
+        assert isinstance(detection, FaceDetection)
+        assert 2 == len(detections)
+        assert 2 == asyncEngine.metrics["completed"]
+        assert 0 == asyncEngine.limiter.inFlightCount
+
+    def test_estimate_descriptor_and_search(self):
+        """
+        Test awaitable descriptor estimation and index search
+        """
+        asyncEngine = AsyncFaceEngine(self.faceEngine)
+        estimator = asyncEngine.createFaceDescriptorEstimator()
+
+        async def estimate():
+            return await estimator.estimate(self.warp)
+
+        descriptor = asyncio.run(estimate())
+        assert isinstance(descriptor, FaceDescriptor)
+        builder = self.faceEngine.createIndexBuilder()
+        builder.append(descriptor)
+        index = asyncEngine.wrapIndex(builder.buildIndex())
+        index.append(descriptor)
+        assert 2 == index.descriptorsCount
+
+        async def search():
+            return await index.search(descriptor, 2)
+
+        results = asyncio.run(search())
+        assert 2 == len(results)
+        assert all(isinstance(result, IndexResult) for result in results)
+
+    def test_wrap_estimator(self):
+        """
+        Test awaitable estimation by a wrapped estimator
+        """
+        estimator = AsyncFaceEngine(self.faceEngine).wrapEstimator(self.faceEngine.createMaskEstimator())
+
+        async def estimate():
+            return await asyncio.gather(estimator.estimate(self.warp), estimator.estimateBatch([self.warp, self.warp]))
+
+        mask, masks = asyncio.run(estimate())
+        assert isinstance(mask, Mask)
+        assert 2 == len(masks)
+
+    def test_in_flight_limit(self):
+        """
+        Test count of simultaneous tasks is limited and extra waiting requests are rejected
+        """
+        limiter = InFlightLimiter(maxInFlight=1, maxWaiting=1)
+        maxInFlight = 0
+
+        async def task():
+            nonlocal maxInFlight
+            maxInFlight = max(maxInFlight, limiter.inFlightCount)
+            await asyncio.sleep(0.01)
+
+        async def run():
+            return await asyncio.gather(*[limiter.run(task) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert 1 == maxInFlight
+        assert [None, None] == results[:2]
+        assert isinstance(results[2], LunaSDKException)
+        assert LunaVLError.TooManyRequests.errorCode == results[2].error.errorCode
+        assert 1 == limiter.rejectedCount
+
+    def test_bad_limiter_parameters(self):
+        """
+        Test limiter with bad parameters
+        """
+        with pytest.raises(ValueError):
+            InFlightLimiter(maxInFlight=0)
+        with pytest.raises(ValueError):
+            InFlightLimiter(maxWaiting=-1)
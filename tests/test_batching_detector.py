@@ -0,0 +1,88 @@
+"""
+Test micro batching face detector.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lunavl.sdk.detectors.batchingdetector import BatchingFaceDetector
+from lunavl.sdk.detectors.facedetector import FaceDetection
+from lunavl.sdk.errors.errors import LunaVLError
+from lunavl.sdk.errors.exceptions import LunaSDKException
+from lunavl.sdk.faceengine.setting_provider import DetectorType
+from lunavl.sdk.image_utils.image import ColorFormat, VLImage
+from tests.base import BaseTestClass
+from tests.detect_test_class import GOOD_AREA, VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE
+from tests.resources import ONE_FACE
+
+
+class TestBatchingFaceDetector(BaseTestClass):
+    """
+    Test of micro batching face detector.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.detector = cls.faceEngine.createFaceDetector(DetectorType.FACE_DET_V3)
+
+    def test_concurrent_detect_same_as_batch_detect(self):
+        """
+        Test concurrent submissions return the same detections as a direct batch detect
+        """
+        images = [VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE] * 8
+        expected = self.detector.detect(images)
+        with BatchingFaceDetector(self.detector, maxBatchSize=4, maxWaitTime=0.05) as batchingDetector:
+            with ThreadPoolExecutor(max_workers=len(images)) as executor:
+                detections = list(executor.map(batchingDetector.detect, images))
+        assert len(expected) == len(detections)
+        for expectedImageDetections, imageDetections in zip(expected, detections):
+            assert len(expectedImageDetections) == len(imageDetections)
+            for expectedDetection, detection in zip(expectedImageDetections, imageDetections):
+                assert isinstance(detection, FaceDetection)
+                assert expectedDetection.boundingBox.rect == detection.boundingBox.rect
+
+    def test_detect_one_with_area(self):
+        """
+        Test detect one with a detect area
+        """
+        with BatchingFaceDetector(self.detector) as batchingDetector:
+            detection = batchingDetector.detectOne(VLIMAGE_ONE_FACE, detectArea=GOOD_AREA)
+        assert isinstance(detection, FaceDetection)
+        assert detection.image is VLIMAGE_ONE_FACE
+
+    def test_async_detect(self):
+        """
+        Test awaitable detect
+        """
+
+        async def detect():
+            return await asyncio.gather(*[batchingDetector.asyncDetect(VLIMAGE_ONE_FACE) for _ in range(4)])
+
+        with BatchingFaceDetector(self.detector, maxBatchSize=4, maxWaitTime=0.05) as batchingDetector:
+            detections = asyncio.run(detect())
+        assert 4 == len(detections)
+        assert all(len(imageDetections) == 1 for imageDetections in detections)
+
+    def test_error_does_not_affect_other_callers(self):
+        """
+        Test a bad image in a batch raises an error only for its own caller
+        """
+        badImage = VLImage.load(filename=ONE_FACE, colorFormat=ColorFormat.B8G8R8)
+        with BatchingFaceDetector(self.detector, maxBatchSize=3, maxWaitTime=0.1) as batchingDetector:
+            futures = [batchingDetector.submit(image) for image in (VLIMAGE_ONE_FACE, badImage, VLIMAGE_ONE_FACE)]
+            assert 1 == len(futures[0].result())
+            assert 1 == len(futures[2].result())
+            with pytest.raises(LunaSDKException) as exceptionInfo:
+                futures[1].result()
+        self.assertLunaVlError(exceptionInfo, LunaVLError.BatchedInternalError)
+
+    def test_submit_to_closed_detector(self):
+        """
+        Test submit to a closed detector
+        """
+        batchingDetector = BatchingFaceDetector(self.detector)
+        batchingDetector.close()
+        with pytest.raises(RuntimeError):
+            batchingDetector.submit(VLIMAGE_ONE_FACE)
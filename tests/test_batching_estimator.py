@@ -0,0 +1,96 @@
+"""
+Test micro batching estimator.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lunavl.sdk.descriptors.descriptors import FaceDescriptor
+from lunavl.sdk.estimators.batching import BatchingEstimator
+from lunavl.sdk.estimators.face_estimators.basic_attributes import BasicAttributes
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.estimators.face_estimators.mask import Mask
+from lunavl.sdk.image_utils.image import VLImage
+from tests.base import BaseTestClass
+from tests.detect_test_class import VLIMAGE_ONE_FACE
+from tests.resources import WARP_CLEAN_FACE, WARP_WHITE_MAN
+
+
+class TestBatchingEstimator(BaseTestClass):
+    """
+    Test of micro batching estimator.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.warps = [
+            FaceWarpedImage(VLImage.load(filename=WARP_WHITE_MAN)),
+            FaceWarpedImage(VLImage.load(filename=WARP_CLEAN_FACE)),
+        ] * 4
+
+    def test_concurrent_estimate_same_as_batch_estimate(self):
+        """
+        Test concurrent estimations return the same results as a direct batch estimation
+        """
+        estimator = self.faceEngine.createMaskEstimator()
+        expected = estimator.estimateBatch(self.warps)
+        with BatchingEstimator(estimator, maxBatchSize=4, maxWaitTime=0.05) as batchingEstimator:
+            with ThreadPoolExecutor(max_workers=len(self.warps)) as executor:
+                masks = list(executor.map(batchingEstimator.estimate, self.warps))
+        assert len(expected) == len(masks)
+        for expectedMask, mask in zip(expected, masks):
+            assert isinstance(mask, Mask)
+            assert expectedMask.asDict() == mask.asDict()
+
+    def test_estimate_with_keyword_arguments(self):
+        """
+        Test estimations with different keyword arguments are batched separately
+        """
+        estimator = self.faceEngine.createBasicAttributesEstimator()
+        with BatchingEstimator(estimator, maxBatchSize=4, maxWaitTime=0.05) as batchingEstimator:
+            ageFuture = batchingEstimator.submit(
+                self.warps[0], estimateAge=True, estimateGender=False, estimateEthnicity=False
+            )
+            genderFuture = batchingEstimator.submit(
+                self.warps[0], estimateAge=False, estimateGender=True, estimateEthnicity=False
+            )
+            age, gender = ageFuture.result(), genderFuture.result()
+        assert isinstance(age, BasicAttributes) and isinstance(gender, BasicAttributes)
+        assert age.age is not None and age.gender is None
+        assert gender.gender is not None and gender.age is None
+
+    def test_async_estimate(self):
+        """
+        Test awaitable descriptor estimation
+        """
+        estimator = self.faceEngine.createFaceDescriptorEstimator()
+
+        async def estimate():
+            return await asyncio.gather(*[batchingEstimator.asyncEstimate(warp) for warp in self.warps])
+
+        with BatchingEstimator(estimator, maxBatchSize=4, maxWaitTime=0.05) as batchingEstimator:
+            descriptors = asyncio.run(estimate())
+        assert len(self.warps) == len(descriptors)
+        assert all(isinstance(descriptor, FaceDescriptor) for descriptor in descriptors)
+        assert descriptors[0].asBytes == estimator.estimate(self.warps[0]).asBytes
+
+    def test_not_batchable_object(self):
+        """
+        Test mask estimation from a detection is estimated without batching
+        """
+        estimator = self.faceEngine.createMaskEstimator()
+        detection = self.faceEngine.createFaceDetector().detectOne(VLIMAGE_ONE_FACE)
+        with BatchingEstimator(estimator) as batchingEstimator:
+            futures = [batchingEstimator.submit(detection), batchingEstimator.submit(self.warps[0])]
+            assert all(isinstance(future.result(), Mask) for future in futures)
+
+    def test_submit_to_closed_estimator(self):
+        """
+        Test submit to a closed estimator
+        """
+        batchingEstimator = BatchingEstimator(self.faceEngine.createCredibilityEstimator())
+        batchingEstimator.close()
+        with pytest.raises(RuntimeError):
+            batchingEstimator.submit(self.warps[0])
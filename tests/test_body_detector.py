@@ -322,3 +322,21 @@ class TestBodyDetector(BodyDetectTestClass):
         self.assertAsyncEstimation(task, BodyDetection)
         task = self.detector.detect([VLIMAGE_ONE_FACE] * 2, asyncEstimate=True)
         self.assertAsyncBatchEstimation(task, BodyDetection)
+
+    def test_detect_arrays_output(self):
+        """
+        Test columnar output of batch body detection matches detection objects
+        """
+        images = [VLIMAGE_SEVERAL_FACE, VLIMAGE_ONE_FACE]
+        detections = self.detector.detect(images, limit=20)
+        arrays = self.detector.detect(images, limit=20, output="arrays")
+        assert [len(imageDetections) for imageDetections in detections] == [
+            arrays.getImageRows(imageIdx).stop - arrays.getImageRows(imageIdx).start for imageIdx in range(len(images))
+        ]
+        assert (len(arrays), 17, 2) == arrays.landmarks17.shape
+        assert (len(arrays), 17) == arrays.landmarks17Scores.shape
+        for row, detection in enumerate(detection for imageDetections in detections for detection in imageDetections):
+            assert detection.boundingBox.score == pytest.approx(arrays.scores[row])
+            assert detection.asDict() == arrays.detection(row).asDict()
+        arrays = self.detector.detect(images, detectLandmarks=False, asyncEstimate=True, output="arrays").get()
+        assert arrays.landmarks17 is None
@@ -59,3 +59,19 @@ class TestCredibility(BaseTestClass):
         task = self.credibilityEstimator.estimate(self.warp, asyncEstimate=True)
         self.assertAsyncEstimation(task, Credibility)
         self.assertCredibilityEstimation(task.get(), 0.926)
+
+    def test_estimate_batch(self):
+        """
+        Test credibility batch estimations
+        """
+        credibilities = self.credibilityEstimator.estimateBatch([self.warp, self.warp])
+        assert 2 == len(credibilities)
+        for credibility in credibilities:
+            self.assertCredibilityEstimation(credibility, 0.926)
+
+    def test_async_estimate_batch(self):
+        """
+        Test async credibility batch estimations
+        """
+        task = self.credibilityEstimator.estimateBatch([self.warp, self.warp], asyncEstimate=True)
+        self.assertAsyncBatchEstimation(task, Credibility)
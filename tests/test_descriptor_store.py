@@ -0,0 +1,98 @@
+"""
+Test descriptor store.
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from lunavl.sdk.descriptors.store import DescriptorStore
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.image_utils.image import VLImage
+from tests.base import BaseTestClass
+from tests.resources import WARP_CLEAN_FACE, WARP_WHITE_MAN
+
+
+class TestDescriptorStore(BaseTestClass):
+    """
+    Test of descriptor store.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.extractor = cls.faceEngine.createFaceDescriptorEstimator()
+        warps = [FaceWarpedImage(VLImage.load(filename=filename)) for filename in (WARP_WHITE_MAN, WARP_CLEAN_FACE)]
+        cls.descriptorBatch, _ = cls.extractor.estimateDescriptorsBatch(warps)
+
+    def setUp(self) -> None:
+        self.temporaryDirectory = tempfile.TemporaryDirectory()
+        self.path = Path(self.temporaryDirectory.name) / "descriptors.lvds"
+
+    def tearDown(self) -> None:
+        self.temporaryDirectory.cleanup()
+
+    def test_save_load(self):
+        """
+        Test store saving and memory mapped loading
+        """
+        store = DescriptorStore.fromDescriptors(self.descriptorBatch, ids=[10, 20])
+        store.save(self.path)
+        loadedStore = DescriptorStore.load(self.path)
+        assert isinstance(loadedStore.descriptors, np.memmap)
+        assert len(self.descriptorBatch) == len(loadedStore)
+        assert store.descriptorVersion == loadedStore.descriptorVersion
+        assert (store.descriptors == loadedStore.descriptors).all()
+        assert np.allclose(store.scores, loadedStore.scores)
+        assert [10, 20] == loadedStore.ids.tolist()
+
+    def test_to_batch_and_index(self):
+        """
+        Test feeding an index builder by store batches
+        """
+        DescriptorStore.fromDescriptors(self.descriptorBatch).save(self.path)
+        store = DescriptorStore.load(self.path)
+        builder = self.faceEngine.createIndexBuilder()
+        for batch in store.iterBatches(self.extractor.descriptorFactory, batchSize=1):
+            builder.appendBatch(batch)
+        assert len(self.descriptorBatch) == builder.bufSize
+        for descriptor, storedDescriptor in zip(self.descriptorBatch, store.toBatch(self.extractor.descriptorFactory)):
+            assert descriptor.asBytes == storedDescriptor.asBytes
+
+    def test_matcher(self):
+        """
+        Test matcher over a store
+        """
+        store = DescriptorStore.fromDescriptors(self.descriptorBatch)
+        indexes, _, _ = store.asMatcher().search(store.descriptors)
+        assert [[0], [1]] == indexes.tolist()
+
+    def test_matcher_of_memory_mapped_store(self):
+        """
+        Test matcher candidates are memory mapped descriptors of a store and not a copy
+        """
+        DescriptorStore.fromDescriptors(list(self.descriptorBatch)).save(self.path)
+        store = DescriptorStore.load(self.path)
+        matcher = store.asMatcher(blockSize=1)
+        assert matcher.candidates is store.descriptors
+        assert isinstance(matcher.candidates, np.memmap)
+        indexes, _, _ = matcher.search(store.descriptors)
+        assert [[0], [1]] == indexes.tolist()
+
+    def test_empty_store(self):
+        """
+        Test saving and loading of an empty store
+        """
+        DescriptorStore(np.empty((0, 512), dtype=np.uint8), descriptorVersion=59).save(self.path)
+        store = DescriptorStore.load(self.path)
+        assert 0 == len(store)
+        assert 512 == store.descriptorLength
+
+    def test_load_bad_file(self):
+        """
+        Test loading not a store file
+        """
+        self.path.write_bytes(b"not a descriptor store file at all")
+        with pytest.raises(ValueError):
+            DescriptorStore.load(self.path)
@@ -223,6 +223,39 @@ class TestDescriptorFunctionality(BaseTestClass):
                         descriptorBatch.append(case.aggregatedDescriptor)
                         assert idx + 1 == len(descriptorBatch)
 
+    def test_descriptor_batch_as_numpy(self):
+        """
+        Test conversion descriptor batch to numpy array and back.
+        """
+        for subTest, case in self.descriptorSubTest():
+            with subTest:
+                descriptorBatch = case.descriptorBatch
+                array = descriptorBatch.asNumpy()
+                assert (len(descriptorBatch), len(descriptorBatch[0].asBytes)) == array.shape
+                for idx, descriptor in enumerate(descriptorBatch):
+                    assert descriptor.asBytes == array[idx].tobytes()
+
+                scores = [0.5] * len(descriptorBatch)
+                restoredBatch = descriptorBatch.fromNumpy(
+                    array, case.estimator.descriptorFactory, scores, descriptorBatch[0].model
+                )
+                assert isinstance(restoredBatch, descriptorBatch.__class__)
+                assert len(descriptorBatch) == len(restoredBatch)
+                for descriptor, restoredDescriptor in zip(descriptorBatch, restoredBatch):
+                    assert descriptor.asBytes == restoredDescriptor.asBytes
+                    assert descriptor.model == restoredDescriptor.model
+                    assert 0.5 == restoredDescriptor.garbageScore
+
+    def test_descriptor_batch_from_numpy_bad_length(self):
+        """
+        Test creation descriptor batch from numpy array with incorrect descriptor length.
+        """
+        array = self.faceDescriptorBatch.asNumpy()
+        with pytest.raises(ValueError):
+            FaceDescriptorBatch.fromNumpy(
+                array[:, :-1], self.faceEstimator.descriptorFactory, descriptorVersion=self.faceDescriptorVersion
+            )
+
 
 class TestEstimateDescriptor(BaseTestClass):
     """
@@ -0,0 +1,76 @@
+"""
+Test face tracker.
+"""
+import numpy as np
+import pytest
+
+from lunavl.sdk.detectors.facetracker import FaceTracker, matchBoxes
+from lunavl.sdk.detectors.tiling import getIoU
+from lunavl.sdk.faceengine.setting_provider import DetectorType
+from lunavl.sdk.image_utils.image import VLImage
+from tests.base import BaseTestClass
+from tests.detect_test_class import VLIMAGE_SEVERAL_FACE
+from tests.resources import CLEAN_ONE_FACE, ONE_FACE
+
+VLIMAGE_ONE_FACE = VLImage.load(filename=CLEAN_ONE_FACE)
+VLIMAGE_ANOTHER_FACE = VLImage.load(filename=ONE_FACE)
+
+
+class TestFaceTracker(BaseTestClass):
+    """
+    Test of face tracker.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.detector = cls.faceEngine.createFaceDetector(DetectorType.FACE_DET_V3)
+
+    def test_stable_track_ids(self):
+        """
+        Test the same faces keep their track ids between full detections
+        """
+        tracker = FaceTracker(self.detector, detectionPeriod=3)
+        firstTracks = tracker.update(VLIMAGE_SEVERAL_FACE)
+        assert len(firstTracks) > 1
+        for frame in range(1, 7):
+            tracks = tracker.update(VLIMAGE_SEVERAL_FACE)
+            assert frame == tracker.frame
+            assert [track.trackId for track in firstTracks] == [track.trackId for track in tracks]
+            assert all(frame == track.lastFrame for track in tracks)
+
+    def test_track_death_and_birth(self):
+        """
+        Test a track dies after missed frames and a new face gets a new track
+        """
+        tracker = FaceTracker(self.detector, detectionPeriod=100, maxMisses=1)
+        [track] = tracker.update(VLIMAGE_ONE_FACE)
+        assert [] == tracker.update(VLIMAGE_ANOTHER_FACE)
+        assert [track] == tracker.tracks
+        assert 1 == track.misses
+        assert [] == tracker.update(VLIMAGE_ANOTHER_FACE)
+        assert [] == tracker.tracks
+        [newTrack] = tracker.update(VLIMAGE_ANOTHER_FACE)
+        assert newTrack.trackId != track.trackId
+
+    def test_update_many(self):
+        """
+        Test batched update of several streams
+        """
+        trackers = [FaceTracker(self.detector, detectionPeriod=2) for _ in range(3)]
+        for _ in range(4):
+            results = FaceTracker.updateMany(trackers, [VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE, VLIMAGE_ONE_FACE])
+            assert 1 == len(results[0]) == len(results[2])
+            assert len(results[1]) > 1
+        with pytest.raises(ValueError):
+            FaceTracker.updateMany(trackers, [VLIMAGE_ONE_FACE])
+
+    def test_match_boxes(self):
+        """
+        Test greedy matching of boxes
+        """
+        boxes = np.array([[0, 0, 10, 10], [20, 20, 30, 30]], dtype=np.float64)
+        otherBoxes = np.array([[21, 21, 31, 31], [1, 1, 11, 11], [100, 100, 110, 110]], dtype=np.float64)
+        assert [(0, 1), (1, 0)] == sorted(matchBoxes(boxes, otherBoxes, 0.3))
+        assert pytest.approx(1.0) == getIoU(boxes, boxes)[0, 0]
+        assert [] == matchBoxes(boxes, otherBoxes[2:], 0.3)
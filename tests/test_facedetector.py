@@ -1,4 +1,7 @@
+from unittest import mock
+
 import pytest
+from PIL import Image as pilImage
 
 from lunavl.sdk.detectors.base import ImageForDetection
 from lunavl.sdk.detectors.facedetector import FaceDetection, FaceDetector
@@ -23,7 +26,7 @@ from tests.detect_test_class import (
     VLIMAGE_SMALL,
     FaceDetectTestClass,
 )
-from tests.resources import MANY_FACES, ONE_FACE, WARP_CLEAN_FACE, BAD_IMAGE
+from tests.resources import MANY_FACES, ONE_FACE, SEVERAL_FACES, WARP_CLEAN_FACE, BAD_IMAGE
 from tests.schemas import LANDMARKS5, REQUIRED_FACE_DETECTION, jsonValidator
 
 
@@ -483,3 +486,85 @@ class TestFaceDetector(FaceDetectTestClass):
         self.assertAsyncEstimation(task, FaceDetection)
         task = self.defaultDetector.detect([VLIMAGE_ONE_FACE] * 2, asyncEstimate=True)
         self.assertAsyncBatchEstimation(task, FaceDetection)
+
+    def test_detect_reduced_image(self):
+        """
+        Test detection on an image decoded at reduced resolution is mapped to the original image
+        """
+        reducedImage = VLImage.load(filename=ONE_FACE, maxSide=400)
+        assert reducedImage.isReduced
+        assert 0.5 == reducedImage.scale
+        assert Rect(0, 0, 456, 540) == reducedImage.rect
+        assert not VLImage.load(filename=ONE_FACE, maxSide=1000).isReduced
+
+        detection = self.defaultDetector.detectOne(image=reducedImage)
+        fullDetection = self.defaultDetector.detectOne(image=VLIMAGE_ONE_FACE)
+        assert detection.boundingBox.rect.width == pytest.approx(fullDetection.boundingBox.rect.width / 2, rel=0.1)
+        assert detection.originalRect.width == pytest.approx(fullDetection.boundingBox.rect.width, rel=0.1)
+        assert detection.originalRect.x == detection.asDict()["rect"]["x"]
+        for point, fullPoint in zip(detection.asDict()["landmarks5"], fullDetection.asDict()["landmarks5"]):
+            assert point == pytest.approx(fullPoint, abs=10)
+
+    def test_warp_reduced_image(self):
+        """
+        Test a detection on a reduced image is warped from a full resolution crop
+        """
+        reducedImage = VLImage.load(filename=ONE_FACE, maxSide=400)
+        detection = self.defaultDetector.detectOne(image=reducedImage)
+        fullResolutionDetection = detection.toFullResolution()
+        assert not fullResolutionDetection.image.isReduced
+        assert fullResolutionDetection.image.rect.width > detection.boundingBox.rect.width * 2
+        warp = self.faceEngine.createFaceWarper().warp(detection)
+        assert detection is warp.sourceDetection
+        assert isinstance(warp.warpedImage, FaceWarpedImage)
+
+    def test_warp_several_faces_of_reduced_image(self):
+        """
+        Test a batch of warps of several faces of a reduced image decodes the full resolution image once
+        """
+        reducedImage = VLImage.load(filename=SEVERAL_FACES, maxSide=800)
+        assert reducedImage.isReduced
+        detections = self.defaultDetector.detect([reducedImage], limit=5)[0]
+        assert len(detections) > 2
+        oneFaceDetection = self.defaultDetector.detectOne(VLIMAGE_ONE_FACE)
+        warper = self.faceEngine.createFaceWarper()
+        with mock.patch.object(pilImage, "open", wraps=pilImage.open) as openImage:
+            warps = warper.warpBatch([detections[0], oneFaceDetection, *detections[1:]])
+        assert 1 == openImage.call_count
+        assert oneFaceDetection is warps[1].sourceDetection
+        del warps[1]
+        for detection, warp in zip(detections, warps):
+            fullDetection = detection.toFullResolution()
+            assert fullDetection.image.rect.width > detection.boundingBox.rect.width * 2
+            assert detection is warp.sourceDetection
+            assert warper.warp(detection).warpedImage.asNPArray().tolist() == warp.warpedImage.asNPArray().tolist()
+
+    def test_detect_arrays_output(self):
+        """
+        Test columnar output of batch detection matches detection objects
+        """
+        images = [VLIMAGE_SEVERAL_FACE, VLIMAGE_SMALL, VLIMAGE_ONE_FACE]
+        detections = self.defaultDetector.detect(images, limit=20, detect68Landmarks=True)
+        arrays = self.defaultDetector.detect(images, limit=20, detect68Landmarks=True, output="arrays")
+        assert sum(len(imageDetections) for imageDetections in detections) == len(arrays)
+        assert (len(arrays), 5, 2) == arrays.landmarks5.shape
+        assert (len(arrays), 68, 2) == arrays.landmarks68.shape
+        for imageIdx, imageDetections in enumerate(detections):
+            rows = arrays.getImageRows(imageIdx)
+            assert (arrays.imageIndexes[rows] == imageIdx).all()
+            for row, detection in zip(range(rows.start, rows.stop), imageDetections):
+                rect = detection.boundingBox.rect
+                assert [rect.x, rect.y, rect.width, rect.height] == pytest.approx(arrays.rects[row].tolist())
+                assert detection.boundingBox.score == pytest.approx(arrays.scores[row])
+                assert [[point.x, point.y] for point in detection.landmarks5.points] == pytest.approx(
+                    arrays.landmarks5[row].tolist()
+                )
+        assert [[detection.asDict() for detection in imageDetections] for imageDetections in detections] == [
+            [detection.asDict() for detection in imageDetections] for imageDetections in arrays.detections()
+        ]
+        task = self.defaultDetector.detect(images, limit=20, asyncEstimate=True, output="arrays")
+        asyncArrays = task.get()
+        assert asyncArrays.landmarks68 is None
+        assert arrays.rects.tolist() == asyncArrays.rects.tolist()
+        with pytest.raises(ValueError):
+            self.defaultDetector.detect(images, output="objects")
@@ -1,3 +1,4 @@
+from types import SimpleNamespace
 from typing import List
 
 import pytest
@@ -6,9 +7,10 @@ from lunavl.sdk.base import BoundingBox
 from lunavl.sdk.detectors.base import ImageForDetection
 from lunavl.sdk.detectors.bodydetector import BodyDetection
 from lunavl.sdk.detectors.facedetector import FaceDetection
-from lunavl.sdk.detectors.humandetector import HumanDetector, HumanDetection
+from lunavl.sdk.detectors.humandetector import HumanDetector, HumanDetection, collectDetectionsResult
 from lunavl.sdk.errors.errors import LunaVLError
 from lunavl.sdk.errors.exceptions import LunaSDKException
+from lunavl.sdk.faceengine.setting_provider import DetectorType
 from lunavl.sdk.image_utils.geometry import Rect
 from lunavl.sdk.image_utils.image import ColorFormat, VLImage
 from tests.base import BaseTestClass
@@ -256,6 +258,33 @@ class TestBodyDetector(BaseTestClass):
         else:
             assert detections[1].body is not None
 
+    def test_face_only_humans(self):
+        """
+        Test faces without an associated body are collected as humans without a body
+        """
+        faceDetector = self.faceEngine.createFaceDetector(DetectorType.FACE_DET_V3)
+        faces = faceDetector.detect([VLIMAGE_SEVERAL_FACE], limit=2)[0]
+        bodies = self.faceEngine.createBodyDetector().detect([VLIMAGE_SEVERAL_FACE], limit=2)[0]
+        assert 2 == len(faces) and 2 == len(bodies)
+        # the second face is associated with the first body
+        detectResult = SimpleNamespace(
+            getSize=lambda: 1,
+            getFaceDetections=lambda imageIdx: [face.coreEstimation.detection for face in faces],
+            getHumanDetections=lambda imageIdx: [body.coreEstimation.detection for body in bodies],
+            getAssociations=lambda imageIdx: [SimpleNamespace(faceId=1, humanId=0, score=0.9)],
+        )
+        [humans] = collectDetectionsResult(detectResult, [VLIMAGE_SEVERAL_FACE])
+        faceRects = [face.boundingBox.rect for face in faces]
+        bodyRects = [body.boundingBox.rect for body in bodies]
+        assert [(1, 0), (None, 1), (0, None)] == [
+            (
+                None if human.face is None else faceRects.index(human.face.boundingBox.rect),
+                None if human.body is None else bodyRects.index(human.body.boundingBox.rect),
+            )
+            for human in humans
+        ]
+        assert [0.9, None, None] == [human.associationScore for human in humans]
+
     def test_batch_detect_in_area_outside_image(self):
         """
         Test batch detection in area outside image
@@ -285,3 +314,17 @@ class TestBodyDetector(BaseTestClass):
         """
         task = self.detector.detect([VLIMAGE_ONE_FACE] * 2, asyncEstimate=True)
         self.assertAsyncBatchEstimation(task, BodyDetection)
+
+    def test_detect_arrays_output(self):
+        """
+        Test columnar output of human detection matches detection objects
+        """
+        images = [VLImage.load(filename=IMAGE_WITH_TWO_BODY_ONE_FACE), VLIMAGE_SEVERAL_FACE]
+        detections = self.detector.detect(images)
+        arrays = self.detector.detect(images, output="arrays")
+        assert len(arrays.associations) == len(arrays.associationScores)
+        assert [[human.asDict() for human in imageHumans] for imageHumans in detections] == [
+            [human.asDict() for human in imageHumans] for imageHumans in arrays.detections()
+        ]
+        for faceRow, bodyRow in arrays.associations:
+            assert arrays.faces.imageIndexes[faceRow] == arrays.bodies.imageIndexes[bodyRow]
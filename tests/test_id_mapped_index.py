@@ -0,0 +1,148 @@
+"""
+Test index with external ids.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.indexes.idmapped import IdIndexResult, IdMappedIndex, getIdsPath
+from lunavl.sdk.indexes.stored_index import IndexType
+from lunavl.sdk.indexes.wal import getWalPath
+from tests.base import BaseTestClass
+from tests.resources import WARP_CLEAN_FACE, WARP_ONE_FACE, WARP_WHITE_MAN
+
+
+class TestIdMappedIndex(BaseTestClass):
+    """
+    Test of index with external ids.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        extractor = cls.faceEngine.createFaceDescriptorEstimator()
+        warps = [FaceWarpedImage.load(filename=name) for name in (WARP_WHITE_MAN, WARP_CLEAN_FACE, WARP_ONE_FACE)]
+        cls.descriptors = [extractor.estimate(warp) for warp in warps]
+        cls.descriptorBatch, _ = extractor.estimateDescriptorsBatch(warps[1:])
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.indexBuilder = self.faceEngine.createIndexBuilder()
+        self.index = IdMappedIndex(self.indexBuilder.buildIndex())
+        self.index.append(self.descriptors[0], 2**40)
+        self.index.appendBatch(self.descriptorBatch, [-7, 15])
+
+    def test_search_returns_ids(self):
+        """
+        Test search results contain external ids
+        """
+        for descriptor, expectedId in zip(self.descriptors, (2**40, -7, 15)):
+            with self.subTest(id=expectedId):
+                result = self.index.search(descriptor)[0]
+                assert isinstance(result, IdIndexResult)
+                assert expectedId == result.id
+                assert expectedId == result.asDict()["id"]
+        assert [[2**40], [-7]] == [
+            [result.id for result in results] for results in self.index.searchBatch(self.descriptors[:2])
+        ]
+
+    def test_remove_by_id(self):
+        """
+        Test removing a descriptor by id
+        """
+        self.index.removeById(-7)
+        assert -7 not in self.index
+        assert 2 == len(self.index)
+        assert 3 == len(self.index.ids)
+        assert -7 not in [result.id for result in self.index.search(self.descriptors[1], 3)]
+        with pytest.raises(KeyError):
+            self.index.removeById(-7)
+
+    def test_lookup(self):
+        """
+        Test lookups of positions, ids and descriptors
+        """
+        assert 2 == self.index.getPosition(15)
+        assert 15 == self.index.getId(2)
+        assert self.descriptors[0].asBytes == self.index[2**40].asBytes
+        assert self.index.nbytes > 0
+
+    def test_duplicate_id(self):
+        """
+        Test appending a descriptor with an existing id
+        """
+        with pytest.raises(ValueError):
+            self.index.append(self.descriptors[1], 15)
+        assert 3 == self.index.index.bufSize
+
+    def test_save_and_load(self):
+        """
+        Test saving and loading of ids with the index
+        """
+        self.index.removeById(2**40)
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "gallery.index")
+            self.index.save(path, IndexType.dynamic)
+            assert getIdsPath(path).exists()
+            loadedIndex = IdMappedIndex.load(self.indexBuilder, path, IndexType.dynamic)
+        assert [-7, 15] == sorted(descriptorId for descriptorId in (2**40, -7, 15) if descriptorId in loadedIndex)
+        assert 15 == loadedIndex.search(self.descriptors[2])[0].id
+
+    def test_save_replaces_files(self):
+        """
+        Test saving over a saved index replaces both files and leaves no temporary files
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "gallery.index")
+            self.index.save(path, IndexType.dynamic)
+            self.index.removeById(15)
+            self.index.save(path, IndexType.dynamic)
+            assert sorted(["gallery.index", getIdsPath(path).name]) == sorted(os.listdir(directory))
+            loadedIndex = IdMappedIndex.load(self.indexBuilder, path, IndexType.dynamic)
+        assert 15 not in loadedIndex
+        assert 2 == len(loadedIndex)
+
+    def test_load_mapping_of_another_snapshot(self):
+        """
+        Test loading of a snapshot replaced without its ids mapping
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "gallery.index")
+            self.index.save(path, IndexType.dynamic)
+            self.index.index.save(path, IndexType.dynamic)
+            with pytest.raises(ValueError):
+                IdMappedIndex.load(self.indexBuilder, path, IndexType.dynamic)
+
+    def test_write_ahead_log(self):
+        """
+        Test ids cannot be lost with a write-ahead log: an index with a log is not wrapped, updated or loaded
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "gallery.index")
+            self.index.save(path, IndexType.dynamic)
+            dynamicIndex = self.indexBuilder.buildIndex()
+            dynamicIndex.attachWal(Path(directory) / "other.wal")
+            with pytest.raises(ValueError):
+                IdMappedIndex(dynamicIndex)
+            self.index.index.attachWal(getWalPath(path))
+            try:
+                with pytest.raises(ValueError):
+                    self.index.append(self.descriptors[1], 16)
+            finally:
+                self.index.index.detachWal()
+                dynamicIndex.detachWal()
+            assert 3 == self.index.index.bufSize
+            with pytest.raises(ValueError):
+                IdMappedIndex.load(self.indexBuilder, path, IndexType.dynamic)
+
+    def test_compact(self):
+        """
+        Test ids are remapped by compaction
+        """
+        self.index.removeById(2**40)
+        self.index.compact()
+        assert [-7, 15] == self.index.ids.tolist()
+        assert 15 == self.index.search(self.descriptors[2])[0].id
@@ -293,3 +293,68 @@ class TestImage(BaseTestClass):
         """
         image = VLImage(IMAGE.convert("CMYK"))
         assert image.format == ColorFormat.R8G8B8
+
+    def test_load_many(self):
+        """
+        Test parallel loading of images from files and bodies
+        """
+        sources = [ONE_FACE, Path(PALETTE_MODE).read_bytes(), Path(ONE_FACE)] * 3
+        images = list(VLImage.loadMany(sources, workers=3, prefetch=2))
+        assert len(sources) == len(images)
+        assert all(image.isValid() for image in images)
+        assert ["one_face.jpg", "", "one_face.jpg"] * 3 == [image.filename for image in images]
+
+        unorderedImages = list(VLImage.loadMany(sources, workers=3, ordered=False))
+        assert sorted(image.filename for image in images) == sorted(image.filename for image in unorderedImages)
+
+    def test_load_batches(self):
+        """
+        Test parallel loading of image batches
+        """
+        batches = list(VLImage.loadBatches([ONE_FACE] * 5, batchSize=2, workers=2))
+        assert [2, 2, 1] == [len(batch) for batch in batches]
+        assert all(image.rect == Rect(0, 0, 912, 1080) for batch in batches for image in batch)
+
+    def test_load_many_bad_image(self):
+        """
+        Test an error of parallel loading is raised on iteration
+        """
+        images = VLImage.loadMany([ONE_FACE, b"not an image"], workers=2)
+        assert next(images).isValid()
+        with pytest.raises(LunaSDKException):
+            next(images)
+
+    def test_convert_to_binary_img(self):
+        """
+        Test in-memory encoding to all image formats
+        """
+        image = VLImage.load(filename=ONE_FACE)
+        for imageFormat in ImageFormat:
+            with self.subTest(imageFormat=imageFormat):
+                decoded = VLImage(image.convertToBinaryImg(imageFormat))
+                assert image.rect == decoded.rect
+        ppm = image.convertToBinaryImg(ImageFormat.PPM)
+        assert ppm.endswith(image.asNPArray().tobytes())
+        assert len(image.convertToBinaryImg(ImageFormat.JPEG, quality=30)) < len(
+            image.convertToBinaryImg(ImageFormat.JPEG, quality=95)
+        )
+        with pytest.raises(ValueError):
+            image.convertToBinaryImg(ImageFormat.JPEG, quality=0)
+
+    def test_convert_to_binary_img_color_formats(self):
+        """
+        Test in-memory encoding of images with different color formats
+        """
+        image = VLImage.load(filename=ONE_FACE)
+        for colorFormat in set(ColorFormat) - RESTRICTED_COLOR_FORMATS:
+            with self.subTest(colorFormat=colorFormat):
+                body = image.convert(colorFormat).convertToBinaryImg(ImageFormat.PNG)
+                assert PIL.Image.open(io.BytesIO(body)).size == (912, 1080)
+
+    def test_encode_many(self):
+        """
+        Test parallel encoding keeps the order of images
+        """
+        images = [VLImage.load(filename=ONE_FACE), VLImage(SINGLE_CHANNEL_IMAGE)] * 3
+        encoded = VLImage.encodeMany(images, ImageFormat.PNG, compressionLevel=1)
+        assert [image.convertToBinaryImg(ImageFormat.PNG, compressionLevel=1) for image in images] == encoded
@@ -0,0 +1,97 @@
+"""
+Test fetching of url images.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from lunavl.sdk.image_utils.fetcher import ImageFetcher
+from lunavl.sdk.image_utils.geometry import Rect
+from lunavl.sdk.image_utils.image import VLImage
+from tests.base import BaseTestClass
+from tests.resources import ONE_FACE
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    """Handler which serves the test image, fails the first request to '/flaky' and returns 404 for '/missing'."""
+
+    protocol_version = "HTTP/1.1"
+    body = Path(ONE_FACE).read_bytes()
+    flakyFailures = 0
+    clients: set = set()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:  # pylint: disable=C0103
+        _ImageHandler.clients.add(self.client_address)
+        status = 200
+        if self.path == "/missing":
+            status = 404
+        elif self.path == "/flaky" and _ImageHandler.flakyFailures < 1:
+            _ImageHandler.flakyFailures += 1
+            status = 503
+        body = self.body if status == 200 else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestImageFetcher(BaseTestClass):
+    """
+    Test of url image fetcher.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.baseUrl = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().teardown_class()
+
+    def test_load_from_url(self):
+        """
+        Test loading of an image with a fetcher
+        """
+        with ImageFetcher(timeout=5) as fetcher:
+            image = VLImage.load(url=f"{self.baseUrl}/image.jpg", fetcher=fetcher)
+        assert image.rect == Rect(0, 0, 912, 1080)
+        assert f"{self.baseUrl}/image.jpg" == image.filename
+
+    def test_retry(self):
+        """
+        Test a failed request is retried
+        """
+        with ImageFetcher(retries=1, backoffFactor=0) as fetcher:
+            assert _ImageHandler.body == fetcher.fetch(f"{self.baseUrl}/flaky")
+
+    def test_fetch_errors(self):
+        """
+        Test fetching of a missing image and a too large image
+        """
+        with ImageFetcher(maxBytes=1000) as fetcher:
+            with pytest.raises(ValueError):
+                fetcher.fetch(f"{self.baseUrl}/missing")
+            with pytest.raises(ValueError):
+                fetcher.fetch(f"{self.baseUrl}/image.jpg")
+
+    def test_load_many_from_urls(self):
+        """
+        Test concurrent loading of images reuses pooled connections
+        """
+        urls = [f"{self.baseUrl}/image{number}.jpg" for number in range(12)]
+        _ImageHandler.clients = set()
+        with ImageFetcher(poolSize=3) as fetcher:
+            images = list(VLImage.loadManyFromUrls(urls, workers=3, fetcher=fetcher))
+        assert urls == [image.filename for image in images]
+        assert all(image.isValid() for image in images)
+        assert len(_ImageHandler.clients) <= 3
@@ -0,0 +1,121 @@
+"""
+Test write-ahead log of dynamic index.
+"""
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.indexes.stored_index import IndexType
+from lunavl.sdk.indexes.wal import WalOperation, getWalPath, readWal
+from tests.base import BaseTestClass
+from tests.resources import WARP_CLEAN_FACE, WARP_ONE_FACE, WARP_WHITE_MAN
+
+
+class TestIndexWal(BaseTestClass):
+    """
+    Test of index write-ahead log.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        extractor = cls.faceEngine.createFaceDescriptorEstimator()
+        warps = [FaceWarpedImage.load(filename=name) for name in (WARP_WHITE_MAN, WARP_CLEAN_FACE, WARP_ONE_FACE)]
+        cls.descriptors = [extractor.estimate(warp) for warp in warps]
+        cls.descriptorBatch, _ = extractor.estimateDescriptorsBatch(warps[1:])
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.temporaryDirectory = tempfile.TemporaryDirectory()
+        self.snapshotPath = str(Path(self.temporaryDirectory.name) / "gallery.index")
+        self.indexBuilder = self.faceEngine.createIndexBuilder()
+        self.indexBuilder.append(self.descriptors[0])
+        index = self.indexBuilder.buildIndex()
+        index.save(self.snapshotPath, IndexType.dynamic)
+        self.index = index
+
+    def tearDown(self) -> None:
+        self.index.detachWal()
+        self.temporaryDirectory.cleanup()
+        super().tearDown()
+
+    def test_log_and_replay(self):
+        """
+        Test updates after a snapshot are restored by index loading
+        """
+        self.index.attachWal(getWalPath(self.snapshotPath))
+        self.index.appendBatch(self.descriptorBatch)
+        self.index.append(self.descriptors[0])
+        self.index.remove(0)
+        self.index.detachWal()
+        operations = [record.operation for record in readWal(getWalPath(self.snapshotPath))]
+        assert [WalOperation.appendBatch, WalOperation.append, WalOperation.remove] == operations
+
+        loadedIndex = self.indexBuilder.loadIndex(self.snapshotPath, IndexType.dynamic)
+        try:
+            assert loadedIndex.wal is not None
+            assert 4 == loadedIndex.bufSize
+            assert 3 == loadedIndex.descriptorsCount
+            assert [3] == [result.index for result in loadedIndex.search(self.descriptors[0])]
+        finally:
+            loadedIndex.detachWal()
+
+    def test_load_without_replay(self):
+        """
+        Test loading of a snapshot without log replaying
+        """
+        self.index.attachWal(getWalPath(self.snapshotPath))
+        self.index.append(self.descriptors[1])
+        loadedIndex = self.indexBuilder.loadIndex(self.snapshotPath, IndexType.dynamic, replayWal=False)
+        assert loadedIndex.wal is None
+        assert 1 == loadedIndex.bufSize
+
+    def test_checkpoint(self):
+        """
+        Test checkpoint folds the log into the snapshot
+        """
+        wal = self.index.attachWal(getWalPath(self.snapshotPath))
+        self.index.appendBatch(self.descriptorBatch)
+        self.index.checkpoint(self.snapshotPath, background=True).result(timeout=60)
+        assert [] == list(readWal(wal.path))
+        self.index.append(self.descriptors[0])
+        self.index.detachWal()
+
+        loadedIndex = self.indexBuilder.loadIndex(self.snapshotPath, IndexType.dynamic)
+        try:
+            assert 4 == loadedIndex.bufSize
+        finally:
+            loadedIndex.detachWal()
+
+    def test_torn_record(self):
+        """
+        Test a torn record at the end of the log is ignored and cut
+        """
+        walPath = getWalPath(self.snapshotPath)
+        self.index.attachWal(walPath)
+        self.index.append(self.descriptors[1])
+        self.index.detachWal()
+        with open(walPath, "ab") as file:
+            file.write(b"\x01\xff\x00")
+        self.index.attachWal(walPath)
+        self.index.append(self.descriptors[2])
+        self.index.detachWal()
+        assert [WalOperation.append, WalOperation.append] == [record.operation for record in readWal(walPath)]
+
+    def test_checkpoint_without_wal(self):
+        """
+        Test checkpoint of an index without log
+        """
+        with pytest.raises(ValueError):
+            self.index.checkpoint(self.snapshotPath)
+
+    def test_bad_wal_file(self):
+        """
+        Test attaching a file which is not a log
+        """
+        walPath = getWalPath(self.snapshotPath)
+        walPath.write_bytes(b"not a write-ahead log")
+        with pytest.raises(ValueError):
+            self.index.attachWal(walPath)
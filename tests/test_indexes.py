@@ -2,7 +2,10 @@
 Test build an index with descriptors.
 """
 import os
+import threading
+import time
 from typing import Union
+from unittest import mock
 
 import pytest
 
@@ -12,6 +15,7 @@ from lunavl.sdk.errors.exceptions import LunaSDKException
 from lunavl.sdk.estimators.face_estimators.face_descriptor import FaceDescriptorEstimator
 from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
 from lunavl.sdk.indexes.base import IndexResult
+from lunavl.sdk.indexes.benchmark import benchmarkIndex
 from lunavl.sdk.indexes.builder import IndexBuilder
 from lunavl.sdk.indexes.stored_index import DenseIndex, DynamicIndex, IndexType
 from tests.base import BaseTestClass
@@ -121,6 +125,29 @@ class TestIndexFunctionality(BaseTestClass):
         assert expectedDescriptorsCount == self.indexBuilder.bufSize
         assert expectedDescriptorsCount == self.getCountOfDescriptorsInStorage(self.indexBuilder)
 
+    def test_append_from_iterable_to_builder(self):
+        """Test streaming append of descriptors, raw descriptors and payloads to index builder by chunks."""
+        progress = []
+
+        def descriptors():
+            yield self.faceDescriptor
+            yield self.faceDescriptor.rawDescriptor
+            for descriptor in self.faceDescriptorBatch:
+                yield descriptor.asBytes
+
+        appended = self.indexBuilder.appendFrom(descriptors(), chunkSize=3, progressCallback=progress.append)
+        assert 4 == appended == self.indexBuilder.bufSize
+        assert 4 == self.getCountOfDescriptorsInStorage(self.indexBuilder)
+        assert [3, 4] == [row.appended for row in progress]
+        assert all(row.throughput >= 0 for row in progress)
+        assert self.faceDescriptor.asBytes == self.indexBuilder[1].asBytes
+        assert self.faceDescriptorBatch[1].asBytes == self.indexBuilder[3].asBytes
+
+    def test_append_from_bad_chunk_size(self):
+        """Test streaming append with incorrect chunk size."""
+        with pytest.raises(ValueError):
+            self.indexBuilder.appendFrom([self.faceDescriptor], chunkSize=0)
+
     def test_get_descriptor_from_builder(self):
         """Test get descriptor from internal storage."""
         expectedDescriptorsCount = 2
@@ -336,3 +363,189 @@ class TestIndexFunctionality(BaseTestClass):
         self.assertAsyncBatchEstimation(task, IndexResult)
         result = task.get()
         assert 2 == len(result), result
+
+    def test_search_batch(self):
+        """Test batch search results are the same as results of searching descriptors one by one."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        dynamicIndex.save(pathToStoredIndex, IndexType.dense)
+        denseIndex = self.indexBuilder.loadIndex(pathToStoredIndex, IndexType.dense)
+        queries = [self.faceDescriptor, *self.faceDescriptorBatch, self.faceDescriptor]
+        for index in (dynamicIndex, denseIndex):
+            with self.subTest(index=index.__class__.__name__):
+                results = index.searchBatch(queries, maxCount=2)
+                assert len(queries) == len(results)
+                for query, result in zip(queries, results):
+                    assert [res.asDict() for res in index.search(query, 2)] == [res.asDict() for res in result]
+
+    def test_search_batch_similarity_threshold(self):
+        """Test batch search results are filtered by similarity."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        results = dynamicIndex.searchBatch(self.faceDescriptorBatch, maxCount=2, similarityThreshold=0.99)
+        assert [[0], [1]] == [[res.index for res in result] for result in results]
+        assert [[], []] == dynamicIndex.searchBatch(self.faceDescriptorBatch, maxCount=2, similarityThreshold=1.1)
+
+    def test_async_search_batch(self):
+        """Test async batch search."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        task = dynamicIndex.searchBatch(self.faceDescriptorBatch, 2, asyncSearch=True)
+        results = task.get()
+        assert 2 == len(results)
+        assert all(2 == len(result) for result in results)
+        assert isinstance(results[0][0], IndexResult)
+
+    def test_search_batch_invalid_input(self):
+        """Test batch search with descriptor of another version."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        with pytest.raises(LunaSDKException) as ex:
+            dynamicIndex.searchBatch([self.faceDescriptor, self.nonDefaultFaceDescriptor])
+        self.assertLunaVlError(ex, LunaVLError.InvalidInput.format("Invalid input"))
+
+    def test_compact_dynamic_index(self):
+        """Test compaction drops removed descriptors and maps old positions to new ones."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        self.indexBuilder.append(self.faceDescriptor)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        dynamicIndex.remove(0)
+        assert pytest.approx(1 / 3) == dynamicIndex.fragmentation
+        mapping = dynamicIndex.compact()
+        assert {1: 0, 2: 1} == mapping
+        self.assertDynamicIndex(dynamicIndex, expectedDescriptorCount=2, expectedBufSize=2)
+        assert 0.0 == dynamicIndex.fragmentation
+        assert self.faceDescriptor.asBytes == dynamicIndex[1].asBytes
+        assert 1 == dynamicIndex.search(self.faceDescriptor)[0].index
+
+    def test_updates_during_compaction(self):
+        """Test updates made during compaction wait for the finish and are not lost."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        dynamicIndex.remove(0)
+        compactionStarted, continueCompaction = threading.Event(), threading.Event()
+        compact = DynamicIndex._compact
+
+        def waitAndCompact(index, chunkSize):
+            compactionStarted.set()
+            continueCompaction.wait()
+            return compact(index, chunkSize)
+
+        with mock.patch.object(DynamicIndex, "_compact", autospec=True, side_effect=waitAndCompact):
+            compaction = threading.Thread(target=dynamicIndex.compact)
+            compaction.start()
+            compactionStarted.wait()
+            update = threading.Thread(target=dynamicIndex.append, args=(self.faceDescriptor,))
+            update.start()
+            update.join(0.1)
+            assert update.is_alive(), "append must wait for the compaction"
+            continueCompaction.set()
+            compaction.join()
+            update.join()
+        self.assertDynamicIndex(dynamicIndex, expectedDescriptorCount=2, expectedBufSize=2)
+        assert 1 == dynamicIndex.search(self.faceDescriptor)[0].index
+
+    def test_compact_unknown_removed_descriptors(self):
+        """Test compaction of a loaded index with unknown positions of removed descriptors."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        del dynamicIndex[0]
+        dynamicIndex.save(pathToStoredIndex, IndexType.dynamic)
+        loadedIndex = self.indexBuilder.loadIndex(pathToStoredIndex, IndexType.dynamic)
+        with pytest.raises(ValueError):
+            loadedIndex.compact()
+
+    def test_exact_search(self):
+        """Test exact search finds the same nearest descriptors as index search and skips removed ones."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        self.indexBuilder.append(self.faceDescriptor)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        for descriptor in (self.faceDescriptor, *self.faceDescriptorBatch):
+            with self.subTest(expected=dynamicIndex.search(descriptor)[0].index):
+                assert dynamicIndex.search(descriptor)[0].index == dynamicIndex.exactSearch(descriptor)[0].index
+        dynamicIndex.remove(2)
+        assert 2 not in [result.index for result in dynamicIndex.exactSearch(self.faceDescriptor, 3)]
+        positions, payloads = dynamicIndex.asNumpy()
+        assert [0, 1] == positions.tolist()
+        assert 2 == len(payloads)
+
+    def test_exact_search_same_as_core_search(self):
+        """Test exact search results have distances and similarities of core search."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        self.indexBuilder.append(self.faceDescriptor)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        queries = [self.faceDescriptor, *self.faceDescriptorBatch]
+        for queryNumber, (exactResults, query) in enumerate(zip(dynamicIndex.exactSearchBatch(queries, 3), queries)):
+            coreResults = dynamicIndex.approximateSearch(query, 3)
+            with self.subTest(query=queryNumber):
+                assert [result.index for result in coreResults] == [result.index for result in exactResults]
+                for coreResult, exactResult in zip(coreResults, exactResults):
+                    assert pytest.approx(coreResult.distance, abs=1e-4) == exactResult.distance
+                    assert pytest.approx(coreResult.similarity, abs=1e-4) == exactResult.similarity
+        threshold = dynamicIndex.approximateSearch(self.faceDescriptor, 2)[1].similarity
+        assert [2] == [
+            result.index for result in dynamicIndex.exactSearchBatch([self.faceDescriptor], 3, threshold + 1e-3)[0]
+        ]
+
+    def test_auto_exact_search(self):
+        """Test search switches to exact mode below the size threshold and sees appended descriptors."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        dynamicIndex.setExactSearch(10)
+        assert 10 == dynamicIndex.exactSearchThreshold
+        dynamicIndex.append(self.faceDescriptor)
+        result = dynamicIndex.search(self.faceDescriptor)[0]
+        assert 2 == result.index
+        assert result.similarity > 0.9
+        assert [[2], [0]] == [
+            [result.index for result in results]
+            for results in dynamicIndex.searchBatch([self.faceDescriptor, self.faceDescriptorBatch[0]])
+        ]
+        with pytest.raises(ValueError):
+            dynamicIndex.setExactSearch(-1)
+
+    def test_benchmark_index(self):
+        """Test recall and qps benchmark of index search."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        self.indexBuilder.append(self.faceDescriptor)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        faceMatcher = self.faceEngine.createFaceMatcher()
+        result = benchmarkIndex(dynamicIndex, faceMatcher, [self.faceDescriptor, *self.faceDescriptorBatch], k=2)
+        assert 3 == result.queryCount
+        assert 0.0 <= result.recall <= 1.0
+        assert result.approximateQps > 0
+        assert result.exactQps > 0
+        with pytest.raises(ValueError):
+            benchmarkIndex(dynamicIndex, faceMatcher, [], k=2)
+
+    def test_search_cache(self):
+        """Test repeated searches are served from the cache until the index is updated."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        cache = dynamicIndex.enableSearchCache(maxSize=8, ttl=None)
+        firstResults = dynamicIndex.search(self.faceDescriptorBatch[0])
+        assert [result.index for result in firstResults] == [
+            result.index for result in dynamicIndex.search(self.faceDescriptorBatch[0])
+        ]
+        assert (1, 1) == (cache.hits, cache.misses)
+        dynamicIndex.searchBatch([self.faceDescriptorBatch[0], self.faceDescriptorBatch[1]])
+        assert (2, 2) == (cache.hits, cache.misses)
+        assert {"size": 2, "max_size": 8, "ttl": None, "hits": 2, "misses": 2} == cache.asDict()
+
+        dynamicIndex.append(self.faceDescriptor)
+        assert 0 == len(cache)
+        assert 2 == dynamicIndex.search(self.faceDescriptor)[0].index
+        dynamicIndex.remove(2)
+        assert 2 not in [result.index for result in dynamicIndex.search(self.faceDescriptor, 2)]
+
+    def test_search_cache_ttl(self):
+        """Test cached results expire."""
+        self.indexBuilder.appendBatch(self.faceDescriptorBatch)
+        dynamicIndex = self.indexBuilder.buildIndex()
+        cache = dynamicIndex.enableSearchCache(ttl=0.01)
+        dynamicIndex.search(self.faceDescriptor)
+        time.sleep(0.02)
+        dynamicIndex.search(self.faceDescriptor)
+        assert (0, 2) == (cache.hits, cache.misses)
+        with pytest.raises(ValueError):
+            dynamicIndex.enableSearchCache(maxSize=0)
@@ -0,0 +1,148 @@
+"""
+Test managed index.
+"""
+import threading
+from unittest import mock
+
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.indexes.builder import IndexBuilder
+from lunavl.sdk.indexes.managed import ManagedIndex
+from tests.base import BaseTestClass
+from tests.resources import WARP_CLEAN_FACE, WARP_ONE_FACE, WARP_WHITE_MAN
+
+
+class TestManagedIndex(BaseTestClass):
+    """
+    Test of managed index.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        extractor = cls.faceEngine.createFaceDescriptorEstimator()
+        warps = [FaceWarpedImage.load(filename=name) for name in (WARP_WHITE_MAN, WARP_CLEAN_FACE, WARP_ONE_FACE)]
+        cls.descriptors = [extractor.estimate(warp) for warp in warps]
+
+    def setUp(self) -> None:
+        super().setUp()
+        builder = self.faceEngine.createIndexBuilder()
+        builder.append(self.descriptors[0])
+        self.managedIndex = ManagedIndex(builder)
+
+    def test_updates_are_searchable_before_rebuild(self):
+        """
+        Test appended descriptors are searchable without a rebuild
+        """
+        self.managedIndex.append(self.descriptors[1])
+        assert 1 == self.managedIndex.pendingCount
+        assert 1 == self.managedIndex.search(self.descriptors[1])[0].index
+
+    def test_rebuild(self):
+        """
+        Test rebuild applies pending updates to the builder and swaps the index
+        """
+        oldIndex = self.managedIndex.index
+        self.managedIndex.append(self.descriptors[1])
+        self.managedIndex.remove(0)
+        self.managedIndex.rebuild()
+        assert oldIndex is not self.managedIndex.index
+        assert 0 == self.managedIndex.pendingCount
+        assert 1 == self.managedIndex.builder.bufSize
+        assert 1 == self.managedIndex.descriptorsCount
+        assert [0] == [result.index for result in self.managedIndex.search(self.descriptors[0], 2)]
+        assert [None, 0] == [self.managedIndex.remapPosition(position) for position in range(2)]
+        metrics = self.managedIndex.asDict()
+        assert 1 == metrics["rebuilds"]
+        assert metrics["last_swap_time"] >= 0
+        assert metrics["last_build_time"] >= 0
+
+    def test_search_during_background_rebuild(self):
+        """
+        Test search and updates during a background rebuild
+        """
+        errors = []
+        stop = threading.Event()
+
+        def search():
+            while not stop.is_set():
+                try:
+                    assert 0 == self.managedIndex.search(self.descriptors[0])[0].index
+                except Exception as exc:  # pylint: disable=W0703
+                    errors.append(exc)
+                    return
+
+        searcher = threading.Thread(target=search)
+        searcher.start()
+        try:
+            assert self.managedIndex.startRebuild()
+            self.managedIndex.append(self.descriptors[2])
+            assert self.managedIndex.waitRebuild(timeout=60)
+        finally:
+            stop.set()
+            searcher.join()
+        assert [] == errors
+        assert 1 == self.managedIndex.asDict()["rebuilds"]
+        assert 1 == self.managedIndex.search(self.descriptors[2])[0].index
+
+    def createManagedIndex(self) -> ManagedIndex:
+        """
+        Create managed index with all test descriptors.
+
+        Returns:
+            managed index, descriptor `i` is at position `i`
+        """
+        builder = self.faceEngine.createIndexBuilder()
+        for descriptor in self.descriptors:
+            builder.append(descriptor)
+        return ManagedIndex(builder)
+
+    def test_several_removes(self):
+        """
+        Test positions after a rebuild with several removes
+        """
+        managedIndex = self.createManagedIndex()
+        managedIndex.append(self.descriptors[1])
+        managedIndex.remove(0)
+        managedIndex.remove(2)
+        managedIndex.rebuild()
+        assert 2 == managedIndex.builder.bufSize
+        assert 2 == managedIndex.descriptorsCount
+        assert [None, 0, None, 1] == [managedIndex.remapPosition(position) for position in range(4)]
+        assert [0, 1] == sorted(result.index for result in managedIndex.search(self.descriptors[1], 2))
+
+        managedIndex.remove(0)
+        managedIndex.rebuild()
+        assert 1 == managedIndex.builder.bufSize
+        assert 0 == managedIndex.search(self.descriptors[1])[0].index
+
+    def test_removes_during_background_rebuild(self):
+        """
+        Test updates made during a background rebuild are translated to positions of the new index
+        """
+        managedIndex = self.createManagedIndex()
+        managedIndex.remove(0)
+        buildStarted, continueBuild = threading.Event(), threading.Event()
+        buildIndex = IndexBuilder.buildIndex
+
+        def waitAndBuild(builder):
+            buildStarted.set()
+            continueBuild.wait()
+            return buildIndex(builder)
+
+        with mock.patch.object(IndexBuilder, "buildIndex", autospec=True, side_effect=waitAndBuild):
+            assert managedIndex.startRebuild()
+            buildStarted.wait()
+            # positions of the index before the swap
+            managedIndex.remove(2)
+            managedIndex.append(self.descriptors[0])
+            continueBuild.set()
+            assert managedIndex.waitRebuild(timeout=60)
+        assert 2 == managedIndex.descriptorsCount
+        assert 2 == managedIndex.pendingCount
+        assert 0 == managedIndex.search(self.descriptors[1])[0].index
+        assert 2 == managedIndex.search(self.descriptors[0])[0].index
+        assert 1 not in [result.index for result in managedIndex.search(self.descriptors[2], 3)]
+
+        managedIndex.rebuild()
+        assert 2 == managedIndex.builder.bufSize
+        assert [0, 1] == [managedIndex.search(descriptor)[0].index for descriptor in self.descriptors[1::-1]]
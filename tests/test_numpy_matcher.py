@@ -0,0 +1,150 @@
+"""
+Test vectorized descriptor matcher.
+"""
+import numpy as np
+import pytest
+
+from lunavl.sdk.descriptors.matcher import NumpyDescriptorMatcher, calibrateSimilarity, descriptorsAsArray
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.image_utils.image import VLImage
+from tests.base import BaseTestClass
+from tests.resources import (
+    WARP_CLEAN_FACE,
+    WARP_FACE_WITH_EYEGLASSES,
+    WARP_FACE_WITH_SUNGLASSES,
+    WARP_ONE_FACE,
+    WARP_WHITE_MAN,
+)
+
+
+class TestNumpyDescriptorMatcher(BaseTestClass):
+    """
+    Test of vectorized descriptor matcher.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        extractor = cls.faceEngine.createFaceDescriptorEstimator()
+        cls.descriptors = [
+            extractor.estimate(FaceWarpedImage(VLImage.load(filename=filename)))
+            for filename in (WARP_WHITE_MAN, WARP_CLEAN_FACE)
+        ]
+        cls.sampleDescriptors = cls.descriptors + [
+            extractor.estimate(FaceWarpedImage(VLImage.load(filename=filename)))
+            for filename in (WARP_ONE_FACE, WARP_FACE_WITH_EYEGLASSES, WARP_FACE_WITH_SUNGLASSES)
+        ]
+        cls.faceMatcher = cls.faceEngine.createFaceMatcher()
+        rng = np.random.default_rng(0)
+        cls.candidates = rng.integers(0, 256, (1000, 64), dtype=np.uint8)
+        cls.queries = rng.integers(0, 256, (17, 64), dtype=np.uint8)
+
+    def test_search_same_as_brute_force(self):
+        """
+        Test top k search results are the same as a brute force search results
+        """
+        matcher = NumpyDescriptorMatcher(self.candidates, offset=128)
+        indexes, distances, similarities = matcher.search(self.queries, topK=5, chunkSize=4)
+        assert (17, 5) == indexes.shape == distances.shape == similarities.shape
+
+        def prepare(array):
+            vectors = array.astype(np.float64) - 128
+            return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        allDistances = np.linalg.norm(prepare(self.queries)[:, None] - prepare(self.candidates)[None], axis=2)
+        expectedIndexes = np.argsort(allDistances, axis=1)[:, :5]
+        assert (expectedIndexes == indexes).all()
+        assert np.allclose(np.take_along_axis(allDistances, expectedIndexes, axis=1), distances, atol=1e-5)
+        assert (np.diff(distances, axis=1) >= 0).all()
+        assert ((0 <= similarities) & (similarities <= 1)).all()
+
+    def test_match(self):
+        """
+        Test many-to-many match returns all distances and similarities
+        """
+        matcher = NumpyDescriptorMatcher(self.candidates)
+        distances, similarities = matcher.match(self.queries)
+        assert (17, 1000) == distances.shape == similarities.shape
+
+    def test_uint8_candidates_by_blocks(self):
+        """
+        Test uint8 candidates are not copied and matching by blocks of candidates is the same as by one block
+        """
+        matcher = NumpyDescriptorMatcher(self.candidates, offset=128, blockSize=64)
+        assert matcher.candidates is self.candidates
+        expectedMatcher = NumpyDescriptorMatcher(self.candidates.astype(np.float32), offset=128)
+        for result, expectedResult in zip(matcher.match(self.queries), expectedMatcher.match(self.queries)):
+            assert np.allclose(expectedResult, result, atol=1e-5)
+        with pytest.raises(ValueError):
+            NumpyDescriptorMatcher(self.candidates, blockSize=0)
+
+    def test_top_k_more_than_candidates(self):
+        """
+        Test top k greater than candidates count
+        """
+        matcher = NumpyDescriptorMatcher(self.candidates[:3])
+        indexes, _, _ = matcher.search(self.queries[0], topK=10)
+        assert [0, 1, 2] == sorted(indexes[0].tolist())
+
+    def test_match_descriptors(self):
+        """
+        Test matching of sdk descriptors and descriptor bytes
+        """
+        matcher = NumpyDescriptorMatcher(self.descriptors)
+        assert len(self.descriptors) == len(matcher)
+        indexes, distances, similarities = matcher.search([descriptor.asBytes for descriptor in self.descriptors])
+        assert [[0], [1]] == indexes.tolist()
+        assert np.allclose(distances, 0, atol=1e-3)
+        assert np.allclose(similarities, 1, atol=1e-3)
+
+    def test_descriptors_as_array(self):
+        """
+        Test conversion descriptors to an array
+        """
+        array = descriptorsAsArray(self.descriptors)
+        assert (2, len(self.descriptors[0].asBytes)) == array.shape
+        assert self.descriptors[1].asBytes == array[1].tobytes()
+
+    def test_bad_query_length(self):
+        """
+        Test matching queries with a wrong length
+        """
+        matcher = NumpyDescriptorMatcher(self.candidates)
+        with pytest.raises(ValueError):
+            matcher.match(self.queries[:, :10])
+        with pytest.raises(ValueError):
+            matcher.search(self.queries, topK=0)
+
+    def getCoreSimilarities(self):
+        """
+        Get similarities of sample descriptors by the core matcher.
+
+        Returns:
+            (N, N) similarities
+        """
+        return np.array(
+            [
+                [result.similarity for result in self.faceMatcher.match(query, self.sampleDescriptors)]
+                for query in self.sampleDescriptors
+            ]
+        )
+
+    def test_ranking_same_as_face_matcher(self):
+        """
+        Test candidates are ranked as by the core matcher
+        """
+        matcher = NumpyDescriptorMatcher(self.sampleDescriptors)
+        _, similarities = matcher.match(self.sampleDescriptors)
+        coreSimilarities = self.getCoreSimilarities()
+        assert (np.argsort(-similarities, axis=1) == np.argsort(-coreSimilarities, axis=1)).all()
+
+    def test_calibrated_similarity(self):
+        """
+        Test calibrated similarity reproduces core matcher similarities
+        """
+        similarityFunction = calibrateSimilarity(self.faceMatcher, self.sampleDescriptors)
+        matcher = NumpyDescriptorMatcher(self.sampleDescriptors, similarityFunction=similarityFunction)
+        _, similarities = matcher.match(self.sampleDescriptors)
+        assert np.allclose(self.getCoreSimilarities(), similarities, atol=0.01)
+        with pytest.raises(ValueError):
+            calibrateSimilarity(self.faceMatcher, self.sampleDescriptors[:1])
@@ -0,0 +1,131 @@
+"""
+Test sharded index.
+"""
+import json
+import os
+import tempfile
+from unittest import mock
+
+import pytest
+
+from lunavl.sdk.estimators.face_estimators.facewarper import FaceWarpedImage
+from lunavl.sdk.indexes.sharded import MANIFEST_NAME, ShardedIndex, ShardedIndexResult
+from lunavl.sdk.indexes.stored_index import DynamicIndex, IndexType
+from tests.base import BaseTestClass
+from tests.resources import WARP_CLEAN_FACE, WARP_ONE_FACE, WARP_WHITE_MAN
+
+
+class TestShardedIndex(BaseTestClass):
+    """
+    Test of sharded index.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        extractor = cls.faceEngine.createFaceDescriptorEstimator()
+        warps = [FaceWarpedImage.load(filename=name) for name in (WARP_WHITE_MAN, WARP_CLEAN_FACE, WARP_ONE_FACE)]
+        cls.descriptors = [extractor.estimate(warp) for warp in warps]
+
+    def test_build_and_search(self):
+        """
+        Test building of shards and merged search results
+        """
+        index = ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=2)
+        assert 2 == index.shardCount
+        assert [2, 1] == [shard.bufSize for shard in index.shards]
+        assert all(isinstance(shard, DynamicIndex) for shard in index.shards)
+
+        for number, descriptor in enumerate(self.descriptors):
+            with self.subTest(descriptor=number):
+                results = index.search(descriptor, maxCount=3)
+                assert 3 == len(results)
+                assert isinstance(results[0], ShardedIndexResult)
+                assert (number // 2, number % 2) == (results[0].shard, results[0].index)
+                assert sorted(result.distance for result in results) == [result.distance for result in results]
+
+    def test_search_batch(self):
+        """
+        Test batch search with a similarity threshold over shards
+        """
+        index = ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=3)
+        results = index.searchBatch(self.descriptors, maxCount=3, similarityThreshold=0.99)
+        assert [[(0, 0)], [(1, 0)], [(2, 0)]] == [[(res.shard, res.index) for res in result] for result in results]
+
+    def test_save_and_load(self):
+        """
+        Test saving and loading of shards with a manifest
+        """
+        index = ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=2)
+        with tempfile.TemporaryDirectory() as directory:
+            index.save(directory, IndexType.dense)
+            loadedIndex = ShardedIndex.load(self.faceEngine, directory)
+            assert 2 == loadedIndex.shardCount
+            assert index.bufSize == loadedIndex.bufSize
+            results = loadedIndex.search(self.descriptors[2])
+            assert (1, 0) == (results[0].shard, results[0].index)
+
+    def test_rebuild_shard(self):
+        """
+        Test rebuilding of one shard
+        """
+        index = ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=2)
+        untouchedShard = index[0]
+        builder = self.faceEngine.createIndexBuilder()
+        builder.append(self.descriptors[0])
+        index.rebuildShard(1, builder)
+        assert untouchedShard is index[0]
+        assert [(0, 0), (1, 0)] == [(result.shard, result.index) for result in index.search(self.descriptors[0], 2)]
+
+    def test_load_without_manifest(self):
+        """
+        Test loading of a directory without manifest
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            with pytest.raises(FileNotFoundError) as ex:
+                ShardedIndex.load(self.faceEngine, directory)
+            assert MANIFEST_NAME in ex.value.args[0]
+
+    def test_bad_shard_count(self):
+        """
+        Test building with incorrect shard count
+        """
+        with pytest.raises(ValueError):
+            ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=0)
+
+    def test_shard_count_more_than_descriptors(self):
+        """
+        Test building does not create empty shards
+        """
+        index = ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=5)
+        assert [1, 1, 1] == [shard.bufSize for shard in index.shards]
+        index = ShardedIndex.build(self.faceEngine, self.descriptors * 3, shardCount=4)
+        assert [3, 3, 3] == [shard.bufSize for shard in index.shards]
+
+    def test_resave(self):
+        """
+        Test saving to a directory with a saved index replaces shards of the previous save
+        """
+        index = ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=2)
+        with tempfile.TemporaryDirectory() as directory:
+            index.save(directory)
+            index.save(directory)
+            with open(os.path.join(directory, MANIFEST_NAME)) as file:
+                manifest = json.load(file)
+            assert 2 == manifest["generation"]
+            assert sorted([MANIFEST_NAME] + [shard["path"] for shard in manifest["shards"]]) == sorted(
+                os.listdir(directory)
+            )
+
+    def test_failed_save_keeps_previous_save(self):
+        """
+        Test a failure while saving shards does not damage the previous save
+        """
+        index = ShardedIndex.build(self.faceEngine, self.descriptors, shardCount=2)
+        with tempfile.TemporaryDirectory() as directory:
+            index.save(directory)
+            with mock.patch.object(DynamicIndex, "save", side_effect=RuntimeError("crash")):
+                with pytest.raises(RuntimeError):
+                    index.save(directory)
+            loadedIndex = ShardedIndex.load(self.faceEngine, directory)
+            assert index.bufSize == loadedIndex.bufSize
@@ -0,0 +1,123 @@
+"""
+Test tiled detection of faces and bodies.
+"""
+import numpy as np
+import pytest
+
+from lunavl.sdk.detectors.tiling import getBoxes, getImageTiles, getIoU, getTiles, nms
+from lunavl.sdk.faceengine.setting_provider import DetectorType
+from lunavl.sdk.image_utils.geometry import Rect
+from lunavl.sdk.image_utils.image import VLImage
+from tests.base import BaseTestClass
+from tests.resources import MANY_FACES, ONE_FACE
+
+VLIMAGE_MANY_FACES = VLImage.load(filename=MANY_FACES)
+VLIMAGE_ONE_FACE = VLImage.load(filename=ONE_FACE)
+
+
+class TestTiledDetection(BaseTestClass):
+    """
+    Test of tiled detection.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.faceDetector = cls.faceEngine.createFaceDetector(DetectorType.FACE_DET_V3)
+        cls.bodyDetector = cls.faceEngine.createBodyDetector()
+
+    def assertNoDuplicates(self, detections):
+        """
+        Assert detections of an image do not overlap much.
+
+        Args:
+            detections: detections of an image
+        """
+        boxes = getBoxes(detections)
+        assert not (np.triu(getIoU(boxes, boxes), 1) > 0.4).any()
+
+    def test_face_tiled_detection(self):
+        """
+        Test tiled detection finds not less faces than a detection of the whole image and does not duplicate them
+        """
+        tileSize = min(VLIMAGE_MANY_FACES.rect.width, VLIMAGE_MANY_FACES.rect.height) // 2
+        [detections] = self.faceDetector.detect([VLIMAGE_MANY_FACES], limit=100)
+        [tiledDetections] = self.faceDetector.detectTiled([VLIMAGE_MANY_FACES], tileSize=tileSize, overlap=100)
+        assert len(tiledDetections) >= len(detections)
+        self.assertNoDuplicates(tiledDetections)
+        scores = [detection.boundingBox.score for detection in tiledDetections]
+        assert sorted(scores, reverse=True) == scores
+
+    def test_face_tiled_detection_of_small_image(self):
+        """
+        Test tiled detection of an image smaller than a tile is a usual detection
+        """
+        [[detection]] = self.faceDetector.detect([VLIMAGE_ONE_FACE])
+        [[tiledDetection]] = self.faceDetector.detectTiled([VLIMAGE_ONE_FACE], tileSize=4096)
+        assert detection.boundingBox.rect == tiledDetection.boundingBox.rect
+        assert tiledDetection.landmarks5 is not None
+
+    def test_face_tiled_detection_with_full_frame(self):
+        """
+        Test full frame pass finds a face larger than the overlap, which is cut by tile borders
+        """
+        [[detection]] = self.faceDetector.detect([VLIMAGE_ONE_FACE])
+        tileSize = int(detection.boundingBox.rect.width)
+        [tiledDetections] = self.faceDetector.detectTiled(
+            [VLIMAGE_ONE_FACE], tileSize=tileSize, overlap=tileSize // 4, fullFrame=True
+        )
+        assert getIoU(getBoxes([detection]), getBoxes(tiledDetections)).max() > 0.9
+        self.assertNoDuplicates(tiledDetections)
+
+    def test_async_face_tiled_detection(self):
+        """
+        Test async tiled detection
+        """
+        images = [VLIMAGE_MANY_FACES, VLIMAGE_ONE_FACE]
+        detections = self.faceDetector.detectTiled(images, tileSize=512)
+        task = self.faceDetector.detectTiled(images, tileSize=512, asyncEstimate=True)
+        asyncDetections = task.get()
+        assert [len(imageDetections) for imageDetections in detections] == [
+            len(imageDetections) for imageDetections in asyncDetections
+        ]
+
+    def test_body_tiled_detection(self):
+        """
+        Test tiled detection of bodies does not duplicate them
+        """
+        [detections] = self.bodyDetector.detectTiled([VLIMAGE_MANY_FACES], tileSize=512, overlap=256)
+        assert detections
+        self.assertNoDuplicates(detections)
+        assert all(detection.landmarks17 is not None for detection in detections)
+
+    def test_get_tiles(self):
+        """
+        Test tiles cover the area with the overlap
+        """
+        tiles = getTiles(Rect(0, 0, 3840, 2160), tileSize=1024, overlap=128)
+        assert 15 == len(tiles)
+        assert all(tile.isInside(Rect(0, 0, 3840, 2160)) for tile in tiles)
+        assert Rect(0, 0, 100, 100) == getTiles(Rect(0, 0, 100, 100), tileSize=1024, overlap=128)[0]
+        with pytest.raises(ValueError):
+            getTiles(Rect(0, 0, 100, 100), tileSize=128, overlap=128)
+
+    def test_get_image_tiles_with_full_frame(self):
+        """
+        Test full frame is added to tiles of an image split into several tiles only
+        """
+        tiles, imageIndexes = getImageTiles([VLIMAGE_MANY_FACES, VLIMAGE_ONE_FACE], tileSize=2048, overlap=128)
+        fullFrameTiles, fullFrameImageIndexes = getImageTiles(
+            [VLIMAGE_MANY_FACES, VLIMAGE_ONE_FACE], tileSize=2048, overlap=128, fullFrame=True
+        )
+        assert len(tiles) + 1 == len(fullFrameTiles)
+        assert VLIMAGE_MANY_FACES.rect in [tile.detectArea for tile in fullFrameTiles]
+        assert imageIndexes.count(0) + 1 == fullFrameImageIndexes.count(0)
+        assert 1 == fullFrameImageIndexes.count(1)
+
+    def test_nms(self):
+        """
+        Test non-maximum suppression keeps the best box of overlapping ones
+        """
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [2, 2, 7, 10], [20, 20, 30, 30]], dtype=np.float64)
+        scores = np.array([0.8, 0.9, 0.7, 0.5])
+        assert [1, 3] == nms(boxes, scores).tolist()
@@ -0,0 +1,106 @@
+"""
+Test validation policy of detectors and estimators.
+"""
+import pytest
+
+from lunavl.sdk.detectors.base import ImageForDetection
+from lunavl.sdk.errors.errors import LunaVLError
+from lunavl.sdk.errors.exceptions import LunaSDKException
+from lunavl.sdk.faceengine.setting_provider import DetectorType
+from lunavl.sdk.image_utils.geometry import Rect
+from lunavl.sdk.validation import ValidationPolicy, getValidationPolicy, setValidationPolicy, validationPolicy
+from lunavl.sdk.validation_benchmark import benchmarkValidationPolicies
+from tests.base import BaseTestClass
+from tests.detect_test_class import OUTSIDE_AREA, VLIMAGE_ONE_FACE
+
+
+class TestValidationPolicy(BaseTestClass):
+    """
+    Test of validation policy.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.detector = cls.faceEngine.createFaceDetector(DetectorType.FACE_DET_V3)
+        cls.headPoseEstimator = cls.faceEngine.createHeadPoseEstimator()
+
+    def tearDown(self) -> None:
+        setValidationPolicy(ValidationPolicy.always)
+
+    def test_default_policy(self):
+        """
+        Test validation before each call is default
+        """
+        assert ValidationPolicy.always == getValidationPolicy()
+
+    def test_set_policy(self):
+        """
+        Test set validation policy by value and override it in a block
+        """
+        setValidationPolicy("on-error")
+        assert ValidationPolicy.onError == getValidationPolicy()
+        with validationPolicy(ValidationPolicy.never):
+            assert ValidationPolicy.never == getValidationPolicy()
+        assert ValidationPolicy.onError == getValidationPolicy()
+
+    def test_unknown_policy(self):
+        """
+        Test unknown validation policy
+        """
+        with pytest.raises(ValueError):
+            setValidationPolicy("sometimes")
+        with pytest.raises(ValueError):
+            with validationPolicy("sometimes"):
+                pass
+
+    def test_valid_input(self):
+        """
+        Test results of valid input do not depend on validation policy
+        """
+        [[detection]] = self.detector.detect([VLIMAGE_ONE_FACE])
+        headPose = self.headPoseEstimator.estimateBatch([detection])
+        for policy in ValidationPolicy:
+            with self.subTest(policy=policy), validationPolicy(policy):
+                [[policyDetection]] = self.detector.detect([VLIMAGE_ONE_FACE])
+                assert detection.boundingBox.rect == policyDetection.boundingBox.rect
+                assert headPose[0].asDict() == self.headPoseEstimator.estimateBatch([policyDetection])[0].asDict()
+
+    def test_invalid_input_detailed_error(self):
+        """
+        Test validation builds detailed errors of invalid input for "always" and "on-error" policies
+        """
+        for policy in (ValidationPolicy.always, ValidationPolicy.onError):
+            for asyncEstimate in (False, True):
+                with self.subTest(policy=policy, asyncEstimate=asyncEstimate):
+                    with pytest.raises(LunaSDKException) as exceptionInfo:
+                        with validationPolicy(policy):
+                            res = self.detector.detect(
+                                [ImageForDetection(image=VLIMAGE_ONE_FACE, detectArea=Rect())],
+                                asyncEstimate=asyncEstimate,
+                            )
+                        if asyncEstimate:
+                            res.get()
+                    self.assertLunaVlError(exceptionInfo, LunaVLError.BatchedInternalError.format("Failed validation."))
+                    assert len(exceptionInfo.value.context) == 1, "Expect one error in exception context"
+                    self.assertReceivedAndRawExpectedErrors(
+                        exceptionInfo.value.context[0], LunaVLError.InvalidRect.format("Invalid rectangle")
+                    )
+
+    def test_invalid_input_without_validation(self):
+        """
+        Test invalid input still raises an exception if validation is skipped
+        """
+        with validationPolicy(ValidationPolicy.never):
+            with pytest.raises(LunaSDKException):
+                self.detector.detectOne(image=VLIMAGE_ONE_FACE, detectArea=OUTSIDE_AREA)
+
+    def test_benchmark(self):
+        """
+        Test benchmark measures calls under each policy
+        """
+        durations = benchmarkValidationPolicies(lambda: self.detector.detect([VLIMAGE_ONE_FACE]), repeat=2, warmup=1)
+        assert set(ValidationPolicy) == set(durations)
+        assert all(duration > 0 for duration in durations.values())
+        with pytest.raises(ValueError):
+            benchmarkValidationPolicies(lambda: None, repeat=0)
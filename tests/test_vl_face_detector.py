@@ -0,0 +1,157 @@
+"""
+Test high level face detector.
+"""
+from unittest import mock
+
+import pytest
+
+from lunavl.sdk.detectors.facedetector import FaceDetection
+from lunavl.sdk.estimator_collections import FaceEstimator
+from lunavl.sdk.estimators.face_estimators.landmarks import FaceLandmarksEstimator
+from lunavl.sdk.image_utils.image import VLImage
+from lunavl.sdk.luna_faces import VLFaceDetection, VLFaceDetectionSettings, VLFaceDetector
+from tests.base import BaseTestClass
+from tests.detect_test_class import VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE
+from tests.resources import SEVERAL_FACES
+
+
+class TestVLFaceDetector(BaseTestClass):
+    """
+    Test of high level face detector.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        super().setup_class()
+        cls.detector = VLFaceDetector(faceEngine=cls.faceEngine)
+
+    def test_detect_and_estimate(self):
+        """
+        Test batch estimations are stored to detections and are equal to single estimations
+        """
+        attributes = {FaceEstimator.Emotions, FaceEstimator.BasicAttributes, FaceEstimator.Descriptor}
+        detections = self.detector.detectAndEstimate([VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE], attributes)
+        expectedDetections = self.detector.detect([VLIMAGE_ONE_FACE, VLIMAGE_SEVERAL_FACE])
+        assert len(expectedDetections) == len(detections)
+        for imageDetections, expectedImageDetections in zip(detections, expectedDetections):
+            assert len(expectedImageDetections) == len(imageDetections)
+            for detection, expectedDetection in zip(imageDetections, expectedImageDetections):
+                assert isinstance(detection, VLFaceDetection)
+                assert detection._emotions is not None
+                assert detection._basicAttributes is not None
+                assert detection._descriptor is not None
+                assert detection._mask is None
+                assert expectedDetection.emotions.asDict() == detection.emotions.asDict()
+                assert expectedDetection.descriptor.asBytes == detection.descriptor.asBytes
+
+    def test_estimate_attributes_keeps_existing_estimations(self):
+        """
+        Test already estimated attributes are not reestimated
+        """
+        detection = self.detector.detectOne(VLIMAGE_ONE_FACE)
+        emotions = detection.emotions
+        self.detector.estimateAttributes([detection], [FaceEstimator.Emotions, FaceEstimator.Glasses])
+        assert emotions is detection.emotions
+        assert detection._glasses is not None
+
+    def test_estimate_not_face_attribute(self):
+        """
+        Test estimation of an image attribute
+        """
+        detection = self.detector.detectOne(VLIMAGE_ONE_FACE)
+        with pytest.raises(ValueError):
+            self.detector.estimateAttributes([detection], [FaceEstimator.OrientationMode])
+
+    def test_as_dict_of_reduced_image(self):
+        """
+        Test detection of a reduced image is serialized in coordinates of the original image as a face detection
+        """
+        reducedImage = VLImage.load(filename=SEVERAL_FACES, maxSide=800)
+        assert reducedImage.isReduced
+        detection = self.detector.detectOne(reducedImage)
+        assert detection.landmarks68 is not None
+        detectionDict = detection.asDict()
+        faceDetectionDict = FaceDetection.asDict(detection)
+        assert {key: int(value) for key, value in faceDetectionDict["rect"].items()} == detectionDict["rect"]
+        assert detectionDict["rect"]["width"] > detection.boundingBox.rect.width * 2
+        assert faceDetectionDict["landmarks5"] == detectionDict["landmarks5"]
+        assert detection.landmarks68.asDict(reducedImage.scale) == detectionDict["landmarks68"]
+
+    def test_landmarks68_on_demand(self):
+        """
+        Test landmarks68 are not detected if estimators do not require them and are estimated on demand
+        """
+        detection = self.detector.detectOne(VLIMAGE_ONE_FACE)
+        assert detection._landmarks68 is None
+        assert "landmarks68" not in detection.asDict()
+        assert 68 == len(detection.landmarks68.points)
+        assert "landmarks68" in detection.asDict()
+
+    def test_warp_of_reduced_image_without_landmarks68(self):
+        """
+        Test warping of a detection of a reduced image does not estimate unknown landmarks68
+        """
+        reducedImage = VLImage.load(filename=SEVERAL_FACES, maxSide=800)
+        assert reducedImage.isReduced
+        detection = self.detector.detectOne(reducedImage)
+        with mock.patch.object(FaceLandmarksEstimator, "estimate", autospec=True) as estimate:
+            assert detection.warp is not None
+        assert not estimate.called
+        assert detection._landmarks68 is None
+
+    def test_head_pose_by_landmarks68(self):
+        """
+        Test landmarks68 are detected if head pose is estimated by them
+        """
+        estimationSettings = VLFaceDetectionSettings(estimateHeadPoseByLandmarks68=True)
+        detector = VLFaceDetector(
+            faceEngine=self.faceEngine, estimationSettings=estimationSettings, estimators=[FaceEstimator.HeadPose]
+        )
+        detection = detector.detectOne(VLIMAGE_ONE_FACE)
+        assert detection._landmarks68 is not None
+        headPoseEstimator = self.faceEngine.createHeadPoseEstimator()
+        assert headPoseEstimator.estimateBy68Landmarks(detection.landmarks68).asDict() == detection.headPose.asDict()
+
+    def test_landmarks68_of_not_configured_estimators(self):
+        """
+        Test landmarks68 are not detected if head pose by them is not among configured estimators
+        """
+        estimationSettings = VLFaceDetectionSettings(estimateHeadPoseByLandmarks68=True)
+        for estimators in (None, [FaceEstimator.Emotions, FaceEstimator.Descriptor]):
+            with self.subTest(estimators=estimators):
+                detector = VLFaceDetector(
+                    faceEngine=self.faceEngine, estimationSettings=estimationSettings, estimators=estimators
+                )
+                [detections] = detector.detect([VLIMAGE_SEVERAL_FACE])
+                assert all(detection._landmarks68 is None for detection in detections)
+
+    def test_estimate_head_pose_by_estimated_landmarks68(self):
+        """
+        Test batch estimation of head pose by landmarks68 estimates missing landmarks68
+        """
+        detector = VLFaceDetector(
+            faceEngine=self.faceEngine, estimationSettings=VLFaceDetectionSettings(estimateHeadPoseByLandmarks68=True)
+        )
+        [detections] = detector.detectAndEstimate([VLIMAGE_SEVERAL_FACE], [FaceEstimator.Emotions])
+        assert all(detection._landmarks68 is None for detection in detections)
+        detector.estimateAttributes(detections, [FaceEstimator.HeadPose])
+        headPoseEstimator = self.faceEngine.createHeadPoseEstimator()
+        for detection in detections:
+            assert detection._landmarks68 is not None
+            expectedHeadPose = headPoseEstimator.estimateBy68Landmarks(detection.landmarks68)
+            assert expectedHeadPose.asDict() == detection._headPose.asDict()
+
+    def test_estimate_attributes_of_detections_with_different_settings(self):
+        """
+        Test batch estimation respects estimation settings of each detection
+        """
+        landmarksDetector = VLFaceDetector(
+            faceEngine=self.faceEngine, estimationSettings=VLFaceDetectionSettings(estimateHeadPoseByLandmarks68=True)
+        )
+        detection = self.detector.detectOne(VLIMAGE_ONE_FACE)
+        landmarksDetection = landmarksDetector.detectOne(VLIMAGE_ONE_FACE)
+        self.detector.estimateAttributes([detection, landmarksDetection], [FaceEstimator.HeadPose])
+        headPoseEstimator = self.faceEngine.createHeadPoseEstimator()
+        assert headPoseEstimator.estimateBatch([detection])[0].asDict() == detection.headPose.asDict()
+        expectedHeadPose = headPoseEstimator.estimateBy68Landmarks(landmarksDetection.landmarks68)
+        assert expectedHeadPose.asDict() == landmarksDetection.headPose.asDict()